@@ -11,6 +11,7 @@ from editor.concept_linking.view_models import ConceptSummary
 from editor.reading_annotations.concept_picker import MAX_CONCEPT_PAGE
 from editor.reading_annotations.concept_picker import MAX_CONCEPT_QUERY_LENGTH
 from editor.reading_annotations.concept_picker import legacy_identity_text
+from mathmongo.concept_search_index import rank_concept_identities
 
 MAX_QUERY_LENGTH = MAX_CONCEPT_QUERY_LENGTH
 MAX_PAGE = MAX_CONCEPT_PAGE
@@ -109,7 +110,11 @@ def search_concepts(
     page: int = 1,
     page_size: int = DEFAULT_PAGE_SIZE,
 ) -> tuple[ConceptSummary, ...]:
-    """Search all safe metadata fields using escaped regex and server-side bounds."""
+    """Search safe metadata fields with server-side bounds.
+
+    Uses the ranked concept search index when it is ready and falls back to
+    an escaped regex over the metadata fields otherwise.
+    """
     if database is None or not hasattr(database, "__getitem__"):
         raise ValueError("An explicit database is required")
     page, page_size = _pagination(page, page_size)
@@ -118,6 +123,14 @@ def search_concepts(
         return ()
     if len(value) > MAX_QUERY_LENGTH:
         raise ValueError(f"La búsqueda no puede exceder {MAX_QUERY_LENGTH} caracteres")
+    hits = rank_concept_identities(
+        database,
+        value,
+        offset=(page - 1) * page_size,
+        limit=page_size,
+    )
+    if hits is not None:
+        return get_concepts(database, hits.identities, limit=page_size)
     pattern = {"$regex": re.escape(value), "$options": "i"}
     selector = {"$or": [{field: pattern} for field in _SEARCH_FIELDS]}
     cursor = database["concepts"].find(selector, dict(CONCEPT_PROJECTION))
@@ -52,8 +52,8 @@ from editor.diary_note_persistence import persist_diary_note_update
 from editor.diary_note_ui import clear_note_settings_state
 from editor.diary_note_ui import render_note_settings_editor
 from editor.helpers.concept_builders import build_concept_metadata
+from editor.helpers.managed_source_selection import cached_load_active_sources
 from editor.helpers.managed_source_selection import can_save_with_managed_source
-from editor.helpers.managed_source_selection import load_active_sources
 from editor.helpers.managed_source_selection import resolve_active_source
 from editor.helpers.managed_source_selection import source_labels
 from editor.latex_bundle import DOWNLOAD_LABEL
@@ -1684,7 +1684,7 @@ def _render_diary_promote_note(notes_col) -> None:
     managed_source_labels = {}
     managed_source_catalog_error = None
     try:
-        managed_sources = load_active_sources(managed_source_repository)
+        managed_sources = cached_load_active_sources(managed_source_repository)
         managed_source_labels = source_labels(managed_sources)
     except Exception as exc:
         managed_source_catalog_error = str(exc)
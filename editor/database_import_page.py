@@ -28,6 +28,7 @@ from mathkb_config import IMPORT_TIMEOUT_SECONDS
 from mathmongo.paths import get_backups_dir
 from mathmongo.paths import get_runtime_dir
 from mathmongo.paths import validate_mutable_path
+from mathmongo.query_cache import bump_collection_versions
 
 CREATE_MODE = "Crear base nueva"
 UPDATE_MODE = "Actualizar base existente"
@@ -297,6 +298,8 @@ def _render_recovery(ui: Any, current_mongo: Any, target_name: str) -> None:
                 f"Se revirtieron {report.reverted_operations} operaciones usando el respaldo "
                 "previo validado."
             )
+        finally:
+            bump_collection_versions(target_name)
 
 
 def _render_update_selection(
@@ -402,6 +405,8 @@ def _render_update_mode(
                     "y el respaldo contienen versiones diferentes."
                 )
             ui.info(f"Respaldo previo validado: {report.backup_path}")
+        finally:
+            bump_collection_versions(target_name)
     _render_recovery(ui, current_mongo, target_name)
 
 
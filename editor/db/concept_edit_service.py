@@ -9,6 +9,10 @@ from datetime import datetime
 from enum import Enum
 from typing import Any
 
+from mathmongo.concept_search_index import refresh_concept_search_entries
+from mathmongo.folder_ingest import INGEST_HASH_FIELD
+from mathmongo.query_cache import bump_collection_versions
+
 
 class ConceptEditStatus(str, Enum):
     """Stable outcomes returned to Edit Concept without claiming false success."""
@@ -160,6 +164,11 @@ def _after_set(document: Mapping[str, Any], values: Mapping[str, Any]) -> dict[s
     return updated
 
 
+def _latex_update(latex_set: Mapping[str, Any]) -> dict[str, Any]:
+    # An edited note no longer matches its ingested file; re-ingesting it must write.
+    return {"$set": dict(latex_set), "$unset": {INGEST_HASH_FIELD: ""}}
+
+
 def _restore_update(
     original: Mapping[str, Any],
     changed_fields: set[str],
@@ -268,7 +277,7 @@ def _transactional_update(
                     latex_result = _update_one(
                         database.latex_documents,
                         preflight.latex,
-                        {"$set": latex_set},
+                        _latex_update(latex_set),
                         active_session,
                     )
                 except Exception as exc:
@@ -341,6 +350,7 @@ def _fallback_update(
 
     concept_after = _after_set(preflight.concept, concept_set)
     latex_after = _after_set(preflight.latex, latex_set)
+    latex_after.pop(INGEST_HASH_FIELD, None)
     changed_fields = set(concept_set)
 
     try:
@@ -392,7 +402,7 @@ def _fallback_update(
         latex_result = _update_one(
             database.latex_documents,
             preflight.latex,
-            {"$set": latex_set},
+            _latex_update(latex_set),
         )
     except Exception as exc:
         latex_error = exc
@@ -482,7 +492,7 @@ def update_concept_fields_preserving_identity(
 
     client = getattr(database, "client", None)
     if _supports_transactions(client):
-        return _transactional_update(
+        result = _transactional_update(
             database,
             client,
             concept_id=concept_id,
@@ -491,11 +501,17 @@ def update_concept_fields_preserving_identity(
             concept_set=concept_set,
             latex_set=latex_set,
         )
-    return _fallback_update(
-        database,
-        concept_id=concept_id,
-        source=source,
-        expected_source_id=expected_source_id,
-        concept_set=concept_set,
-        latex_set=latex_set,
-    )
+    else:
+        result = _fallback_update(
+            database,
+            concept_id=concept_id,
+            source=source,
+            expected_source_id=expected_source_id,
+            concept_set=concept_set,
+            latex_set=latex_set,
+        )
+    # Compensated failures wrote too, so cached reads are dropped either way.
+    bump_collection_versions(database, "concepts", "latex_documents")
+    if result.success:
+        refresh_concept_search_entries(database, [(concept_id, source)])
+    return result
@@ -1,5 +1,9 @@
 import re
 
+from mathmongo.concept_search_index import refresh_concept_search_entries
+from mathmongo.query_cache import bump_collection_versions
+
+
 def upsert_concept_metadata(db, concept_id: str, source: str, concepto_dict: dict) -> None:
     """
     Persist concept metadata using the current upsert behavior.
@@ -12,6 +16,8 @@ def upsert_concept_metadata(db, concept_id: str, source: str, concepto_dict: dic
         {"$set": concepto_dict},
         upsert=True,
     )
+    bump_collection_versions(db, "concepts")
+    refresh_concept_search_entries(db, [(concept_id, source)])
 
 
 def concept_exists(db, concept_id: str, source: str) -> bool:
@@ -37,6 +43,8 @@ def insert_concept_metadata(db, concept_id: str, source: str, concepto_dict: dic
     doc["id"] = concept_id
     doc["source"] = source
     db.concepts.insert_one(doc)
+    bump_collection_versions(db, "concepts")
+    refresh_concept_search_entries(db, [(concept_id, source)])
 
 
 def insert_concept_with_latex_atomic(
@@ -76,6 +84,8 @@ def insert_concept_with_latex_atomic(
     except Exception:
         db.concepts.delete_one({"id": concept_id, "source": source})
         raise
+    bump_collection_versions(db, "concepts", "latex_documents")
+    refresh_concept_search_entries(db, [(concept_id, source)])
 
 
 def semantic_duplicate_exists(db, titulo, tipo, source):
@@ -14,11 +14,18 @@ from exporters_latex.concept_ordering import order_by_graph
 from exporters_latex.concept_ordering import order_by_title
 from exporters_latex.concept_ordering import order_by_type
 from exporters_latex.exportadorlatex import ExportadorLatex
+from exporters_latex.latex_validation import default_validation_cache
 from exporters_latex.latex_validation import validate_selected_concepts_from_mongo
 from exporters_latex.latex_validation import validate_source_from_mongo
 from exporters_latex.unified_document import build_unified_document_bundle
+from mathdatabase.mathmongo import attach_latex_contents
+from mathdatabase.mathmongo import find_by_identities
+from mathkb_config import LATEX_VALIDATION_BATCH_SIZE
+from mathmongo.concept_search_index import rank_concept_identities
 from mathmongo.config import resolve_config
 from mathmongo.paths import get_exports_dir
+from mathmongo.relation_endpoints import relation_source_query
+from mathmongo.relation_endpoints import split_relation_endpoint
 
 CONCEPT_TYPES = [
     "definicion",
@@ -45,14 +52,27 @@ def _load_concepts(db, source: str, selected_types: list[str], search: str) -> l
     if selected_types:
         query["tipo"] = {"$in": selected_types}
 
-    concepts = list(db.concepts.find(query).sort("titulo", 1))
     search_norm = search.strip().lower()
+    hits = (
+        rank_concept_identities(db, search, source=source, concept_types=selected_types)
+        if search_norm
+        else None
+    )
+    if hits is not None:
+        found = find_by_identities(db.concepts, hits.identities)
+        return [found[identity] for identity in hits.identities if identity in found]
+
+    concepts = list(db.concepts.find(query).sort("titulo", 1))
     if search_norm:
+        latex_by_identity = find_by_identities(
+            db.latex_documents,
+            ((concept.get("id"), concept.get("source")) for concept in concepts),
+            projection={"contenido_latex": 1, "_id": 0},
+        )
         filtered = []
         for concept in concepts:
-            latex_doc = db.latex_documents.find_one(
-                {"id": concept.get("id"), "source": concept.get("source")},
-                {"contenido_latex": 1, "_id": 0},
+            latex_doc = latex_by_identity.get(
+                (str(concept.get("id")), str(concept.get("source")))
             )
             haystack = " ".join(
                 str(value or "")
@@ -71,26 +91,15 @@ def _load_concepts(db, source: str, selected_types: list[str], search: str) -> l
 
 
 def _attach_latex(db, concepts: list[dict[str, Any]]) -> list[dict[str, Any]]:
-    enriched = []
-    for concept in concepts:
-        doc = dict(concept)
-        latex_doc = db.latex_documents.find_one(
-            {"id": doc.get("id"), "source": doc.get("source")}
-        )
-        doc["contenido_latex"] = (latex_doc or {}).get("contenido_latex", "")
-        enriched.append(doc)
-    return enriched
+    return attach_latex_contents(db.latex_documents, concepts)
 
 
 def _concepts_for_keys(db, keys: list[str]) -> list[dict[str, Any]]:
-    concepts = []
-    for key in keys:
-        if "@" not in key:
-            continue
-        concept_id, source = key.split("@", 1)
-        concept = db.concepts.find_one({"id": concept_id, "source": source})
-        if concept:
-            concepts.append(concept)
+    identities = [
+        endpoint for key in keys if (endpoint := split_relation_endpoint(key)) is not None
+    ]
+    found = find_by_identities(db.concepts, identities)
+    concepts = [found[identity] for identity in identities if identity in found]
     return _attach_latex(db, concepts)
 
 
@@ -104,13 +113,7 @@ def _move_item(items: list[str], index: int, delta: int) -> list[str]:
 
 
 def _relations_for_source(db, source: str) -> list[dict[str, Any]]:
-    query = {
-        "$or": [
-            {"desde": {"$regex": f"@{source}$"}},
-            {"hasta": {"$regex": f"@{source}$"}},
-        ]
-    }
-    return list(db.relations.find(query))
+    return list(db.relations.find(relation_source_query([source])))
 
 
 def _set_order_from_concepts(concepts: list[dict[str, Any]]) -> None:
@@ -121,6 +124,16 @@ def _validation_key(result: dict[str, Any]) -> str:
     return f"{result.get('concept_id')}@{result.get('source')}"
 
 
+def _validation_progress():
+    bar = st.progress(0, text="Validando LaTeX...")
+
+    def update(done: int, total: int, result) -> None:
+        label = result.title or result.concept_id
+        bar.progress(done / total, text=f"Validando LaTeX: {done}/{total} ({label})")
+
+    return update
+
+
 def _validation_rows(results: list[dict[str, Any]]) -> list[dict[str, Any]]:
     rows = []
     for result in results:
@@ -333,6 +346,8 @@ def render_document_builder_page(
                 selected_keys_for_validation,
                 db,
                 apply_fixes=apply_safe_fixes_for_export,
+                progress=_validation_progress(),
+                cache=default_validation_cache(),
             )
             st.session_state[_builder_state_key("validation_results")] = [
                 result.__dict__ for result in results
@@ -345,6 +360,9 @@ def render_document_builder_page(
             source,
             db,
             apply_fixes=apply_safe_fixes_for_export,
+            progress=_validation_progress(),
+            cache=default_validation_cache(),
+            batch_size=LATEX_VALIDATION_BATCH_SIZE,
         )
         st.session_state[_builder_state_key("validation_results")] = report["results"]
     if action_col3.button(
@@ -466,6 +484,8 @@ def render_document_builder_page(
                 list(st.session_state[items_key]),
                 db,
                 apply_fixes=apply_safe_fixes_for_export,
+                progress=_validation_progress(),
+                cache=default_validation_cache(),
             )
             validation_results_for_export = [result.__dict__ for result in results]
             st.session_state[_builder_state_key("validation_results")] = validation_results_for_export
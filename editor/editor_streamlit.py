@@ -3,7 +3,6 @@
 import html
 import json
 import os
-import re
 import sys
 from copy import deepcopy
 from datetime import datetime
@@ -63,8 +62,8 @@ from pdf_export import generar_pdf_desde_formulario
 
 from db.concept_repository import insert_concept_with_latex_atomic
 from editor.document_builder import render_document_builder_page
+from editor.helpers.managed_source_selection import cached_load_active_sources
 from editor.helpers.managed_source_selection import can_save_with_managed_source
-from editor.helpers.managed_source_selection import load_active_sources
 from editor.helpers.managed_source_selection import resolve_active_source
 from editor.helpers.managed_source_selection import source_labels
 from editor.helpers.tipo_aplicacion import TipoAplicacion
@@ -103,10 +102,12 @@ from editor.utils.cleanup_exports import list_deletable_files
 from editor.utils.cleanup_exports import move_legacy_root_graph_files_to_runtime
 from editor.utils.cleanup_exports import scan_cleanup_dirs
 from editor.utils.db_export import export_database_to_zip
+from editor.utils.knowledge_graph_sync import GraphState
 from editor.utils.knowledge_graph_sync import add_concepts_to_graph_state
 from editor.utils.knowledge_graph_sync import concept_graph_node_errors
 from editor.utils.knowledge_graph_sync import concept_graph_node_warnings
 from editor.utils.knowledge_graph_sync import concept_key
+from editor.utils.knowledge_graph_sync import concept_resolver_for_graph
 from editor.utils.knowledge_graph_sync import concept_table_rows
 from editor.utils.knowledge_graph_sync import concepts_by_keys
 from editor.utils.knowledge_graph_sync import default_sync_settings
@@ -146,6 +147,8 @@ from exporters_quarto.quarto_exporter import QuartoBookExporter
 # Render preview graph using the same renderer as "Knowledge Graph"
 from mathdatabase.mathmongo import MathMongo
 from mathdatabase.mathmongo import MongoIndexInitializationError
+from mathdatabase.mathmongo import attach_latex_contents
+from mathdatabase.mathmongo import find_by_identities
 from mathkb_config import CLEANUP_BACKUP_DIR
 from mathkb_config import CLEANUP_LOG_FILE
 from mathkb_config import EXPORT_CLEANUP_DIRS
@@ -156,6 +159,7 @@ from mathkb_config import GRAPH_RUNTIME_DIR
 from mathkb_config import LATEX_MAX_PASSES
 from mathkb_config import PDF_COMPILE_TIMEOUT_SECONDS
 from mathkb_config import PROJECT_ROOT
+from mathmongo.concept_search_index import refresh_concept_search_entries
 from mathmongo.config import mongo_connection_guidance
 from mathmongo.config import resolve_config
 from mathmongo.config import sanitize_mongo_error
@@ -164,8 +168,17 @@ from mathmongo.paths import get_exports_dir
 from mathmongo.paths import get_latex_runtime_dir
 from mathmongo.paths import resolve_home_path
 from mathmongo.paths import validate_mutable_path
+from mathmongo.query_cache import EDITOR_QUERY_CACHE
+from mathmongo.query_cache import QUERY_CACHE_MAX_AGE_SECONDS
+from mathmongo.query_cache import bump_collection_versions
+from mathmongo.query_cache import cached_distinct
+from mathmongo.query_cache import cached_query
+from mathmongo.query_cache import query_params
+from mathmongo.relation_endpoints import relation_source_query
 from schemas.schemas import ConceptoBase
 from visualizations.grafoconocimiento import GrafoConocimiento
+from visualizations.incremental_graph import KNOWLEDGE_GRAPH_BASES
+from visualizations.incremental_graph import GraphFilters
 
 DEBUG_KNOWLEDGE_GRAPH = os.getenv("DEBUG_KNOWLEDGE_GRAPH", "0") == "1"
 
@@ -788,6 +801,23 @@ def _render_concept_media_manager(
     return assets
 
 
+def _cached_distinct(db, collection: str, field: str) -> list:
+    """Distinct values of ``field`` for the active database, reused across reruns."""
+    return cached_distinct(db, collection, field, scope=active_database_scope or "")
+
+
+def _cached_concepts(db, query: dict) -> list[dict]:
+    """Concepts matching ``query`` newest first, reused until ``concepts`` changes."""
+    return cached_query(
+        db,
+        "concepts.newest_first",
+        lambda: list(db.concepts.find(query).sort("fecha_creacion", -1)),
+        collections=("concepts",),
+        scope=active_database_scope or "",
+        params=query_params(query),
+    )
+
+
 def _source_from_graph_endpoint(value) -> str | None:
     if not isinstance(value, str) or "@" not in value:
         return None
@@ -798,12 +828,12 @@ def _source_from_graph_endpoint(value) -> str | None:
 def _knowledge_graph_source_options(mongo: MathMongo, saved_maps: list[dict] | None = None) -> list[str]:
     sources = set()
 
-    for source in mongo.concepts.distinct("source"):
+    for source in _cached_distinct(mongo, "concepts", "source"):
         if isinstance(source, str) and source.strip():
             sources.add(source.strip())
 
     for field in ("desde", "hasta"):
-        for endpoint in mongo.relations.distinct(field):
+        for endpoint in _cached_distinct(mongo, "relations", field):
             source = _source_from_graph_endpoint(endpoint)
             if source:
                 sources.add(source)
@@ -831,31 +861,12 @@ def _build_knowledge_graph_state_from_filters(
     concept_types: list[str],
     previous_state: dict | None = None,
 ) -> dict:
-    clean_sources = [source for source in sources or [] if source]
-    clean_relations = [relation for relation in relation_types or [] if relation]
-    clean_types = [concept_type for concept_type in concept_types or [] if concept_type]
-
-    concept_query = {}
-    if clean_sources:
-        concept_query["source"] = {"$in": clean_sources}
-    if clean_types:
-        concept_query["tipo"] = {"$in": clean_types}
-    concepts = list(mongo.concepts.find(concept_query))
-
-    relation_query = {}
-    if clean_sources:
-        source_pattern = "|".join(re.escape(source) for source in clean_sources)
-        relation_query["$or"] = [
-            {"desde": {"$regex": f"@({source_pattern})$"}},
-            {"hasta": {"$regex": f"@({source_pattern})$"}},
-        ]
-    if clean_relations:
-        relation_query["tipo"] = {"$in": clean_relations}
-    relations = list(mongo.relations.find(relation_query))
-
-    grafo = GrafoConocimiento(concepts, relations)
-    grafo.construir_grafo(tipos_relacion=clean_relations, tipos_concepto=clean_types)
-    return grafo.to_graph_state(previous_state=previous_state)
+    # The base graph of the database is cached; a filter change only evaluates
+    # the new view in memory and serializes the nodes and edges entering it.
+    filters = GraphFilters.clean(sources, relation_types, concept_types)
+    graph_state, delta = KNOWLEDGE_GRAPH_BASES.get(mongo).graph_state_update(filters, previous_state)
+    _kg_debug("Filter delta", **delta.summary())
+    return graph_state
 
 
 def _knowledge_graph_concept_selector(concepts: list[dict], key: str) -> list[dict]:
@@ -1273,11 +1284,11 @@ elif page == "🏠 Inicio":
         st.metric("Relaciones", relation_count)
 
     with col3:
-        sources = db.concepts.distinct("source")
+        sources = _cached_distinct(db, "concepts", "source")
         st.metric("Fuentes", len(sources))
 
     with col4:
-        categories = db.concepts.distinct("categorias")
+        categories = _cached_distinct(db, "concepts", "categorias")
         st.metric("Categorías", len(categories))
 
     st.markdown("---")
@@ -1317,7 +1328,7 @@ elif page == "🏠 Inicio":
 
         # Load available sources (sanitized)
         try:
-            available_sources = db.concepts.distinct("source")
+            available_sources = _cached_distinct(db, "concepts", "source")
             available_sources = sorted(
                 [s for s in available_sources if isinstance(s, str) and s.strip()],
                 key=lambda x: x.lower(),
@@ -1790,7 +1801,10 @@ elif page == "💡 Nuevo concepto":
     else:
         managed_source_repository = catalog_context.source_repository
         try:
-            managed_sources = load_active_sources(managed_source_repository)
+            managed_sources = cached_load_active_sources(
+                managed_source_repository,
+                scope=active_database_scope or "",
+            )
             managed_source_labels = source_labels(managed_sources)
         except Exception as exc:
             managed_source_catalog_error = safe_catalog_error(exc)
@@ -1902,7 +1916,7 @@ elif page == "💡 Nuevo concepto":
     "Combinatorics", "Logic", "Statistics", "Calculus"]
 
     # 2. Categorías adicionales ya existentes en la base de datos
-    categorias_db = db.concepts.distinct("categorias")
+    categorias_db = _cached_distinct(db, "concepts", "categorias")
     categorias_db = [cat for cat in categorias_db if isinstance(cat, str)]
 
     # 3. Opcional: incluir categorías sugeridas por usuarios previos
@@ -2292,7 +2306,7 @@ elif page == "🖊️ Editar concepto":
     legacy_last_selected_key = source_catalog_state_key("legacy_last_selected_concept")
     available_legacy_sources = [
         value
-        for value in db.concepts.distinct("source")
+        for value in _cached_distinct(db, "concepts", "source")
         if isinstance(value, str) and value
     ]
     source_options = ["All", *available_legacy_sources]
@@ -2300,7 +2314,7 @@ elif page == "🖊️ Editar concepto":
         "All",
         *[
             value
-            for value in db.concepts.distinct("tipo")
+            for value in _cached_distinct(db, "concepts", "tipo")
             if isinstance(value, str) and value
         ],
     ]
@@ -2345,7 +2359,7 @@ elif page == "🖊️ Editar concepto":
         query["tipo"] = filter_type
 
     # Get concepts for selection
-    concepts = list(db.concepts.find(query).sort("fecha_creacion", -1))
+    concepts = _cached_concepts(db, query)
 
     if not concepts:
         st.warning("⚠️ No concepts found with the selected filters.")
@@ -2563,7 +2577,10 @@ elif page == "🖊️ Editar concepto":
             else:
                 link_source_repository = catalog_context.source_repository
                 try:
-                    managed_sources = load_active_sources(link_source_repository)
+                    managed_sources = cached_load_active_sources(
+                        link_source_repository,
+                        scope=active_database_scope or "",
+                    )
                     managed_source_labels = source_labels(managed_sources)
                 except Exception as exc:
                     link_catalog_error = safe_catalog_error(exc)
@@ -2705,7 +2722,7 @@ elif page == "🖊️ Editar concepto":
 
         # Categories
         # Get all available categories from database
-        categorias_db = db.concepts.distinct("categorias")
+        categorias_db = _cached_distinct(db, "concepts", "categorias")
         categorias_db = [cat for cat in categorias_db if isinstance(cat, str)]
 
         # Combine predefined and database categories
@@ -3063,6 +3080,7 @@ elif page == "🖊️ Editar concepto":
                             # Delete concept and LaTeX content
                             db.concepts.delete_one({"id": selected_concept['id'], "source": selected_concept['source']})
                             db.latex_documents.delete_one({"id": selected_concept['id'], "source": selected_concept['source']})
+                            refresh_concept_search_entries(db, [(selected_concept['id'], selected_concept['source'])])
 
                             # Delete related relations
                             db.relations.delete_many({
@@ -3071,6 +3089,7 @@ elif page == "🖊️ Editar concepto":
                                     {"hasta": f"{selected_concept['id']}@{selected_concept['source']}"}
                                 ]
                             })
+                            bump_collection_versions(db, "concepts", "latex_documents", "relations")
 
                             st.session_state["delete_armed_edit"] = False
                             st.success("✅ Concept deleted successfully!")
@@ -3098,10 +3117,10 @@ elif page == "🧠 Conceptos":
     col1, col2, col3 = st.columns(3)
 
     with col1:
-        filter_type = st.selectbox("Type", ["All"] + list(db.concepts.distinct("tipo")))
+        filter_type = st.selectbox("Type", ["All"] + list(_cached_distinct(db, "concepts", "tipo")))
 
     with col2:
-        filter_source = st.selectbox("Source", ["All"] + list(db.concepts.distinct("source")))
+        filter_source = st.selectbox("Source", ["All"] + list(_cached_distinct(db, "concepts", "source")))
 
     with col3:
         search_term = st.text_input("Search", placeholder="Search by title or ID...")
@@ -3119,7 +3138,7 @@ elif page == "🧠 Conceptos":
         ]
 
     # Execute query
-    concepts = list(db.concepts.find(query).sort("fecha_creacion", -1))
+    concepts = _cached_concepts(db, query)
 
     st.subheader(f"📊 Results ({len(concepts)} concepts)")
 
@@ -3170,13 +3189,11 @@ elif page == "🧠 Conceptos":
                 from scripts.export_quarto_book import _write_book_quarto_yml
                 build_path = validate_mutable_path(resolve_home_path(build_dir))
                 selected_ids = {concept_id_map[label] for label in selected_labels}
-                selected_concepts = []
-                for c in concepts:
-                    if c["id"] in selected_ids:
-                        latex_doc = db.latex_documents.find_one({"id": c["id"], "source": c["source"]})
-                        c2 = dict(c)  # copia para no mutar la lista base
-                        c2["contenido_latex"] = (latex_doc or {}).get("contenido_latex", "")
-                        selected_concepts.append(c2)
+                # Copias con el LaTeX unido en bloque; la lista base no se muta.
+                selected_concepts = attach_latex_contents(
+                    db.latex_documents,
+                    (c for c in concepts if c["id"] in selected_ids),
+                )
 
                 # --- MVP-B: LaTeX preflight (pdflatex compile check) ---
                 if preflight_compile:
@@ -3354,6 +3371,8 @@ elif page == "🧠 Conceptos":
                         if st.button("⚠️ Confirm Delete", key=f"confirm_{concept['id']}"):
                             db.concepts.delete_one({"id": concept['id'], "source": concept['source']})
                             db.latex_documents.delete_one({"id": concept['id'], "source": concept['source']})
+                            bump_collection_versions(db, "concepts", "latex_documents")
+                            refresh_concept_search_entries(db, [(concept['id'], concept['source'])])
                             st.success("Concept deleted!")
                             st.rerun()
     else:
@@ -3390,8 +3409,8 @@ elif page == "🕸️ Relaciones":
         with col_from:
             st.write("**From Concept:**")
             # Filter concepts for "from" selection
-            desde_source_filter = st.selectbox("From Source", ["All"] + list(db.concepts.distinct("source")), key="desde_source_filter")
-            desde_type_filter = st.selectbox("From Type", ["All"] + list(db.concepts.distinct("tipo")), key="desde_type_filter")
+            desde_source_filter = st.selectbox("From Source", ["All"] + list(_cached_distinct(db, "concepts", "source")), key="desde_source_filter")
+            desde_type_filter = st.selectbox("From Type", ["All"] + list(_cached_distinct(db, "concepts", "tipo")), key="desde_type_filter")
 
             # Build query for "from" concepts
             desde_query = {}
@@ -3400,7 +3419,7 @@ elif page == "🕸️ Relaciones":
             if desde_type_filter != "All":
                 desde_query["tipo"] = desde_type_filter
 
-            desde_concepts = list(db.concepts.find(desde_query).sort("fecha_creacion", -1))
+            desde_concepts = _cached_concepts(db, desde_query)
 
             if desde_concepts:
                 desde_options = []
@@ -3424,8 +3443,8 @@ elif page == "🕸️ Relaciones":
         with col_to:
             st.write("**To Concept:**")
             # Filter concepts for "to" selection
-            hasta_source_filter = st.selectbox("To Source", ["All"] + list(db.concepts.distinct("source")), key="hasta_source_filter")
-            hasta_type_filter = st.selectbox("To Type", ["All"] + list(db.concepts.distinct("tipo")), key="hasta_type_filter")
+            hasta_source_filter = st.selectbox("To Source", ["All"] + list(_cached_distinct(db, "concepts", "source")), key="hasta_source_filter")
+            hasta_type_filter = st.selectbox("To Type", ["All"] + list(_cached_distinct(db, "concepts", "tipo")), key="hasta_type_filter")
 
             # Build query for "to" concepts
             hasta_query = {}
@@ -3434,7 +3453,7 @@ elif page == "🕸️ Relaciones":
             if hasta_type_filter != "All":
                 hasta_query["tipo"] = hasta_type_filter
 
-            hasta_concepts = list(db.concepts.find(hasta_query).sort("fecha_creacion", -1))
+            hasta_concepts = _cached_concepts(db, hasta_query)
 
             if hasta_concepts:
                 hasta_options = []
@@ -3904,17 +3923,14 @@ elif page == "🕸️ Relaciones":
         # Filter relations for editing
         col1, col2 = st.columns(2)
         with col1:
-            edit_filter_source = st.selectbox("Filter by Source", ["All"] + list(db.concepts.distinct("source")), key="edit_source_filter")
+            edit_filter_source = st.selectbox("Filter by Source", ["All"] + list(_cached_distinct(db, "concepts", "source")), key="edit_source_filter")
         with col2:
             edit_filter_type = st.selectbox("Filter by Type", ["All"] + [t.value for t in TipoRelacion], key="edit_type_filter")
 
         # Build query for relations to edit
         edit_query = {}
         if edit_filter_source != "All":
-            edit_query["$or"] = [
-                {"desde": {"$regex": f"@{edit_filter_source}$"}},
-                {"hasta": {"$regex": f"@{edit_filter_source}$"}}
-            ]
+            edit_query.update(relation_source_query([edit_filter_source]))
         if edit_filter_type != "All":
             edit_query["tipo"] = edit_filter_type
 
@@ -3991,6 +4007,7 @@ elif page == "🕸️ Relaciones":
                                         }
                                     }
                                 )
+                                bump_collection_versions(db, "relations")
                                 st.success("✅ Relation updated successfully!")
                             except Exception as e:
                                 st.error(f"❌ Error updating relation: {e}")
@@ -4017,6 +4034,7 @@ elif page == "🕸️ Relaciones":
                             if st.button("❌ Confirm Delete", key=confirm_btn_key):
                                 try:
                                     db.relations.delete_one({"_id": rel["_id"]})
+                                    bump_collection_versions(db, "relations")
                                     st.success("✅ Relation deleted successfully!")
                                     st.session_state.pop(confirm_state_key, None)
                                     st.rerun()
@@ -4031,17 +4049,14 @@ elif page == "🕸️ Relaciones":
         # Filter relations for viewing
         col1, col2 = st.columns(2)
         with col1:
-            view_filter_source = st.selectbox("Filter by Source", ["All"] + list(db.concepts.distinct("source")), key="view_source_filter")
+            view_filter_source = st.selectbox("Filter by Source", ["All"] + list(_cached_distinct(db, "concepts", "source")), key="view_source_filter")
         with col2:
             view_filter_type = st.selectbox("Filter by Type", ["All"] + [t.value for t in TipoRelacion], key="view_type_filter")
 
         # Build query
         view_query = {}
         if view_filter_source != "All":
-            view_query["$or"] = [
-                {"desde": {"$regex": f"@{view_filter_source}$"}},
-                {"hasta": {"$regex": f"@{view_filter_source}$"}}
-            ]
+            view_query.update(relation_source_query([view_filter_source]))
         if view_filter_type != "All":
             view_query["tipo"] = view_filter_type
 
@@ -4153,7 +4168,13 @@ elif page == "🗺️ Grafo de conocimiento":
 
     maps_col = db.db["knowledge_graph_maps"]
     try:
-        all_maps = list(maps_col.find({}).sort("updated_at", -1).limit(200))
+        all_maps = cached_query(
+            db,
+            "knowledge_graph_maps.recent",
+            lambda: list(maps_col.find({}).sort("updated_at", -1).limit(200)),
+            collections=("knowledge_graph_maps",),
+            scope=active_database_scope or "",
+        )
     except Exception as exc:
         all_maps = []
         st.error(f"No se pudieron listar los mapas guardados: {exc}")
@@ -4174,7 +4195,7 @@ elif page == "🗺️ Grafo de conocimiento":
     }
     db_concept_type_options = {
         concept_type
-        for concept_type in db.concepts.distinct("tipo")
+        for concept_type in _cached_distinct(db, "concepts", "tipo")
         if isinstance(concept_type, str) and concept_type.strip()
     }
     concept_type_options = sorted(
@@ -4192,7 +4213,7 @@ elif page == "🗺️ Grafo de conocimiento":
     }
     db_relation_type_options = {
         relation_type
-        for relation_type in db.relations.distinct("tipo")
+        for relation_type in _cached_distinct(db, "relations", "tipo")
         if isinstance(relation_type, str) and relation_type.strip()
     }
     relation_type_options = sorted(
@@ -4252,12 +4273,7 @@ elif page == "🗺️ Grafo de conocimiento":
                         concept_query["tipo"] = {"$in": selected_types}
                     concepts = list(db.concepts.find(concept_query))
 
-                    relation_query = {
-                        "$or": [
-                            {"desde": {"$regex": f"@({'|'.join(selected_sources)})$"}},
-                            {"hasta": {"$regex": f"@({'|'.join(selected_sources)})$"}},
-                        ]
-                    }
+                    relation_query = relation_source_query(selected_sources)
                     if selected_relations:
                         relation_query["tipo"] = {"$in": selected_relations}
                     relations = list(db.relations.find(relation_query))
@@ -4269,6 +4285,7 @@ elif page == "🗺️ Grafo de conocimiento":
                             tipos_concepto=selected_types,
                         )
                         st.session_state["knowledge_graph_new_html"] = grafo.exportar_html(salida=None)
+                        _kg_debug("Exported graph HTML", **grafo.export_metrics)
                         st.session_state["knowledge_graph_new_stats"] = {
                             "nodes": len(grafo.G.nodes),
                             "edges": len(grafo.G.edges),
@@ -4344,6 +4361,7 @@ elif page == "🗺️ Grafo de conocimiento":
                         "sync_settings": default_sync_settings(),
                     }
                     result = maps_col.insert_one(document)
+                    bump_collection_versions(db, "knowledge_graph_maps")
                     if result.acknowledged:
                         st.success("Mapa guardado correctamente.")
                     else:
@@ -4433,6 +4451,7 @@ elif page == "🗺️ Grafo de conocimiento":
                             duplicate["created_at"] = now
                             duplicate["updated_at"] = now
                             result = maps_col.insert_one(duplicate)
+                            bump_collection_versions(db, "knowledge_graph_maps")
                             if result.acknowledged:
                                 st.success("Mapa duplicado correctamente.")
                             else:
@@ -4447,6 +4466,7 @@ elif page == "🗺️ Grafo de conocimiento":
                         else:
                             try:
                                 result = maps_col.delete_one(_knowledge_graph_map_id_query(selected_map_id))
+                                bump_collection_versions(db, "knowledge_graph_maps")
                                 if result.deleted_count:
                                     st.success("Mapa eliminado correctamente.")
                                     if st.session_state.get("knowledge_graph_active_map_id") == selected_map_id:
@@ -4571,6 +4591,7 @@ elif page == "🗺️ Grafo de conocimiento":
                             }
                         },
                     )
+                    bump_collection_versions(db, "knowledge_graph_maps")
                     if repair_result.acknowledged:
                         graph_state = repaired_graph_state
                         st.session_state["knowledge_graph_edit_graph_state"] = repaired_graph_state
@@ -4591,6 +4612,8 @@ elif page == "🗺️ Grafo de conocimiento":
                     )
                 current_node_count, current_edge_count = _knowledge_graph_state_counts(graph_state)
                 form_state = _sync_kg_edit_form_state_from_graph(edit_map_id_text, graph_state)
+                # Parsed once per rerun; the read-only helpers below share its indexes.
+                graph_index = GraphState(graph_state)
                 map_source_options = merge_ordered_values(
                     source_options,
                     filters.get("sources", []),
@@ -4762,6 +4785,7 @@ elif page == "🗺️ Grafo de conocimiento":
                                     }
                                 },
                             )
+                            bump_collection_versions(db, "knowledge_graph_maps")
                             if repair_result.acknowledged:
                                 st.session_state["knowledge_graph_edit_graph_state"] = repaired_graph_state
                                 st.session_state["knowledge_graph_render_version"] = (
@@ -4800,7 +4824,7 @@ elif page == "🗺️ Grafo de conocimiento":
                 missing_concepts = detect_missing_source_concepts(
                     db,
                     edit_doc_for_sync,
-                    graph_state,
+                    graph_index,
                     include_removed=bool(st.session_state.get(include_removed_sync_key, False)),
                 )
                 show_manual_sync = bool(st.session_state.get(manual_sync_key))
@@ -4867,6 +4891,7 @@ elif page == "🗺️ Grafo de conocimiento":
                                     }
                                 },
                             )
+                            bump_collection_versions(db, "knowledge_graph_maps")
                             if result.acknowledged:
                                 st.session_state[manual_sync_key] = False
                                 st.session_state["knowledge_graph_message"] = (
@@ -4930,7 +4955,7 @@ elif page == "🗺️ Grafo de conocimiento":
                         external_concepts = find_available_concepts(
                             db,
                             external_source,
-                            graph_state,
+                            graph_index,
                             concept_types=list(external_types or []),
                             search_text=external_search,
                         )
@@ -4952,7 +4977,8 @@ elif page == "🗺️ Grafo de conocimiento":
                                     sync_origin="external_source",
                                 )
 
-                node_rows = map_node_rows(db, graph_state)
+                node_resolver = concept_resolver_for_graph(db, graph_index)
+                node_rows = map_node_rows(db, graph_index, node_resolver)
 
                 def _queue_node_removal(node_ids: list[str], reason: str) -> None:
                     clean_ids = [node_id for node_id in node_ids if node_id]
@@ -5065,7 +5091,7 @@ elif page == "🗺️ Grafo de conocimiento":
                         if st.button("🗑️ Quitar nodos seleccionados del mapa", key=f"kg_remove_selected_nodes_{edit_map_id}"):
                             _queue_node_removal(selected_node_ids, "selected")
 
-                        incomplete_ids = incomplete_node_ids(db, graph_state)
+                        incomplete_ids = incomplete_node_ids(db, graph_index, node_resolver)
                         if incomplete_ids:
                             st.divider()
                             st.caption(f"Nodos incompletos detectados: {len(incomplete_ids)}")
@@ -5078,7 +5104,7 @@ elif page == "🗺️ Grafo de conocimiento":
                             if st.button("🧹 Eliminar nodos incompletos", key=f"kg_remove_incomplete_nodes_{edit_map_id}"):
                                 _queue_node_removal(incomplete_ids, "incomplete")
 
-                        isolated_ids = isolated_node_ids(graph_state)
+                        isolated_ids = isolated_node_ids(graph_index)
                         if isolated_ids:
                             st.divider()
                             st.caption(f"Nodos aislados detectados: {len(isolated_ids)}")
@@ -5288,6 +5314,7 @@ elif page == "🗺️ Grafo de conocimiento":
                                     }
                                 },
                             )
+                            bump_collection_versions(db, "knowledge_graph_maps")
                             saved_nodes, saved_edges = _knowledge_graph_state_counts(new_graph_state)
                             _kg_debug(
                                 "Saving edit map",
@@ -5428,6 +5455,7 @@ elif page == "🗺️ Grafo de conocimiento":
                             "sync_settings": default_sync_settings(),
                         }
                     )
+                    bump_collection_versions(db, "knowledge_graph_maps")
                     if result.acknowledged:
                         st.success("Mapa importado correctamente.")
                     else:
@@ -5463,7 +5491,7 @@ elif page == "📤 Exportar":
     col1, col2 = st.columns(2)
 
     with col1:
-        export_source = st.selectbox("Select Source", [""] + list(db.concepts.distinct("source")))
+        export_source = st.selectbox("Select Source", [""] + list(_cached_distinct(db, "concepts", "source")))
         export_type = st.selectbox("Export Type", ["All", "definicion", "teorema", "proposicion", "corolario", "lema", "ejemplo", "nota"])
 
     with col2:
@@ -5505,6 +5533,10 @@ elif page == "📤 Exportar":
                     query["tipo"] = export_type
 
                 concepts = list(db.concepts.find(query))
+                latex_by_identity = find_by_identities(
+                    db.latex_documents,
+                    ((concept["id"], export_source) for concept in concepts),
+                )
 
                 if concepts:
                     progress_bar = st.progress(0)
@@ -5513,7 +5545,7 @@ elif page == "📤 Exportar":
                     for i, concept in enumerate(concepts):
                         status_text.text(f"Exporting {concept['id']}...")
 
-                        latex_doc = db.latex_documents.find_one({"id": concept['id'], "source": export_source})
+                        latex_doc = latex_by_identity.get((str(concept['id']), export_source))
                         if latex_doc:
                             contenido_latex = latex_doc['contenido_latex']
                             if validate_latex_before_export:
@@ -5579,7 +5611,7 @@ elif page == "📤 Exportar":
 
     if st.button("🔄 Export All Sources"):
         try:
-            sources = db.concepts.distinct("source")
+            sources = _cached_distinct(db, "concepts", "source")
             exportador = ExportadorLatex()
 
             progress_bar = st.progress(0)
@@ -5636,10 +5668,10 @@ elif page == "⚙️ Configuración":
         st.metric("Relaciones", relation_count)
 
     with col2:
-        source_count = len(db.concepts.distinct("source"))
+        source_count = len(_cached_distinct(db, "concepts", "source"))
         st.metric("Fuentes", source_count)
 
-        category_count = len(db.concepts.distinct("categorias"))
+        category_count = len(_cached_distinct(db, "concepts", "categorias"))
         st.metric("Categorías", category_count)
 
     st.subheader("Protección de datos")
@@ -5655,6 +5687,25 @@ elif page == "⚙️ Configuración":
             "estructuras ni mostrar contenido privado."
         )
         st.code("python -m mathmongo.doctor doctor", language="bash")
+    with st.expander("Caché de consultas", expanded=False, icon=":material/cached:"):
+        st.caption(
+            "Las listas de fuentes, tipos, conceptos, mapas y catálogo se reutilizan entre "
+            "interacciones hasta que se escribe en su colección o pasan "
+            f"{QUERY_CACHE_MAX_AGE_SECONDS:.0f} segundos."
+        )
+        query_cache_stats = EDITOR_QUERY_CACHE.stats()
+        if query_cache_stats:
+            st.table(
+                [
+                    {"Consulta": query, "Aciertos": item.hits, "Fallos": item.misses}
+                    for query, item in query_cache_stats.items()
+                ]
+            )
+        else:
+            st.caption("Todavía no hay consultas en caché en este proceso.")
+        if st.button("Vaciar caché", key="query_cache_clear"):
+            EDITOR_QUERY_CACHE.clear()
+            st.rerun()
     if catalog_context is not None:
         st.subheader("Diagnóstico del catálogo")
         render_catalog_status(
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from collections import Counter
 
+from mathmongo.query_cache import cached_query
 from mathmongo.source_catalog.models import Source
 from mathmongo.source_catalog.models import SourceStatus
 from mathmongo.source_catalog.repository import SourceRepository
@@ -30,6 +31,21 @@ def load_active_sources(repository: SourceRepository) -> tuple[Source, ...]:
     return tuple(sorted(sources, key=lambda source: (source.name.casefold(), source.source_id)))
 
 
+def cached_load_active_sources(
+    repository: SourceRepository,
+    *,
+    scope: str = "",
+) -> tuple[Source, ...]:
+    """Reuse :func:`load_active_sources` across reruns until ``sources`` is written."""
+    return cached_query(
+        repository.database,
+        "sources.active",
+        lambda: load_active_sources(repository),
+        collections=(SourceRepository.COLLECTION,),
+        scope=scope,
+    )
+
+
 def _short_source_id(source_id: str) -> str:
     value = source_id.removeprefix("src_")
     return f"{value[:8]}…{value[-8:]}"
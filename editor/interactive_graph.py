@@ -15,6 +15,7 @@ from pyvis.network import Network
 
 from mathmongo.paths import get_graph_runtime_dir
 from mathmongo.paths import validate_mutable_path
+from mathmongo.relation_endpoints import relation_source_query
 
 
 class InteractiveGraphManager:
@@ -94,12 +95,7 @@ class InteractiveGraphManager:
         concepts = list(self.db.concepts.find(concept_query))
         
         # Build relation query
-        relation_query = {}
-        if filter_sources:
-            relation_query["$or"] = [
-                {"desde": {"$regex": f"@({'|'.join(filter_sources)})$"}},
-                {"hasta": {"$regex": f"@({'|'.join(filter_sources)})$"}}
-            ]
+        relation_query = relation_source_query(filter_sources) if filter_sources else {}
         if filter_relations:
             relation_query["tipo"] = {"$in": filter_relations}
         
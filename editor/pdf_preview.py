@@ -162,11 +162,18 @@ def load_pdf_preview(
         if before.st_size <= 0:
             raise PdfPreviewError("empty", "El PDF generado está vacío.")
 
+        # Hash while reading so the payload is not walked a second time.
+        digest = hashlib.sha256()
         chunks: list[bytes] = []
         while True:
             chunk = os.read(descriptor, 1024 * 1024)
             if not chunk:
                 break
+            if not chunks and not chunk.startswith(PDF_SIGNATURE):
+                raise PdfPreviewError(
+                    "invalid_header", "El archivo generado no tiene una cabecera PDF válida."
+                )
+            digest.update(chunk)
             chunks.append(chunk)
         after = os.fstat(descriptor)
     except PdfPreviewError:
@@ -192,7 +199,7 @@ def load_pdf_preview(
 
     return PdfPreviewPayload(
         pdf_bytes=pdf_bytes,
-        sha256=hashlib.sha256(pdf_bytes).hexdigest(),
+        sha256=digest.hexdigest(),
         file_name=safe_file_name,
         context_identity=context_identity,
     )
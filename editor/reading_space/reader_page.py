@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import hashlib
 import inspect
 from types import SimpleNamespace
 from typing import Any
@@ -301,15 +300,21 @@ def _open_pdf(
         ui.error("El servicio no devolvió bytes para el PDF abierto.")
         return None
     subject = _subject(context, reader)
-    observed_sha = hashlib.sha256(payload.pdf_bytes).hexdigest()
-    if payload.sha256 != subject["sha256"] or observed_sha != subject["sha256"]:
+    if payload.sha256 != subject["sha256"]:
         ui.error("La identidad SHA-256 del PDF abierto no coincide.")
         return None
+    try:
+        # The viewer needs bytes; open() re-verifies the SHA-256 over the mapping.
+        with payload.open() as mapping:
+            pdf_bytes = mapping[:]
+    except Exception as exc:
+        ui.error(f"No se pudo leer el PDF verificado: {safe_error_message(exc)}")
+        return None
     store_pdf_preview(
         ui.session_state,
         PDF_PREVIEW_NAMESPACE,
         PdfPreviewPayload(
-            pdf_bytes=payload.pdf_bytes,
+            pdf_bytes=pdf_bytes,
             sha256=payload.sha256,
             file_name=payload.file_name,
             context_identity=_subject_identity(subject),
@@ -3,9 +3,11 @@
 from __future__ import annotations
 
 import hashlib
+import io
 import json
 from pathlib import PurePath
 from typing import Any
+from typing import BinaryIO
 
 from editor.pdf_preview import PdfPreviewPayload
 from editor.pdf_preview import clear_pdf_preview
@@ -31,6 +33,7 @@ from mathmongo.source_documents.service import DocumentOperationResult
 from mathmongo.source_documents.service import DocumentOperationStatus
 from mathmongo.source_documents.service import SourceDocumentService
 from mathmongo.source_documents.storage import MAX_SOURCE_PDF_UPLOAD_BYTES
+from mathmongo.source_documents.storage import BlobValidationError
 from mathmongo.source_documents.storage import SourceDocumentBlobStore
 
 PDF_PREVIEW_NAMESPACE = "source_document"
@@ -44,10 +47,14 @@ def clear_source_document_preview(state: Any) -> None:
     state.pop(DOCUMENT_PREVIEW_SUBJECT, None)
 
 
-def uploaded_pdf_bytes(uploaded_file: Any) -> bytes:
-    """Materialize and validate one bounded Streamlit PDF upload without opening a path."""
+def uploaded_pdf_file(uploaded_file: Any) -> BinaryIO:
+    """Return one bounded Streamlit PDF upload rewound for streaming, without opening a path.
+
+    Only the declared size is checked here; the byte limit and the ``%PDF-``
+    header are enforced while the upload is hashed or staged.
+    """
     if uploaded_file is None:
-        return b""
+        raise ValueError("No se seleccionó ningún PDF.")
     declared_size = getattr(uploaded_file, "size", None)
     if (
         isinstance(declared_size, int)
@@ -55,36 +62,28 @@ def uploaded_pdf_bytes(uploaded_file: Any) -> bytes:
         and declared_size > MAX_SOURCE_PDF_UPLOAD_BYTES
     ):
         raise ValueError(f"El PDF supera el límite de {MAX_SOURCE_PDF_UPLOAD_BYTES} bytes.")
-
-    position = None
     if hasattr(uploaded_file, "read"):
-        if hasattr(uploaded_file, "tell"):
-            try:
-                position = uploaded_file.tell()
-            except (OSError, ValueError):
-                position = None
-        value = uploaded_file.read(MAX_SOURCE_PDF_UPLOAD_BYTES + 1)
-        if position is not None and hasattr(uploaded_file, "seek"):
-            try:
-                uploaded_file.seek(position)
-            except (OSError, ValueError):
-                pass
-    elif hasattr(uploaded_file, "getvalue"):
+        if hasattr(uploaded_file, "seek"):
+            uploaded_file.seek(0)
+        return uploaded_file
+    if hasattr(uploaded_file, "getvalue"):
         value = uploaded_file.getvalue()
-    else:
-        raise TypeError("El archivo subido no expone bytes legibles.")
-
-    if not isinstance(value, (bytes, bytearray, memoryview)):
-        raise TypeError("El PDF subido debe contener bytes.")
-    data = bytes(value)
-    if not data:
-        raise ValueError("El PDF subido está vacío.")
-    if len(data) > MAX_SOURCE_PDF_UPLOAD_BYTES:
-        raise ValueError(f"El PDF supera el límite de {MAX_SOURCE_PDF_UPLOAD_BYTES} bytes.")
-    if not data.startswith(b"%PDF-"):
-        raise ValueError("El PDF subido no tiene una cabecera %PDF- válida.")
-    SourceDocumentBlobStore.prepare_pdf(data)
-    return data
+        if not isinstance(value, (bytes, bytearray, memoryview)):
+            raise TypeError("El PDF subido debe contener bytes.")
+        return io.BytesIO(value)
+    raise TypeError("El archivo subido no expone bytes legibles.")
+
+
+def uploaded_pdf_identity(pdf_file: BinaryIO) -> tuple[str, int]:
+    """Stream-validate an upload from :func:`uploaded_pdf_file` and return its SHA-256 and size.
+
+    The upload is rewound afterwards so the same file object can be staged.
+    """
+    try:
+        return SourceDocumentBlobStore.digest_pdf(pdf_file)
+    finally:
+        if hasattr(pdf_file, "seek"):
+            pdf_file.seek(0)
 
 
 def uploaded_pdf_filename(uploaded_file: Any) -> str:
@@ -331,11 +330,13 @@ def _open_pdf_preview(
         if payload.document.source_id != document.source_id:
             raise ValueError("El PDF leído no pertenece a la Source seleccionada.")
         subject = _preview_subject(context, payload.document)
-        observed_sha = hashlib.sha256(payload.pdf_bytes).hexdigest()
-        if payload.sha256 != subject["sha256"] or observed_sha != subject["sha256"]:
+        if payload.sha256 != subject["sha256"]:
             raise ValueError("La identidad SHA-256 del PDF no coincide.")
+        # The viewer needs bytes; open() re-verifies the SHA-256 over the mapping.
+        with payload.open() as mapping:
+            pdf_bytes = mapping[:]
         preview = PdfPreviewPayload(
-            pdf_bytes=payload.pdf_bytes,
+            pdf_bytes=pdf_bytes,
             sha256=payload.sha256,
             file_name=payload.file_name,
             context_identity=_preview_identity(subject),
@@ -622,9 +623,8 @@ def _render_add_pdf(
         return
     try:
         filename = uploaded_pdf_filename(uploaded)
-        pdf_bytes = uploaded_pdf_bytes(uploaded)
-        prepared = SourceDocumentBlobStore.prepare_pdf(pdf_bytes)
-    except (TypeError, ValueError) as exc:
+        sha256, size_bytes = uploaded_pdf_identity(uploaded_pdf_file(uploaded))
+    except (TypeError, ValueError, BlobValidationError) as exc:
         ui.error(safe_error_message(exc))
         return
     except Exception as exc:
@@ -633,12 +633,12 @@ def _render_add_pdf(
     ui.write(
         {
             "filename": filename,
-            "size_bytes": prepared.size_bytes,
-            "sha256": prepared.sha256,
+            "size_bytes": size_bytes,
+            "sha256": sha256,
             "mime_type": "application/pdf",
         }
     )
-    key_prefix = f"document_add_pdf_{source.source_id}_{prepared.sha256[:16]}"
+    key_prefix = f"document_add_pdf_{source.source_id}_{sha256[:16]}"
     metadata = _metadata_inputs(
         ui,
         context,
@@ -664,7 +664,7 @@ def _render_add_pdf(
         context,
         "create_pdf_document",
         source.source_id,
-        {"sha256": prepared.sha256, "filename": filename, **metadata},
+        {"sha256": sha256, "filename": filename, **metadata},
     )
     result = _run_operation_once(
         ui,
@@ -672,7 +672,7 @@ def _render_add_pdf(
         token=token,
         action=lambda: service.create_pdf_document(
             source_id=source.source_id,
-            pdf_bytes=pdf_bytes,
+            pdf_bytes=uploaded_pdf_file(uploaded),
             original_filename=filename,
             **metadata,
         ),
@@ -792,6 +792,7 @@ __all__ = [
     "PDF_PREVIEW_NAMESPACE",
     "clear_source_document_preview",
     "render_source_documents",
-    "uploaded_pdf_bytes",
+    "uploaded_pdf_file",
     "uploaded_pdf_filename",
+    "uploaded_pdf_identity",
 ]
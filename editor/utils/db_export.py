@@ -7,9 +7,15 @@ import os
 import stat
 import time
 import zipfile
+from collections import Counter
+from collections.abc import Iterable
+from collections.abc import Iterator
+from dataclasses import dataclass
 from datetime import datetime
 from datetime import timezone
+from itertools import islice
 from pathlib import Path
+from typing import IO
 
 from bson import ObjectId
 from bson.json_util import CANONICAL_JSON_OPTIONS
@@ -18,6 +24,7 @@ from bson.json_util import dumps as bson_json_dumps
 from editor.utils.db_portability import PortabilityValidationError
 from editor.utils.db_portability import legacy_concept_portability_issues
 from mathkb_config import DOCUMENT_PAGE_MAP_COLLECTIONS
+from mathkb_config import EXPORT_BATCH_SIZE
 from mathkb_config import EXPORT_COLLECTIONS
 from mathkb_config import EXPORT_TIMEOUT_SECONDS
 from mathkb_config import LEGACY_PROJECT_ROOT
@@ -40,6 +47,7 @@ from mathmongo.reading_annotations.models import DocumentAnnotation
 from mathmongo.reading_annotations.models import ReadingNote
 from mathmongo.reading_space.models import DocumentReadingState
 from mathmongo.source_documents.models import DocumentKind
+from mathmongo.source_documents.models import PdfVersion
 from mathmongo.source_documents.models import SourceDocument
 from mathmongo.source_documents.storage import SourceDocumentBlobStore
 
@@ -47,6 +55,8 @@ logger = logging.getLogger(__name__)
 
 DEFAULT_EXPORT_COLLECTIONS = list(EXPORT_COLLECTIONS)
 CATALOG_EXTENDED_JSON_ENCODING = "mongodb_extended_json_v2_canonical"
+MEDIA_CHUNK_BYTES = 1024 * 1024
+LEGACY_CONCEPT_COLLECTIONS = frozenset({"concepts", "concept_evidence_links", "relations"})
 
 
 def _raise_if_timed_out(started_at: float, timeout_seconds: int, operation: str) -> None:
@@ -109,8 +119,13 @@ def _open_private_output_directory(directory: Path, *, create: bool = True) -> i
         raise
 
 
-def _read_stable_media_file(path: Path) -> bytes:
-    """Read one regular media file without following its leaf symlink."""
+def _copy_stable_media_file(path: Path, destination: IO[bytes]) -> tuple[int, str]:
+    """Stream one regular media file into ``destination`` without following its leaf symlink.
+
+    Returns the number of bytes copied and their SHA-256, hashed chunk by chunk
+    as they are written. Raises when the file changed while it was being read,
+    so a torn copy never reaches a published archive.
+    """
     if find_symlink_component(path) is not None:
         raise ValueError(f"Refusing symlinked media during export: {path}")
     flags = os.O_RDONLY | getattr(os, "O_CLOEXEC", 0) | getattr(os, "O_NOFOLLOW", 0)
@@ -119,12 +134,16 @@ def _read_stable_media_file(path: Path) -> bytes:
         before = os.fstat(descriptor)
         if not stat.S_ISREG(before.st_mode):
             raise ValueError(f"Refusing non-regular media during export: {path}")
-        data = bytearray()
-        while True:
-            chunk = os.read(descriptor, 1024 * 1024)
+        copied = 0
+        digest = hashlib.sha256()
+        while copied < before.st_size:
+            chunk = os.read(descriptor, min(MEDIA_CHUNK_BYTES, before.st_size - copied))
             if not chunk:
                 break
-            data.extend(chunk)
+            destination.write(chunk)
+            digest.update(chunk)
+            copied += len(chunk)
+        grew = bool(os.read(descriptor, 1))
         after = os.fstat(descriptor)
         if (
             before.st_dev,
@@ -138,16 +157,16 @@ def _read_stable_media_file(path: Path) -> bytes:
             after.st_size,
             after.st_mtime_ns,
             after.st_ctime_ns,
-        ) or len(data) != before.st_size:
+        ) or copied != before.st_size or grew:
             raise ValueError(f"Media changed during export: {path}")
-        return bytes(data)
+        return copied, digest.hexdigest()
     finally:
         os.close(descriptor)
 
 
-def _media_payloads() -> dict[str, bytes]:
-    """Merge legacy then XDG media into an in-memory portable inventory."""
-    payloads: dict[str, bytes] = {}
+def _media_inventory() -> dict[str, Path]:
+    """Merge legacy then XDG media paths into the portable inventory; XDG wins on clashes."""
+    inventory: dict[str, Path] = {}
     for source_root in (LEGACY_PROJECT_ROOT / MEDIA_ROOT, LOCAL_MEDIA_ROOT):
         if find_symlink_component(source_root) is not None or not source_root.is_dir():
             continue
@@ -155,8 +174,108 @@ def _media_payloads() -> dict[str, bytes]:
             if source.is_symlink() or not source.is_file():
                 continue
             relative_name = (MEDIA_ROOT / source.relative_to(source_root)).as_posix()
-            payloads[relative_name] = _read_stable_media_file(source)
-    return payloads
+            inventory[relative_name] = source
+    return inventory
+
+
+class _JsonArrayWriter:
+    """Write a JSON array one encoded element at a time into a binary stream.
+
+    The output is byte-identical to ``json.dumps(elements, indent=2)`` as long
+    as every element was itself encoded with ``indent=2``: JSON escapes raw
+    newlines inside strings, so indenting each line by one level is exact.
+    """
+
+    def __init__(self, stream: IO[bytes]) -> None:
+        """Start an empty array on ``stream``."""
+        self._stream = stream
+        self.count = 0
+
+    def write_all(self, encoded_elements: Iterable[str]) -> None:
+        """Append already encoded elements with a single write."""
+        parts = []
+        for text in encoded_elements:
+            parts.append("[\n  " if self.count == 0 else ",\n  ")
+            parts.append(text.replace("\n", "\n  "))
+            self.count += 1
+        if parts:
+            self._stream.write("".join(parts).encode("utf-8"))
+
+    def close(self) -> None:
+        """Terminate the array."""
+        self._stream.write(b"\n]" if self.count else b"[]")
+
+
+def _document_batches(cursor: Iterable[dict], batch_size: int) -> Iterator[tuple[int, list[dict]]]:
+    """Yield ``(offset, documents)`` slices of a cursor without materializing it."""
+    documents = iter(cursor)
+    offset = 0
+    while batch := list(islice(documents, batch_size)):
+        yield offset, batch
+        offset += len(batch)
+
+
+def _scheduled_collection_names(db, *, include_all_collections: bool) -> list[str]:
+    """Return the collections an export writes, in archive order."""
+    existing_collection_names = set(db.list_collection_names())
+    always_exported = set(EXPORT_COLLECTIONS)
+    if include_all_collections:
+        return sorted(existing_collection_names | always_exported)
+    optional = existing_collection_names & {
+        *SOURCE_CATALOG_COLLECTIONS,
+        *SOURCE_DOCUMENT_COLLECTIONS,
+        *READING_SPACE_COLLECTIONS,
+        *DOCUMENT_PAGE_MAP_COLLECTIONS,
+        *READING_ANNOTATION_COLLECTIONS,
+    }
+    return sorted(always_exported | optional)
+
+
+def _exported_batches(
+    db,
+    collection_name: str,
+    *,
+    use_extended_json: bool,
+    started_at: float,
+    identities: "_ExportIdentityIndex",
+    legacy_normalizations: list[LegacyConceptNormalization],
+) -> Iterator[list[tuple[dict, str]]]:
+    """Yield one collection in bounded batches of ``(archived document, encoded JSON)``.
+
+    Legacy Concept identities are normalized and every batch is observed by
+    ``identities`` exactly as the export writes it. The archived document is the
+    value a reader decodes back from the archive: canonical Extended JSON keeps
+    BSON types, the legacy encoding stores ``mongo_to_json_safe`` values.
+    """
+    cursor = db[collection_name].find({}).max_time_ms(EXPORT_TIMEOUT_SECONDS * 1000)
+    legacy_encoder = json.JSONEncoder(ensure_ascii=False, indent=2)
+    for offset, raw_docs in _document_batches(cursor, EXPORT_BATCH_SIZE):
+        _raise_if_timed_out(started_at, EXPORT_TIMEOUT_SECONDS, f"exporting {collection_name}")
+        if collection_name in LEGACY_CONCEPT_COLLECTIONS:
+            normalized, transformations = normalize_legacy_concept_documents(
+                collection_name,
+                raw_docs,
+                start=offset + 1,
+            )
+            raw_docs = list(normalized)
+            legacy_normalizations.extend(transformations)
+        identities.observe(collection_name, raw_docs, portable=use_extended_json)
+        if use_extended_json:
+            yield [
+                (
+                    document,
+                    bson_json_dumps(
+                        document,
+                        json_options=CANONICAL_JSON_OPTIONS,
+                        ensure_ascii=False,
+                        indent=2,
+                    ),
+                )
+                for document in raw_docs
+            ]
+        else:
+            safe_documents = [mongo_to_json_safe(document) for document in raw_docs]
+            yield [(document, legacy_encoder.encode(document)) for document in safe_documents]
 
 
 def _publish_anonymous_zip(
@@ -353,31 +472,270 @@ def _source_document_identity(document: SourceDocument) -> tuple[str, str, str]:
     return (document.source_id, "web", document.web.url_normalized)
 
 
-def _validate_source_document_identities(documents: list[SourceDocument]) -> None:
+def _evidence_identity(link: ConceptEvidenceLink) -> tuple[object, ...]:
+    """Return the immutable exact-link identity enforced by the S4 domain."""
+    return (
+        link.concept_legacy_source,
+        link.concept_legacy_id,
+        link.source_id,
+        link.reference_id,
+        link.document_id,
+        link.annotation_id,
+        link.note_id,
+        link.page_number,
+        link.link_type.value,
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class _SourceDocumentSummary:
+    """The Source Document fields that cross-collection export checks compare."""
+
+    document_id: str
+    source_id: str
+    reference_id: str | None
+    kind: DocumentKind
+    identity: tuple[str, str, str]
+    pdf_versions: tuple[tuple[str, str], ...] | None
+
+    @classmethod
+    def from_model(cls, document: SourceDocument) -> "_SourceDocumentSummary":
+        """Keep ``(version_id, sha256)`` pairs instead of full PDF version records."""
+        pdf_versions = None
+        if document.pdf is not None:
+            pdf_versions = tuple(
+                (version.version_id, version.sha256) for version in document.pdf.versions
+            )
+        return cls(
+            document.document_id,
+            document.source_id,
+            document.reference_id,
+            document.kind,
+            _source_document_identity(document),
+            pdf_versions,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class _ReadingStateSummary:
+    """The reading state fields checked against Source Documents."""
+
+    reading_state_id: str
+    user_scope: str
+    document_id: str
+    source_id: str
+    reference_id: str | None
+
+
+@dataclass(frozen=True, slots=True)
+class _PageMapSummary:
+    """The Page Map fields checked against Source Documents."""
+
+    page_map_id: str
+    active: bool
+    user_scope: str
+    document_id: str
+    source_id: str
+
+
+@dataclass(frozen=True, slots=True)
+class _EvidenceTargetSummary:
+    """An annotation or reading note as seen by the S4 relationship checks."""
+
+    record_id: str
+    source_id: str
+    document_id: str | None
+    reference_id: str | None
+    visual_anchor: tuple[str, str] | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class _EvidenceLinkSummary:
+    """The Concept Evidence Link fields checked against targets and Concepts."""
+
+    evidence_link_id: str
+    identity: tuple[object, ...]
+    source_id: str
+    reference_id: str | None
+    document_id: str | None
+    annotation_id: str | None
+    note_id: str | None
+    concept_legacy_id: str
+    concept_legacy_source: str
+
+
+class _ExportIdentityIndex:
+    """Compact identities gathered while collections stream into the archive.
+
+    Documents are validated and written batch by batch; only the fields that
+    the cross-collection portability checks compare are retained, so the final
+    checks cost memory per record rather than per document body.
+    """
+
+    def __init__(self) -> None:
+        """Start with every portable collection empty."""
+        self.source_documents: list[_SourceDocumentSummary] = []
+        self.current_pdf_versions: list[PdfVersion] = []
+        self.reading_states: list[_ReadingStateSummary] = []
+        self.page_maps: list[_PageMapSummary] = []
+        self.annotations: list[_EvidenceTargetSummary] = []
+        self.notes: list[_EvidenceTargetSummary] = []
+        self.evidence_links: list[_EvidenceLinkSummary] = []
+        self.source_ids: list[str] = []
+        self.references: list[tuple[str, object]] = []
+        self.concept_counts: Counter[tuple[str, str]] = Counter()
+
+    def observe(self, collection_name: str, raw_docs: list[dict], *, portable: bool) -> None:
+        """Validate one batch of ``collection_name`` and keep its identities."""
+        if collection_name == "sources":
+            self.source_ids.extend(
+                document["source_id"]
+                for document in raw_docs
+                if isinstance(document, dict) and isinstance(document.get("source_id"), str)
+            )
+        elif collection_name == "references":
+            self.references.extend(
+                (document["reference_id"], document.get("source_ids", []))
+                for document in raw_docs
+                if isinstance(document, dict) and isinstance(document.get("reference_id"), str)
+            )
+        elif collection_name == "concepts":
+            self.concept_counts.update(
+                (str(document["id"]), str(document["source"]))
+                for document in raw_docs
+                if isinstance(document, dict)
+                and document.get("id") is not None
+                and document.get("source") is not None
+            )
+        if not portable:
+            return
+
+        if collection_name in SOURCE_DOCUMENT_COLLECTIONS:
+            for raw_document in raw_docs:
+                document = _source_document_model(raw_document)
+                self.source_documents.append(_SourceDocumentSummary.from_model(document))
+                if document.pdf is not None:
+                    self.current_pdf_versions.append(document.pdf.current_version)
+        elif collection_name in READING_SPACE_COLLECTIONS:
+            for raw_document in raw_docs:
+                state = _reading_state_model(raw_document)
+                self.reading_states.append(
+                    _ReadingStateSummary(
+                        state.reading_state_id,
+                        state.user_scope,
+                        state.document_id,
+                        state.source_id,
+                        state.reference_id,
+                    )
+                )
+        elif collection_name in DOCUMENT_PAGE_MAP_COLLECTIONS:
+            page_maps = [_document_page_map_model(document) for document in raw_docs]
+            _validate_canonical_portable_documents(collection_name, raw_docs, page_maps)
+            self.page_maps.extend(
+                _PageMapSummary(
+                    page_map.page_map_id,
+                    page_map.status.value == "active",
+                    page_map.user_scope,
+                    page_map.document_id,
+                    page_map.source_id,
+                )
+                for page_map in page_maps
+            )
+        elif collection_name == "document_annotations":
+            annotations = [_reading_annotation_model(document) for document in raw_docs]
+            _validate_canonical_portable_documents(collection_name, raw_docs, annotations)
+            self.annotations.extend(
+                _EvidenceTargetSummary(
+                    annotation.annotation_id,
+                    annotation.source_id,
+                    annotation.document_id,
+                    annotation.reference_id,
+                    None
+                    if annotation.visual_anchor is None
+                    else (
+                        annotation.visual_anchor.version_id,
+                        annotation.visual_anchor.document_sha256,
+                    ),
+                )
+                for annotation in annotations
+            )
+        elif collection_name == "reading_notes":
+            notes = [_reading_note_model(document) for document in raw_docs]
+            _validate_canonical_portable_documents(collection_name, raw_docs, notes)
+            self.notes.extend(
+                _EvidenceTargetSummary(
+                    note.note_id,
+                    note.source_id,
+                    note.document_id,
+                    note.reference_id,
+                )
+                for note in notes
+            )
+        elif collection_name == "concept_evidence_links":
+            links = [_concept_evidence_model(document) for document in raw_docs]
+            _validate_canonical_portable_documents(collection_name, raw_docs, links)
+            self.evidence_links.extend(
+                _EvidenceLinkSummary(
+                    link.evidence_link_id,
+                    _evidence_identity(link),
+                    link.source_id,
+                    link.reference_id,
+                    link.document_id,
+                    link.annotation_id,
+                    link.note_id,
+                    link.concept_legacy_id,
+                    link.concept_legacy_source,
+                )
+                for link in links
+            )
+
+    def validate(self) -> None:
+        """Run every cross-collection portability check on the gathered identities."""
+        _validate_source_document_identities(self.source_documents)
+        _validate_reading_state_portability(self.reading_states, self.source_documents)
+        _validate_page_map_portability(self.page_maps, self.source_documents)
+        _validate_reading_annotation_portability(
+            self.annotations,
+            self.notes,
+            self.evidence_links,
+            source_documents=self.source_documents,
+            source_ids=self.source_ids,
+            references=self.references,
+            concept_counts=self.concept_counts,
+        )
+
+
+def _documents_by_id(
+    source_documents: list[_SourceDocumentSummary],
+) -> dict[str, _SourceDocumentSummary]:
+    documents_by_id: dict[str, _SourceDocumentSummary] = {}
+    for document in source_documents:
+        if document.document_id in documents_by_id:
+            raise ValueError("Source Documents contain a duplicate document_id")
+        documents_by_id[document.document_id] = document
+    return documents_by_id
+
+
+def _validate_source_document_identities(documents: list[_SourceDocumentSummary]) -> None:
     """Reject archives that would violate the service's per-Source identities."""
     seen: dict[tuple[str, str, str], str] = {}
     for document in documents:
-        identity = _source_document_identity(document)
-        previous = seen.get(identity)
+        previous = seen.get(document.identity)
         if previous is not None and previous != document.document_id:
             raise ValueError(
                 "Source Documents contain different document IDs for one Source identity"
             )
-        seen[identity] = document.document_id
+        seen[document.identity] = document.document_id
 
 
 def _validate_reading_state_portability(
-    reading_states: list[DocumentReadingState],
-    source_documents: list[SourceDocument],
+    reading_states: list[_ReadingStateSummary],
+    source_documents: list[_SourceDocumentSummary],
 ) -> None:
     """Reject dangling or ambiguous reading state before creating an archive."""
     if not reading_states:
         return
-    documents_by_id: dict[str, SourceDocument] = {}
-    for document in source_documents:
-        if document.document_id in documents_by_id:
-            raise ValueError("Source Documents contain a duplicate document_id")
-        documents_by_id[document.document_id] = document
+    documents_by_id = _documents_by_id(source_documents)
 
     seen_ids: set[str] = set()
     seen_identities: dict[tuple[str, str], str] = {}
@@ -401,17 +759,13 @@ def _validate_reading_state_portability(
 
 
 def _validate_page_map_portability(
-    page_maps: list[DocumentPageMap],
-    source_documents: list[SourceDocument],
+    page_maps: list[_PageMapSummary],
+    source_documents: list[_SourceDocumentSummary],
 ) -> None:
     """Reject dangling, duplicate, or ambiguous Page Maps before export."""
     if not page_maps:
         return
-    documents_by_id: dict[str, SourceDocument] = {}
-    for document in source_documents:
-        if document.document_id in documents_by_id:
-            raise ValueError("Source Documents contain a duplicate document_id")
-        documents_by_id[document.document_id] = document
+    documents_by_id = _documents_by_id(source_documents)
 
     seen_ids: set[str] = set()
     active_identities: dict[tuple[str, str], str] = {}
@@ -419,7 +773,7 @@ def _validate_page_map_portability(
         if page_map.page_map_id in seen_ids:
             raise ValueError("Document Page Maps contain a duplicate page_map_id")
         seen_ids.add(page_map.page_map_id)
-        if page_map.status.value == "active":
+        if page_map.active:
             identity = (page_map.user_scope, page_map.document_id)
             previous = active_identities.get(identity)
             if previous is not None and previous != page_map.page_map_id:
@@ -437,77 +791,41 @@ def _validate_page_map_portability(
             raise ValueError("Page Map Source does not match its Source Document")
 
 
-def _evidence_identity(link: ConceptEvidenceLink) -> tuple[object, ...]:
-    """Return the immutable exact-link identity enforced by the S4 domain."""
-    return (
-        link.concept_legacy_source,
-        link.concept_legacy_id,
-        link.source_id,
-        link.reference_id,
-        link.document_id,
-        link.annotation_id,
-        link.note_id,
-        link.page_number,
-        link.link_type.value,
-    )
-
-
 def _validate_reading_annotation_portability(
-    annotations: list[DocumentAnnotation],
-    notes: list[ReadingNote],
-    evidence_links: list[ConceptEvidenceLink],
+    annotations: list[_EvidenceTargetSummary],
+    notes: list[_EvidenceTargetSummary],
+    evidence_links: list[_EvidenceLinkSummary],
     *,
-    source_documents: list[SourceDocument],
-    raw_sources: list[dict],
-    raw_references: list[dict],
-    raw_concepts: list[dict],
+    source_documents: list[_SourceDocumentSummary],
+    source_ids: list[str],
+    references: list[tuple[str, object]],
+    concept_counts: Counter[tuple[str, str]],
 ) -> None:
     """Reject dangling or ambiguous S4 intellectual-work records on export."""
     if not annotations and not notes and not evidence_links:
         return
 
-    source_ids: set[str] = set()
-    for document in raw_sources:
-        source_id = document.get("source_id") if isinstance(document, dict) else None
-        if not isinstance(source_id, str):
-            continue
-        if source_id in source_ids:
+    exported_source_ids: set[str] = set()
+    for source_id in source_ids:
+        if source_id in exported_source_ids:
             raise ValueError("Sources contain a duplicate source_id")
-        source_ids.add(source_id)
+        exported_source_ids.add(source_id)
 
-    references_by_id: dict[str, dict] = {}
-    for document in raw_references:
-        reference_id = document.get("reference_id") if isinstance(document, dict) else None
-        if not isinstance(reference_id, str):
-            continue
-        if reference_id in references_by_id:
+    reference_sources_by_id: dict[str, object] = {}
+    for reference_id, reference_source_ids in references:
+        if reference_id in reference_sources_by_id:
             raise ValueError("References contain a duplicate reference_id")
-        references_by_id[reference_id] = document
-    documents_by_id: dict[str, SourceDocument] = {}
-    for document in source_documents:
-        if document.document_id in documents_by_id:
-            raise ValueError("Source Documents contain a duplicate document_id")
-        documents_by_id[document.document_id] = document
-    concept_counts: dict[tuple[str, str], int] = {}
-    for document in raw_concepts:
-        if (
-            not isinstance(document, dict)
-            or document.get("id") is None
-            or document.get("source") is None
-        ):
-            continue
-        key = (str(document["id"]), str(document["source"]))
-        concept_counts[key] = concept_counts.get(key, 0) + 1
+        reference_sources_by_id[reference_id] = reference_source_ids
+    documents_by_id = _documents_by_id(source_documents)
     legacy_concept_issues = legacy_concept_portability_issues(
         evidence_links,
-        count_matching_concepts=lambda concept_id, concept_source: concept_counts.get(
-            (concept_id, concept_source),
-            0,
-        ),
+        count_matching_concepts=lambda concept_id, concept_source: concept_counts[
+            (concept_id, concept_source)
+        ],
     )
 
     def require_source(domain_name: str, domain_id: str, source_id: str) -> None:
-        if source_id not in source_ids:
+        if source_id not in exported_source_ids:
             raise ValueError(f"{domain_name} {domain_id} points to a Source absent from the export")
 
     def require_reference(
@@ -518,18 +836,18 @@ def _validate_reading_annotation_portability(
     ) -> None:
         if reference_id is None:
             return
-        reference = references_by_id.get(reference_id)
-        if reference is None or source_id not in reference.get("source_ids", []):
+        reference_source_ids = reference_sources_by_id.get(reference_id)
+        if reference_source_ids is None or source_id not in reference_source_ids:
             raise ValueError(
                 f"{domain_name} {domain_id} Reference is absent or does not belong to its Source"
             )
 
-    annotations_by_id: dict[str, DocumentAnnotation] = {}
+    annotations_by_id: dict[str, _EvidenceTargetSummary] = {}
     for annotation in annotations:
-        if annotation.annotation_id in annotations_by_id:
+        if annotation.record_id in annotations_by_id:
             raise ValueError("Document Annotations contain a duplicate annotation_id")
-        annotations_by_id[annotation.annotation_id] = annotation
-        require_source("Document Annotation", annotation.annotation_id, annotation.source_id)
+        annotations_by_id[annotation.record_id] = annotation
+        require_source("Document Annotation", annotation.record_id, annotation.source_id)
         document = documents_by_id.get(annotation.document_id)
         if document is None:
             raise ValueError("Document Annotation points to a Source Document absent from export")
@@ -539,39 +857,40 @@ def _validate_reading_annotation_portability(
             raise ValueError("Document Annotation Reference does not match its Source Document")
         require_reference(
             "Document Annotation",
-            annotation.annotation_id,
+            annotation.record_id,
             annotation.source_id,
             annotation.reference_id,
         )
         visual_anchor = annotation.visual_anchor
         if visual_anchor is not None:
-            if document.kind != DocumentKind.PDF or document.pdf is None:
+            if document.kind != DocumentKind.PDF or document.pdf_versions is None:
                 raise ValueError("Visual Annotation points to a non-PDF Source Document")
-            matching_versions = tuple(
-                version
-                for version in document.pdf.versions
-                if version.version_id == visual_anchor.version_id
+            anchor_version_id, anchor_sha256 = visual_anchor
+            matching_shas = tuple(
+                sha256
+                for version_id, sha256 in document.pdf_versions
+                if version_id == anchor_version_id
             )
-            if len(matching_versions) != 1:
+            if len(matching_shas) != 1:
                 raise ValueError(
                     "Visual Annotation points to a PDF version absent from its Source Document"
                 )
-            if matching_versions[0].sha256 != visual_anchor.document_sha256:
+            if matching_shas[0] != anchor_sha256:
                 raise ValueError("Visual Annotation SHA does not match its referenced PDF version")
 
-    notes_by_id: dict[str, ReadingNote] = {}
+    notes_by_id: dict[str, _EvidenceTargetSummary] = {}
     for note in notes:
-        if note.note_id in notes_by_id:
+        if note.record_id in notes_by_id:
             raise ValueError("Reading Notes contain a duplicate note_id")
-        notes_by_id[note.note_id] = note
-        require_source("Reading Note", note.note_id, note.source_id)
+        notes_by_id[note.record_id] = note
+        require_source("Reading Note", note.record_id, note.source_id)
         if note.document_id is not None:
             document = documents_by_id.get(note.document_id)
             if document is None:
                 raise ValueError("Reading Note points to a Source Document absent from export")
             if document.source_id != note.source_id:
                 raise ValueError("Reading Note Source does not match its Source Document")
-        require_reference("Reading Note", note.note_id, note.source_id, note.reference_id)
+        require_reference("Reading Note", note.record_id, note.source_id, note.reference_id)
 
     seen_evidence_ids: set[str] = set()
     seen_evidence_identities: dict[tuple[object, ...], str] = {}
@@ -579,11 +898,10 @@ def _validate_reading_annotation_portability(
         if link.evidence_link_id in seen_evidence_ids:
             raise ValueError("Concept Evidence Links contain a duplicate evidence_link_id")
         seen_evidence_ids.add(link.evidence_link_id)
-        identity = _evidence_identity(link)
-        previous = seen_evidence_identities.get(identity)
+        previous = seen_evidence_identities.get(link.identity)
         if previous is not None and previous != link.evidence_link_id:
             raise ValueError("Concept Evidence Links contain different IDs for one exact link")
-        seen_evidence_identities[identity] = link.evidence_link_id
+        seen_evidence_identities[link.identity] = link.evidence_link_id
 
         require_source("Concept Evidence Link", link.evidence_link_id, link.source_id)
         require_reference(
@@ -675,6 +993,7 @@ def export_database_to_zip(
         "collections": {},
         "collection_encodings": {},
         "media_files": {},
+        "media_sha256": {},
         "source_document_blobs": {},
         "legacy_concept_registry_sha256": REGISTRY_SHA256,
         "legacy_concept_normalizations": [],
@@ -685,167 +1004,11 @@ def export_database_to_zip(
         # Historical collections keep their existing backup behavior. Source
         # Catalog collections are optional and are exported only after they
         # have actually been created in the selected database.
-        existing_collection_names = set(db.list_collection_names())
-        always_exported = set(EXPORT_COLLECTIONS)
-        optional_catalog = existing_collection_names & set(SOURCE_CATALOG_COLLECTIONS)
-        optional_documents = existing_collection_names & set(SOURCE_DOCUMENT_COLLECTIONS)
-        optional_reading = existing_collection_names & set(READING_SPACE_COLLECTIONS)
-        optional_page_maps = existing_collection_names & set(DOCUMENT_PAGE_MAP_COLLECTIONS)
-        optional_annotations = existing_collection_names & set(READING_ANNOTATION_COLLECTIONS)
-        collection_names = sorted(
-            existing_collection_names | always_exported
-            if include_all_collections
-            else always_exported
-            | optional_catalog
-            | optional_documents
-            | optional_reading
-            | optional_page_maps
-            | optional_annotations
+        collection_names = _scheduled_collection_names(
+            db,
+            include_all_collections=include_all_collections,
         )
         logger.info("Collections scheduled for export: %s", ", ".join(collection_names))
-        collection_payloads: dict[str, str] = {}
-        source_documents: list[SourceDocument] = []
-        reading_states: list[DocumentReadingState] = []
-        annotations: list[DocumentAnnotation] = []
-        notes: list[ReadingNote] = []
-        evidence_links: list[ConceptEvidenceLink] = []
-        page_maps: list[DocumentPageMap] = []
-        raw_sources: list[dict] = []
-        raw_references: list[dict] = []
-        raw_concepts: list[dict] = []
-        legacy_normalizations: list[LegacyConceptNormalization] = []
-        for collection_name in collection_names:
-            _raise_if_timed_out(started_at, EXPORT_TIMEOUT_SECONDS, f"reading {collection_name}")
-            collection_started_at = time.monotonic()
-            cursor = db[collection_name].find({}).max_time_ms(EXPORT_TIMEOUT_SECONDS * 1000)
-            raw_docs = list(cursor)
-            if collection_name in {
-                "concepts",
-                "concept_evidence_links",
-                "relations",
-            }:
-                normalized, transformations = normalize_legacy_concept_documents(
-                    collection_name,
-                    raw_docs,
-                )
-                raw_docs = list(normalized)
-                legacy_normalizations.extend(transformations)
-            metadata["collections"][collection_name] = len(raw_docs)
-
-            if collection_name == "sources":
-                raw_sources = raw_docs
-            elif collection_name == "references":
-                raw_references = raw_docs
-            elif collection_name == "concepts":
-                raw_concepts = raw_docs
-
-            use_extended_json = (
-                include_all_collections or collection_name in PORTABLE_EXTENDED_JSON_COLLECTIONS
-            )
-            if use_extended_json:
-                if collection_name in SOURCE_DOCUMENT_COLLECTIONS:
-                    source_documents = [_source_document_model(document) for document in raw_docs]
-                elif collection_name in READING_SPACE_COLLECTIONS:
-                    reading_states = [_reading_state_model(document) for document in raw_docs]
-                elif collection_name in DOCUMENT_PAGE_MAP_COLLECTIONS:
-                    page_maps = [_document_page_map_model(document) for document in raw_docs]
-                    _validate_canonical_portable_documents(collection_name, raw_docs, page_maps)
-                elif collection_name == "document_annotations":
-                    annotations = [_reading_annotation_model(document) for document in raw_docs]
-                    _validate_canonical_portable_documents(collection_name, raw_docs, annotations)
-                elif collection_name == "reading_notes":
-                    notes = [_reading_note_model(document) for document in raw_docs]
-                    _validate_canonical_portable_documents(collection_name, raw_docs, notes)
-                elif collection_name == "concept_evidence_links":
-                    evidence_links = [_concept_evidence_model(document) for document in raw_docs]
-                    _validate_canonical_portable_documents(
-                        collection_name,
-                        raw_docs,
-                        evidence_links,
-                    )
-                collection_payloads[collection_name] = bson_json_dumps(
-                    raw_docs,
-                    json_options=CANONICAL_JSON_OPTIONS,
-                    ensure_ascii=False,
-                    indent=2,
-                )
-                metadata["collection_encodings"][collection_name] = CATALOG_EXTENDED_JSON_ENCODING
-            else:
-                docs = [mongo_to_json_safe(doc) for doc in raw_docs]
-                collection_payloads[collection_name] = json.dumps(
-                    docs,
-                    ensure_ascii=False,
-                    indent=2,
-                )
-            logger.info(
-                "Exported collection %s: %s documents in %.2fs",
-                collection_name,
-                len(raw_docs),
-                time.monotonic() - collection_started_at,
-            )
-
-        metadata["legacy_concept_normalizations"] = [
-            {
-                "collection": item.collection,
-                "record_id": item.record_id,
-                "legacy_id": item.legacy_identity[0],
-                "legacy_source": item.legacy_identity[1],
-                "canonical_id": item.canonical_identity[0],
-                "canonical_source": item.canonical_identity[1],
-            }
-            for item in legacy_normalizations
-        ]
-
-        _validate_source_document_identities(source_documents)
-        _validate_reading_state_portability(reading_states, source_documents)
-        _validate_page_map_portability(page_maps, source_documents)
-        _validate_reading_annotation_portability(
-            annotations,
-            notes,
-            evidence_links,
-            source_documents=source_documents,
-            raw_sources=raw_sources,
-            raw_references=raw_references,
-            raw_concepts=raw_concepts,
-        )
-
-        _raise_if_timed_out(started_at, EXPORT_TIMEOUT_SECONDS, "copying media files")
-        media_payloads = _media_payloads()
-        metadata["media_files"] = {name: len(data) for name, data in sorted(media_payloads.items())}
-        if media_payloads:
-            logger.info(
-                "Prepared portable media inventory with %s files",
-                len(media_payloads),
-            )
-
-        blob_payloads: dict[str, bytes] = {}
-        if source_documents:
-            blob_store = source_document_blob_store or SourceDocumentBlobStore()
-            for document in source_documents:
-                if document.pdf is None:
-                    continue
-                version = document.pdf.current_version
-                data = blob_store.read_version(version)
-                existing = blob_payloads.get(version.logical_path)
-                if existing is not None and existing != data:
-                    raise ValueError("Source Document SHA path resolved to different PDF bytes")
-                blob_payloads[version.logical_path] = data
-        metadata["source_document_blobs"] = {
-            name: {
-                "sha256": hashlib.sha256(data).hexdigest(),
-                "size_bytes": len(data),
-            }
-            for name, data in sorted(blob_payloads.items())
-        }
-        if blob_payloads:
-            logger.info("Prepared %s portable Source Document PDF blobs", len(blob_payloads))
-
-        _raise_if_timed_out(started_at, EXPORT_TIMEOUT_SECONDS, "writing metadata")
-        metadata["snapshot_completed_at"] = (
-            datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
-        )
-        metadata["duration_seconds"] = round(time.monotonic() - started_at, 3)
-        _raise_if_timed_out(started_at, EXPORT_TIMEOUT_SECONDS, "creating ZIP archive")
         temporary_flag = getattr(os, "O_TMPFILE", 0)
         if not temporary_flag:
             raise OSError("This platform cannot stage backups through anonymous files")
@@ -855,32 +1018,129 @@ def export_database_to_zip(
             0o600,
             dir_fd=output_directory_descriptor,
         )
+        identities = _ExportIdentityIndex()
+        legacy_normalizations: list[LegacyConceptNormalization] = []
+        # Collections, media and blobs stream straight into the anonymous ZIP.
+        # Nothing is linked into the output directory until every check below
+        # has passed, so a rejected export leaves no file behind.
         with os.fdopen(os.dup(anonymous_descriptor), "w+b") as handle:
             with zipfile.ZipFile(handle, "w", zipfile.ZIP_DEFLATED) as archive:
-                for collection_name, payload in sorted(collection_payloads.items()):
+                for collection_name in collection_names:
                     _raise_if_timed_out(
                         started_at,
                         EXPORT_TIMEOUT_SECONDS,
-                        f"zipping {collection_name}",
+                        f"reading {collection_name}",
                     )
-                    archive.writestr(
+                    collection_started_at = time.monotonic()
+                    use_extended_json = (
+                        include_all_collections
+                        or collection_name in PORTABLE_EXTENDED_JSON_COLLECTIONS
+                    )
+                    with archive.open(
                         f"{base_name}/collections/{collection_name}.json",
-                        payload,
+                        "w",
+                        force_zip64=True,
+                    ) as member:
+                        writer = _JsonArrayWriter(member)
+                        for batch in _exported_batches(
+                            db,
+                            collection_name,
+                            use_extended_json=use_extended_json,
+                            started_at=started_at,
+                            identities=identities,
+                            legacy_normalizations=legacy_normalizations,
+                        ):
+                            writer.write_all(encoded for _document, encoded in batch)
+                        writer.close()
+                    metadata["collections"][collection_name] = writer.count
+                    if use_extended_json:
+                        metadata["collection_encodings"][collection_name] = (
+                            CATALOG_EXTENDED_JSON_ENCODING
+                        )
+                    logger.info(
+                        "Exported collection %s: %s documents in %.2fs",
+                        collection_name,
+                        writer.count,
+                        time.monotonic() - collection_started_at,
                     )
-                for relative_name, payload in sorted(media_payloads.items()):
+
+                metadata["legacy_concept_normalizations"] = [
+                    {
+                        "collection": item.collection,
+                        "record_id": item.record_id,
+                        "legacy_id": item.legacy_identity[0],
+                        "legacy_source": item.legacy_identity[1],
+                        "canonical_id": item.canonical_identity[0],
+                        "canonical_source": item.canonical_identity[1],
+                    }
+                    for item in legacy_normalizations
+                ]
+                identities.validate()
+
+                _raise_if_timed_out(started_at, EXPORT_TIMEOUT_SECONDS, "copying media files")
+                media_inventory = _media_inventory()
+                for relative_name, source in sorted(media_inventory.items()):
                     _raise_if_timed_out(
                         started_at,
                         EXPORT_TIMEOUT_SECONDS,
                         f"zipping {Path(relative_name).name}",
                     )
-                    archive.writestr(f"{base_name}/{relative_name}", payload)
-                for logical_path, payload in sorted(blob_payloads.items()):
-                    _raise_if_timed_out(
-                        started_at,
-                        EXPORT_TIMEOUT_SECONDS,
-                        f"zipping Source Document blob {Path(logical_path).name}",
+                    with archive.open(
+                        f"{base_name}/{relative_name}",
+                        "w",
+                        force_zip64=True,
+                    ) as member:
+                        size, sha256 = _copy_stable_media_file(source, member)
+                    # The source catalog migration reader requires plain integer sizes.
+                    metadata["media_files"][relative_name] = size
+                    metadata["media_sha256"][relative_name] = sha256
+                if media_inventory:
+                    logger.info(
+                        "Exported portable media inventory with %s files",
+                        len(media_inventory),
                     )
-                    archive.writestr(f"{base_name}/{logical_path}", payload)
+
+                blob_identities: dict[str, dict[str, object]] = {}
+                if identities.current_pdf_versions:
+                    blob_store = source_document_blob_store or SourceDocumentBlobStore()
+                    for version in sorted(
+                        identities.current_pdf_versions,
+                        key=lambda item: item.logical_path,
+                    ):
+                        _raise_if_timed_out(
+                            started_at,
+                            EXPORT_TIMEOUT_SECONDS,
+                            f"zipping Source Document blob {Path(version.logical_path).name}",
+                        )
+                        # copy_version verifies the stored bytes against this identity
+                        # and streams them, so no PDF is held in memory.
+                        identity = {"sha256": version.sha256, "size_bytes": version.size_bytes}
+                        existing = blob_identities.get(version.logical_path)
+                        if existing is not None:
+                            if existing != identity:
+                                raise ValueError(
+                                    "Source Document SHA path resolved to different PDF bytes"
+                                )
+                            continue
+                        with archive.open(
+                            f"{base_name}/{version.logical_path}",
+                            "w",
+                            force_zip64=True,
+                        ) as member:
+                            blob_store.copy_version(version, member)
+                        blob_identities[version.logical_path] = identity
+                metadata["source_document_blobs"] = blob_identities
+                if blob_identities:
+                    logger.info(
+                        "Exported %s portable Source Document PDF blobs",
+                        len(blob_identities),
+                    )
+
+                _raise_if_timed_out(started_at, EXPORT_TIMEOUT_SECONDS, "writing metadata")
+                metadata["snapshot_completed_at"] = (
+                    datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+                )
+                metadata["duration_seconds"] = round(time.monotonic() - started_at, 3)
                 archive.writestr(
                     f"{base_name}/metadata.json",
                     json.dumps(metadata, ensure_ascii=False, indent=2),
@@ -11,6 +11,7 @@ import stat
 import time
 import unicodedata
 import zipfile
+from collections.abc import Iterator
 from dataclasses import dataclass
 from dataclasses import field
 from datetime import datetime
@@ -25,12 +26,14 @@ from bson.errors import InvalidId
 from bson.json_util import CANONICAL_JSON_OPTIONS
 from bson.json_util import dumps as bson_json_dumps
 from bson.json_util import loads as bson_json_loads
+from pymongo.errors import BulkWriteError
 from pymongo.errors import DuplicateKeyError
 
 from editor.utils.db_portability import PortabilityIssue
 from editor.utils.db_portability import legacy_concept_portability_issues
 from mathkb_config import DATA_DIR
 from mathkb_config import DOCUMENT_PAGE_MAP_COLLECTIONS
+from mathkb_config import IMPORT_BATCH_SIZE
 from mathkb_config import IMPORT_COLLECTIONS
 from mathkb_config import IMPORT_TIMEOUT_SECONDS
 from mathkb_config import MEDIA_ASSETS_COLLECTION
@@ -38,14 +41,17 @@ from mathkb_config import MEDIA_ROOT
 from mathkb_config import PORTABLE_EXTENDED_JSON_COLLECTIONS
 from mathkb_config import READING_ANNOTATION_COLLECTIONS
 from mathkb_config import SOURCE_CATALOG_COLLECTIONS
+from mathmongo.concept_search_index import refresh_concept_search_entries
 from mathmongo.document_page_maps.models import DocumentPageMap
 from mathmongo.legacy_concept_aliases import LegacyConceptNormalization
 from mathmongo.legacy_concept_aliases import normalize_legacy_concept_documents
 from mathmongo.paths import validate_mutable_path
+from mathmongo.query_cache import bump_collection_versions
 from mathmongo.reading_annotations.models import ConceptEvidenceLink
 from mathmongo.reading_annotations.models import DocumentAnnotation
 from mathmongo.reading_annotations.models import ReadingNote
 from mathmongo.reading_space.models import DocumentReadingState
+from mathmongo.relation_endpoints import with_relation_endpoint_fields
 from mathmongo.source_catalog.models import Reference
 from mathmongo.source_catalog.models import Source
 from mathmongo.source_catalog_migration.manifest import MANIFEST_COLLECTION
@@ -56,8 +62,8 @@ from mathmongo.source_catalog_migration.zip_reader import _read_member
 from mathmongo.source_catalog_migration.zip_reader import _validate_members
 from mathmongo.source_documents.indexes import SourceDocumentIndexManager
 from mathmongo.source_documents.models import DocumentKind
+from mathmongo.source_documents.models import PdfVersion
 from mathmongo.source_documents.models import SourceDocument
-from mathmongo.source_documents.storage import PreparedPdf
 from mathmongo.source_documents.storage import SourceDocumentBlobStore
 
 if TYPE_CHECKING:
@@ -135,7 +141,8 @@ class _MediaRestorePlan:
 
 @dataclass(frozen=True)
 class _SourceDocumentBlobPlan:
-    prepared: PreparedPdf
+    member_name: str
+    version: PdfVersion
 
 
 class CatalogImportConflictError(RuntimeError):
@@ -877,6 +884,61 @@ def _catalog_documents_identical(existing: dict, incoming: dict) -> bool:
     return _catalog_comparable(existing) == _catalog_comparable(incoming)
 
 
+def _legacy_documents_identical(collection_name: str, existing: dict, incoming: dict) -> bool:
+    """Compare legacy documents, deriving relation endpoint fields on both sides.
+
+    Relations stored before ``desde_source``/``hasta_source`` existed must
+    still be identical to the same archived relation.
+    """
+    if collection_name == "relations":
+        existing = with_relation_endpoint_fields(existing)
+        incoming = with_relation_endpoint_fields(incoming)
+    return _catalog_documents_identical(existing, incoming)
+
+
+def _existing_documents_by_id(collection, storage_ids: list[Any]) -> dict[Any, dict]:
+    """Fetch destination documents for many ``_id`` values with chunked ``$in`` queries."""
+    unique_ids = list(dict.fromkeys(storage_ids))
+    existing: dict[Any, dict] = {}
+    for start in range(0, len(unique_ids), IMPORT_BATCH_SIZE):
+        cursor = collection.find({"_id": {"$in": unique_ids[start : start + IMPORT_BATCH_SIZE]}})
+        max_time_ms = getattr(cursor, "max_time_ms", None)
+        if callable(max_time_ms):
+            cursor = max_time_ms(IMPORT_TIMEOUT_SECONDS * 1000)
+        try:
+            for document in cursor:
+                if not isinstance(document, dict):
+                    raise ValueError("MongoDB returned a non-document import identity match")
+                existing[document["_id"]] = document
+        finally:
+            close = getattr(cursor, "close", None)
+            if callable(close):
+                close()
+    return existing
+
+
+def _insert_legacy_batch(
+    collection,
+    collection_name: str,
+    documents: list[dict],
+    report: DatabaseImportReport,
+) -> None:
+    """Insert one ordered batch, counting the prefix MongoDB wrote if it stops early."""
+    if not documents:
+        return
+    try:
+        collection.insert_many(documents, ordered=True)
+    except BulkWriteError as exc:
+        written = exc.details.get("nInserted", 0)
+        report.legacy_inserted[collection_name] = (
+            report.legacy_inserted.get(collection_name, 0) + written
+        )
+        raise
+    report.legacy_inserted[collection_name] = (
+        report.legacy_inserted.get(collection_name, 0) + len(documents)
+    )
+
+
 def _find_at_most_two(collection, query: dict) -> tuple[dict, ...]:
     """Expose duplicate destination identities without an unbounded query."""
     cursor = collection.find(query)
@@ -1034,6 +1096,23 @@ def _read_zip_member(zf: zipfile.ZipFile, member_name: str) -> bytes:
     return data
 
 
+def _zip_member_chunks(zf: zipfile.ZipFile, member_name: str) -> Iterator[bytes]:
+    """Yield one member in bounded chunks, failing if it differs from its declared size."""
+    try:
+        info = zf.getinfo(member_name)
+    except KeyError as exc:
+        raise ValueError(f"ZIP member is missing: {member_name}") from exc
+    size = 0
+    with zf.open(info, "r") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            size += len(chunk)
+            if size > info.file_size:
+                raise ValueError("ZIP member expanded beyond its declared size")
+            yield chunk
+    if size != info.file_size:
+        raise ValueError("ZIP member size is inconsistent")
+
+
 def _read_collection_documents(
     zf: zipfile.ZipFile,
     member_name: str,
@@ -1109,6 +1188,7 @@ def _validate_import_metadata(
         raise ValueError("metadata collection inventory does not match physical ZIP members")
 
     actual_media: dict[str, int] = {}
+    media_members: dict[str, str] = {}
     for member_name in names:
         relative_path = _safe_media_member_path(base_dir, member_name)
         if relative_path is not None:
@@ -1116,6 +1196,7 @@ def _validate_import_metadata(
             if relative_name in actual_media:
                 raise ValueError("ZIP contains duplicate normalized media paths")
             actual_media[relative_name] = zf.getinfo(member_name).file_size
+            media_members[relative_name] = member_name
     if "media_files" in metadata:
         declared_media = metadata["media_files"]
         if not isinstance(declared_media, dict) or any(
@@ -1128,6 +1209,23 @@ def _validate_import_metadata(
             raise ValueError("metadata.media_files must contain non-negative integer sizes")
         if declared_media != actual_media:
             raise ValueError("metadata media inventory does not match physical ZIP members")
+    if "media_sha256" in metadata:
+        declared_digests = metadata["media_sha256"]
+        if (
+            not isinstance(declared_digests, dict)
+            or set(declared_digests) != set(actual_media)
+            or any(
+                not isinstance(digest, str) or not re.fullmatch(r"[0-9a-f]{64}", digest)
+                for digest in declared_digests.values()
+            )
+        ):
+            raise ValueError("metadata.media_sha256 must hold one SHA-256 per media member")
+        for relative_name, member_name in media_members.items():
+            digest = hashlib.sha256()
+            for chunk in _zip_member_chunks(zf, member_name):
+                digest.update(chunk)
+            if digest.hexdigest() != declared_digests[relative_name]:
+                raise ValueError("metadata media SHA-256 does not match physical ZIP members")
 
     actual_source_document_blobs: dict[str, dict[str, Any]] = {}
     for member_name in names:
@@ -1135,12 +1233,11 @@ def _validate_import_metadata(
         if logical_path is None:
             continue
         info = zf.getinfo(member_name)
-        data = _read_zip_member(zf, member_name)
-        prepared = SourceDocumentBlobStore.prepare_pdf(data)
-        if prepared.logical_path != logical_path:
+        sha256, _size = SourceDocumentBlobStore.digest_pdf(_zip_member_chunks(zf, member_name))
+        if not logical_path.endswith(f"/{sha256[:2]}/{sha256}.pdf"):
             raise ValueError("Physical Source Document blob path does not match its PDF bytes")
         actual_source_document_blobs[logical_path] = {
-            "sha256": prepared.sha256,
+            "sha256": sha256,
             "size_bytes": info.file_size,
         }
     if "source_documents" in collection_members and format_declared:
@@ -1287,8 +1384,7 @@ def _prepare_legacy_import(
     """Preflight all remapped legacy documents before writing media or MongoDB."""
     pending: dict[str, list[dict]] = {}
     for collection_name, raw_documents in legacy_documents.items():
-        documents: list[dict] = []
-        seen: dict[Any, dict] = {}
+        remapped: list[dict] = []
         for raw_document in raw_documents:
             original_media_path = (
                 raw_document.get("path") if collection_name == MEDIA_ASSETS_COLLECTION else None
@@ -1296,14 +1392,22 @@ def _prepare_legacy_import(
             document = _remap_media_paths_in_value(raw_document, path_remap)
             if isinstance(original_media_path, str) and original_media_path in path_remap:
                 document["filename"] = Path(document["path"]).name
+            remapped.append(document)
+        destination = _existing_documents_by_id(
+            db[collection_name],
+            [document["_id"] for document in remapped if document.get("_id") is not None],
+        )
 
+        documents: list[dict] = []
+        seen: dict[Any, dict] = {}
+        for document in remapped:
             storage_id = document.get("_id")
             if storage_id is not None:
                 previous = seen.get(storage_id)
                 if previous is not None:
                     reason = (
                         "duplicate identical legacy _id in archive"
-                        if _catalog_documents_identical(previous, document)
+                        if _legacy_documents_identical(collection_name, previous, document)
                         else "duplicate legacy _id with different data in archive"
                     )
                     report.catalog_conflicts.append(
@@ -1311,8 +1415,9 @@ def _prepare_legacy_import(
                     )
                     continue
                 seen[storage_id] = document
-                existing = db[collection_name].find_one({"_id": storage_id})
-                if existing is not None and not _catalog_documents_identical(
+                existing = destination.get(storage_id)
+                if existing is not None and not _legacy_documents_identical(
+                    collection_name,
                     existing,
                     document,
                 ):
@@ -1354,7 +1459,7 @@ def _require_existing_documents_are_archive_subset(
                     (
                         index
                         for index, candidate in enumerate(remaining)
-                        if _catalog_documents_identical(existing, candidate)
+                        if _legacy_documents_identical(collection_name, existing, candidate)
                     ),
                     None,
                 )
@@ -2359,27 +2464,21 @@ def _plan_source_document_blobs(
     plans: list[_SourceDocumentBlobPlan] = []
     for logical_path, version in sorted(referenced.items()):
         member_name = f"{base_dir}/{logical_path}"
-        try:
-            data = _read_zip_member(zf, member_name)
-        except ValueError as exc:
-            raise ValueError("Source Document PDF blob is missing from the archive") from exc
-        prepared = blob_store.prepare_pdf(data)
-        if (
-            prepared.logical_path != version.logical_path
-            or prepared.sha256 != version.sha256
-            or prepared.size_bytes != version.size_bytes
-        ):
+        if member_name not in zf.NameToInfo:
+            raise ValueError("Source Document PDF blob is missing from the archive")
+        # Hash the member in bounded chunks; it is staged only when published.
+        sha256, size_bytes = blob_store.digest_pdf(_zip_member_chunks(zf, member_name))
+        if sha256 != version.sha256 or size_bytes != version.size_bytes:
             raise ValueError("Source Document PDF blob does not match version metadata")
         try:
-            existing_data = blob_store.read_version(version)
+            # open_version verifies an existing blob against the same SHA-256.
+            with blob_store.open_version(version):
+                pass
         except FileNotFoundError:
             pass
         except Exception as exc:
             raise ValueError("Canonical Source Document blob destination conflicts") from exc
-        else:
-            if existing_data != data:
-                raise ValueError("Canonical Source Document blob destination has different bytes")
-        plans.append(_SourceDocumentBlobPlan(prepared))
+        plans.append(_SourceDocumentBlobPlan(member_name, version))
 
     physical_paths = {
         logical_path
@@ -2477,6 +2576,7 @@ def import_zip_into_database(
     if folded_name == "mathv0" and database_name != "MathV0":
         raise ValueError("Database import can restore only the exact case-sensitive MathV0 name")
     report = DatabaseImportReport()
+    touched_concepts: list[tuple[Any, Any]] = []
     logger.info(
         "Starting database import: zip=%s db=%s timeout=%ss",
         zip_path,
@@ -2541,8 +2641,15 @@ def import_zip_into_database(
                     collection_name,
                     documents,
                 )
+                if collection_name == "relations":
+                    normalized = [with_relation_endpoint_fields(doc) for doc in normalized]
                 legacy_documents[collection_name] = list(normalized)
                 report.legacy_concept_normalizations.extend(transformations)
+            touched_concepts.extend(
+                (document.get("id"), document.get("source"))
+                for collection_name in ("concepts", "latex_documents")
+                for document in legacy_documents.get(collection_name) or ()
+            )
             catalog_pending = _prepare_catalog_import(
                 zf,
                 names,
@@ -2597,7 +2704,10 @@ def import_zip_into_database(
                     IMPORT_TIMEOUT_SECONDS,
                     "restoring Source Document PDF blob",
                 )
-                publish_result = blob_store.publish(blob_plan.prepared)
+                with blob_store.stage_pdf(_zip_member_chunks(zf, blob_plan.member_name)) as staged:
+                    if staged.sha256 != blob_plan.version.sha256:
+                        raise ValueError("Source Document PDF blob changed while importing")
+                    publish_result = blob_store.publish_staged(staged)
                 if publish_result.created:
                     report.source_document_blobs_created += 1
                 else:
@@ -2839,34 +2949,38 @@ def import_zip_into_database(
                     continue
 
                 docs = legacy_pending.get(coll, [])
-                for idx, doc in enumerate(docs, start=1):
-                    if idx == 1 or idx % 100 == 0:
-                        _raise_if_timed_out(
-                            started_at,
-                            IMPORT_TIMEOUT_SECONDS,
-                            f"importing {coll}",
-                        )
-                    if "_id" in doc:
-                        existing = db[coll].find_one({"_id": doc["_id"]})
-                        if existing is not None:
-                            if _catalog_documents_identical(existing, doc):
-                                report.legacy_identical[coll] = (
-                                    report.legacy_identical.get(coll, 0) + 1
-                                )
-                                continue
-                            report.catalog_conflicts.append(
-                                CatalogImportConflict(
-                                    coll,
-                                    str(doc["_id"]),
-                                    "destination contains different legacy data for the same _id",
-                                )
+                for start in range(0, len(docs), IMPORT_BATCH_SIZE):
+                    _raise_if_timed_out(
+                        started_at,
+                        IMPORT_TIMEOUT_SECONDS,
+                        f"importing {coll}",
+                    )
+                    batch = docs[start : start + IMPORT_BATCH_SIZE]
+                    existing_by_id = _existing_documents_by_id(
+                        db[coll],
+                        [doc["_id"] for doc in batch if "_id" in doc],
+                    )
+                    inserts: list[dict] = []
+                    for doc in batch:
+                        existing = existing_by_id.get(doc["_id"]) if "_id" in doc else None
+                        if existing is None:
+                            inserts.append(doc)
+                            continue
+                        if _legacy_documents_identical(coll, existing, doc):
+                            report.legacy_identical[coll] = report.legacy_identical.get(coll, 0) + 1
+                            continue
+                        # Documents archived before the conflict are still written,
+                        # exactly as the one-by-one import used to leave them.
+                        _insert_legacy_batch(db[coll], coll, inserts, report)
+                        report.catalog_conflicts.append(
+                            CatalogImportConflict(
+                                coll,
+                                str(doc["_id"]),
+                                "destination contains different legacy data for the same _id",
                             )
-                            raise CatalogImportConflictError(report)
-                        db[coll].insert_one(doc)
-                        report.legacy_inserted[coll] = report.legacy_inserted.get(coll, 0) + 1
-                    else:
-                        db[coll].insert_one(doc)
-                        report.legacy_inserted[coll] = report.legacy_inserted.get(coll, 0) + 1
+                        )
+                        raise CatalogImportConflictError(report)
+                    _insert_legacy_batch(db[coll], coll, inserts, report)
                 imported_counts[coll] = len(legacy_documents.get(coll, []))
                 report.imported_counts[coll] = len(legacy_documents.get(coll, []))
                 logger.info(
@@ -2902,3 +3016,14 @@ def import_zip_into_database(
             time.monotonic() - started_at,
         )
         raise
+    finally:
+        # Failed imports may still have written documents.
+        bump_collection_versions(db)
+        refresh_concept_search_entries(
+            db,
+            (
+                (concept_id, source)
+                for concept_id, source in touched_concepts
+                if isinstance(concept_id, str) and isinstance(source, str)
+            ),
+        )
@@ -15,6 +15,7 @@ from dataclasses import field
 from datetime import datetime
 from datetime import timezone
 from enum import Enum
+from itertools import product
 from pathlib import Path
 from pathlib import PurePosixPath
 from typing import Any
@@ -23,29 +24,34 @@ from uuid import uuid4
 from bson.json_util import CANONICAL_JSON_OPTIONS
 from bson.json_util import dumps as bson_json_dumps
 from bson.json_util import loads as bson_json_loads
-from pymongo.errors import DuplicateKeyError
+from pymongo.errors import BulkWriteError
 
 from editor.utils import db_import
 from editor.utils.db_export import export_database_to_zip
 from editor.utils.db_portability import PortabilityIssue
 from editor.utils.db_portability import legacy_concept_portability_issues
 from mathkb_config import DOCUMENT_PAGE_MAP_COLLECTIONS
+from mathkb_config import IMPORT_BATCH_SIZE
+from mathkb_config import IMPORT_TIMEOUT_SECONDS
 from mathkb_config import MEDIA_ASSETS_COLLECTION
 from mathkb_config import PORTABLE_EXTENDED_JSON_COLLECTIONS
 from mathkb_config import READING_ANNOTATION_COLLECTIONS
 from mathkb_config import SOURCE_CATALOG_COLLECTIONS
+from mathmongo.concept_search_index import refresh_concept_search_entries
 from mathmongo.document_page_maps.indexes import DocumentPageMapIndexManager
 from mathmongo.document_page_maps.models import DocumentPageMap
 from mathmongo.legacy_concept_aliases import LegacyConceptNormalization
 from mathmongo.legacy_concept_aliases import normalize_legacy_concept_documents
 from mathmongo.paths import get_backups_dir
 from mathmongo.paths import validate_mutable_path
+from mathmongo.query_cache import bump_collection_versions
 from mathmongo.reading_annotations.indexes import ReadingAnnotationIndexManager
 from mathmongo.reading_annotations.models import ConceptEvidenceLink
 from mathmongo.reading_annotations.models import DocumentAnnotation
 from mathmongo.reading_annotations.models import ReadingNote
 from mathmongo.reading_space.indexes import ReadingSpaceIndexManager
 from mathmongo.reading_space.models import DocumentReadingState
+from mathmongo.relation_endpoints import with_relation_endpoint_fields
 from mathmongo.source_catalog.indexes import SourceCatalogIndexManager
 from mathmongo.source_catalog.models import Reference
 from mathmongo.source_catalog.models import Source
@@ -74,6 +80,7 @@ SUPPORTED_COLLECTION_ENCODINGS = frozenset({JSON_ENCODING, EXTENDED_JSON_ENCODIN
 _SAFE_COLLECTION_RE = re.compile(r"^[A-Za-z][A-Za-z0-9_]{0,119}$")
 _SUPPORTED_COMPRESSION = frozenset({zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED})
 _WINDOWS_DRIVE_RE = re.compile(r"^[A-Za-z]:")
+_DUPLICATE_KEY_CODE = 11000
 
 _PORTABLE_MODELS: dict[str, type[Any]] = {
     "sources": Source,
@@ -709,6 +716,7 @@ def _load_archive(zip_path: Path) -> _LoadedArchive:
             if relative is not None:
                 media[relative] = _read_exact_member(zf, member_name)
         _validate_media_inventory(metadata.get("media_files"), media)
+        _validate_media_digests(metadata.get("media_sha256"), media)
 
         blobs: dict[str, bytes] = {}
         for member_name in names:
@@ -759,6 +767,19 @@ def _validate_media_inventory(raw_inventory: Any, media: Mapping[Path, bytes]) -
             raise ValueError("metadata media SHA-256 does not match archive bytes")
 
 
+def _validate_media_digests(raw_digests: Any, media: Mapping[Path, bytes]) -> None:
+    if raw_digests is None:
+        return
+    if not isinstance(raw_digests, dict):
+        raise ValueError("metadata.media_sha256 must contain an object")
+    observed = {path.as_posix(): data for path, data in media.items()}
+    if set(raw_digests) != set(observed):
+        raise ValueError("metadata media digests do not match archive members")
+    for name, declared in raw_digests.items():
+        if not isinstance(declared, str) or hashlib.sha256(observed[name]).hexdigest() != declared:
+            raise ValueError("metadata media SHA-256 does not match archive bytes")
+
+
 def _validate_blob_inventory(raw_inventory: Any, blobs: Mapping[str, bytes]) -> None:
     if not isinstance(raw_inventory, dict):
         raise ValueError("metadata.source_document_blobs must contain an object")
@@ -931,6 +952,7 @@ def _validate_document(
                 value = document.get(field_name)
                 if not isinstance(value, str) or not value.strip():
                     return document, f"Relation requires {field_name}"
+            document = with_relation_endpoint_fields(document)
         elif collection == MEDIA_ASSETS_COLLECTION:
             if not isinstance(document.get("asset_id"), str) or not document["asset_id"].strip():
                 return document, "Media asset requires asset_id"
@@ -949,6 +971,113 @@ def _find_matches(database: Any, collection: str, query: Mapping[str, Any]) -> t
     return db_import._find_at_most_two(database[collection], dict(query))
 
 
+def _match_key(value: Any) -> tuple[Any, ...]:
+    """Return a hashable key that compares like MongoDB equality for identity values."""
+    if value is None:
+        return ("null",)
+    if isinstance(value, bool):
+        return ("bool", value)
+    if isinstance(value, (int, float)):
+        return ("number", value)
+    if isinstance(value, str):
+        return ("string", value)
+    return ("bson", _canonical(value))
+
+
+def _path_match_keys(value: Any, parts: tuple[str, ...]) -> set[tuple[Any, ...]]:
+    """Return the keys an equality query on a dotted path matches, traversing arrays."""
+    if not parts:
+        keys = {_match_key(value)}
+        if isinstance(value, list):
+            keys.update(_match_key(item) for item in value)
+        return keys
+    if isinstance(value, list):
+        return {key for item in value for key in _path_match_keys(item, parts)}
+    if not isinstance(value, Mapping) or parts[0] not in value:
+        return {_match_key(None)}
+    return _path_match_keys(value[parts[0]], parts[1:])
+
+
+class _DestinationIndex:
+    """Destination documents for many identity queries, fetched in a few round trips.
+
+    Queries are registered first and grouped by collection and field tuple. Each group is
+    resolved with chunked ``$in`` (one field) or ``$or`` (several fields) queries and the
+    returned documents are indexed locally, so a plan costs O(collections x chunks) round
+    trips instead of one per identity.
+    """
+
+    def __init__(self, database: Any, existing_names: set[str]) -> None:
+        """Bind the destination database and the collections that already exist."""
+        self._database = database
+        self._existing_names = existing_names
+        self._pending: dict[tuple[str, tuple[str, ...]], dict[tuple, dict[str, Any]]] = {}
+        self._matches: dict[tuple[str, tuple[str, ...], tuple], list[dict]] = {}
+
+    @staticmethod
+    def _key(query: Mapping[str, Any]) -> tuple[tuple[str, ...], tuple]:
+        fields = tuple(sorted(query))
+        return fields, tuple(_match_key(query[name]) for name in fields)
+
+    def add(self, collection: str, query: Mapping[str, Any]) -> None:
+        """Register one equality query for the next batched lookup."""
+        if collection not in self._existing_names:
+            return
+        fields, values = self._key(query)
+        if (collection, fields, values) not in self._matches:
+            self._pending.setdefault((collection, fields), {})[values] = dict(query)
+
+    def matches(self, collection: str, query: Mapping[str, Any]) -> tuple[dict, ...]:
+        """Return the destination documents matching ``query`` in cursor order."""
+        if collection not in self._existing_names:
+            return ()
+        self.add(collection, query)
+        if self._pending:
+            self._resolve()
+        fields, values = self._key(query)
+        return tuple(self._matches[(collection, fields, values)])
+
+    def _resolve(self) -> None:
+        pending, self._pending = self._pending, {}
+        for (collection, fields), queries in pending.items():
+            items = list(queries.items())
+            for start in range(0, len(items), IMPORT_BATCH_SIZE):
+                chunk = dict(items[start : start + IMPORT_BATCH_SIZE])
+                for values in chunk:
+                    self._matches[(collection, fields, values)] = []
+                for document in self._fetch(collection, fields, list(chunk.values())):
+                    document_keys = [
+                        _path_match_keys(document, tuple(name.split("."))) for name in fields
+                    ]
+                    for values in product(*document_keys):
+                        if values in chunk:
+                            self._matches[(collection, fields, values)].append(document)
+
+    def _fetch(
+        self,
+        collection: str,
+        fields: tuple[str, ...],
+        queries: list[dict[str, Any]],
+    ) -> list[dict]:
+        if len(fields) == 1:
+            query = {fields[0]: {"$in": [item[fields[0]] for item in queries]}}
+        else:
+            query = {"$or": queries}
+        cursor = self._database[collection].find(query)
+        max_time_ms = getattr(cursor, "max_time_ms", None)
+        if callable(max_time_ms):
+            cursor = max_time_ms(IMPORT_TIMEOUT_SECONDS * 1000)
+        try:
+            documents = list(cursor)
+        finally:
+            close = getattr(cursor, "close", None)
+            if callable(close):
+                close()
+        if not all(isinstance(document, dict) for document in documents):
+            raise ValueError("MongoDB returned a non-document import identity match")
+        return documents
+
+
 def _build_candidates(
     loaded: _LoadedArchive,
 ) -> tuple[dict[str, list[_Candidate]], list[UpdateIssue]]:
@@ -1018,8 +1147,13 @@ def _candidate_action(
     candidate: _Candidate,
     *,
     existing_names: set[str],
+    destination: _DestinationIndex | None = None,
 ) -> tuple[DocumentAction, UpdateIssue | None]:
     assert candidate.primary_query is not None
+    if destination is None:
+        destination = _DestinationIndex(database, existing_names)
+        for query in candidate.unique_queries:
+            destination.add(candidate.collection, query)
     if candidate.collection not in existing_names:
         return (
             DocumentAction(
@@ -1036,7 +1170,7 @@ def _candidate_action(
 
     matches_by_query: list[tuple[dict[str, Any], tuple[dict, ...]]] = []
     for query in candidate.unique_queries:
-        matches = _find_matches(database, candidate.collection, query)
+        matches = destination.matches(candidate.collection, query)
         if len(matches) > 1:
             return (
                 DocumentAction(
@@ -1097,7 +1231,11 @@ def _candidate_action(
 
     if existing is None:
         classification = DocumentClassification.INSERT
-    elif db_import._catalog_documents_identical(existing, candidate.document):
+    elif db_import._legacy_documents_identical(
+        candidate.collection,
+        existing,
+        candidate.document,
+    ):
         classification = DocumentClassification.IDENTICAL
     else:
         classification = DocumentClassification.CONFLICT
@@ -1130,7 +1268,7 @@ def _relationship_issues(
     database: Any,
     candidates: Mapping[str, list[_Candidate]],
     *,
-    existing_names: set[str],
+    destination: _DestinationIndex,
 ) -> list[UpdateIssue]:
     issues: list[UpdateIssue] = []
     valid_docs = {
@@ -1146,16 +1284,32 @@ def _relationship_issues(
         for item in valid_docs.get("references", [])
         if item.get("reference_id")
     }
+    incoming_concepts = {
+        _canonical({"id": item.get("id"), "source": item.get("source")})
+        for item in valid_docs.get("concepts", [])
+    }
+    for reference in valid_docs.get("references", []):
+        for source_id in reference.get("source_ids", []):
+            if source_id not in incoming_sources:
+                destination.add("sources", {"source_id": source_id})
+    for document in valid_docs.get("source_documents", []):
+        if document.get("source_id") not in incoming_sources:
+            destination.add("sources", {"source_id": document.get("source_id")})
+        reference_id = document.get("reference_id")
+        if reference_id is not None and reference_id not in incoming_references:
+            destination.add("references", {"reference_id": reference_id})
+    for relation in valid_docs.get("relations", []):
+        for endpoint in (relation.get("desde"), relation.get("hasta")):
+            query = _endpoint_query(endpoint)
+            if query is not None and _canonical(query) not in incoming_concepts:
+                destination.add("concepts", query)
+
     for reference in valid_docs.get("references", []):
         token = _token("references", {"reference_id": reference.get("reference_id")})
         for source_id in reference.get("source_ids", []):
             if source_id in incoming_sources:
                 continue
-            matches = (
-                _find_matches(database, "sources", {"source_id": source_id})
-                if "sources" in existing_names
-                else ()
-            )
+            matches = destination.matches("sources", {"source_id": source_id})
             if len(matches) != 1:
                 issues.append(
                     UpdateIssue(
@@ -1168,11 +1322,7 @@ def _relationship_issues(
         token = _token("source_documents", {"document_id": document.get("document_id")})
         source_id = document.get("source_id")
         if source_id not in incoming_sources:
-            matches = (
-                _find_matches(database, "sources", {"source_id": source_id})
-                if "sources" in existing_names
-                else ()
-            )
+            matches = destination.matches("sources", {"source_id": source_id})
             if len(matches) != 1:
                 issues.append(
                     UpdateIssue(
@@ -1184,8 +1334,8 @@ def _relationship_issues(
         reference_id = document.get("reference_id")
         if reference_id is not None:
             reference = incoming_references.get(reference_id)
-            if reference is None and "references" in existing_names:
-                matches = _find_matches(database, "references", {"reference_id": reference_id})
+            if reference is None:
+                matches = destination.matches("references", {"reference_id": reference_id})
                 reference = matches[0] if len(matches) == 1 else None
             if reference is None or source_id not in reference.get("source_ids", []):
                 issues.append(
@@ -1196,10 +1346,6 @@ def _relationship_issues(
                     )
                 )
 
-    incoming_concepts = {
-        _canonical({"id": item.get("id"), "source": item.get("source")})
-        for item in valid_docs.get("concepts", [])
-    }
     for relation in valid_docs.get("relations", []):
         token = _token(
             "relations",
@@ -1212,9 +1358,7 @@ def _relationship_issues(
                 continue
             if _canonical(query) in incoming_concepts:
                 continue
-            matches = (
-                _find_matches(database, "concepts", query) if "concepts" in existing_names else ()
-            )
+            matches = destination.matches("concepts", query)
             if len(matches) != 1:
                 issues.append(
                     UpdateIssue(
@@ -1288,20 +1432,21 @@ def _preupdate_backup_portability_issues(
     database: Any,
     *,
     existing_names: set[str],
+    destination: _DestinationIndex,
 ) -> list[UpdateIssue]:
     """Diagnose failures that a full pre-update backup would hit."""
     if "concept_evidence_links" not in existing_names:
         return []
-    evidence_links = database["concept_evidence_links"].find({})
+    evidence_links = list(database["concept_evidence_links"].find({}))
+    for link in evidence_links:
+        if isinstance(link, Mapping):
+            concept_id = link.get("concept_legacy_id")
+            concept_source = link.get("concept_legacy_source")
+            if isinstance(concept_id, str) and isinstance(concept_source, str):
+                destination.add("concepts", {"id": concept_id, "source": concept_source})
 
     def count_matching_concepts(concept_id: str, concept_source: str) -> int:
-        if "concepts" not in existing_names:
-            return 0
-        return int(
-            database["concepts"].count_documents(
-                {"id": concept_id, "source": concept_source}
-            )
-        )
+        return len(destination.matches("concepts", {"id": concept_id, "source": concept_source}))
 
     portability_issues = legacy_concept_portability_issues(
         evidence_links,
@@ -1396,7 +1541,7 @@ def _plan_files(
             )
             continue
         try:
-            existing = blob_store.read_version(version)
+            matches_existing = blob_store.version_matches(version, data)
         except FileNotFoundError:
             exists = False
         except Exception:
@@ -1410,7 +1555,7 @@ def _plan_files(
             continue
         else:
             exists = True
-            if existing != data:
+            if not matches_existing:
                 issues.append(
                     UpdateIssue(
                         "source_documents",
@@ -1575,12 +1720,19 @@ def analyze_database_update(
     loaded = _load_archive(zip_path)
     existing_names = set(database.list_collection_names())
     candidates, issues = _build_candidates(loaded)
+    destination = _DestinationIndex(database, existing_names)
     issues.extend(
         _preupdate_backup_portability_issues(
             database,
             existing_names=existing_names,
+            destination=destination,
         )
     )
+    for collection_candidates in candidates.values():
+        for candidate in collection_candidates:
+            if not candidate.invalid_reason and candidate.primary_query is not None:
+                for query in candidate.unique_queries:
+                    destination.add(candidate.collection, query)
     actions: list[DocumentAction] = []
     for collection_candidates in candidates.values():
         for candidate in collection_candidates:
@@ -1602,12 +1754,13 @@ def analyze_database_update(
                 database,
                 candidate,
                 existing_names=existing_names,
+                destination=destination,
             )
             actions.append(action)
             if issue is not None:
                 issues.append(issue)
 
-    issues.extend(_relationship_issues(database, candidates, existing_names=existing_names))
+    issues.extend(_relationship_issues(database, candidates, destination=destination))
     issues.extend(_managed_index_issues(database, set(loaded.collections)))
     issues = sorted(
         set(issues),
@@ -1977,6 +2130,41 @@ def _apply_known_indexes(mongo: Any, collection_names: set[str]) -> None:
         )
 
 
+def _insert_actions(
+    database: Any,
+    collection: str,
+    actions: list[DocumentAction],
+    operations: list[AppliedOperation],
+) -> int:
+    """Insert planned documents with one ordered ``insert_many`` and record each write."""
+    if not actions:
+        return 0
+    documents = [dict(action.incoming) for action in actions]
+    written, error = len(documents), None
+    try:
+        database[collection].insert_many(documents, ordered=True)
+    except BulkWriteError as exc:
+        # An ordered bulk stops at the first failure; everything before it is stored.
+        written, error = exc.details.get("nInserted", 0), exc
+    for action, document in zip(actions[:written], documents[:written], strict=True):
+        operations.append(
+            AppliedOperation(
+                "document_inserted",
+                collection=collection,
+                query=dict(action.identity_query),
+                after=document,
+            )
+        )
+    if error is not None:
+        write_errors = error.details.get("writeErrors") or [{}]
+        if write_errors[0].get("code") != _DUPLICATE_KEY_CODE:
+            raise error
+        raise StaleUpdatePlanError(
+            "A unique identity appeared while applying the update"
+        ) from error
+    return written
+
+
 def apply_database_update(
     zip_path: Path,
     mongo: Any,
@@ -2047,12 +2235,14 @@ def apply_database_update(
         for action in current_plan.actions:
             actions_by_collection.setdefault(action.collection, []).append(action)
         for collection in _ordered_collection_names(set(actions_by_collection)):
+            pending_inserts: list[DocumentAction] = []
             for action in actions_by_collection[collection]:
                 if action.classification is DocumentClassification.INVALID:
                     raise RuntimeError("Invalid action reached update apply")
                 current = _current_match(database, action)
                 if action.classification is DocumentClassification.IDENTICAL:
-                    if current is None or not db_import._catalog_documents_identical(
+                    if current is None or not db_import._legacy_documents_identical(
+                        collection,
                         current,
                         dict(action.incoming),
                     ):
@@ -2061,24 +2251,18 @@ def apply_database_update(
                 if action.classification is DocumentClassification.INSERT:
                     if current is not None:
                         raise StaleUpdatePlanError("Insert identity appeared after dry-run")
-                    try:
-                        database[collection].insert_one(dict(action.incoming))
-                    except DuplicateKeyError as exc:
-                        raise StaleUpdatePlanError(
-                            "A unique identity appeared while applying the update"
-                        ) from exc
-                    inserted += 1
-                    operations.append(
-                        AppliedOperation(
-                            "document_inserted",
-                            collection=collection,
-                            query=dict(action.identity_query),
-                            after=dict(action.incoming),
+                    pending_inserts.append(action)
+                    if len(pending_inserts) >= IMPORT_BATCH_SIZE:
+                        inserted += _insert_actions(
+                            database, collection, pending_inserts, operations
                         )
-                    )
+                        pending_inserts = []
                     continue
 
                 assert action.classification is DocumentClassification.CONFLICT
+                # Keep writes in plan order: queued inserts land before a replacement.
+                inserted += _insert_actions(database, collection, pending_inserts, operations)
+                pending_inserts = []
                 if (
                     current is None
                     or action.existing is None
@@ -2112,6 +2296,7 @@ def apply_database_update(
                         after=replacement,
                     )
                 )
+            inserted += _insert_actions(database, collection, pending_inserts, operations)
 
         _apply_known_indexes(mongo, archive_collections)
         final_plan = analyze_database_update(
@@ -2147,7 +2332,20 @@ def apply_database_update(
             backup_path=backup_path,
             operations=tuple(operations),
         ) from exc
-
+    finally:
+        bump_collection_versions(database)
+        # Also after a failure: the operations that did land are in the database.
+        refresh_concept_search_entries(
+            database,
+            (
+                (operation.after["id"], operation.after["source"])
+                for operation in operations
+                if operation.collection in {"concepts", "latex_documents"}
+                and operation.after is not None
+                and isinstance(operation.after.get("id"), str)
+                and isinstance(operation.after.get("source"), str)
+            ),
+        )
     conflicts_preserved = sum(policy is ConflictPolicy.KEEP_CURRENT for policy in policies.values())
     unmanaged = tuple(item.name for item in current_plan.collection_plans if not item.managed)
     return DatabaseUpdateReport(
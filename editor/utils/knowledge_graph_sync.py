@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections import Counter
 from copy import deepcopy
 from datetime import datetime
 from typing import Any
@@ -127,7 +128,243 @@ def node_concept_key(node: dict) -> str:
     return _clean_text(node.get("id") if isinstance(node, dict) else "")
 
 
-def graph_node_items(graph_state: dict | None) -> list[dict]:
+_STATE_LISTS = ("nodes", "edges", "fullNodes", "fullEdges")
+# Merged views read the full lists first, like graph_node_items/graph_edge_items.
+_VIEW_LISTS = {"node": ("fullNodes", "nodes"), "edge": ("fullEdges", "edges")}
+
+
+def _node_view_key(node: dict) -> str:
+    return _clean_text(node.get("id")) or node_concept_key(node)
+
+
+def _count(counter: Counter, key: Any, step: int) -> None:
+    counter[key] += step
+    if counter[key] <= 0:
+        del counter[key]
+
+
+class GraphState:
+    """A saved vis-network graph state parsed once and indexed for map operations.
+
+    Nodes are indexed by id and concept key, edges by identity and endpoints,
+    and edge counts are kept up to date as items are added or removed, so
+    lookups and edits cost O(changed items). Items are never modified in place:
+    unchanged node and edge dicts are shared with the parsed state and with
+    :meth:`to_dict`, and callers must treat them as read-only.
+    """
+
+    def __init__(self, graph_state: dict | None = None) -> None:
+        """Index ``graph_state``, filling in missing lists like ``_ensure_graph_state_lists``."""
+        raw = graph_state if isinstance(graph_state, dict) else {}
+        self._fields = dict(raw)
+        self._items: dict[str, dict[int, Any]] = {name: {} for name in _STATE_LISTS}
+        self._slots_by_id: dict[str, dict[str, set[int]]] = {name: {} for name in _STATE_LISTS}
+        self._keys: dict[str, Counter] = {name: Counter() for name in _STATE_LISTS}
+        self._junk: dict[str, set[int]] = {name: set() for name in _STATE_LISTS}
+        self._holders: dict[str, dict[str, list[tuple[int, int]]]] = {"node": {}, "edge": {}}
+        self._views: dict[str, list[dict] | None] = {"node": None, "edge": None}
+        self._concept_keys: Counter = Counter()
+        self._full_keys: Counter = Counter()
+        self._sources_by_concept_id: dict[str, Counter] = {}
+        self._incoming: Counter = Counter()
+        self._outgoing: Counter = Counter()
+        self._next_slot = 0
+
+        lists = {
+            name: raw[name] if isinstance(raw.get(name), list) else None for name in _STATE_LISTS
+        }
+        lists["nodes"] = lists["nodes"] or []
+        lists["edges"] = lists["edges"] or []
+        for name, fallback in (("fullNodes", "nodes"), ("fullEdges", "edges")):
+            if lists[name] is None:
+                lists[name] = lists[fallback]
+        for name in _STATE_LISTS:
+            # Keeps the key order of the saved state; missing lists go last.
+            self._fields[name] = None
+            for item in lists[name]:
+                self._insert(name, item)
+
+    @classmethod
+    def of(cls, graph_state: dict | GraphState | None) -> GraphState:
+        """Return ``graph_state`` if already indexed, else parse it."""
+        return graph_state if isinstance(graph_state, GraphState) else cls(graph_state)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a top-level entry; node and edge lists are returned as new lists."""
+        if key in self._items:
+            return list(self._items[key].values())
+        return self._fields.get(key, default)
+
+    def set(self, key: str, value: Any) -> None:
+        """Replace a top-level entry other than the node and edge lists."""
+        if key in self._items:
+            raise ValueError(f"{key} se modifica con add_node/add_edge/remove_nodes.")
+        self._fields[key] = value
+
+    def to_dict(self) -> dict:
+        """Serialize back to the saved JSON layout."""
+        state = dict(self._fields)
+        for name in _STATE_LISTS:
+            state[name] = list(self._items[name].values())
+        return state
+
+    def nodes(self) -> list[dict]:
+        """Return the nodes of ``fullNodes`` then ``nodes``, first occurrence by id or key."""
+        return list(self._view("node"))
+
+    def edges(self) -> list[dict]:
+        """Return the edges of ``fullEdges`` then ``edges``, first occurrence by identity."""
+        return list(self._view("edge"))
+
+    def concept_keys(self) -> set[str]:
+        """Return the concept keys of :meth:`nodes`."""
+        return set(self._concept_keys)
+
+    def edge_identities(self, collection: str = "fullEdges") -> set[str]:
+        """Return the identities of the edges stored in ``collection``."""
+        return set(self._keys[collection])
+
+    def contains_concept(self, concept: dict) -> bool:
+        """Answer ``graph_contains_concept`` from the indexes."""
+        candidate_id, candidate_source = concept_parts(concept)
+        candidate_full_key = concept_key_from_parts(candidate_id, candidate_source)
+        if candidate_full_key and candidate_full_key in self._full_keys:
+            return True
+        sources = self._sources_by_concept_id.get(candidate_id) if candidate_id else None
+        if not sources:
+            return False
+        return not candidate_source or "" in sources or candidate_source in sources
+
+    def edge_counts(self) -> dict[str, dict[str, int]]:
+        """Return incoming and outgoing edge counts for every node id."""
+        counts = {}
+        for node in self._view("node"):
+            node_id = _clean_text(node.get("id"))
+            if node_id:
+                counts[node_id] = {
+                    "incoming": self._incoming.get(node_id, 0),
+                    "outgoing": self._outgoing.get(node_id, 0),
+                }
+        return counts
+
+    def add_node(self, node: dict) -> None:
+        """Append ``node`` to each node list that has no node with its concept key."""
+        node_key = node_concept_key(node)
+        for name in ("nodes", "fullNodes"):
+            if node_key not in self._keys[name]:
+                self._insert(name, node)
+
+    def add_edge(self, edge: dict) -> bool:
+        """Append ``edge`` to each edge list that lacks its identity; True if any did."""
+        identity = edge_identity(edge)
+        appended = False
+        for name in ("edges", "fullEdges"):
+            if identity not in self._keys[name]:
+                self._insert(name, edge)
+                appended = True
+        return appended
+
+    def remove_nodes(self, node_ids: set[str]) -> tuple[int, int]:
+        """Drop nodes with these ids, their edges and non-dict entries.
+
+        Returns the number of nodes and edges removed from ``nodes`` and ``edges``.
+        """
+        removed = {}
+        for name in _STATE_LISTS:
+            slots_by_id = self._slots_by_id[name]
+            matched = set().union(*(slots_by_id.get(node_id, ()) for node_id in node_ids))
+            removed[name] = len(matched)
+            for slot in [*matched, *self._junk[name]]:
+                self._discard(name, slot)
+        return removed["nodes"], removed["edges"]
+
+    def _view(self, kind: str) -> list[dict]:
+        view = self._views[kind]
+        if view is None:
+            representatives = {min(holders) for holders in self._holders[kind].values()}
+            view = [
+                item
+                for rank, name in enumerate(_VIEW_LISTS[kind])
+                for slot, item in self._items[name].items()
+                if (rank, slot) in representatives
+            ]
+            self._views[kind] = view
+        return view
+
+    def _insert(self, name: str, item: Any) -> None:
+        slot = self._next_slot
+        self._next_slot += 1
+        self._items[name][slot] = item
+        if isinstance(item, dict):
+            self._index(name, slot, item, 1)
+        else:
+            self._junk[name].add(slot)
+
+    def _discard(self, name: str, slot: int) -> None:
+        item = self._items[name][slot]
+        if isinstance(item, dict):
+            self._index(name, slot, item, -1)
+        self._junk[name].discard(slot)
+        del self._items[name][slot]
+
+    def _index(self, name: str, slot: int, item: dict, step: int) -> None:
+        if name in _VIEW_LISTS["node"]:
+            kind = "node"
+            ids = {_clean_text(item.get("id"))}
+            _count(self._keys[name], node_concept_key(item), step)
+            view_key = _node_view_key(item)
+        else:
+            kind = "edge"
+            ids = {_clean_text(item.get("from")), _clean_text(item.get("to"))}
+            view_key = edge_identity(item)
+            _count(self._keys[name], view_key, step)
+        for item_id in ids:
+            slots = self._slots_by_id[name].setdefault(item_id, set())
+            if step > 0:
+                slots.add(slot)
+            else:
+                slots.discard(slot)
+                if not slots:
+                    del self._slots_by_id[name][item_id]
+
+        holders = self._holders[kind].setdefault(view_key, [])
+        previous = min(holders) if holders else None
+        if step > 0:
+            holders.append((_VIEW_LISTS[kind].index(name), slot))
+        else:
+            holders.remove((_VIEW_LISTS[kind].index(name), slot))
+        current = min(holders) if holders else None
+        if not holders:
+            del self._holders[kind][view_key]
+        if previous != current:
+            self._views[kind] = None
+            if previous is not None:
+                self._index_view(kind, previous, -1)
+            if current is not None:
+                self._index_view(kind, current, 1)
+
+    def _index_view(self, kind: str, holder: tuple[int, int], step: int) -> None:
+        rank, slot = holder
+        item = self._items[_VIEW_LISTS[kind][rank]][slot]
+        if kind == "edge":
+            _count(self._outgoing, _clean_text(item.get("from")), step)
+            _count(self._incoming, _clean_text(item.get("to")), step)
+            return
+        node_key = node_concept_key(item)
+        if node_key:
+            _count(self._concept_keys, node_key, step)
+        concept_id, source = node_concept_parts(item)
+        _count(self._full_keys, concept_key_from_parts(concept_id, source), step)
+        if concept_id:
+            sources = self._sources_by_concept_id.setdefault(concept_id, Counter())
+            _count(sources, source, step)
+            if not sources:
+                del self._sources_by_concept_id[concept_id]
+
+
+def graph_node_items(graph_state: dict | GraphState | None) -> list[dict]:
+    if isinstance(graph_state, GraphState):
+        return graph_state.nodes()
     if not isinstance(graph_state, dict):
         return []
     items: list[dict] = []
@@ -147,7 +384,9 @@ def graph_node_items(graph_state: dict | None) -> list[dict]:
     return items
 
 
-def graph_edge_items(graph_state: dict | None) -> list[dict]:
+def graph_edge_items(graph_state: dict | GraphState | None) -> list[dict]:
+    if isinstance(graph_state, GraphState):
+        return graph_state.edges()
     if not isinstance(graph_state, dict):
         return []
     items: list[dict] = []
@@ -167,7 +406,9 @@ def graph_edge_items(graph_state: dict | None) -> list[dict]:
     return items
 
 
-def graph_contains_concept(graph_state: dict | None, concept: dict) -> bool:
+def graph_contains_concept(graph_state: dict | GraphState | None, concept: dict) -> bool:
+    if isinstance(graph_state, GraphState):
+        return graph_state.contains_concept(concept)
     candidate_id, candidate_source = concept_parts(concept)
     candidate_full_key = concept_key_from_parts(candidate_id, candidate_source)
     for node in graph_node_items(graph_state):
@@ -181,7 +422,9 @@ def graph_contains_concept(graph_state: dict | None, concept: dict) -> bool:
     return False
 
 
-def graph_concept_keys(graph_state: dict | None) -> set[str]:
+def graph_concept_keys(graph_state: dict | GraphState | None) -> set[str]:
+    if isinstance(graph_state, GraphState):
+        return graph_state.concept_keys()
     keys = set()
     for node in graph_node_items(graph_state):
         key = node_concept_key(node)
@@ -282,7 +525,7 @@ def concepts_by_keys(concepts: list[dict], selected_keys: set[str]) -> list[dict
 def detect_missing_source_concepts(
     mongo: Any,
     map_doc: dict,
-    graph_state: dict | None = None,
+    graph_state: dict | GraphState | None = None,
     *,
     include_removed: bool = False,
 ) -> list[dict]:
@@ -297,10 +540,11 @@ def detect_missing_source_concepts(
         sync_settings = default_sync_settings(map_doc.get("sync_settings"))
         removed_ids.update(sync_settings.get("removed_node_ids", []))
         removed_ids.update(sync_settings.get("manually_removed_node_ids", []))
+    graph_index = GraphState.of(graph_state)
     missing = [
         concept
         for concept in concepts
-        if not graph_contains_concept(graph_state, concept) and concept_key(concept) not in removed_ids
+        if not graph_index.contains_concept(concept) and concept_key(concept) not in removed_ids
     ]
     return sorted(
         missing,
@@ -316,7 +560,7 @@ def detect_missing_source_concepts(
 def find_available_concepts(
     mongo: Any,
     source: str,
-    graph_state: dict | None,
+    graph_state: dict | GraphState | None,
     concept_types: list[str] | None = None,
     search_text: str = "",
     limit: int = 300,
@@ -348,7 +592,8 @@ def find_available_concepts(
             ).lower()
         ]
 
-    available = [concept for concept in concepts if not graph_contains_concept(graph_state, concept)]
+    graph_index = GraphState.of(graph_state)
+    available = [concept for concept in concepts if not graph_index.contains_concept(concept)]
     return sorted(
         available,
         key=lambda concept: (
@@ -368,14 +613,19 @@ def _numeric(value: Any) -> float | None:
         return None
 
 
-def new_node_position(graph_state: dict | None, index: int) -> dict:
+def _position_anchor(graph_state: dict | GraphState | None) -> tuple[float, float]:
     nodes = graph_node_items(graph_state)
     xs = [_numeric(node.get("x")) for node in nodes]
     ys = [_numeric(node.get("y")) for node in nodes]
     xs = [value for value in xs if value is not None]
     ys = [value for value in ys if value is not None]
-    max_x = max(xs) if xs else 0
-    min_y = min(ys) if ys else 0
+    return (max(xs) if xs else 0), (min(ys) if ys else 0)
+
+
+def new_node_position(
+    graph_state: dict | GraphState | None, index: int, anchor: tuple[float, float] | None = None
+) -> dict:
+    max_x, min_y = anchor or _position_anchor(graph_state)
     col = index % 3
     row = index // 3
     return {
@@ -645,28 +895,7 @@ def _ensure_graph_state_lists(graph_state: dict) -> None:
         graph_state["fullEdges"] = deepcopy(graph_state["edges"])
 
 
-def _append_node_to_state(graph_state: dict, node: dict) -> None:
-    node_key = node_concept_key(node)
-    for collection_name in ("nodes", "fullNodes"):
-        collection = graph_state[collection_name]
-        if any(node_concept_key(item) == node_key for item in collection if isinstance(item, dict)):
-            continue
-        collection.append(deepcopy(node))
-
-
-def _append_edge_to_state(graph_state: dict, edge: dict) -> bool:
-    new_identity = edge_identity(edge)
-    appended = False
-    for collection_name in ("edges", "fullEdges"):
-        collection = graph_state[collection_name]
-        if any(edge_identity(item) == new_identity for item in collection if isinstance(item, dict)):
-            continue
-        collection.append(deepcopy(edge))
-        appended = True
-    return appended
-
-
-def relation_docs_between_graph_nodes(mongo: Any, graph_state: dict) -> list[dict]:
+def relation_docs_between_graph_nodes(mongo: Any, graph_state: dict | GraphState) -> list[dict]:
     node_keys = sorted(graph_concept_keys(graph_state))
     if not node_keys:
         return []
@@ -711,7 +940,7 @@ def node_source_text(node: dict) -> str:
     return source
 
 
-def infer_sources_from_graph_state(graph_state: dict | None) -> list[str]:
+def infer_sources_from_graph_state(graph_state: dict | GraphState | None) -> list[str]:
     sources = set()
     for node in graph_node_items(graph_state):
         source = node_source_text(node)
@@ -725,7 +954,7 @@ def infer_sources_from_graph_state(graph_state: dict | None) -> list[str]:
     return sorted(sources, key=str.lower)
 
 
-def infer_concept_types_from_graph_state(graph_state: dict | None) -> list[str]:
+def infer_concept_types_from_graph_state(graph_state: dict | GraphState | None) -> list[str]:
     concept_types = set()
     for node in graph_node_items(graph_state):
         node_info = node.get("nodeInfo") if isinstance(node.get("nodeInfo"), dict) else {}
@@ -740,7 +969,9 @@ def infer_concept_types_from_graph_state(graph_state: dict | None) -> list[str]:
     return sorted(concept_types, key=str.lower)
 
 
-def edge_counts_by_node(graph_state: dict | None) -> dict[str, dict[str, int]]:
+def edge_counts_by_node(graph_state: dict | GraphState | None) -> dict[str, dict[str, int]]:
+    if isinstance(graph_state, GraphState):
+        return graph_state.edge_counts()
     counts: dict[str, dict[str, int]] = {}
     for node in graph_node_items(graph_state):
         node_id = _clean_text(node.get("id"))
@@ -757,12 +988,15 @@ def edge_counts_by_node(graph_state: dict | None) -> dict[str, dict[str, int]]:
     return counts
 
 
-def map_node_rows(mongo: Any, graph_state: dict | None) -> list[dict]:
+def map_node_rows(
+    mongo: Any, graph_state: dict | GraphState | None, resolver: ConceptNodeResolver | None = None
+) -> list[dict]:
+    resolver = resolver or concept_resolver_for_graph(mongo, graph_state)
     counts = edge_counts_by_node(graph_state)
     rows = []
     for node in sorted(graph_node_items(graph_state), key=lambda item: node_display_title(item).lower()):
         node_id = _clean_text(node.get("id"))
-        concept = find_concept_for_node(mongo, node)
+        concept = resolver.find(node)
         incomplete = _node_is_incomplete_or_stale(node) or concept is None
         rows.append(
             {
@@ -779,19 +1013,22 @@ def map_node_rows(mongo: Any, graph_state: dict | None) -> list[dict]:
     return rows
 
 
-def incomplete_node_ids(mongo: Any, graph_state: dict | None) -> list[str]:
+def incomplete_node_ids(
+    mongo: Any, graph_state: dict | GraphState | None, resolver: ConceptNodeResolver | None = None
+) -> list[str]:
+    resolver = resolver or concept_resolver_for_graph(mongo, graph_state)
     ids = []
     for node in graph_node_items(graph_state):
         node_id = _clean_text(node.get("id"))
         if not node_id:
             continue
-        concept = find_concept_for_node(mongo, node)
+        concept = resolver.find(node)
         if _node_is_incomplete_or_stale(node) or concept is None:
             ids.append(node_id)
     return sorted(set(ids))
 
 
-def isolated_node_ids(graph_state: dict | None) -> list[str]:
+def isolated_node_ids(graph_state: dict | GraphState | None) -> list[str]:
     counts = edge_counts_by_node(graph_state)
     isolated = [
         node_id
@@ -839,36 +1076,19 @@ def graph_state_integrity_issues(graph_state: dict | None) -> list[str]:
 
 def remove_nodes_from_graph_state(graph_state: dict | None, node_ids: list[str]) -> tuple[dict, int, int]:
     removed_ids = {_clean_text(node_id) for node_id in node_ids if _clean_text(node_id)}
-    new_state = deepcopy(graph_state) if isinstance(graph_state, dict) else {}
-    _ensure_graph_state_lists(new_state)
+    state = GraphState(graph_state)
     if not removed_ids:
-        return new_state, 0, 0
+        return state.to_dict(), 0, 0
 
-    removed_count = 0
-    for collection_name in ("nodes", "fullNodes"):
-        original_nodes = [node for node in new_state[collection_name] if isinstance(node, dict)]
-        kept_nodes = [node for node in original_nodes if _clean_text(node.get("id")) not in removed_ids]
-        if collection_name == "nodes":
-            removed_count = len(original_nodes) - len(kept_nodes)
-        new_state[collection_name] = kept_nodes
-
-    removed_edges = 0
-    for collection_name in ("edges", "fullEdges"):
-        original_edges = [edge for edge in new_state[collection_name] if isinstance(edge, dict)]
-        kept_edges = [
-            edge
-            for edge in original_edges
-            if _clean_text(edge.get("from")) not in removed_ids and _clean_text(edge.get("to")) not in removed_ids
-        ]
-        if collection_name == "edges":
-            removed_edges = len(original_edges) - len(kept_edges)
-        new_state[collection_name] = kept_edges
+    removed_count, removed_edges = state.remove_nodes(removed_ids)
 
-    if isinstance(new_state.get("selection"), list):
-        new_state["selection"] = [node_id for node_id in new_state["selection"] if node_id not in removed_ids]
+    selection = state.get("selection")
+    if isinstance(selection, list):
+        state.set("selection", [node_id for node_id in selection if node_id not in removed_ids])
 
-    ui_controls = new_state.get("uiControls")
+    ui_controls = state.get("uiControls")
     if isinstance(ui_controls, dict):
+        ui_controls = dict(ui_controls)
         if ui_controls.get("selectedNodeId") in removed_ids:
             ui_controls["selectedNodeId"] = ""
         if isinstance(ui_controls.get("visibleNodeIds"), list):
@@ -876,13 +1096,14 @@ def remove_nodes_from_graph_state(graph_state: dict | None, node_ids: list[str])
                 node_id for node_id in ui_controls["visibleNodeIds"] if node_id not in removed_ids
             ]
         if isinstance(ui_controls.get("visibleEdgeIds"), list):
-            remaining_edge_ids = {edge_identity(edge) for edge in new_state.get("fullEdges", [])}
+            remaining_edge_ids = state.edge_identities("fullEdges")
             ui_controls["visibleEdgeIds"] = [
                 edge_id for edge_id in ui_controls["visibleEdgeIds"] if edge_id in remaining_edge_ids
             ]
+        state.set("uiControls", ui_controls)
 
-    new_state["exportedAt"] = utc_timestamp()
-    return new_state, removed_count, removed_edges
+    state.set("exportedAt", utc_timestamp())
+    return state.to_dict(), removed_count, removed_edges
 
 
 def _concept_lookup_queries(concept_id: str, source: str) -> list[dict]:
@@ -899,13 +1120,90 @@ def _concept_lookup_queries(concept_id: str, source: str) -> list[dict]:
     return queries
 
 
-def find_concept_for_node(mongo: Any, node: dict) -> dict | None:
+CONCEPT_LOOKUP_FIELDS = ("id", "concept_id", "conceptId")
+CONCEPT_LOOKUP_CHUNK_SIZE = 500
+
+
+def _node_lookup_parts(node: dict) -> tuple[str, str]:
     concept_id, source = node_concept_parts(node)
     if not concept_id:
         node_id = _clean_text(node.get("id") if isinstance(node, dict) else "")
         concept_id, source = split_concept_key(node_id)
+    return concept_id, source
+
+
+def _lookup_field(query: dict) -> str:
+    return next(field for field in CONCEPT_LOOKUP_FIELDS if field in query)
+
+
+def _matches_value(stored: Any, wanted: Any) -> bool:
+    # Mongo equality also matches an array that contains the value.
+    if isinstance(stored, list):
+        return wanted in stored
+    return stored == wanted
+
+
+class ConceptNodeResolver:
+    """Resolve graph nodes to concepts with one ``$in`` query per lookup field.
+
+    Node lookups replay the query order of ``_concept_lookup_queries`` against
+    the prefetched documents, so they return what the per-node ``find_one``
+    sequence would.
+    """
+
+    def __init__(self, mongo: Any, nodes: list[dict], chunk_size: int = CONCEPT_LOOKUP_CHUNK_SIZE) -> None:
+        """Fetch every concept that any lookup query of ``nodes`` could match."""
+        wanted: dict[str, set[str]] = {field: set() for field in CONCEPT_LOOKUP_FIELDS}
+        for node in nodes:
+            for query in _concept_lookup_queries(*_node_lookup_parts(node)):
+                field = _lookup_field(query)
+                wanted[field].add(query[field])
+
+        size = max(1, int(chunk_size))
+        seen: set[Any] = set()
+        self.query_count = 0
+        self._by_value: dict[str, dict[str, list[dict]]] = {field: {} for field in CONCEPT_LOOKUP_FIELDS}
+        for field in CONCEPT_LOOKUP_FIELDS:
+            values = sorted(wanted[field])
+            for start in range(0, len(values), size):
+                self.query_count += 1
+                for concept in mongo.concepts.find({field: {"$in": values[start : start + size]}}):
+                    marker = concept.get("_id", id(concept))
+                    if marker not in seen:
+                        seen.add(marker)
+                        self._index(concept)
+
+    def _index(self, concept: dict) -> None:
+        for field in CONCEPT_LOOKUP_FIELDS:
+            stored = concept.get(field)
+            for value in stored if isinstance(stored, list) else [stored]:
+                if isinstance(value, str):
+                    self._by_value[field].setdefault(value, []).append(concept)
+
+    def find(self, node: dict) -> dict | None:
+        """Return the concept the first matching lookup query of ``node`` would find."""
+        for query in _concept_lookup_queries(*_node_lookup_parts(node)):
+            field = _lookup_field(query)
+            for concept in self._by_value[field].get(query[field], ()):
+                if "source" not in query or _matches_value(concept.get("source"), query["source"]):
+                    return concept
+        return None
+
 
-    for query in _concept_lookup_queries(concept_id, source):
+def concept_resolver_for_graph(
+    mongo: Any, graph_state: dict | GraphState | None
+) -> ConceptNodeResolver:
+    """Prefetch the concepts of every node of ``graph_state``."""
+    return ConceptNodeResolver(mongo, graph_node_items(graph_state))
+
+
+def find_concept_for_node(
+    mongo: Any, node: dict, resolver: ConceptNodeResolver | None = None
+) -> dict | None:
+    if resolver is not None:
+        return resolver.find(node)
+
+    for query in _concept_lookup_queries(*_node_lookup_parts(node)):
         concept = mongo.concepts.find_one(query)
         if concept:
             return concept
@@ -972,14 +1270,17 @@ def _repair_node_from_concept(node: dict, concept: dict) -> dict:
     return repaired
 
 
-def repair_incomplete_graph_nodes(mongo: Any, graph_state: dict | None) -> tuple[dict, int, int]:
+def repair_incomplete_graph_nodes(
+    mongo: Any, graph_state: dict | None, resolver: ConceptNodeResolver | None = None
+) -> tuple[dict, int, int]:
     repaired_state = deepcopy(graph_state) if isinstance(graph_state, dict) else {}
     _ensure_graph_state_lists(repaired_state)
+    resolver = resolver or concept_resolver_for_graph(mongo, repaired_state)
 
     repairs_by_key: dict[str, dict] = {}
     unresolved = 0
     for node in graph_node_items(repaired_state):
-        concept = find_concept_for_node(mongo, node)
+        concept = resolver.find(node)
         if not concept:
             if _node_is_incomplete_or_stale(node):
                 unresolved += 1
@@ -1029,48 +1330,46 @@ def add_concepts_to_graph_state(
     include_relations: bool = False,
     sync_origin: str = "source_sync",
 ) -> tuple[dict, int, int]:
-    new_state = deepcopy(graph_state) if isinstance(graph_state, dict) else {}
-    _ensure_graph_state_lists(new_state)
+    state = GraphState(graph_state)
+    anchor = _position_anchor(state)
     added_at = utc_timestamp()
 
     added_nodes = 0
     for concept in concepts:
-        if graph_contains_concept(new_state, concept):
+        if state.contains_concept(concept):
             continue
-        position = new_node_position(graph_state, added_nodes)
-        node = build_node_from_concept(concept, position, added_at, sync_origin)
-        _append_node_to_state(new_state, node)
+        position = new_node_position(state, added_nodes, anchor)
+        state.add_node(build_node_from_concept(concept, position, added_at, sync_origin))
         added_nodes += 1
 
     added_edges = 0
     if include_relations:
-        valid_node_keys = graph_concept_keys(new_state)
-        for relation in relation_docs_between_graph_nodes(mongo, new_state):
+        valid_node_keys = state.concept_keys()
+        for relation in relation_docs_between_graph_nodes(mongo, state):
             from_id = _clean_text(relation.get("desde"))
             to_id = _clean_text(relation.get("hasta"))
             if from_id not in valid_node_keys or to_id not in valid_node_keys:
                 continue
-            if _append_edge_to_state(new_state, relation_edge_from_doc(relation, added_at)):
+            if state.add_edge(relation_edge_from_doc(relation, added_at)):
                 added_edges += 1
 
-    new_state["exportedAt"] = added_at
-    return new_state, added_nodes, added_edges
+    state.set("exportedAt", added_at)
+    return state.to_dict(), added_nodes, added_edges
 
 
 def merge_preserved_graph_items(new_graph_state: dict, previous_graph_state: dict | None) -> dict:
-    merged = deepcopy(new_graph_state) if isinstance(new_graph_state, dict) else {}
-    _ensure_graph_state_lists(merged)
+    merged = GraphState(new_graph_state)
 
     for node in graph_node_items(previous_graph_state):
-        if not graph_contains_concept(merged, node):
-            _append_node_to_state(merged, node)
+        if not merged.contains_concept(node):
+            merged.add_node(node)
 
-    merged_keys = graph_concept_keys(merged)
+    merged_keys = merged.concept_keys()
     for edge in graph_edge_items(previous_graph_state):
         from_id = _clean_text(edge.get("from"))
         to_id = _clean_text(edge.get("to"))
         if from_id in merged_keys and to_id in merged_keys:
-            _append_edge_to_state(merged, edge)
+            merged.add_edge(edge)
 
-    merged["exportedAt"] = utc_timestamp()
-    return merged
+    merged.set("exportedAt", utc_timestamp())
+    return merged.to_dict()
@@ -22,8 +22,10 @@ from mathkb_config import MAX_IMAGE_UPLOAD_BYTES
 from mathkb_config import MEDIA_ASSETS_COLLECTION
 from mathkb_config import MEDIA_ROOT
 from mathkb_config import PROJECT_ROOT
+from mathmongo.concept_search_index import refresh_concept_search_entries
 from mathmongo.paths import find_symlink_component
 from mathmongo.paths import validate_mutable_path
+from mathmongo.query_cache import bump_collection_versions
 
 LATEX_IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".pdf"}
 HEAVY_TIKZ_DRAW_THRESHOLD = 500
@@ -166,6 +168,8 @@ def save_media_asset(
                 {"id": concept_id, "source": source},
                 {"$addToSet": {"image_ids": asset_id}},
             )
+            bump_collection_versions(mongo_db, "concepts")
+            refresh_concept_search_entries(mongo_db, [(concept_id, source)])
         if note_key:
             mongo_db["latex_notes"].update_one(
                 _note_filter(note_key),
@@ -322,6 +326,8 @@ def detach_media_asset_from_concept(
         {"id": concept_id, "source": source},
         {"$pull": {"image_ids": asset_id}},
     )
+    bump_collection_versions(mongo_db, "concepts")
+    refresh_concept_search_entries(mongo_db, [(concept_id, source)])
     media_collection(db).update_one(
         {"asset_id": asset_id},
         {"$pull": {"concept_ids": concept_key}, "$set": {"updated_at": datetime.utcnow()}},
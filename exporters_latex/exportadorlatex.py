@@ -15,6 +15,7 @@ from exporters_latex.latex_compile import latex_warning_message
 from exporters_latex.latex_compile import run_latex_until_stable
 from exporters_latex.unified_document import export_unified_document_with_inputs
 from exporters_latex.unified_document import render_concept_fragment
+from mathdatabase.mathmongo import find_by_identities
 from mathkb_config import LATEX_MAX_PASSES
 from mathkb_config import PDF_COMPILE_TIMEOUT_SECONDS
 from mathmongo.config import resolve_config
@@ -127,9 +128,13 @@ class ExportadorLatex:
         """Exporta todos los conceptos provenientes de un mismo *source*."""
         conceptos = list(db.concepts.find({"source": source}))
         print(f"🔎 Conceptos encontrados para '{source}': {len(conceptos)}")
+        latex_por_identidad = find_by_identities(
+            db.latex_documents,
+            ((c["id"], source) for c in conceptos),
+        )
 
         for c in conceptos:
-            doc = db.latex_documents.find_one({"id": c["id"], "source": source})
+            doc = latex_por_identidad.get((str(c["id"]), source))
             if not doc:
                 print(f"⚠️  LaTeX no encontrado para {c['id']}")
                 continue
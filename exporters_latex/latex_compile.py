@@ -9,6 +9,8 @@ import re
 from pathlib import Path
 from typing import Sequence
 
+from exporters_latex.latex_formats import default_format_cache
+from exporters_latex.latex_formats import format_failed
 from mathkb_config import LATEX_MAX_PASSES
 from mathkb_config import PDF_COMPILE_TIMEOUT_SECONDS
 
@@ -344,30 +346,13 @@ def latex_warning_message(classification: dict) -> str:
     return "\n".join(lines)
 
 
-def run_latex_command(
-    command: Sequence[str | Path],
-    cwd: str | Path,
+def _run_latex_process(
+    command_text: list[str],
+    cwd_path: Path,
     tex_file: str | Path,
-    timeout_seconds: int = PDF_COMPILE_TIMEOUT_SECONDS,
+    timeout_seconds: int,
+    env: dict[str, str] | None = None,
 ) -> subprocess.CompletedProcess[str]:
-    command_text = [str(part) for part in command]
-    if not command_text:
-        raise ValueError("LaTeX command cannot be empty")
-    if shutil.which(command_text[0]) is None:
-        raise FileNotFoundError(latex_command_not_found_message(command_text))
-    cwd_path = Path(cwd)
-    if not cwd_path.exists():
-        raise FileNotFoundError(
-            latex_missing_path_message(tex_file, command_text, cwd_path, "working directory")
-        )
-    tex_path = Path(tex_file)
-    tex_path_for_check = tex_path if tex_path.is_absolute() else cwd_path / tex_path
-    if not tex_path_for_check.exists():
-        raise FileNotFoundError(
-            latex_missing_path_message(tex_file, command_text, tex_path_for_check, "source file")
-        )
-    validate_includegraphics_paths(tex_file, cwd_path)
-
     try:
         raw_result = subprocess.run(
             command_text,
@@ -375,6 +360,7 @@ def run_latex_command(
             capture_output=True,
             text=False,
             timeout=timeout_seconds,
+            env=env,
         )
         stdout_text, stdout_decode = decode_diagnostic_bytes(
             raw_result.stdout,
@@ -403,6 +389,54 @@ def run_latex_command(
         raise type(exc)(latex_os_error_message(tex_file, command_text, exc)) from exc
 
 
+def run_latex_command(
+    command: Sequence[str | Path],
+    cwd: str | Path,
+    tex_file: str | Path,
+    timeout_seconds: int = PDF_COMPILE_TIMEOUT_SECONDS,
+    use_format_cache: bool = True,
+) -> subprocess.CompletedProcess[str]:
+    command_text = [str(part) for part in command]
+    if not command_text:
+        raise ValueError("LaTeX command cannot be empty")
+    if shutil.which(command_text[0]) is None:
+        raise FileNotFoundError(latex_command_not_found_message(command_text))
+    cwd_path = Path(cwd)
+    if not cwd_path.exists():
+        raise FileNotFoundError(
+            latex_missing_path_message(tex_file, command_text, cwd_path, "working directory")
+        )
+    tex_path = Path(tex_file)
+    tex_path_for_check = tex_path if tex_path.is_absolute() else cwd_path / tex_path
+    if not tex_path_for_check.exists():
+        raise FileNotFoundError(
+            latex_missing_path_message(tex_file, command_text, tex_path_for_check, "source file")
+        )
+    validate_includegraphics_paths(tex_file, cwd_path)
+
+    # Preload the class/package preamble from a dumped format when possible;
+    # any problem with the format falls back to the plain command below.
+    formats = default_format_cache() if use_format_cache else None
+    formatted = None
+    if formats is not None:
+        try:
+            formatted = formats.prepare(command_text, cwd_path, tex_file)
+        except (OSError, ValueError, subprocess.SubprocessError):
+            formatted = None
+    if formatted is not None:
+        try:
+            result = _run_latex_process(
+                formatted.command, cwd_path, tex_file, timeout_seconds, env=formatted.env
+            )
+        finally:
+            formatted.body_path.unlink(missing_ok=True)
+        output = "\n".join(part for part in (result.stdout, result.stderr) if part)
+        if result.returncode == 0 or not format_failed(output):
+            return result
+        formats.mark_failed(formatted.key, output)
+    return _run_latex_process(command_text, cwd_path, tex_file, timeout_seconds)
+
+
 def run_latex_until_stable(
     command: Sequence[str | Path],
     cwd: str | Path,
@@ -0,0 +1,381 @@
+r"""Precompiled pdflatex formats for shared document preambles.
+
+Most of the time ``pdflatex`` spends on a short fragment goes into loading
+the class and packages of the preamble. The leading ``\documentclass`` and
+``\usepackage`` lines of a document are therefore dumped once into a
+``.fmt`` file; later compiles load that format and read a copy of the
+document with those lines blanked, so line numbers in the log do not move.
+
+Formats are keyed by the SHA-256 of the preloaded lines, of every class and
+package file they load (local files by content, distribution files by
+path and stat) and of the engine, so editing ``miestilo.sty`` or updating
+TeX Live builds a new format. A preamble that cannot be dumped is
+remembered and compiled the plain way.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+from collections.abc import Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from mathkb_config import LATEX_FORMAT_CACHE_ENABLED
+from mathkb_config import PDF_COMPILE_TIMEOUT_SECONDS
+from mathmongo.paths import get_cache_dir
+from mathmongo.paths import validate_mutable_path
+
+FORMAT_VERSION = 1
+FORMAT_ENGINES = {"pdflatex": "pdflatex"}
+# Packages that open output files or patch the output routine while loading
+# do not survive \dump; they and everything after them load at compile time.
+FORMAT_UNSAFE_PACKAGES = frozenset(
+    {"hyperref", "bookmark", "cleveref", "fontspec", "unicode-math", "minted", "pdfpages"}
+)
+FORMAT_CONFLICTING_OPTIONS = ("ini", "fmt", "jobname", "progname")
+FORMAT_FAILURE_MARKERS = (
+    "Fatal format file error",
+    "I can't find the format file",
+    "---! ",
+)
+MAX_CACHED_FORMATS = 16
+PRELOADED_SUFFIX = ".preloaded.tex"
+
+_PRELOAD_LINE_RE = re.compile(
+    r"^\s*\\(?P<kind>documentclass|usepackage|RequirePackage)\s*"
+    r"(?:\[[^\]]*\])?\s*\{(?P<names>[^{}]*)\}\s*(?:%.*)?$"
+)
+_IGNORABLE_LINE_RE = re.compile(r"^\s*(?:%.*)?$")
+
+
+@dataclass(frozen=True)
+class PreloadablePreamble:
+    """Leading lines of a document that can be loaded from a format."""
+
+    lines: tuple[str, ...]
+    class_name: str
+    packages: tuple[str, ...]
+
+    @property
+    def dependencies(self) -> tuple[str, ...]:
+        """Return the class and package file names the lines load."""
+        return (f"{self.class_name}.cls", *(f"{name}.sty" for name in self.packages))
+
+
+@dataclass(frozen=True)
+class FormattedCommand:
+    """A compile command rewritten to load a precompiled format."""
+
+    command: list[str]
+    env: dict[str, str]
+    body_path: Path
+    key: str
+
+
+def split_preloadable_preamble(latex: str) -> PreloadablePreamble | None:
+    r"""Return the ``\documentclass``/``\usepackage`` prefix of ``latex``.
+
+    Blank and comment lines inside the prefix are kept so that blanking the
+    prefix preserves line numbers. ``None`` means nothing can be preloaded.
+    """
+    lines: list[str] = []
+    meaningful: list[str] = []
+    class_name = ""
+    packages: list[str] = []
+    for line in latex.splitlines():
+        if _IGNORABLE_LINE_RE.match(line):
+            lines.append(line)
+            continue
+        match = _PRELOAD_LINE_RE.match(line)
+        if match is None:
+            break
+        names = [name.strip() for name in match.group("names").split(",") if name.strip()]
+        if match.group("kind") == "documentclass":
+            if class_name or len(names) != 1:
+                break
+            class_name = names[0]
+        elif not class_name or any(name in FORMAT_UNSAFE_PACKAGES for name in names):
+            break
+        else:
+            packages.extend(names)
+        lines.append(line)
+        meaningful = list(lines)
+    if not class_name:
+        return None
+    return PreloadablePreamble(tuple(meaningful), class_name, tuple(packages))
+
+
+@lru_cache(maxsize=8)
+def engine_fingerprint(executable: str) -> tuple[str, ...]:
+    """Return the engine version line and the stat of its base format."""
+    parts = []
+    for command in ([executable, "--version"], ["kpsewhich", "-engine=pdftex", "pdflatex.fmt"]):
+        try:
+            result = subprocess.run(command, capture_output=True, text=True, timeout=10)
+        except (OSError, subprocess.SubprocessError):
+            parts.append("")
+            continue
+        first_line = (result.stdout or "").strip().splitlines()[:1]
+        parts.append(first_line[0] if first_line else "")
+    base_format = Path(parts[1]) if parts[1] else None
+    if base_format is not None and base_format.is_file():
+        stat = base_format.stat()
+        parts.append(f"{stat.st_size}:{stat.st_mtime_ns}")
+    return tuple(parts)
+
+
+@lru_cache(maxsize=64)
+def _distribution_files(names: tuple[str, ...]) -> tuple[tuple[str, str], ...]:
+    # One kpsewhich call per preamble variant and process.
+    if not names:
+        return ()
+    try:
+        result = subprocess.run(
+            ["kpsewhich", *names], capture_output=True, text=True, timeout=10
+        )
+    except (OSError, subprocess.SubprocessError):
+        return tuple((name, "") for name in names)
+    stamps = []
+    for line in (result.stdout or "").splitlines():
+        path = Path(line.strip())
+        if path.is_file():
+            stat = path.stat()
+            stamps.append((path.name, f"{path}:{stat.st_size}:{stat.st_mtime_ns}"))
+    return tuple(stamps)
+
+
+def _local_dependency_files(cwd: Path) -> list[Path]:
+    return sorted(
+        path
+        for path in cwd.iterdir()
+        if path.suffix in {".sty", ".cls"} and path.is_file() and not path.is_symlink()
+    )
+
+
+def format_key(preamble: PreloadablePreamble, cwd: Path, executable: str) -> str:
+    """Hash everything a dumped format for ``preamble`` depends on."""
+    # Local packages may load each other, so every local style file counts.
+    local = {path.name: path for path in _local_dependency_files(cwd)}
+    local_hashes = {
+        name: hashlib.sha256(path.read_bytes()).hexdigest() for name, path in local.items()
+    }
+    distribution = tuple(name for name in preamble.dependencies if name not in local)
+    payload = {
+        "version": FORMAT_VERSION,
+        "lines": list(preamble.lines),
+        "local": local_hashes,
+        "distribution": list(_distribution_files(distribution)),
+        "engine": list(engine_fingerprint(executable)),
+    }
+    text = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+
+def default_format_cache_dir() -> Path:
+    """Return the per-user directory that holds dumped formats."""
+    return get_cache_dir() / "latex_formats"
+
+
+class LatexFormatCache:
+    """Directory of dumped ``.fmt`` files plus markers for failed dumps."""
+
+    def __init__(
+        self,
+        root: str | Path | None = None,
+        *,
+        max_formats: int = MAX_CACHED_FORMATS,
+        timeout_seconds: int = PDF_COMPILE_TIMEOUT_SECONDS,
+    ) -> None:
+        """Use ``root`` (default: the XDG cache) for formats."""
+        self.root = Path(root) if root is not None else default_format_cache_dir()
+        self.max_formats = max_formats
+        self.timeout_seconds = timeout_seconds
+        self._locks: dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _root(self) -> Path:
+        root = validate_mutable_path(self.root)
+        root.mkdir(parents=True, exist_ok=True, mode=0o700)
+        return root
+
+    def format_path(self, key: str) -> Path:
+        """Return where the format for ``key`` lives."""
+        return self.root / f"{key}.fmt"
+
+    def _failure_path(self, key: str) -> Path:
+        return self.root / f"{key}.failed"
+
+    def _lock(self, key: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def ensure(self, key: str, preamble: PreloadablePreamble, cwd: Path, executable: str) -> bool:
+        """Make sure the format for ``key`` exists; ``False`` if it cannot be dumped."""
+        with self._lock(key):
+            fmt = self.format_path(key)
+            if fmt.is_file():
+                os.utime(fmt)
+                return True
+            if self._failure_path(key).exists():
+                return False
+            return self._dump(key, preamble, cwd, executable)
+
+    def _dump(self, key: str, preamble: PreloadablePreamble, cwd: Path, executable: str) -> bool:
+        root = self._root()
+        with tempfile.TemporaryDirectory(prefix="dump_", dir=root) as build:
+            build_dir = validate_mutable_path(Path(build), allowed_root=root)
+            for path in _local_dependency_files(cwd):
+                shutil.copy2(path, build_dir / path.name)
+            source = build_dir / f"{key}.tex"
+            source.write_text("\n".join([*preamble.lines, r"\dump", ""]), encoding="utf-8")
+            command = [
+                executable,
+                "-ini",
+                "-interaction=nonstopmode",
+                "-halt-on-error",
+                f"-jobname={key}",
+                f"&{FORMAT_ENGINES[Path(executable).name]}",
+                source.name,
+            ]
+            try:
+                result = subprocess.run(
+                    command,
+                    cwd=str(build_dir),
+                    capture_output=True,
+                    text=True,
+                    errors="replace",
+                    timeout=self.timeout_seconds,
+                )
+                output = "\n".join(part for part in (result.stdout, result.stderr) if part)
+                dumped = build_dir / f"{key}.fmt"
+                succeeded = result.returncode == 0 and dumped.is_file()
+            except (OSError, subprocess.SubprocessError) as exc:
+                output, succeeded = str(exc), False
+            if not succeeded:
+                self._failure_path(key).write_text(output[-4000:], encoding="utf-8")
+                return False
+            os.replace(dumped, self.format_path(key))
+        self.prune()
+        return True
+
+    def mark_failed(self, key: str, output: str) -> None:
+        """Stop using the format for ``key`` after the engine rejected it."""
+        with self._lock(key):
+            self.format_path(key).unlink(missing_ok=True)
+            self._failure_path(key).write_text(output[-4000:], encoding="utf-8")
+
+    def invalidate(self, key: str | None = None) -> int:
+        """Forget one format (or all of them) and its failure marker."""
+        if not self.root.is_dir():
+            return 0
+        pattern = f"{key}.*" if key is not None else "*"
+        removed = 0
+        for path in self._root().glob(pattern):
+            if path.suffix in {".fmt", ".failed"} and path.is_file():
+                path.unlink()
+                removed += 1
+        return removed
+
+    def prune(self) -> None:
+        """Keep only the ``max_formats`` most recently used formats."""
+        formats = sorted(
+            self._root().glob("*.fmt"), key=lambda path: path.stat().st_mtime, reverse=True
+        )
+        for path in formats[self.max_formats :]:
+            path.unlink(missing_ok=True)
+
+    def prepare(
+        self,
+        command: Sequence[str],
+        cwd: Path,
+        tex_file: str | Path,
+    ) -> FormattedCommand | None:
+        """Rewrite ``command`` to preload its preamble, or return ``None``."""
+        executable = command[0] if command else ""
+        if Path(executable).name not in FORMAT_ENGINES:
+            return None
+        options = [part.lstrip("-") for part in command[1:-1] if part.startswith("-")]
+        if any(option.startswith(FORMAT_CONFLICTING_OPTIONS) for option in options):
+            return None
+        if any(part.startswith("&") for part in command[1:]):
+            return None
+        tex_arg = str(tex_file)
+        if command[-1] != tex_arg:
+            return None
+        tex_path = Path(tex_arg) if Path(tex_arg).is_absolute() else cwd / tex_arg
+        if tex_path.suffix != ".tex" or tex_path.name.endswith(PRELOADED_SUFFIX):
+            return None
+        latex = tex_path.read_text(encoding="utf-8", errors="replace")
+        preamble = split_preloadable_preamble(latex)
+        if preamble is None:
+            return None
+        key = format_key(preamble, cwd, executable)
+        if not self.ensure(key, preamble, cwd, executable):
+            return None
+
+        body_lines = latex.split("\n")
+        for index in range(len(preamble.lines)):
+            body_lines[index] = ""
+        body_path = validate_mutable_path(
+            tex_path.with_name(tex_path.stem + PRELOADED_SUFFIX),
+            allowed_root=tex_path.parent,
+        )
+        body_path.write_text("\n".join(body_lines), encoding="utf-8")
+        body_arg = str(Path(tex_arg).with_name(body_path.name))
+        return FormattedCommand(
+            command=[
+                executable,
+                f"-fmt={key}",
+                # Without it kpathsea would search with the format name as program.
+                f"-progname={Path(executable).name}",
+                f"-jobname={tex_path.stem}",
+                *command[1:-1],
+                body_arg,
+            ],
+            # A trailing separator keeps the default format path after ours.
+            env={**os.environ, "TEXFORMATS": f"{self.root}{os.pathsep}"},
+            body_path=body_path,
+            key=key,
+        )
+
+
+def format_failed(output: str) -> bool:
+    """Return whether engine output blames the preloaded format."""
+    return any(marker in (output or "") for marker in FORMAT_FAILURE_MARKERS)
+
+
+_DEFAULT_CACHE: LatexFormatCache | None = None
+_DEFAULT_CACHE_LOCK = threading.Lock()
+
+
+def default_format_cache() -> LatexFormatCache | None:
+    """Return the shared format cache, or ``None`` when it is disabled."""
+    global _DEFAULT_CACHE
+    if not LATEX_FORMAT_CACHE_ENABLED:
+        return None
+    with _DEFAULT_CACHE_LOCK:
+        if _DEFAULT_CACHE is None:
+            _DEFAULT_CACHE = LatexFormatCache()
+        return _DEFAULT_CACHE
+
+
+__all__ = [
+    "FORMAT_UNSAFE_PACKAGES",
+    "FormattedCommand",
+    "LatexFormatCache",
+    "PreloadablePreamble",
+    "default_format_cache",
+    "default_format_cache_dir",
+    "engine_fingerprint",
+    "format_failed",
+    "format_key",
+    "split_preloadable_preamble",
+]
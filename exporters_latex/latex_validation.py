@@ -6,23 +6,35 @@ import shutil
 import subprocess
 import tempfile
 import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
 from dataclasses import asdict
 from dataclasses import dataclass
+from dataclasses import replace
 from difflib import get_close_matches
 from pathlib import Path
 from typing import Any
 
 from editor.utils.media_assets import copy_media_tree_for_latex
+from exporters_latex.latex_compile import INCLUDEGRAPHICS_RE
 from exporters_latex.latex_compile import command_to_text
 from exporters_latex.latex_compile import decode_diagnostic_bytes
+from exporters_latex.latex_compile import extract_latex_fatal_errors
 from exporters_latex.latex_compile import latex_command_not_found_message
 from exporters_latex.latex_compile import latex_timeout_message
 from exporters_latex.latex_compile import output_tail
 from exporters_latex.latex_compile import run_latex_until_stable
+from exporters_latex.latex_validation_cache import LatexValidationCache
+from exporters_latex.latex_validation_cache import fingerprint_files
 from exporters_latex.unified_document import copy_latex_styles
 from exporters_latex.unified_document import sanitize_source_name
 from mathkb_config import LATEX_LINTER_TIMEOUT_SECONDS
 from mathkb_config import LATEX_MAX_PASSES
+from mathkb_config import LATEX_VALIDATION_WORKERS
+from mathkb_config import LEGACY_PROJECT_ROOT
+from mathkb_config import LOCAL_MEDIA_ROOT
+from mathkb_config import MEDIA_ROOT
 from mathkb_config import PDF_COMPILE_TIMEOUT_SECONDS
 from mathmongo.paths import get_latex_runtime_dir
 from mathmongo.paths import get_state_dir
@@ -30,6 +42,19 @@ from mathmongo.paths import validate_mutable_path
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 TEMPLATES_LATEX_DIR = PROJECT_ROOT / "templates_latex"
+VALIDATION_PREAMBLE = (
+    r"\documentclass[12pt]{article}",
+    r"\usepackage{miestilo}",
+    r"\usepackage{coloredtheorem}",
+    r"\usepackage{graphicx}",
+)
+VALIDATION_TOOLS = ("pdflatex", "chktex", "lacheck")
+BATCH_DOCUMENT_NAME = "fragment_batch.tex"
+BATCH_MARKER = "MMVALIDATE"
+_BATCH_MARKER_RE = re.compile(rf"^{BATCH_MARKER}-(BEGIN|END) (\d+)$", re.MULTILINE)
+_BATCH_LINE_ERROR_RE = re.compile(
+    rf"^(?:.*/)?{re.escape(BATCH_DOCUMENT_NAME)}:(\d+): (.+)$", re.MULTILINE
+)
 
 SAFE_FIXES = {
     r"\texbf{": r"\textbf{",
@@ -318,10 +343,7 @@ def _write_validation_document(latex: str, work_dir: Path) -> Path:
     test_path.write_text(
         "\n".join(
             [
-                r"\documentclass[12pt]{article}",
-                r"\usepackage{miestilo}",
-                r"\usepackage{coloredtheorem}",
-                r"\usepackage{graphicx}",
+                *VALIDATION_PREAMBLE,
                 r"\begin{document}",
                 "",
                 latex or "",
@@ -748,6 +770,78 @@ def validate_latex_document(tex_path: str | Path) -> dict[str, Any]:
         }
 
 
+def _concept_identity(concept: dict[str, Any]) -> dict[str, str]:
+    return {
+        "concept_id": str(concept.get("id") or concept.get("concept_id") or ""),
+        "source": str(concept.get("source") or ""),
+        "title": str(concept.get("titulo") or concept.get("title") or ""),
+        "type": str(concept.get("tipo") or concept.get("type") or ""),
+    }
+
+
+def _media_fingerprint() -> dict[str, list[Any]]:
+    # Mirrors copy_media_tree_for_latex: every file it would copy, by stat.
+    files: dict[str, list[Any]] = {}
+    for root in (LEGACY_PROJECT_ROOT / MEDIA_ROOT, LOCAL_MEDIA_ROOT):
+        if not root.exists():
+            continue
+        for path in sorted(root.rglob("*")):
+            if path.is_file() and not path.is_symlink():
+                stat = path.stat()
+                files[str(path.relative_to(root))] = [stat.st_size, stat.st_mtime_ns]
+    return files
+
+
+def validation_environment(kind: str) -> dict[str, Any]:
+    """Fingerprint the templates, tools or media a validation depends on."""
+    if kind == "templates":
+        styles = [p for p in TEMPLATES_LATEX_DIR.iterdir() if p.suffix in {".sty", ".cls"}]
+        return {"preamble": list(VALIDATION_PREAMBLE), "files": fingerprint_files(styles)}
+    if kind == "tools":
+        versions = {}
+        for tool in VALIDATION_TOOLS:
+            executable = shutil.which(tool)
+            versions[tool] = _chktex_version(executable) if executable else ""
+        return {"versions": versions, "max_passes": LATEX_MAX_PASSES}
+    if kind == "media":
+        return _media_fingerprint()
+    raise ValueError(f"Unknown validation environment: {kind}")
+
+
+def _has_timeout(result: LatexValidationResult) -> bool:
+    # A timeout says more about machine load than about the fragment.
+    messages = [result.log_excerpt, *result.chktex_warnings, *result.lacheck_warnings]
+    return any("timed out after" in message for message in messages)
+
+
+def default_validation_cache() -> LatexValidationCache:
+    """Return the per-user validation cache bound to the live environment."""
+    return LatexValidationCache(environment=validation_environment)
+
+
+def _validation_cache_key(
+    cache: LatexValidationCache,
+    latex: str,
+    apply_fixes: bool,
+    run_compile: bool,
+    run_linters: bool,
+) -> str:
+    payload = {
+        "latex": latex,
+        "options": {
+            "apply_fixes": apply_fixes,
+            "run_compile": run_compile,
+            "run_linters": run_linters,
+        },
+        "templates": cache.environment("templates"),
+        "tools": cache.environment("tools"),
+    }
+    # Only fragments that include images depend on the media tree.
+    if INCLUDEGRAPHICS_RE.search(latex):
+        payload["media"] = cache.environment("media")
+    return cache.key(payload)
+
+
 def validate_latex_fragment(
     latex: str,
     concept: dict[str, Any] | None = None,
@@ -755,9 +849,25 @@ def validate_latex_fragment(
     run_compile: bool = True,
     run_linters: bool = True,
     work_dir: Path | None = None,
+    cache: LatexValidationCache | None = None,
 ) -> LatexValidationResult:
     concept = concept or {}
     original = latex or ""
+    if cache is not None and work_dir is None and (run_linters or run_compile):
+        key = _validation_cache_key(cache, original, apply_fixes, run_compile, run_linters)
+        cached = cache.get(key)
+        if cached is not None:
+            return LatexValidationResult(**{**cached, **_concept_identity(concept)})
+        result = validate_latex_fragment(
+            original,
+            concept=concept,
+            apply_fixes=apply_fixes,
+            run_compile=run_compile,
+            run_linters=run_linters,
+        )
+        if not _has_timeout(result):
+            cache.put(key, asdict(result))
+        return result
     corrected, safe_fixes = apply_safe_fixes(original)
     effective_latex = corrected if apply_fixes else original
 
@@ -857,10 +967,7 @@ def validate_latex_fragment(
         status = "warning"
 
     return LatexValidationResult(
-        concept_id=str(concept.get("id") or concept.get("concept_id") or ""),
-        source=str(concept.get("source") or ""),
-        title=str(concept.get("titulo") or concept.get("title") or ""),
-        type=str(concept.get("tipo") or concept.get("type") or ""),
+        **_concept_identity(concept),
         status=status,
         has_latex=has_latex,
         unknown_commands=unknown_commands,
@@ -890,6 +997,19 @@ def _get_latex_doc(db, concept_id: str, source: str) -> dict[str, Any] | None:
     return mongo_db.latex_documents.find_one({"id": concept_id, "source": source})
 
 
+def _load_validation_job(
+    concept_id: str,
+    source: str,
+    db,
+    concept: dict[str, Any] | None = None,
+) -> tuple[dict[str, Any], str]:
+    if concept is None:
+        concept = db.concepts.find_one({"id": concept_id, "source": source})
+    concept = concept or {"id": concept_id, "source": source}
+    latex_doc = _get_latex_doc(db, concept_id, source) or {}
+    return concept, latex_doc.get("contenido_latex", "")
+
+
 def validate_concept_from_mongo(
     concept_id: str,
     source: str,
@@ -897,70 +1017,411 @@ def validate_concept_from_mongo(
     apply_fixes: bool = False,
     run_compile: bool = True,
     run_linters: bool = True,
+    cache: LatexValidationCache | None = None,
 ) -> LatexValidationResult:
-    if hasattr(db, "concepts"):
-        concept = db.concepts.find_one({"id": concept_id, "source": source})
-    else:
-        concept = db.concepts.find_one({"id": concept_id, "source": source})
-    concept = concept or {"id": concept_id, "source": source}
-    latex_doc = _get_latex_doc(db, concept_id, source) or {}
+    concept, latex = _load_validation_job(concept_id, source, db)
     return validate_latex_fragment(
-        latex_doc.get("contenido_latex", ""),
+        latex,
         concept=concept,
         apply_fixes=apply_fixes,
         run_compile=run_compile,
         run_linters=run_linters,
+        cache=cache,
     )
 
 
-def validate_selected_concepts_from_mongo(
-    concept_keys: list[str] | list[tuple[str, str]],
-    db,
+ValidationProgress = Callable[[int, int, LatexValidationResult], None]
+
+
+def _failed_validation_result(
+    concept: dict[str, Any],
+    latex: str,
+    exc: Exception,
+) -> LatexValidationResult:
+    return LatexValidationResult(
+        **_concept_identity(concept),
+        status="error",
+        has_latex=bool((latex or "").strip()),
+        unknown_commands=[],
+        safe_fixes=[],
+        balanced_braces=True,
+        balanced_environments=True,
+        environment_errors=[],
+        undefined_environments=[],
+        chktex_available=False,
+        chktex_warnings=[],
+        lacheck_available=False,
+        lacheck_warnings=[],
+        compile_success=False,
+        log_excerpt=f"Validation failed: {type(exc).__name__}: {exc}",
+        corrected_latex_preview=latex or "",
+    )
+
+
+def _validate_job(
+    job: tuple[dict[str, Any], str],
+    options: dict[str, Any],
+) -> LatexValidationResult:
+    concept, latex = job
+    try:
+        return validate_latex_fragment(latex, concept=concept, **options)
+    except Exception as exc:
+        return _failed_validation_result(concept, latex, exc)
+
+
+def validate_latex_jobs(
+    jobs: list[tuple[dict[str, Any], str]],
     apply_fixes: bool = False,
     run_compile: bool = True,
     run_linters: bool = True,
+    max_workers: int | None = None,
+    progress: ValidationProgress | None = None,
+    cache: LatexValidationCache | None = None,
+    batch_size: int | None = None,
 ) -> list[LatexValidationResult]:
-    results = []
-    for item in concept_keys:
-        if isinstance(item, tuple):
-            concept_id, source = item
+    """Validate ``(concept, latex)`` jobs on a bounded thread pool.
+
+    Every job works in its own temporary directory, so pdflatex and the
+    linters of different concepts never share files; a job that raises is
+    reported as an ``error`` result instead of aborting the batch. Results
+    keep the order of ``jobs``. ``progress(done, total, result)`` runs on the
+    calling thread as each job finishes. With a ``cache``, unchanged
+    fragments are answered from it without running any tool. A
+    ``batch_size`` above one compiles fragments together, see
+    :func:`compile_fragments_batched`.
+    """
+    if run_compile and batch_size is not None and batch_size > 1 and len(jobs) > 1:
+        return _validate_latex_jobs_batched(
+            jobs,
+            apply_fixes=apply_fixes,
+            run_linters=run_linters,
+            max_workers=max_workers,
+            progress=progress,
+            cache=cache,
+            batch_size=batch_size,
+        )
+    options = {
+        "apply_fixes": apply_fixes,
+        "run_compile": run_compile,
+        "run_linters": run_linters,
+    }
+    if cache is not None:
+        options["cache"] = cache
+    total = len(jobs)
+    workers = min(max_workers or LATEX_VALIDATION_WORKERS, total)
+    results: list[LatexValidationResult | None] = [None] * total
+    if workers <= 1:
+        for index, job in enumerate(jobs):
+            results[index] = _validate_job(job, options)
+            if progress is not None:
+                progress(index + 1, total, results[index])
+        return results
+    # The work is dominated by pdflatex/chktex subprocesses, so threads keep
+    # the pool cheap and avoid pickling concepts or database handles.
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="latex-validation") as pool:
+        futures = {pool.submit(_validate_job, job, options): index for index, job in enumerate(jobs)}
+        for done, future in enumerate(as_completed(futures), start=1):
+            index = futures[future]
+            results[index] = future.result()
+            if progress is not None:
+                progress(done, total, results[index])
+    return results
+
+
+def _write_batch_document(
+    fragments: list[str],
+    work_dir: Path,
+) -> tuple[Path, list[tuple[int, int]]]:
+    work_dir = validate_mutable_path(work_dir)
+    copy_latex_styles(work_dir, TEMPLATES_LATEX_DIR)
+    copy_media_tree_for_latex(work_dir)
+    lines = [*VALIDATION_PREAMBLE, r"\begin{document}", ""]
+    line_ranges = []
+    for index, fragment in enumerate(fragments):
+        # Each fragment runs in its own group and page between log sentinels.
+        lines.extend([rf"\typeout{{{BATCH_MARKER}-BEGIN {index}}}", r"\begingroup"])
+        first_line = len(lines) + 1
+        lines.extend((fragment or "").split("\n"))
+        line_ranges.append((first_line, len(lines)))
+        lines.extend(
+            [r"\par\endgroup", r"\clearpage", rf"\typeout{{{BATCH_MARKER}-END {index}}}", ""]
+        )
+    lines.extend([r"\end{document}", ""])
+    batch_path = validate_mutable_path(work_dir / BATCH_DOCUMENT_NAME, allowed_root=work_dir)
+    batch_path.write_text("\n".join(lines), encoding="utf-8")
+    return batch_path, line_ranges
+
+
+def attribute_batch_log(
+    log_text: str,
+    line_ranges: list[tuple[int, int]],
+) -> tuple[dict[int, str], dict[int, list[str]], set[int], list[str]]:
+    """Split a batch log by fragment sentinels and attribute its errors.
+
+    Returns the log segment of every fragment that started, the errors of
+    each fragment, the fragments that reached their closing sentinel and
+    the errors that belong to no fragment. ``file:line`` errors are mapped
+    through ``line_ranges``; other fatal messages belong to the segment
+    they appear in.
+    """
+    segments: dict[int, str] = {}
+    finished: set[int] = set()
+    errors: dict[int, list[str]] = {}
+    unattributed: list[str] = []
+    markers = list(_BATCH_MARKER_RE.finditer(log_text))
+    outside = [log_text[: markers[0].start()] if markers else log_text]
+    for position, marker in enumerate(markers):
+        kind, index = marker.group(1), int(marker.group(2))
+        end = markers[position + 1].start() if position + 1 < len(markers) else len(log_text)
+        text = log_text[marker.end() : end]
+        if kind == "BEGIN":
+            segments[index] = text
         else:
-            concept_id, source = item.split("@", 1)
-        results.append(
-            validate_concept_from_mongo(
-                concept_id,
-                source,
-                db,
-                apply_fixes=apply_fixes,
-                run_compile=run_compile,
-                run_linters=run_linters,
+            finished.add(index)
+            outside.append(text)
+    for index, text in segments.items():
+        for line_error in _BATCH_LINE_ERROR_RE.finditer(text):
+            line = int(line_error.group(1))
+            owner = next(
+                (i for i, (first, last) in enumerate(line_ranges) if first <= line <= last),
+                index,
             )
-        )
+            errors.setdefault(owner, []).append(line_error.group(0))
+        fatal = extract_latex_fatal_errors(_BATCH_LINE_ERROR_RE.sub("", text))
+        if fatal:
+            errors.setdefault(index, []).extend(fatal)
+    for text in outside:
+        unattributed.extend(match.group(0) for match in _BATCH_LINE_ERROR_RE.finditer(text))
+        unattributed.extend(extract_latex_fatal_errors(text))
+    return segments, errors, finished, unattributed
+
+
+def _compile_batch(fragments: list[str]) -> dict[int, tuple[bool, str]]:
+    # Outcomes for the fragments the batch could decide; the others are unknown.
+    runtime_dir = validate_mutable_path(get_latex_runtime_dir())
+    runtime_dir.mkdir(parents=True, exist_ok=True, mode=0o700)
+    with tempfile.TemporaryDirectory(prefix="mathkb_latex_batch_", dir=runtime_dir) as owned:
+        work_path = validate_mutable_path(Path(owned), allowed_root=runtime_dir)
+        batch_path, line_ranges = _write_batch_document(fragments, work_path)
+        command = ["pdflatex", "-interaction=nonstopmode", "-file-line-error", batch_path.name]
+        try:
+            compile_info = run_latex_until_stable(
+                command,
+                cwd=str(work_path),
+                tex_file=batch_path.name,
+                pdf_path=batch_path.with_suffix(".pdf"),
+                log_path=batch_path.with_suffix(".log"),
+                timeout_seconds=PDF_COMPILE_TIMEOUT_SECONDS,
+                max_passes=LATEX_MAX_PASSES,
+            )
+        except FileNotFoundError:
+            message = latex_command_not_found_message(["pdflatex"])
+            return {index: (False, message) for index in range(len(fragments))}
+        except subprocess.TimeoutExpired:
+            return {}
+    segments, errors, finished, unattributed = attribute_batch_log(
+        compile_info.get("log_text", ""), line_ranges
+    )
+    pdf_written = bool(compile_info.get("pdf_valid"))
+    outcomes = {}
+    for index in range(len(fragments)):
+        excerpt = "\n".join(segments.get(index, "").strip().splitlines()[-60:])
+        if index in errors:
+            outcomes[index] = (False, excerpt)
+        elif index in finished and pdf_written and not unattributed:
+            outcomes[index] = (True, excerpt)
+    return outcomes
+
+
+def compile_fragments_batched(fragments: list[str]) -> list[tuple[bool, str]]:
+    """Compile ``fragments`` in shared pdflatex runs; same outcomes as one by one.
+
+    Fragments are compiled together in one document. Fragments the log
+    blames are recompiled alone, so their ``log_excerpt`` is the one an
+    isolated compile gives; fragments the batch could not decide (fatal
+    stop, unattributed error, timeout) are bisected until they are
+    decided or alone. A clean batch therefore costs a single TeX run.
+    """
+    outcomes: list[tuple[bool, str] | None] = [None] * len(fragments)
+    pending = [list(range(len(fragments)))]
+    while pending:
+        group = pending.pop()
+        if len(group) == 1:
+            outcomes[group[0]] = compile_latex_fragment(fragments[group[0]])
+            continue
+        decided = _compile_batch([fragments[index] for index in group])
+        unknown = []
+        for position, index in enumerate(group):
+            outcome = decided.get(position)
+            if outcome is None:
+                unknown.append(index)
+            elif outcome[0]:
+                outcomes[index] = outcome
+            else:
+                outcomes[index] = compile_latex_fragment(fragments[index])
+        if len(unknown) == len(group):
+            middle = len(unknown) // 2
+            pending.extend([unknown[:middle], unknown[middle:]])
+        elif unknown:
+            pending.append(unknown)
+    return outcomes
+
+
+def _batched_compile_result(
+    static: LatexValidationResult,
+    outcome: tuple[bool, str],
+) -> LatexValidationResult:
+    compile_success, log_excerpt = outcome
+    status = static.status if compile_success else "error"
+    return replace(static, compile_success=compile_success, log_excerpt=log_excerpt, status=status)
+
+
+def _validate_latex_jobs_batched(
+    jobs: list[tuple[dict[str, Any], str]],
+    *,
+    apply_fixes: bool,
+    run_linters: bool,
+    max_workers: int | None,
+    progress: ValidationProgress | None,
+    cache: LatexValidationCache | None,
+    batch_size: int,
+) -> list[LatexValidationResult]:
+    total = len(jobs)
+    results: list[LatexValidationResult | None] = [None] * total
+    keys: dict[int, str] = {}
+    done = 0
+
+    def finish(index: int, result: LatexValidationResult) -> None:
+        nonlocal done
+        results[index] = result
+        if index in keys and not _has_timeout(result):
+            cache.put(keys[index], asdict(result))
+        done += 1
+        if progress is not None:
+            progress(done, total, result)
+
+    misses = []
+    for index, (concept, latex) in enumerate(jobs):
+        if cache is not None:
+            keys[index] = _validation_cache_key(cache, latex or "", apply_fixes, True, run_linters)
+            cached = cache.get(keys[index])
+            if cached is not None:
+                del keys[index]
+                finish(index, LatexValidationResult(**{**cached, **_concept_identity(concept)}))
+                continue
+        misses.append(index)
+
+    # Static checks and linters stay per fragment; only pdflatex is batched.
+    static = validate_latex_jobs(
+        [jobs[index] for index in misses],
+        apply_fixes=apply_fixes,
+        run_compile=False,
+        run_linters=run_linters,
+        max_workers=max_workers,
+    )
+    static_by_index = {}
+    for index, result in zip(misses, static, strict=True):
+        if result.compile_success:
+            static_by_index[index] = result
+        else:
+            finish(index, result)
+    effective = {
+        index: result.corrected_latex_preview if apply_fixes else (jobs[index][1] or "")
+        for index, result in static_by_index.items()
+    }
+    # Fragments that cannot be closed inside a group would spill into their
+    # neighbours, so they are compiled alone.
+    batchable = [
+        index
+        for index, result in static_by_index.items()
+        if result.balanced_braces
+        and result.balanced_environments
+        and not result.undefined_environments
+    ]
+    groups = [
+        batchable[start : start + batch_size] for start in range(0, len(batchable), batch_size)
+    ]
+    alone = set(static_by_index) - set(batchable)
+    groups.extend([index] for index in static_by_index if index in alone)
+
+    def compile_group(group: list[int]) -> list[tuple[bool, str]]:
+        try:
+            return compile_fragments_batched([effective[index] for index in group])
+        except Exception as exc:
+            return [(False, f"Validation failed: {type(exc).__name__}: {exc}")] * len(group)
+
+    if not groups:
+        return results
+    workers = max(1, min(max_workers or LATEX_VALIDATION_WORKERS, len(groups)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="latex-batch") as pool:
+        futures = {pool.submit(compile_group, group): group for group in groups}
+        for future in as_completed(futures):
+            group = futures[future]
+            for index, outcome in zip(group, future.result(), strict=True):
+                finish(index, _batched_compile_result(static_by_index[index], outcome))
     return results
 
 
+def _concept_key(item: str | tuple[str, str]) -> tuple[str, str]:
+    if isinstance(item, tuple):
+        return item
+    concept_id, source = item.split("@", 1)
+    return concept_id, source
+
+
+def validate_selected_concepts_from_mongo(
+    concept_keys: list[str] | list[tuple[str, str]],
+    db,
+    apply_fixes: bool = False,
+    run_compile: bool = True,
+    run_linters: bool = True,
+    max_workers: int | None = None,
+    progress: ValidationProgress | None = None,
+    cache: LatexValidationCache | None = None,
+    batch_size: int | None = None,
+) -> list[LatexValidationResult]:
+    jobs = [_load_validation_job(*_concept_key(item), db) for item in concept_keys]
+    return validate_latex_jobs(
+        jobs,
+        apply_fixes=apply_fixes,
+        run_compile=run_compile,
+        run_linters=run_linters,
+        max_workers=max_workers,
+        progress=progress,
+        cache=cache,
+        batch_size=batch_size,
+    )
+
+
 def validate_source_from_mongo(
     source: str,
     db,
     apply_fixes: bool = False,
     run_compile: bool = True,
     run_linters: bool = True,
+    max_workers: int | None = None,
+    progress: ValidationProgress | None = None,
+    cache: LatexValidationCache | None = None,
+    batch_size: int | None = None,
 ) -> dict[str, Any]:
     if hasattr(db, "get_concepts_by_source"):
         concepts = db.get_concepts_by_source(source)
     else:
         concepts = list(db.concepts.find({"source": source}))
-    results = [
-        validate_concept_from_mongo(
-            concept.get("id"),
-            source,
-            db,
-            apply_fixes=apply_fixes,
-            run_compile=run_compile,
-            run_linters=run_linters,
-        )
+    jobs = [
+        _load_validation_job(concept.get("id"), source, db, concept=concept)
         for concept in concepts
     ]
+    results = validate_latex_jobs(
+        jobs,
+        apply_fixes=apply_fixes,
+        run_compile=run_compile,
+        run_linters=run_linters,
+        max_workers=max_workers,
+        progress=progress,
+        cache=cache,
+        batch_size=batch_size,
+    )
     return summarize_validation_results(source, results)
 
 
@@ -0,0 +1,179 @@
+"""Content-addressed on-disk cache for LaTeX fragment validation results.
+
+Entries are keyed by the SHA-256 of everything that can change a validation
+outcome: the fragment text, the validation options and an environment
+fingerprint (style/class files, tool versions, referenced media). The cache
+is a single SQLite file with least-recently-used eviction, safe to share
+between the worker threads of one validation batch.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from collections.abc import Mapping
+from contextlib import closing
+from pathlib import Path
+from typing import Any
+
+from mathkb_config import LATEX_VALIDATION_CACHE_MAX_ENTRIES
+from mathmongo.paths import get_cache_dir
+from mathmongo.paths import validate_mutable_path
+
+CACHE_FORMAT_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS validation_results (
+    key TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    last_used REAL NOT NULL
+)
+"""
+
+
+def default_validation_cache_path() -> Path:
+    """Return the per-user location of the validation result cache."""
+    return get_cache_dir() / "latex_validation" / "results.sqlite3"
+
+
+def fingerprint_files(paths: list[Path]) -> dict[str, str]:
+    """Return the SHA-256 of each existing regular file, by file name."""
+    digests = {}
+    for path in sorted(paths):
+        if path.is_file() and not path.is_symlink():
+            digests[path.name] = hashlib.sha256(path.read_bytes()).hexdigest()
+    return digests
+
+
+class LatexValidationCache:
+    """Persistent LRU map from validation keys to result dictionaries."""
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        *,
+        environment: Callable[[str], Mapping[str, Any]] | None = None,
+        max_entries: int = LATEX_VALIDATION_CACHE_MAX_ENTRIES,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Open (lazily) the cache file at ``path``.
+
+        ``environment(kind)`` returns the fingerprint of one part of the
+        validation environment; each kind is computed once per instance.
+        """
+        self.path = Path(path) if path is not None else default_validation_cache_path()
+        self.max_entries = max_entries
+        self._environment_factory = environment or (lambda kind: {})
+        self._environment: dict[str, Mapping[str, Any]] = {}
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._ready = False
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def environment(self, kind: str) -> Mapping[str, Any]:
+        """Return the memoized environment fingerprint ``kind``."""
+        with self._lock:
+            if kind not in self._environment:
+                self._environment[kind] = self._environment_factory(kind)
+            return self._environment[kind]
+
+    def key(self, payload: Mapping[str, Any]) -> str:
+        """Hash a JSON-serializable description of one validation."""
+        text = json.dumps(
+            {"version": CACHE_FORMAT_VERSION, **payload},
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        path = validate_mutable_path(self.path)
+        if not self._ready:
+            parent = validate_mutable_path(path.parent)
+            parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+        connection = sqlite3.connect(path, timeout=30)
+        if not self._ready:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(_SCHEMA)
+            self._ready = True
+        return connection
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Return the stored result for ``key`` and mark it as recently used."""
+        with closing(self._connect()) as connection, connection:
+            row = connection.execute(
+                "SELECT payload FROM validation_results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                connection.execute(
+                    "UPDATE validation_results SET last_used = ? WHERE key = ?",
+                    (self._clock(), key),
+                )
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, result: Mapping[str, Any]) -> None:
+        """Store ``result`` and evict the least recently used overflow."""
+        payload = json.dumps(result, ensure_ascii=False, default=str)
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO validation_results (key, payload, last_used) "
+                "VALUES (?, ?, ?)",
+                (key, payload, self._clock()),
+            )
+            (count,) = connection.execute("SELECT COUNT(*) FROM validation_results").fetchone()
+            overflow = count - self.max_entries
+            if overflow > 0:
+                connection.execute(
+                    "DELETE FROM validation_results WHERE key IN ("
+                    "SELECT key FROM validation_results ORDER BY last_used ASC LIMIT ?)",
+                    (overflow,),
+                )
+        if overflow > 0:
+            with self._lock:
+                self.evictions += overflow
+
+    def invalidate(self, keys: list[str] | None = None) -> int:
+        """Drop ``keys`` (or every entry) and return how many were removed."""
+        if not self.path.exists():
+            return 0
+        with closing(self._connect()) as connection, connection:
+            if keys is None:
+                cursor = connection.execute("DELETE FROM validation_results")
+            else:
+                cursor = connection.executemany(
+                    "DELETE FROM validation_results WHERE key = ?", [(key,) for key in keys]
+                )
+            return cursor.rowcount
+
+    def __len__(self) -> int:
+        """Return the number of stored results."""
+        if not self.path.exists():
+            return 0
+        with closing(self._connect()) as connection:
+            (count,) = connection.execute("SELECT COUNT(*) FROM validation_results").fetchone()
+        return count
+
+    def stats(self) -> dict[str, int]:
+        """Return hit/miss/eviction counters of this instance."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+__all__ = [
+    "CACHE_FORMAT_VERSION",
+    "LatexValidationCache",
+    "default_validation_cache_path",
+    "fingerprint_files",
+]
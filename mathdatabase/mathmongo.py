@@ -1,15 +1,25 @@
+from collections.abc import Iterable
+from collections.abc import Iterator
 from datetime import datetime
-from pathlib import Path
 from typing import List
 from typing import Optional
 
-from pydantic import ValidationError
 from pymongo import ASCENDING
 from pymongo import MongoClient
 from pymongo.errors import OperationFailure
 
 from mathkb_config import MEDIA_ASSETS_COLLECTION
+from mathmongo.concept_search_index import rebuild_concept_search_index
+from mathmongo.concept_search_index import refresh_concept_search_entries
 from mathmongo.config import resolve_config
+from mathmongo.folder_ingest import INGEST_HASH_FIELD
+from mathmongo.folder_ingest import FolderIngestReport
+from mathmongo.folder_ingest import ingest_folder
+from mathmongo.query_cache import bump_collection_versions
+from mathmongo.relation_endpoints import RelationEndpointBackfillReport
+from mathmongo.relation_endpoints import apply_relation_endpoint_backfill
+from mathmongo.relation_endpoints import relation_endpoint_fields
+from mathmongo.relation_endpoints import relation_source_query
 from schemas.schemas import ConceptoBase
 from schemas.schemas import LineageResult
 from schemas.schemas import Referencia
@@ -54,6 +64,141 @@ def _format_index_spec(spec: dict) -> str:
     )
 
 
+LATEX_LOOKUP_CHUNK_SIZE = 500
+
+
+def _identity_chunks(
+    identities: Iterable[tuple[str, str]],
+    chunk_size: int,
+) -> list[list[tuple[str, str]]]:
+    unique = list(dict.fromkeys((str(cid), str(src)) for cid, src in identities))
+    size = max(1, int(chunk_size))
+    return [unique[index : index + size] for index in range(0, len(unique), size)]
+
+
+def _identity_query(chunk: list[tuple[str, str]]) -> dict:
+    ids_by_source: dict[str, list[str]] = {}
+    for concept_id, source in chunk:
+        ids_by_source.setdefault(source, []).append(concept_id)
+    clauses = [
+        {"source": source, "id": {"$in": ids}} for source, ids in ids_by_source.items()
+    ]
+    return clauses[0] if len(clauses) == 1 else {"$or": clauses}
+
+
+def find_by_identities(
+    collection,
+    identities: Iterable[tuple[str, str]],
+    *,
+    projection: dict | None = None,
+    chunk_size: int = LATEX_LOOKUP_CHUNK_SIZE,
+) -> dict[tuple[str, str], dict]:
+    """Fetch documents keyed by ``(id, source)`` with one query per chunk."""
+    if projection is not None and any(projection.values()):
+        projection = {**projection, "id": 1, "source": 1}
+    found: dict[tuple[str, str], dict] = {}
+    for chunk in _identity_chunks(identities, chunk_size):
+        for doc in collection.find(_identity_query(chunk), projection):
+            found.setdefault((str(doc.get("id")), str(doc.get("source"))), doc)
+    return found
+
+
+def attach_latex_contents(
+    latex_documents,
+    concepts: Iterable[dict],
+    *,
+    chunk_size: int = LATEX_LOOKUP_CHUNK_SIZE,
+) -> list[dict]:
+    """Return copies of ``concepts`` with ``contenido_latex`` joined in bulk."""
+    concepts = [dict(concept) for concept in concepts]
+    latex_by_identity = find_by_identities(
+        latex_documents,
+        ((concept.get("id"), concept.get("source")) for concept in concepts),
+        projection={"_id": 0, "contenido_latex": 1},
+        chunk_size=chunk_size,
+    )
+    for concept in concepts:
+        identity = (str(concept.get("id")), str(concept.get("source")))
+        latex_doc = latex_by_identity.get(identity) or {}
+        concept["contenido_latex"] = latex_doc.get("contenido_latex", "")
+    return concepts
+
+
+def _relations_query(
+    desde_id: str | None,
+    desde_source: str | None,
+    hasta_id: str | None,
+    hasta_source: str | None,
+    tipo: TipoRelacion | None,
+) -> dict:
+    query = {}
+    if desde_id and desde_source:
+        query["desde"] = f"{desde_id}@{desde_source}"
+    if hasta_id and hasta_source:
+        query["hasta"] = f"{hasta_id}@{hasta_source}"
+    if tipo:
+        query["tipo"] = tipo.value
+    return query
+
+
+def _relation_from_document(d: dict) -> Relation:
+    endpoints = relation_endpoint_fields(d["desde"], d["hasta"])
+    if len(endpoints) != 4:
+        raise ValueError(f"Malformed relation endpoints: {d['desde']!r} -> {d['hasta']!r}")
+    return Relation(
+        desde_id=endpoints["desde_id"],
+        desde_source=endpoints["desde_source"],
+        hasta_id=endpoints["hasta_id"],
+        hasta_source=endpoints["hasta_source"],
+        tipo=d["tipo"],  # con enum string
+        descripcion=d.get("descripcion", ""),
+    )
+
+
+class _ReferenceResolver:
+    """Per-call memo of validated ``Referencia`` objects keyed by concept identity."""
+
+    def __init__(self, concepts, chunk_size: int) -> None:
+        self._concepts = concepts
+        self._chunk_size = chunk_size
+        self._references: dict[tuple[str, str], Referencia | None] = {}
+
+    def enrich(self, relations: list[Relation]) -> list[RelationEnriched]:
+        identities = [
+            identity
+            for relation in relations
+            for identity in (
+                (relation.desde_id, relation.desde_source),
+                (relation.hasta_id, relation.hasta_source),
+            )
+            if identity not in self._references
+        ]
+        found = find_by_identities(
+            self._concepts,
+            identities,
+            projection={"_id": 0, "referencia": 1},
+            chunk_size=self._chunk_size,
+        )
+        for identity in identities:
+            if identity not in self._references:
+                self._references[identity] = _validated_reference(found.get(identity))
+        return [
+            RelationEnriched(
+                relation=relation,
+                desde_ref=self._references[(relation.desde_id, relation.desde_source)],
+                hasta_ref=self._references[(relation.hasta_id, relation.hasta_source)],
+            )
+            for relation in relations
+        ]
+
+
+def _validated_reference(doc: dict | None) -> Referencia | None:
+    ref = doc.get("referencia") if doc else None
+    if isinstance(ref, dict) and ref.get("tipo_referencia"):
+        return Referencia.model_validate(ref)
+    return None
+
+
 class MathMongo:
     def __init__(self, mongo_uri: str | None = None, db_name: str | None = None):
         settings = resolve_config()
@@ -107,6 +252,19 @@ class MathMongo:
             [("id", ASCENDING), ("source", ASCENDING)],
             unique=True,
         )
+        # Legacy identity fields still matched when resolving knowledge-graph nodes.
+        self._ensure_index(
+            self.concepts,
+            [("concept_id", ASCENDING)],
+            name="concepts_legacy_concept_id",
+            sparse=True,
+        )
+        self._ensure_index(
+            self.concepts,
+            [("conceptId", ASCENDING)],
+            name="concepts_legacy_conceptId",
+            sparse=True,
+        )
         self._ensure_index(
             self.latex_documents,
             [("id", ASCENDING), ("source", ASCENDING)],
@@ -117,6 +275,16 @@ class MathMongo:
             [("desde", ASCENDING), ("hasta", ASCENDING), ("tipo", ASCENDING)],
             unique=True,
         )
+        self._ensure_index(
+            self.relations,
+            [("desde_source", ASCENDING), ("desde_id", ASCENDING)],
+            name="relations_desde_source_id",
+        )
+        self._ensure_index(
+            self.relations,
+            [("hasta_source", ASCENDING), ("hasta_id", ASCENDING)],
+            name="relations_hasta_source_id",
+        )
         self._ensure_index(self.knowledge_graph_maps, [("name", ASCENDING)], name="kg_maps_name")
         self._ensure_index(
             self.knowledge_graph_maps,
@@ -175,45 +343,30 @@ class MathMongo:
 
 
 
-    def ingest_folder(self, folder: str, source: str) -> list[ConceptoBase]:
-        from parsers.yaml_latex_parser import YamlLatexParser
-
-        resultados = []
-        path = Path(folder)
-        for file_path in path.glob("*.md"):
-            print(f"Procesando archivo: {file_path.name}")
-            meta, contenido_latex = YamlLatexParser.extraer_yaml_y_contenido(str(file_path))
-            meta["source"] = source
-            
-
-            try:
-                concepto = ConceptoBase(**meta, contenido_latex=contenido_latex)
-            except ValidationError as e:
-                print(f"❌ Error en {file_path.name}: {e}")
-                continue
-
-            concepto_dict = concepto.model_dump(mode="python", exclude={"contenido_latex"}, exclude_none=True)
-            
-            self.concepts.update_one(
-                {"id": concepto.id, "source": source},
-                {"$set": concepto_dict},upsert=True)
-            
-            # 2. Guardar contenido LaTeX en latex_documents
-            now = datetime.now()
-
-            self.latex_documents.update_one(
-            {"id": concepto.id, "source": source},
-            {
-                "$set": {
-                    "contenido_latex": contenido_latex,
-                    "ultima_actualizacion": now
-                },
-                "$setOnInsert": {"fecha_creacion": now}
-            },upsert=True)
-
-            resultados.append(concepto)
-
-        return resultados
+    def ingest_folder(
+        self,
+        folder: str,
+        source: str,
+        *,
+        dry_run: bool = False,
+        max_workers: int | None = None,
+    ) -> list[ConceptoBase]:
+        """Upsert the ``*.md`` notes of ``folder``; unchanged files are skipped."""
+        report = self.ingest_folder_report(folder, source, dry_run=dry_run, max_workers=max_workers)
+        for name, error in report.invalid:
+            print(f"❌ Error en {name}: {error}")
+        return list(report.concepts)
+
+    def ingest_folder_report(
+        self,
+        folder: str,
+        source: str,
+        *,
+        dry_run: bool = False,
+        max_workers: int | None = None,
+    ) -> FolderIngestReport:
+        """Ingest ``folder`` and return skipped/invalid files and per-stage timings."""
+        return ingest_folder(self.db, folder, source, dry_run=dry_run, max_workers=max_workers)
 
     def get_concepts_by_source(self, source: str) -> list[dict]:
         """Return concept metadata documents for a source."""
@@ -223,28 +376,55 @@ class MathMongo:
         """Return the LaTeX document associated with a concept."""
         return self.latex_documents.find_one({"id": concept_id, "source": source})
 
+    def get_concepts_with_latex(
+        self,
+        query: dict | None = None,
+        *,
+        projection: dict | None = None,
+        sort: list[tuple[str, int]] | None = None,
+        chunk_size: int = LATEX_LOOKUP_CHUNK_SIZE,
+    ) -> list[dict]:
+        """Return matching concepts joined with ``contenido_latex`` in bulk.
+
+        One ``concepts`` query plus one ``latex_documents`` query per
+        ``chunk_size`` identities, instead of one LaTeX lookup per concept.
+        """
+        if projection is not None and any(projection.values()):
+            projection = {**projection, "id": 1, "source": 1}
+        cursor = self.concepts.find(query or {}, projection)
+        if sort:
+            cursor = cursor.sort(sort)
+        return attach_latex_contents(self.latex_documents, cursor, chunk_size=chunk_size)
+
+    def get_concepts_with_latex_by_keys(
+        self,
+        identities: Iterable[tuple[str, str]],
+        *,
+        projection: dict | None = None,
+        chunk_size: int = LATEX_LOOKUP_CHUNK_SIZE,
+    ) -> list[dict]:
+        """Return concepts for ``(id, source)`` pairs, in input order, with LaTeX."""
+        identities = [(str(cid), str(src)) for cid, src in identities]
+        found = find_by_identities(
+            self.concepts,
+            identities,
+            projection=projection,
+            chunk_size=chunk_size,
+        )
+        ordered = [found[identity] for identity in dict.fromkeys(identities) if identity in found]
+        return attach_latex_contents(self.latex_documents, ordered, chunk_size=chunk_size)
+
     def get_concepts_with_latex_by_source(self, source: str) -> list[dict]:
         """Return concept metadata enriched with contenido_latex from latex_documents."""
-        enriched = []
-        for concept in self.get_concepts_by_source(source):
-            doc = dict(concept)
-            latex_doc = self.get_latex_document(doc.get("id"), source) or {}
-            doc["contenido_latex"] = latex_doc.get("contenido_latex", "")
-            enriched.append(doc)
-        return enriched
+        return self.get_concepts_with_latex({"source": source})
 
     def get_relations_by_source(self, source: str) -> list[dict]:
         """Return relations where either endpoint belongs to source."""
-        return list(
-            self.relations.find(
-                {
-                    "$or": [
-                        {"desde": {"$regex": f"@{source}$"}},
-                        {"hasta": {"$regex": f"@{source}$"}},
-                    ]
-                }
-            )
-        )
+        return list(self.relations.find(relation_source_query([source])))
+
+    def backfill_relation_endpoints(self, *, dry_run: bool = False) -> RelationEndpointBackfillReport:
+        """Derive indexed endpoint fields for relations written before they existed."""
+        return apply_relation_endpoint_backfill(self.relations, dry_run=dry_run)
 
     def update_latex_document(self, concept_id: str, source: str, new_latex: str) -> None:
         """Explicitly update LaTeX content for a concept.
@@ -258,10 +438,17 @@ class MathMongo:
                 "$set": {
                     "contenido_latex": new_latex,
                     "ultima_actualizacion": datetime.now(),
-                }
+                },
+                "$unset": {INGEST_HASH_FIELD: ""},
             },
             upsert=False,
         )
+        bump_collection_versions(self.db, "latex_documents")
+        refresh_concept_search_entries(self.db, [(concept_id, source)])
+
+    def rebuild_concept_search_index(self) -> int:
+        """Rebuild the ranked concept search index and enable it for searches."""
+        return rebuild_concept_search_index(self.db)
 
     def get_notebook_notes(self, query: Optional[dict] = None, limit: int = 100) -> list[dict]:
         """Return latex diary notes from the experimental Cuaderno module."""
@@ -447,12 +634,14 @@ class MathMongo:
             "tipo": rel.tipo,
             "descripcion": rel.descripcion
         }
+        doc.update(relation_endpoint_fields(doc["desde"], doc["hasta"]))
 
         self.relations.update_one(
             {"desde": doc["desde"], "hasta": doc["hasta"], "tipo": doc["tipo"]},
             {"$set": doc},
             upsert=True
         )
+        bump_collection_versions(self.db, "relations")
         print(f"🔗 Relación registrada: {doc['desde']} --[{doc['tipo']}]--> {doc['hasta']}")
         return rel
     
@@ -470,26 +659,8 @@ class MathMongo:
         - hasta_id + hasta_source
         - tipo (enum).
         """  # noqa: D205
-        query = {}
-        if desde_id and desde_source:
-            query["desde"] = f"{desde_id}@{desde_source}"
-        if hasta_id and hasta_source:
-            query["hasta"] = f"{hasta_id}@{hasta_source}"
-        if tipo:
-            query["tipo"] = tipo.value
-
-        docs = self.relations.find(query)
-        relaciones = []
-        for d in docs:
-            rel = Relation(
-            desde_id=d["desde"].split("@")[0],
-            desde_source=d["desde"].split("@")[1],
-            hasta_id=d["hasta"].split("@")[0],
-            hasta_source=d["hasta"].split("@")[1],
-            tipo=d["tipo"],  # con enum string
-            descripcion=d.get("descripcion", ""))
-            relaciones.append(rel)
-        return relaciones
+        query = _relations_query(desde_id, desde_source, hasta_id, hasta_source, tipo)
+        return [_relation_from_document(d) for d in self.relations.find(query)]
     
 
     def get_relations_with_references(
@@ -498,9 +669,14 @@ class MathMongo:
         desde_source: Optional[str] = None,
         hasta_id: Optional[str] = None,
         hasta_source: Optional[str] = None,
-        tipo: Optional[TipoRelacion] = None) -> List[RelationEnriched]:
+        tipo: Optional[TipoRelacion] = None,
+        *,
+        chunk_size: int = LATEX_LOOKUP_CHUNK_SIZE) -> List[RelationEnriched]:
         """
         Obtiene relaciones y las enriquece con referencias bibliográficas si existen.
+
+        Las referencias de todos los extremos se leen con una consulta ``$in``
+        por bloque de ``chunk_size`` identidades, no con dos ``find_one`` por relación.
         """
         relaciones = self.get_relations(
         desde_id=desde_id,
@@ -508,26 +684,32 @@ class MathMongo:
         hasta_id=hasta_id,
         hasta_source=hasta_source,
         tipo=tipo)
+        return _ReferenceResolver(self.concepts, chunk_size).enrich(relaciones)
 
-        resultados = []
-        for r in relaciones:
-             doc_desde = self.concepts.find_one({"id": r.desde_id, "source": r.desde_source})
-             doc_hasta = self.concepts.find_one({"id": r.hasta_id, "source": r.hasta_source})
-
-             ref_desde = doc_desde.get("referencia") if doc_desde else None
-             ref_hasta = doc_hasta.get("referencia") if doc_hasta else None
-             enriched = RelationEnriched(
-            relation=r,
-            desde_ref=(Referencia.model_validate(ref_desde)
-                       if isinstance(ref_desde, dict) and ref_desde.get("tipo_referencia")
-                       else None),
-            hasta_ref=(Referencia.model_validate(ref_hasta)
-                       if isinstance(ref_hasta, dict) and ref_hasta.get("tipo_referencia")
-                       else None))
-             resultados.append(enriched)
-
-
-        return resultados
+    def iter_relations_with_references(
+        self,
+        desde_id: str | None = None,
+        desde_source: str | None = None,
+        hasta_id: str | None = None,
+        hasta_source: str | None = None,
+        tipo: TipoRelacion | None = None,
+        *,
+        batch_size: int = LATEX_LOOKUP_CHUNK_SIZE) -> Iterator[RelationEnriched]:
+        """Versión en streaming de ``get_relations_with_references``.
+
+        Consume el cursor de relaciones en lotes de ``batch_size``; cada lote
+        resuelve solo las referencias que aún no se han visto en esta llamada.
+        """
+        query = _relations_query(desde_id, desde_source, hasta_id, hasta_source, tipo)
+        resolver = _ReferenceResolver(self.concepts, LATEX_LOOKUP_CHUNK_SIZE)
+        batch: list[Relation] = []
+        for d in self.relations.find(query):
+            batch.append(_relation_from_document(d))
+            if len(batch) >= max(1, int(batch_size)):
+                yield from resolver.enrich(batch)
+                batch = []
+        if batch:
+            yield from resolver.enrich(batch)
 
     def get_lineage(
             self,
@@ -32,9 +32,21 @@ def _timeout_from_env(name: str, default: int) -> int:
 PDF_COMPILE_TIMEOUT_SECONDS = _timeout_from_env("PDF_COMPILE_TIMEOUT_SECONDS", 300)
 LATEX_MAX_PASSES = _timeout_from_env("LATEX_MAX_PASSES", 4)
 EXPORT_TIMEOUT_SECONDS = _timeout_from_env("EXPORT_TIMEOUT_SECONDS", 300)
+EXPORT_BATCH_SIZE = _timeout_from_env("EXPORT_BATCH_SIZE", 500)
 IMPORT_TIMEOUT_SECONDS = _timeout_from_env("IMPORT_TIMEOUT_SECONDS", 300)
+IMPORT_BATCH_SIZE = _timeout_from_env("IMPORT_BATCH_SIZE", 1000)
+INGEST_WORKERS = _timeout_from_env("INGEST_WORKERS", os.cpu_count() or 1)
 LATEX_LINTER_TIMEOUT_SECONDS = _timeout_from_env("LATEX_LINTER_TIMEOUT_SECONDS", 60)
+LATEX_VALIDATION_WORKERS = _timeout_from_env("LATEX_VALIDATION_WORKERS", os.cpu_count() or 1)
+LATEX_VALIDATION_BATCH_SIZE = _timeout_from_env("LATEX_VALIDATION_BATCH_SIZE", 25)
+LATEX_VALIDATION_CACHE_MAX_ENTRIES = _timeout_from_env("LATEX_VALIDATION_CACHE_MAX_ENTRIES", 20_000)
 MAX_IMAGE_UPLOAD_BYTES = _timeout_from_env("MAX_IMAGE_UPLOAD_BYTES", 10 * 1024 * 1024)
+LATEX_FORMAT_CACHE_ENABLED = os.getenv("MATHKB_LATEX_FORMAT_CACHE", "1").strip().lower() not in {
+    "0",
+    "false",
+    "no",
+    "off",
+}
 
 PROJECT_ROOT = get_resource_root()
 LEGACY_PROJECT_ROOT = get_legacy_project_root()
@@ -15,6 +15,8 @@ from mathmongo.academic_cli.common import close_client
 from mathmongo.academic_cli.common import connect_database
 from mathmongo.academic_cli.common import diagnostic
 from mathmongo.academic_cli.common import emit
+from mathmongo.academic_cli.common import next_page_hint
+from mathmongo.academic_cli.common import page_payload
 from mathmongo.academic_cli.common import require_apply_confirmation
 from mathmongo.academic_cli.common import validate_write_options
 from mathmongo.source_catalog.models import Source
@@ -57,6 +59,7 @@ def _source_list(args: argparse.Namespace, *, search: str | None = None) -> int:
                 search,
                 page=args.page,
                 page_size=args.limit,
+                cursor=args.cursor,
                 status=args.status,
                 source_type=args.source_type,
                 tag=args.tag,
@@ -65,18 +68,22 @@ def _source_list(args: argparse.Namespace, *, search: str | None = None) -> int:
             else repository.list(
                 page=args.page,
                 page_size=args.limit,
+                cursor=args.cursor,
                 status=args.status,
                 source_type=args.source_type,
                 tag=args.tag,
             )
         )
-        payload = {"items": [_source_row(item) for item in page.items], "page": page.page, "total": page.total}
+        payload = page_payload(args, page, [_source_row(item) for item in page.items])
         if args.output == "json":
             emit(args, payload)
         else:
             emit(args, payload["items"], columns=("source_id", "name", "type", "status", "tags", "updated_at"))
             diagnostic(args, f"Base: {database.name}; {page.total} Sources.")
+            next_page_hint(args, page)
         return ExitCode.SUCCESS
+    except ValueError as exc:
+        raise AcademicCliError(f"Paginación inválida: {exc}") from exc
     finally:
         close_client(client)
 
@@ -279,6 +286,7 @@ def _reference_list(args: argparse.Namespace, *, search: str | None = None) -> i
                 search,
                 page=args.page,
                 page_size=args.limit,
+                cursor=args.cursor,
                 status=args.status,
                 source_id=args.source,
             )
@@ -286,19 +294,23 @@ def _reference_list(args: argparse.Namespace, *, search: str | None = None) -> i
             else repository.list(
                 page=args.page,
                 page_size=args.limit,
+                cursor=args.cursor,
                 status=args.status,
                 source_id=args.source,
                 reference_type=args.reference_type,
                 year=args.year,
             )
         )
-        payload = {"items": [_reference_row(item) for item in page.items], "page": page.page, "total": page.total}
+        payload = page_payload(args, page, [_reference_row(item) for item in page.items])
         if args.output == "json":
             emit(args, payload)
         else:
             emit(args, payload["items"], columns=("reference_id", "title", "type", "year", "sources", "status", "updated_at"))
             diagnostic(args, f"Base: {database.name}; {page.total} References.")
+            next_page_hint(args, page)
         return ExitCode.SUCCESS
+    except ValueError as exc:
+        raise AcademicCliError(f"Paginación inválida: {exc}") from exc
     finally:
         close_client(client)
 
@@ -319,6 +331,10 @@ def _reference_show(args: argparse.Namespace) -> int:
 def _add_paging(parser: argparse.ArgumentParser) -> None:
     parser.add_argument("--page", type=int, default=1)
     parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument(
+        "--cursor",
+        help="Paginación por cursor: '*' abre el listado; luego usa el next_cursor devuelto.",
+    )
 
 
 def install_catalog_commands(subparsers: argparse._SubParsersAction[argparse.ArgumentParser]) -> None:
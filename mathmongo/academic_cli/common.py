@@ -158,6 +158,22 @@ def diagnostic(args: argparse.Namespace, message: str) -> None:
         print(message, file=sys.stderr)
 
 
+def page_payload(args: argparse.Namespace, page: Any, items: list[Any]) -> dict[str, Any]:
+    """Build the stable list payload; ``--cursor`` adds the next keyset cursor."""
+    payload: dict[str, Any] = {"items": items, "page": page.page, "total": page.total}
+    if getattr(args, "cursor", None) is not None:
+        payload["next_cursor"] = page.next_cursor
+    return payload
+
+
+def next_page_hint(args: argparse.Namespace, page: Any) -> None:
+    """Tell table readers how to continue a keyset listing, on stderr."""
+    next_cursor = getattr(page, "next_cursor", None)
+    if getattr(args, "cursor", None) is None or not next_cursor or getattr(args, "quiet", False):
+        return
+    print(f"Siguiente página: --cursor {next_cursor}", file=sys.stderr)
+
+
 def require_apply_confirmation(args: argparse.Namespace, *, operation: str) -> bool:
     """Apply the universal preview/apply contract without writing during a preview."""
     apply_requested = bool(getattr(args, "apply", False))
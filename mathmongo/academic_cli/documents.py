@@ -12,6 +12,9 @@ from mathmongo.academic_cli.common import close_client
 from mathmongo.academic_cli.common import connect_database
 from mathmongo.academic_cli.common import diagnostic
 from mathmongo.academic_cli.common import emit
+from mathmongo.academic_cli.common import next_page_hint
+from mathmongo.academic_cli.common import page_payload
+from mathmongo.reading_space.service import ReadingOperationStatus
 from mathmongo.reading_space.service import ReadingSpaceService
 from mathmongo.source_documents.repository import SourceDocumentRepository
 from mathmongo.source_documents.service import SourceDocumentService
@@ -42,8 +45,9 @@ def _document_list(args: argparse.Namespace) -> int:
             page_size=args.limit,
             status=args.status,
             kind=args.kind,
+            cursor=args.cursor,
         )
-        payload = {"items": [_document_row(item) for item in page.items], "page": page.page, "total": page.total}
+        payload = page_payload(args, page, [_document_row(item) for item in page.items])
         if args.output == "json":
             emit(args, payload)
         else:
@@ -53,7 +57,10 @@ def _document_list(args: argparse.Namespace) -> int:
                 columns=("document_id", "kind", "title", "status", "sha256", "size_bytes", "updated_at"),
             )
             diagnostic(args, f"Base: {database.name}; {page.total} Documents para {args.source}.")
+            next_page_hint(args, page)
         return ExitCode.SUCCESS
+    except ValueError as exc:
+        raise AcademicCliError(f"Paginación inválida: {exc}") from exc
     finally:
         close_client(client)
 
@@ -93,9 +100,15 @@ def _reading_list(args: argparse.Namespace) -> int:
             user_scope=args.user_scope,
             page=args.page,
             page_size=args.limit,
+            cursor=args.cursor,
         )
         if not result.completed or result.value is None:
-            raise AcademicCliError(result.message or "No se pudo listar Reading Space.", ExitCode.CONNECTION)
+            code = (
+                ExitCode.VALIDATION
+                if result.status == ReadingOperationStatus.INVALID_STATE
+                else ExitCode.CONNECTION
+            )
+            raise AcademicCliError(result.message or "No se pudo listar Reading Space.", code)
         page = result.value
         items = [
             {
@@ -105,7 +118,7 @@ def _reading_list(args: argparse.Namespace) -> int:
             }
             for item in page.items
         ]
-        payload = {"items": items, "page": page.page, "total": page.total}
+        payload = page_payload(args, page, items)
         if args.output == "json":
             emit(args, payload)
         else:
@@ -115,6 +128,7 @@ def _reading_list(args: argparse.Namespace) -> int:
                 columns=("document_id", "title", "source_id", "kind", "reading_status", "current_page"),
             )
             diagnostic(args, f"Base: {database.name}; {page.total} documentos legibles.")
+            next_page_hint(args, page)
         return ExitCode.SUCCESS
     finally:
         close_client(client)
@@ -150,6 +164,10 @@ def _reading_show(args: argparse.Namespace) -> int:
 def _add_paging(parser: argparse.ArgumentParser) -> None:
     parser.add_argument("--page", type=int, default=1)
     parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument(
+        "--cursor",
+        help="Paginación por cursor: '*' abre el listado; luego usa el next_cursor devuelto.",
+    )
 
 
 def install_document_commands(subparsers: argparse._SubParsersAction[argparse.ArgumentParser]) -> None:
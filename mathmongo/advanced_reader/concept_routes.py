@@ -96,6 +96,12 @@ def _operation_error(
             "The Annotation cannot receive visual concept evidence.",
             status_code=409,
         )
+    if status == ReadingAnnotationOperationStatus.INVALID_CURSOR:
+        return AdvancedReaderError(
+            "invalid_page_cursor",
+            "The page cursor is malformed or belongs to another listing.",
+            status_code=400,
+        )
     if status == ReadingAnnotationOperationStatus.INVALID_STATE:
         if "visual" in folded and "not" in folded:
             return AdvancedReaderError(
@@ -207,6 +213,7 @@ def build_concept_router() -> APIRouter:
         status: Literal["active", "archived", "all"] = "active",
         page: Annotated[int, Query(ge=1, le=100_000)] = 1,
         limit: Annotated[int, Query(ge=1, le=50)] = 25,
+        cursor: Annotated[str | None, Query(min_length=1, max_length=4_096)] = None,
     ) -> ConceptEvidenceListResponse:
         dependencies = _dependencies(request)
         service, access, resolved, annotation = _annotation_context(dependencies, annotation_id)
@@ -215,6 +222,7 @@ def build_concept_router() -> APIRouter:
             status=None if status == "all" else EvidenceLinkStatus(status),
             page=page,
             page_size=limit,
+            cursor=cursor,
         )
         if not result.completed or result.value is None:
             raise _operation_error(result.status, result.message)
@@ -241,6 +249,7 @@ def build_concept_router() -> APIRouter:
             page_size=result.value.page_size,
             total=result.value.total,
             pages=result.value.pages,
+            next_cursor=result.value.next_cursor,
         )
 
     @router.post(
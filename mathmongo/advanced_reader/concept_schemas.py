@@ -102,6 +102,7 @@ class ConceptEvidenceListResponse(TransportModel):
     page_size: int
     total: int
     pages: int
+    next_cursor: str | None = None
 
 
 class ConceptEvidenceWriteResponse(TransportModel):
@@ -13,6 +13,7 @@ from typing import Any
 from editor.concept_linking.concept_search import CONCEPT_PROJECTION
 from editor.concept_linking.concept_search import concept_from_document
 from editor.concept_linking.view_models import ConceptSummary
+from mathmongo.concept_search_index import rank_concept_identities
 
 MAX_CONCEPT_QUERY_LENGTH = 160
 MAX_CONCEPT_SEARCH_LIMIT = 50
@@ -66,7 +67,11 @@ def search_legacy_concepts(
     page: int = 1,
     limit: int = DEFAULT_CONCEPT_SEARCH_LIMIT,
 ) -> ConceptSearchPage:
-    """Search approved metadata only, with an escaped regex and stable order."""
+    """Search approved fields, ranked by the concept search index when it is ready.
+
+    Without a ready index this keeps the escaped metadata regex and stable
+    source/id order.
+    """
     if database is None or not hasattr(database, "__getitem__"):
         raise ValueError("an explicit database is required")
     if (
@@ -85,6 +90,19 @@ def search_legacy_concepts(
     source_value = _bounded_text(source, maximum=1_000)
     type_value = _bounded_text(concept_type, maximum=160)
     category_value = _bounded_text(category, maximum=160)
+    hits = rank_concept_identities(
+        database,
+        value or "",
+        source=source_value,
+        concept_types=() if type_value is None else (type_value,),
+        category=category_value,
+        offset=(page - 1) * limit,
+        limit=limit,
+    )
+    if hits is not None:
+        found = get_legacy_concepts(database, hits.identities, limit=limit)
+        ranked = tuple(found[identity] for identity in hits.identities if identity in found)
+        return ConceptSearchPage(ranked, page, limit, hits.has_more)
     pattern = {"$regex": re.escape(value or ""), "$options": "i"}
     clauses: list[dict[str, Any]] = [{"$or": [{field: pattern} for field in SEARCH_FIELDS]}]
     if source_value is not None:
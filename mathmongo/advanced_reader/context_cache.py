@@ -0,0 +1,163 @@
+"""Short-lived per-Document memo of reader contexts for hot reader endpoints."""
+
+# ruff: noqa: D102,D107
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from mathmongo.query_cache import COLLECTION_VERSIONS
+from mathmongo.query_cache import CollectionVersions
+from mathmongo.reading_space.service import ReaderContext
+from mathmongo.reading_space.service import ReadingOperationStatus
+from mathmongo.reading_space.service import ReadingServiceResult
+
+DEFAULT_MAX_ENTRIES = 128
+DEFAULT_TTL_SECONDS = 10.0
+# Source and Reference writers bump whole collections; Document, reading-state
+# and page-map writers bump the Document's own counter.
+CONTEXT_COLLECTIONS = ("sources", "references")
+
+ContextVersions = tuple[int, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class ReaderContextCacheStats:
+    """Counters reported by ``/health``; never Document identifiers."""
+
+    hits: int
+    misses: int
+    entries: int
+
+
+@dataclass(frozen=True, slots=True)
+class _Entry:
+    result: ReadingServiceResult[ReaderContext]
+    versions: ContextVersions
+    loaded_at: float
+
+
+class ReaderContextCache:
+    """Bounded LRU of reader contexts keyed by database and Document id.
+
+    An entry is served while no in-process write touched its Document, Sources
+    or References and it is younger than ``ttl_seconds``; the TTL bounds how
+    long writes made by other processes, such as the editor, stay unseen.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+        versions: CollectionVersions = COLLECTION_VERSIONS,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("Reader context cache requires at least one entry")
+        if ttl_seconds <= 0:
+            raise ValueError("Reader context cache requires a positive TTL")
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._versions = versions
+        self._entries: OrderedDict[tuple[str, str], _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def versions(self, database_name: str, document_id: str) -> ContextVersions:
+        """Return the write counters a cached context for ``document_id`` depends on."""
+        return self._versions.document_snapshot(database_name, document_id, CONTEXT_COLLECTIONS)
+
+    def get(
+        self,
+        database_name: str,
+        document_id: str,
+        loader: Callable[[], ReadingServiceResult[ReaderContext]],
+        *,
+        refresh: bool = False,
+    ) -> ReadingServiceResult[ReaderContext]:
+        """Return the cached context or call ``loader``; ``refresh`` always reloads.
+
+        Database errors are returned but never cached.
+        """
+        key = (database_name, document_id)
+        # Versions are read before loading: a write racing the load leaves
+        # the entry stale for the next caller instead of hiding the write.
+        versions = self.versions(database_name, document_id)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if (
+                not refresh
+                and entry is not None
+                and entry.versions == versions
+                and now - entry.loaded_at <= self._ttl_seconds
+            ):
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry.result
+            if entry is not None:
+                del self._entries[key]
+            self._misses += 1
+        result = loader()
+        if result.status != ReadingOperationStatus.ERROR:
+            self._store(key, _Entry(result, versions, now))
+        return result
+
+    def record_write(
+        self,
+        database_name: str,
+        document_id: str,
+        before: ContextVersions,
+        result: ReadingServiceResult[ReaderContext],
+    ) -> bool:
+        """Keep ``result`` if the caller's write is the only one since ``before``.
+
+        Any other interleaving, including writers that do not bump the
+        Document counter, drops the entry instead.
+        """
+        key = (database_name, document_id)
+        after = self.versions(database_name, document_id)
+        if len(before) != len(after) or (*before[:-1], before[-1] + 1) != after:
+            with self._lock:
+                self._entries.pop(key, None)
+            return False
+        self._store(key, _Entry(result, after, self._clock()))
+        return True
+
+    def _store(self, key: tuple[str, str], entry: _Entry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, database_name: str, document_id: str) -> None:
+        with self._lock:
+            self._entries.pop((database_name, document_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def stats(self) -> ReaderContextCacheStats:
+        with self._lock:
+            return ReaderContextCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                entries=len(self._entries),
+            )
+
+
+__all__ = [
+    "ReaderContextCache",
+    "ReaderContextCacheStats",
+]
@@ -7,9 +7,13 @@ from __future__ import annotations
 import re
 from collections.abc import Callable
 from dataclasses import dataclass
+from dataclasses import field
 from pathlib import Path
 from typing import Any
 
+from mathmongo.advanced_reader.context_cache import ReaderContextCache
+from mathmongo.advanced_reader.verification_cache import VerifiedBlobCache
+from mathmongo.advanced_reader.verification_cache import process_verification_cache
 from mathmongo.document_page_maps.service import DocumentPageMapService
 from mathmongo.reading_annotations.indexes import ReadingAnnotationIndexManager
 from mathmongo.reading_annotations.service import ReadingAnnotationService
@@ -34,6 +38,8 @@ class AdvancedReaderDependencies:
     health_check: Callable[[], bool]
     annotation_service: ReadingAnnotationService | None = None
     annotation_index_manager: ReadingAnnotationIndexManager | None = None
+    verification_cache: VerifiedBlobCache = field(default_factory=process_verification_cache)
+    reader_context_cache: ReaderContextCache = field(default_factory=ReaderContextCache)
 
     @classmethod
     def from_database(
@@ -8,13 +8,18 @@ import hashlib
 import os
 import stat
 from dataclasses import dataclass
+from dataclasses import replace
 from pathlib import Path
 
 from mathmongo.advanced_reader.dependencies import AdvancedReaderDependencies
+from mathmongo.advanced_reader.verification_cache import VerifiedBlobIdentity
+from mathmongo.document_page_maps.service import MAX_PAGE_LABEL_RANGE
 from mathmongo.document_page_maps.service import PageMapOperationStatus
 from mathmongo.paths import find_symlink_component
+from mathmongo.reading_space.models import DocumentReadingState
 from mathmongo.reading_space.service import ReaderContext
 from mathmongo.reading_space.service import ReadingOperationStatus
+from mathmongo.reading_space.service import ReadingServiceResult
 from mathmongo.source_documents.models import PDF_MIME_TYPE
 from mathmongo.source_documents.models import DocumentKind
 from mathmongo.source_documents.models import DocumentStatus
@@ -77,8 +82,13 @@ class VerifiedPdfHandle:
     def open(
         cls, dependencies: AdvancedReaderDependencies, version: PdfVersion
     ) -> VerifiedPdfHandle:
-        """Resolve only through S2 storage, then verify header, size, mode and SHA."""
+        """Resolve only through S2 storage, then verify header, size, mode and SHA.
+
+        The full SHA-256 pass is skipped only when the descriptor's ``fstat``
+        identity matches a verification already recorded in this process.
+        """
         storage = dependencies.document_service.storage
+        cache = dependencies.verification_cache
         descriptor: int | None = None
         try:
             path = storage.path_for_version(version)
@@ -135,9 +145,11 @@ class VerifiedPdfHandle:
                     "PDF integrity verification failed.",
                     status_code=409,
                 )
+            identity = VerifiedBlobIdentity.from_stat(version.sha256, before)
+            cached = cache.is_verified(identity)
             digest = hashlib.sha256()
             offset = 0
-            while offset < before.st_size:
+            while not cached and offset < before.st_size:
                 chunk = os.pread(
                     descriptor,
                     min(VERIFY_CHUNK_BYTES, before.st_size - offset),
@@ -158,12 +170,16 @@ class VerifiedPdfHandle:
                     status_code=409,
                 )
             after = os.fstat(descriptor)
-            if not _same_file_identity(before, after) or digest.hexdigest() != version.sha256:
+            if not _same_file_identity(before, after) or (
+                not cached and digest.hexdigest() != version.sha256
+            ):
                 raise AdvancedReaderError(
                     "integrity_error",
                     "PDF integrity verification failed.",
                     status_code=409,
                 )
+            if not cached:
+                cache.record(identity)
             result = cls(descriptor, observed=after, version=version)
             descriptor = None
             return result
@@ -237,7 +253,13 @@ class DocumentAccessService:
         inspect_integrity: bool,
     ) -> ResolvedPdfDocument:
         identifier = self._validated_document_id(document_id)
-        result = self.dependencies.reading_service.get_reader_context(identifier)
+        # Integrity-inspected opens reload so each reading session starts fresh.
+        result = self.dependencies.reader_context_cache.get(
+            self.dependencies.database_name,
+            identifier,
+            lambda: self.dependencies.reading_service.get_reader_context(identifier),
+            refresh=inspect_integrity,
+        )
         if result.status == ReadingOperationStatus.NOT_FOUND:
             raise AdvancedReaderError(
                 "document_not_found",
@@ -299,6 +321,28 @@ class DocumentAccessService:
                 raise AdvancedReaderError(code, message, status_code=status_code)
         return ResolvedPdfDocument(context, version)
 
+    def context_versions(self, resolved: ResolvedPdfDocument) -> tuple[int, ...]:
+        """Snapshot the cache counters before writing through ``resolved``."""
+        return self.dependencies.reader_context_cache.versions(
+            self.dependencies.database_name,
+            resolved.context.document.document_id,
+        )
+
+    def remember_reading_state(
+        self,
+        resolved: ResolvedPdfDocument,
+        state: DocumentReadingState,
+        before: tuple[int, ...],
+    ) -> None:
+        """Write a saved reading state through to the cached reader context."""
+        context = replace(resolved.context, reading_state=state, effective_status=state.status)
+        self.dependencies.reader_context_cache.record_write(
+            self.dependencies.database_name,
+            context.document.document_id,
+            before,
+            ReadingServiceResult(ReadingOperationStatus.SUCCESS, context),
+        )
+
     def open_verified_pdf(self, resolved: ResolvedPdfDocument) -> VerifiedPdfHandle:
         return VerifiedPdfHandle.open(self.dependencies, resolved.version)
 
@@ -316,6 +360,33 @@ class DocumentAccessService:
                 return label, f"Book page {label} · PDF page {pdf_page}"
         return None, f"PDF page {pdf_page}"
 
+    def page_labels(
+        self,
+        document_id: str,
+        first_page: int,
+        last_page: int,
+    ) -> list[tuple[int, str | None, str]]:
+        """Label ``first_page..last_page`` with one page-map lookup; absence stays nonblocking."""
+        if last_page < first_page or last_page - first_page >= MAX_PAGE_LABEL_RANGE:
+            raise AdvancedReaderError(
+                "page_invalid",
+                f"PDF page ranges must span 1 to {MAX_PAGE_LABEL_RANGE} ordered pages.",
+                status_code=422,
+            )
+        pages = range(first_page, last_page + 1)
+        result = self.dependencies.page_map_service.compute_page_labels(
+            document_id, first_page, last_page
+        )
+        labels: tuple[str | None, ...] = (None,) * len(pages)
+        if result.status == PageMapOperationStatus.SUCCESS and result.value is not None:
+            labels = result.value.labels
+        return [
+            (page, label, f"Book page {label} · PDF page {page}")
+            if label
+            else (page, None, f"PDF page {page}")
+            for page, label in zip(pages, labels, strict=True)
+        ]
+
 
 __all__ = [
     "AdvancedReaderError",
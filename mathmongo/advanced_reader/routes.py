@@ -24,13 +24,16 @@ from mathmongo.advanced_reader.range_requests import RangeRequestError
 from mathmongo.advanced_reader.range_requests import parse_range_header
 from mathmongo.advanced_reader.schemas import DocumentMetadataResponse
 from mathmongo.advanced_reader.schemas import HealthResponse
+from mathmongo.advanced_reader.schemas import PageLabelRangeResponse
 from mathmongo.advanced_reader.schemas import PageLabelResponse
 from mathmongo.advanced_reader.schemas import ReaderCapabilities
+from mathmongo.advanced_reader.schemas import ReaderContextCacheHealth
 from mathmongo.advanced_reader.schemas import ReadingPageUpdate
 from mathmongo.advanced_reader.schemas import ReadingStateResponse
 from mathmongo.advanced_reader.schemas import ReadingStateSummary
 from mathmongo.advanced_reader.schemas import ReferenceSummary
 from mathmongo.advanced_reader.schemas import SourceSummary
+from mathmongo.advanced_reader.schemas import VerificationCacheHealth
 from mathmongo.advanced_reader.schemas import VersionSummary
 from mathmongo.advanced_reader.schemas import VisualAnchorResponse
 from mathmongo.advanced_reader.schemas import VisualAnnotationCreate
@@ -97,6 +100,12 @@ def _visual_operation_error(status: ReadingAnnotationOperationStatus) -> Advance
             "Archived visual annotations cannot be edited.",
             status_code=409,
         )
+    if status == ReadingAnnotationOperationStatus.INVALID_CURSOR:
+        return AdvancedReaderError(
+            "invalid_page_cursor",
+            "The page cursor is malformed or belongs to another listing.",
+            status_code=400,
+        )
     if status == ReadingAnnotationOperationStatus.INVALID_STATE:
         return AdvancedReaderError(
             "visual_annotations_not_ready",
@@ -193,9 +202,21 @@ def build_api_router() -> APIRouter:
                 "The configured database is unavailable.",
                 status_code=503,
             )
+        cache_stats = dependencies.verification_cache.stats()
+        context_stats = dependencies.reader_context_cache.stats()
         return HealthResponse(
             database=dependencies.database_name,
             frontend_ready=dependencies.frontend_ready,
+            pdf_verification_cache=VerificationCacheHealth(
+                hits=cache_stats.hits,
+                misses=cache_stats.misses,
+                entries=cache_stats.entries,
+            ),
+            reader_context_cache=ReaderContextCacheHealth(
+                hits=context_stats.hits,
+                misses=context_stats.misses,
+                entries=context_stats.entries,
+            ),
         )
 
     @router.get("/documents/{document_id}", response_model=DocumentMetadataResponse)
@@ -365,6 +386,7 @@ def build_api_router() -> APIRouter:
                 "PDF page exceeds the known page count.",
                 status_code=422,
             )
+        before = access.context_versions(resolved)
         result = dependencies.reading_service.update_current_page(
             document_id,
             payload.pdf_page,
@@ -394,6 +416,7 @@ def build_api_router() -> APIRouter:
                 status_code=409,
             )
         state = result.value
+        access.remember_reading_state(resolved, state, before)
         return ReadingStateResponse(
             document_id=resolved.context.document.document_id,
             status=state.status.value,
@@ -423,6 +446,46 @@ def build_api_router() -> APIRouter:
             display_label=display_label,
         )
 
+    @router.get(
+        "/documents/{document_id}/page-labels",
+        response_model=PageLabelRangeResponse,
+    )
+    def page_labels(
+        document_id: str,
+        request: Request,
+        first_page: Annotated[int, Query(alias="from", strict=False, ge=1)] = 1,
+        last_page: Annotated[int | None, Query(alias="to", strict=False, ge=1)] = None,
+    ) -> PageLabelRangeResponse:
+        access = DocumentAccessService(_dependencies(request))
+        resolved = access.resolve_pdf(document_id, inspect_integrity=False)
+        known_total = getattr(resolved.context.reading_state, "total_pages", None)
+        if last_page is None and not isinstance(known_total, int):
+            raise AdvancedReaderError(
+                "page_invalid",
+                "The last PDF page is required while the page count is unknown.",
+                status_code=422,
+            )
+        last = last_page if last_page is not None else known_total
+        if isinstance(known_total, int) and last > known_total:
+            raise AdvancedReaderError(
+                "page_invalid",
+                "PDF page exceeds the known page count.",
+                status_code=422,
+            )
+        labels = access.page_labels(document_id, first_page, last)
+        return PageLabelRangeResponse(
+            first_page=first_page,
+            last_page=last,
+            labels=[
+                PageLabelResponse(
+                    pdf_page=page,
+                    book_page_label=book_label,
+                    display_label=display_label,
+                )
+                for page, book_label, display_label in labels
+            ],
+        )
+
     @router.get(
         "/documents/{document_id}/visual-annotations",
         response_model=VisualAnnotationListResponse,
@@ -434,6 +497,7 @@ def build_api_router() -> APIRouter:
         status: Literal["active", "archived", "all"] = "active",
         page: Annotated[int, Query(strict=False, ge=1, le=100_000)] = 1,
         limit: Annotated[int, Query(strict=False, ge=1, le=100)] = 50,
+        cursor: Annotated[str | None, Query(min_length=1, max_length=4_096)] = None,
     ) -> VisualAnnotationListResponse:
         dependencies = _dependencies(request)
         access = DocumentAccessService(dependencies)
@@ -444,6 +508,7 @@ def build_api_router() -> APIRouter:
             status=None if status == "all" else AnnotationStatus(status),
             page=page,
             page_size=limit,
+            cursor=cursor,
         )
         if not result.completed or result.value is None:
             raise _visual_operation_error(result.status)
@@ -471,6 +536,7 @@ def build_api_router() -> APIRouter:
             page_size=result.value.page_size,
             total=result.value.total,
             pages=result.value.pages,
+            next_cursor=result.value.next_cursor,
         )
 
     @router.post(
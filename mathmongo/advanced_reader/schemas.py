@@ -31,11 +31,25 @@ class TransportModel(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
 
+class VerificationCacheHealth(TransportModel):
+    hits: int = Field(ge=0)
+    misses: int = Field(ge=0)
+    entries: int = Field(ge=0)
+
+
+class ReaderContextCacheHealth(TransportModel):
+    hits: int = Field(ge=0)
+    misses: int = Field(ge=0)
+    entries: int = Field(ge=0)
+
+
 class HealthResponse(TransportModel):
     status: Literal["ok"] = "ok"
     service: Literal["mathmongo-advanced-reader"] = "mathmongo-advanced-reader"
     database: str
     frontend_ready: bool
+    pdf_verification_cache: VerificationCacheHealth
+    reader_context_cache: ReaderContextCacheHealth
 
 
 class ApiErrorDetail(TransportModel):
@@ -78,6 +92,12 @@ class PageLabelResponse(TransportModel):
     display_label: str
 
 
+class PageLabelRangeResponse(TransportModel):
+    first_page: int
+    last_page: int
+    labels: list[PageLabelResponse]
+
+
 class ReaderCapabilities(TransportModel):
     page_navigation: Literal[True] = True
     thumbnails: Literal[True] = True
@@ -267,6 +287,7 @@ class VisualAnnotationListResponse(TransportModel):
     page_size: int
     total: int
     pages: int
+    next_cursor: str | None = None
 
 
 __all__ = [
@@ -274,13 +295,16 @@ __all__ = [
     "ApiErrorResponse",
     "DocumentMetadataResponse",
     "HealthResponse",
+    "PageLabelRangeResponse",
     "PageLabelResponse",
     "ReaderCapabilities",
+    "ReaderContextCacheHealth",
     "ReadingPageUpdate",
     "ReadingStateResponse",
     "ReadingStateSummary",
     "ReferenceSummary",
     "SourceSummary",
+    "VerificationCacheHealth",
     "VersionSummary",
     "VisualAnchorResponse",
     "VisualAnnotationCreate",
@@ -0,0 +1,135 @@
+"""Process-wide memo of PDF blobs whose SHA-256 was already verified."""
+
+# ruff: noqa: D102,D107
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_TTL_SECONDS = 15 * 60.0
+
+
+@dataclass(frozen=True, slots=True)
+class VerifiedBlobIdentity:
+    """The expected SHA plus the exact ``fstat`` identity that produced it."""
+
+    sha256: str
+    device: int
+    inode: int
+    size: int
+    mtime_ns: int
+    ctime_ns: int
+
+    @classmethod
+    def from_stat(cls, sha256: str, observed: os.stat_result) -> VerifiedBlobIdentity:
+        return cls(
+            sha256=sha256,
+            device=observed.st_dev,
+            inode=observed.st_ino,
+            size=observed.st_size,
+            mtime_ns=observed.st_mtime_ns,
+            ctime_ns=observed.st_ctime_ns,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class VerificationCacheStats:
+    """Counters reported by ``/health``; never blob paths or identities."""
+
+    hits: int
+    misses: int
+    entries: int
+
+
+class VerifiedBlobCache:
+    """Bounded LRU of recent verifications; any identity change is a miss."""
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("Verification cache requires at least one entry")
+        if ttl_seconds <= 0:
+            raise ValueError("Verification cache requires a positive TTL")
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[VerifiedBlobIdentity, float] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def is_verified(self, identity: VerifiedBlobIdentity) -> bool:
+        """Count and answer one lookup; expired entries are dropped as misses."""
+        now = self._clock()
+        with self._lock:
+            verified_at = self._entries.get(identity)
+            if verified_at is not None and now - verified_at <= self._ttl_seconds:
+                self._entries.move_to_end(identity)
+                self._hits += 1
+                return True
+            if verified_at is not None:
+                del self._entries[identity]
+            self._misses += 1
+            return False
+
+    def record(self, identity: VerifiedBlobIdentity) -> None:
+        """Remember a completed full-hash verification for this exact identity."""
+        now = self._clock()
+        with self._lock:
+            stale = [
+                key
+                for key in self._entries
+                if key.sha256 == identity.sha256 and key != identity
+            ]
+            for key in stale:
+                del self._entries[key]
+            self._entries[identity] = now
+            self._entries.move_to_end(identity)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, sha256: str) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key.sha256 == sha256]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def stats(self) -> VerificationCacheStats:
+        with self._lock:
+            return VerificationCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                entries=len(self._entries),
+            )
+
+
+_PROCESS_CACHE = VerifiedBlobCache()
+
+
+def process_verification_cache() -> VerifiedBlobCache:
+    """Return the cache shared by every app built in this reader process."""
+    return _PROCESS_CACHE
+
+
+__all__ = [
+    "VerificationCacheStats",
+    "VerifiedBlobCache",
+    "VerifiedBlobIdentity",
+    "process_verification_cache",
+]
@@ -4,32 +4,53 @@ from __future__ import annotations
 
 import argparse
 import hashlib
+import io
 import json
+import os
 import platform
 import re
+import shutil
 import subprocess
 import sys
+import tempfile
+import time
 import zipfile
+from collections.abc import Callable
+from collections.abc import Iterator
 from collections.abc import Mapping
+from contextlib import ExitStack
+from datetime import datetime
+from datetime import timezone
 from pathlib import Path
 from types import SimpleNamespace
+from typing import IO
 from typing import Any
+from typing import TypeVar
 
 from bson.json_util import CANONICAL_JSON_OPTIONS
 from bson.json_util import dumps as bson_json_dumps
 from bson.json_util import loads as bson_json_loads
+from bson.json_util import object_hook as bson_object_hook
 
+from editor.utils import db_export
+from editor.utils import db_update
+from editor.utils.db_export import CATALOG_EXTENDED_JSON_ENCODING
 from editor.utils.db_export import export_database_to_zip
 from editor.utils.db_import import import_zip_into_database
 from editor.utils.db_import import inspect_export_zip
+from mathkb_config import EXPORT_TIMEOUT_SECONDS
+from mathkb_config import PORTABLE_EXTENDED_JSON_COLLECTIONS
 from mathmongo.config import AppConfig
 from mathmongo.config import active_database_diagnostic
 from mathmongo.config import resolve_config
 from mathmongo.config import sanitize_mongo_error
+from mathmongo.legacy_concept_aliases import REGISTRY_SHA256
 from mathmongo.paths import get_backups_dir
 from mathmongo.paths import validate_mutable_path
+from mathmongo.source_documents.storage import SourceDocumentBlobStore
 
 BACKUP_FORMAT = "mathmongo_verified_backup_v1"
+INCREMENTAL_BACKUP_FORMAT = "mathmongo_incremental_backup_v1"
 MANIFEST_SUFFIX = ".manifest.json"
 _SAFE_DATABASE_NAME = re.compile(r"^[A-Za-z0-9_-]{1,63}$")
 _SYSTEM_DATABASES = frozenset({"admin", "config", "local"})
@@ -39,6 +60,9 @@ _COLLECTION_OPTION_KEYS = (
     "validationLevel",
     "validationTimeoutMS",
 )
+_T = TypeVar("_T")
+_JSON_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_JSON_CHUNK_CHARS = 1024 * 1024
 _INDEX_OPTION_KEYS = (
     "unique",
     "sparse",
@@ -53,12 +77,18 @@ class BackupError(RuntimeError):
     """Raised when a backup cannot be proven complete or safe to restore."""
 
 
-def _sha256_file(path: Path) -> str:
+def _sha256_stream(handle: IO[bytes]) -> tuple[str, int]:
     digest = hashlib.sha256()
+    size = 0
+    for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+        digest.update(chunk)
+        size += len(chunk)
+    return digest.hexdigest(), size
+
+
+def _sha256_file(path: Path) -> str:
     with path.open("rb") as handle:
-        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
-            digest.update(chunk)
-    return digest.hexdigest()
+        return _sha256_stream(handle)[0]
 
 
 def _zip_member_inventory(path: Path) -> dict[str, dict[str, int | str]]:
@@ -67,11 +97,9 @@ def _zip_member_inventory(path: Path) -> dict[str, dict[str, int | str]]:
         for info in sorted(archive.infolist(), key=lambda item: item.filename):
             if info.is_dir():
                 continue
-            data = archive.read(info)
-            inventory[info.filename] = {
-                "sha256": hashlib.sha256(data).hexdigest(),
-                "size_bytes": len(data),
-            }
+            with archive.open(info) as member:
+                digest, size = _sha256_stream(member)
+            inventory[info.filename] = {"sha256": digest, "size_bytes": size}
     return inventory
 
 
@@ -190,11 +218,44 @@ def _read_manifest(path: str | Path) -> tuple[Path, dict[str, Any]]:
         payload = bson_json_loads(manifest_path.read_text(encoding="utf-8"))
     except (OSError, ValueError, json.JSONDecodeError) as exc:
         raise BackupError("Backup manifest could not be read.") from exc
-    if not isinstance(payload, dict) or payload.get("format") != BACKUP_FORMAT:
+    if not isinstance(payload, dict) or payload.get("format") not in {
+        BACKUP_FORMAT,
+        INCREMENTAL_BACKUP_FORMAT,
+    }:
         raise BackupError("Backup manifest has an unsupported format.")
     return manifest_path, payload
 
 
+def _archive_identity(archive_path: Path) -> dict[str, Any]:
+    return {
+        "filename": archive_path.name,
+        "sha256": _sha256_file(archive_path),
+        "size_bytes": archive_path.stat().st_size,
+        "members": _zip_member_inventory(archive_path),
+    }
+
+
+def _verified_archive_path(path: Path, manifest: Mapping[str, Any]) -> Path:
+    """Return the manifest's archive after checking its bytes and member inventory."""
+    archive = manifest.get("archive")
+    if not isinstance(archive, Mapping):
+        raise BackupError("Backup manifest has no archive identity.")
+    filename = archive.get("filename")
+    if not isinstance(filename, str) or Path(filename).name != filename:
+        raise BackupError("Backup manifest archive filename is unsafe.")
+    archive_path = path.parent / filename
+    if not archive_path.is_file() or archive_path.is_symlink():
+        raise BackupError("Backup archive is missing or unsafe.")
+    if archive.get("sha256") != _sha256_file(archive_path):
+        raise BackupError("Backup archive SHA-256 does not match its manifest.")
+    if archive.get("size_bytes") != archive_path.stat().st_size:
+        raise BackupError("Backup archive size does not match its manifest.")
+    members = archive.get("members")
+    if not isinstance(members, Mapping) or _zip_member_inventory(archive_path) != dict(members):
+        raise BackupError("Backup archive member inventory does not match its manifest.")
+    return archive_path
+
+
 def create_verified_backup(
     mongo: Any,
     output_directory: str | Path,
@@ -242,12 +303,7 @@ def create_verified_backup(
             "pymongo": _pymongo_version(),
             **(_server_facts(client) if client is not None else {}),
         },
-        "archive": {
-            "filename": archive_path.name,
-            "sha256": _sha256_file(archive_path),
-            "size_bytes": archive_path.stat().st_size,
-            "members": _zip_member_inventory(archive_path),
-        },
+        "archive": _archive_identity(archive_path),
         "archive_collection_counts": archive_counts,
         "database_structure": after,
         "restore_structure": _restore_structure(after, archive_counts),
@@ -267,24 +323,15 @@ def _pymongo_version() -> str:
 
 
 def verify_backup(manifest_path: str | Path) -> dict[str, Any]:
-    """Verify archive bytes, member hashes and metadata without touching MongoDB."""
+    """Verify archive bytes, member hashes and metadata without touching MongoDB.
+
+    An incremental manifest is verified together with every link of its chain.
+    """
     path, manifest = _read_manifest(manifest_path)
-    archive = manifest.get("archive")
-    if not isinstance(archive, Mapping):
-        raise BackupError("Backup manifest has no archive identity.")
-    filename = archive.get("filename")
-    if not isinstance(filename, str) or Path(filename).name != filename:
-        raise BackupError("Backup manifest archive filename is unsafe.")
-    archive_path = path.parent / filename
-    if not archive_path.is_file() or archive_path.is_symlink():
-        raise BackupError("Backup archive is missing or unsafe.")
-    if archive.get("sha256") != _sha256_file(archive_path):
-        raise BackupError("Backup archive SHA-256 does not match its manifest.")
-    if archive.get("size_bytes") != archive_path.stat().st_size:
-        raise BackupError("Backup archive size does not match its manifest.")
-    members = archive.get("members")
-    if not isinstance(members, Mapping) or _zip_member_inventory(archive_path) != dict(members):
-        raise BackupError("Backup archive member inventory does not match its manifest.")
+    if manifest["format"] == INCREMENTAL_BACKUP_FORMAT:
+        return _verify_backup_chain(path)
+    archive_path = _verified_archive_path(path, manifest)
+    members = manifest["archive"]["members"]
     inspection = inspect_export_zip(archive_path)
     expected_counts = manifest.get("archive_collection_counts")
     if not isinstance(expected_counts, Mapping):
@@ -358,7 +405,19 @@ def restore_to_new_database(
     target_database: str,
     mongo_uri: str | None = None,
 ) -> dict[str, Any]:
-    """Restore a verified archive only into a previously absent non-MathV0 database."""
+    """Restore a verified archive only into a previously absent non-MathV0 database.
+
+    An incremental chain is first compacted into a scratch full backup.
+    """
+    _, head = _read_manifest(manifest_path)
+    if head["format"] == INCREMENTAL_BACKUP_FORMAT:
+        with tempfile.TemporaryDirectory(prefix="mathmongo_restore_") as scratch:
+            _, compacted = compact_backup_chain(manifest_path, scratch)
+            return restore_to_new_database(
+                compacted,
+                target_database=target_database,
+                mongo_uri=mongo_uri,
+            )
     verification = verify_backup(manifest_path)
     _, manifest = _read_manifest(manifest_path)
     source = manifest["source"]
@@ -396,8 +455,606 @@ def restore_to_new_database(
         raise BackupError(sanitize_mongo_error(exc, uri)) from exc
 
 
-def backup_from_config(output_directory: str | Path | None = None) -> tuple[Path, Path]:
-    """Create a backup of the explicitly configured database."""
+class _DigestingWriter:
+    """Forward writes to a binary stream while hashing them."""
+
+    def __init__(self, stream: IO[bytes]) -> None:
+        """Wrap ``stream``."""
+        self._stream = stream
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        """Hash and forward one chunk."""
+        self.digest.update(data)
+        self.size += len(data)
+        return self._stream.write(data)
+
+
+def _document_entry(document: Mapping[str, Any]) -> tuple[str, str]:
+    """Return the ``_id`` key and content hash an incremental chain tracks per document."""
+    if "_id" not in document:
+        raise BackupError("Incremental backups require every document to carry an _id.")
+    return db_update._canonical(document["_id"]), db_update._content_hash(document)
+
+
+def _archive_base_dir(archive: zipfile.ZipFile) -> str:
+    base_dirs = {name.split("/", 1)[0] for name in archive.namelist() if "/" in name}
+    if len(base_dirs) != 1:
+        raise BackupError("Backup archive has an ambiguous base directory.")
+    return base_dirs.pop()
+
+
+def _archived_documents(
+    archive: zipfile.ZipFile,
+    member_name: str,
+    *,
+    extended_json: bool,
+) -> Iterator[dict[str, Any]]:
+    """Yield the documents of one archived collection without reading the member whole.
+
+    The member is decoded in bounded chunks and each array element is parsed as
+    soon as it is complete, so memory follows the largest document rather than
+    the largest collection.
+    """
+    decoder = (
+        json.JSONDecoder(object_hook=lambda obj: bson_object_hook(obj, CANONICAL_JSON_OPTIONS))
+        if extended_json
+        else json.JSONDecoder()
+    )
+    invalid = f"Backup archive member {member_name!r} is not a valid JSON document array."
+    with archive.open(member_name) as member:
+        text = io.TextIOWrapper(member, encoding="utf-8")
+        buffer = ""
+        position = 0
+        exhausted = False
+
+        def next_token() -> str:
+            """Skip whitespace, reading more text as needed; return ``""`` at the end."""
+            nonlocal buffer, position, exhausted
+            while True:
+                position = _JSON_WHITESPACE.match(buffer, position).end()
+                if position < len(buffer) or exhausted:
+                    return buffer[position : position + 1]
+                chunk = text.read(_JSON_CHUNK_CHARS)
+                exhausted = not chunk
+                buffer, position = buffer[position:] + chunk, 0
+
+        try:
+            if next_token() != "[":
+                raise BackupError(invalid)
+            position += 1
+            separator = ""
+            while (token := next_token()) != "]":
+                if separator:
+                    if token != ",":
+                        raise BackupError(invalid)
+                    position += 1
+                    next_token()
+                while True:
+                    try:
+                        document, end = decoder.raw_decode(buffer, position)
+                        break
+                    except json.JSONDecodeError:
+                        if exhausted:
+                            raise
+                        chunk = text.read(_JSON_CHUNK_CHARS)
+                        exhausted = not chunk
+                        buffer, position = buffer[position:] + chunk, 0
+                if not isinstance(document, dict):
+                    raise BackupError(invalid)
+                position = end
+                separator = ","
+                yield document
+            position += 1
+            if next_token():
+                raise BackupError(invalid)
+        except (UnicodeDecodeError, ValueError) as exc:
+            raise BackupError(invalid) from exc
+
+
+def _full_backup_state(archive_path: Path) -> dict[str, Any]:
+    """Derive per-document hashes, media and blob identities from a full backup archive."""
+    with zipfile.ZipFile(archive_path) as archive:
+        base_dir = _archive_base_dir(archive)
+        metadata = json.loads(archive.read(f"{base_dir}/metadata.json"))
+        if not isinstance(metadata, dict) or not isinstance(metadata.get("collections"), dict):
+            raise BackupError("Backup archive metadata has no collection inventory.")
+        encodings = metadata.get("collection_encodings") or {}
+        collections: dict[str, Any] = {}
+        for name in metadata["collections"]:
+            extended_json = encodings.get(name) == CATALOG_EXTENDED_JSON_ENCODING
+            documents: dict[str, str] = {}
+            member_name = f"{base_dir}/collections/{name}.json"
+            for document in _archived_documents(archive, member_name, extended_json=extended_json):
+                key, digest = _document_entry(document)
+                if key in documents:
+                    raise BackupError(f"Backup collection {name!r} repeats a document _id.")
+                documents[key] = digest
+            collections[name] = {"extended_json": extended_json, "documents": documents}
+        media: dict[str, Any] = {}
+        for relative_name in metadata.get("media_files") or {}:
+            with archive.open(f"{base_dir}/{relative_name}") as member:
+                digest, size = _sha256_stream(member)
+            # A full archive keeps no mtimes, so the first delta hashes every media file.
+            media[relative_name] = {"sha256": digest, "size_bytes": size, "mtime_ns": None}
+        blobs = dict(metadata.get("source_document_blobs") or {})
+    return {"collections": collections, "media": media, "blobs": blobs}
+
+
+def _chain_state_counts(state: Mapping[str, Any]) -> dict[str, int]:
+    return {name: len(item["documents"]) for name, item in state["collections"].items()}
+
+
+def _backup_chain(manifest_path: str | Path) -> list[tuple[Path, dict[str, Any], Path]]:
+    """Return ``(manifest path, manifest, archive path)`` links from the full base to the tip.
+
+    Every archive is checked against its manifest and every parent manifest
+    against the SHA-256 its child recorded, so no link can be swapped.
+    """
+    links: list[tuple[Path, dict[str, Any], Path]] = []
+    path, manifest = _read_manifest(manifest_path)
+    while True:
+        if manifest["format"] == BACKUP_FORMAT:
+            archive_path = verify_backup(path)["archive_path"]
+            links.append((path, manifest, archive_path))
+            break
+        links.append((path, manifest, _verified_archive_path(path, manifest)))
+        parent = manifest.get("parent")
+        filename = parent.get("manifest") if isinstance(parent, Mapping) else None
+        if not isinstance(filename, str) or Path(filename).name != filename:
+            raise BackupError("Incremental backup manifest has no safe parent manifest.")
+        parent_path = path.parent / filename
+        if any(parent_path == link_path for link_path, _manifest, _archive in links):
+            raise BackupError("Incremental backup chain contains a cycle.")
+        if not parent_path.is_file() or parent_path.is_symlink():
+            raise BackupError("Incremental backup parent manifest is missing or unsafe.")
+        if parent.get("sha256") != _sha256_file(parent_path):
+            raise BackupError("Incremental backup parent manifest does not match its SHA-256.")
+        path, manifest = _read_manifest(parent_path)
+    links.reverse()
+    return links
+
+
+def _verify_backup_chain(manifest_path: Path) -> dict[str, Any]:
+    chain = _backup_chain(manifest_path)
+    for _path, manifest, archive_path in chain[1:]:
+        state = manifest.get("state")
+        if not isinstance(state, Mapping):
+            raise BackupError("Incremental backup manifest has no chain state.")
+        if manifest.get("archive_collection_counts") != _chain_state_counts(state):
+            raise BackupError("Incremental backup counts do not match its chain state.")
+        with zipfile.ZipFile(archive_path) as archive:
+            base_dir = _archive_base_dir(archive)
+            for name, item in state["collections"].items():
+                member_name = f"{base_dir}/collections/{name}.json"
+                count = 0
+                matches = True
+                for document in _archived_documents(
+                    archive,
+                    member_name,
+                    extended_json=item["extended_json"],
+                ):
+                    key, digest = _document_entry(document)
+                    matches = matches and item["documents"].get(key) == digest
+                    count += 1
+                upserted = manifest["changes"]["collections"][name]["upserted"]
+                if count != upserted or not matches:
+                    raise BackupError(
+                        f"Incremental backup documents of {name!r} do not match the chain state."
+                    )
+    tip_path, tip, tip_archive = chain[-1]
+    return {
+        "archive_path": tip_archive,
+        "database_name": tip["source"]["database"],
+        "collections": tip["archive_collection_counts"],
+        "members": len(tip["archive"]["members"]),
+        "chain_length": len(chain),
+    }
+
+
+def _open_new_archive(path: Path) -> IO[bytes]:
+    flags = (
+        os.O_WRONLY
+        | os.O_CREAT
+        | os.O_EXCL
+        | getattr(os, "O_CLOEXEC", 0)
+        | getattr(os, "O_NOFOLLOW", 0)
+    )
+    return os.fdopen(os.open(path, flags, 0o600), "wb")
+
+
+def _write_incremental_archive(
+    database: Any,
+    archive_path: Path,
+    previous: Mapping[str, Any],
+    *,
+    blob_store: SourceDocumentBlobStore | None,
+) -> tuple[dict[str, Any], dict[str, Any], list[dict[str, str]]]:
+    """Stream changed documents, media and PDF blobs into a new delta archive.
+
+    Returns the chain state after this run, the change summary and the legacy
+    Concept normalizations the export pipeline applied.
+    """
+    started_at = time.monotonic()
+    base_name = archive_path.stem
+    identities = db_export._ExportIdentityIndex()
+    normalizations: list[Any] = []
+    state: dict[str, Any] = {"collections": {}, "media": {}, "blobs": {}}
+    changes: dict[str, Any] = {"collections": {}}
+    with _open_new_archive(archive_path) as handle:
+        with zipfile.ZipFile(handle, "w", zipfile.ZIP_DEFLATED) as archive:
+            for name in db_export._scheduled_collection_names(
+                database,
+                include_all_collections=False,
+            ):
+                extended_json = name in PORTABLE_EXTENDED_JSON_COLLECTIONS
+                known = previous["collections"].get(name, {}).get("documents", {})
+                documents: dict[str, str] = {}
+                with archive.open(
+                    f"{base_name}/collections/{name}.json",
+                    "w",
+                    force_zip64=True,
+                ) as member:
+                    writer = db_export._JsonArrayWriter(member)
+                    for batch in db_export._exported_batches(
+                        database,
+                        name,
+                        use_extended_json=extended_json,
+                        started_at=started_at,
+                        identities=identities,
+                        legacy_normalizations=normalizations,
+                    ):
+                        changed: list[str] = []
+                        for document, encoded in batch:
+                            key, digest = _document_entry(document)
+                            if key in documents:
+                                raise BackupError(f"Collection {name!r} repeats a document _id.")
+                            documents[key] = digest
+                            if known.get(key) != digest:
+                                changed.append(encoded)
+                        writer.write_all(changed)
+                    writer.close()
+                state["collections"][name] = {
+                    "extended_json": extended_json,
+                    "documents": documents,
+                }
+                changes["collections"][name] = {
+                    "upserted": writer.count,
+                    "deleted": sorted(set(known) - set(documents)),
+                }
+            identities.validate()
+
+            upserted_media: list[str] = []
+            for relative_name, source in sorted(db_export._media_inventory().items()):
+                info = source.stat(follow_symlinks=False)
+                known = previous["media"].get(relative_name)
+                if known is not None and (known["size_bytes"], known["mtime_ns"]) == (
+                    info.st_size,
+                    info.st_mtime_ns,
+                ):
+                    state["media"][relative_name] = known
+                    continue
+                digest = _sha256_file(source)
+                if known is None or known["sha256"] != digest:
+                    with archive.open(
+                        f"{base_name}/{relative_name}",
+                        "w",
+                        force_zip64=True,
+                    ) as member:
+                        _size, copied = db_export._copy_stable_media_file(source, member)
+                    if copied != digest:
+                        raise BackupError(f"Media changed during incremental backup: {source}")
+                    upserted_media.append(relative_name)
+                state["media"][relative_name] = {
+                    "sha256": digest,
+                    "size_bytes": info.st_size,
+                    "mtime_ns": info.st_mtime_ns,
+                }
+            changes["media"] = {
+                "upserted": upserted_media,
+                "deleted": sorted(set(previous["media"]) - set(state["media"])),
+            }
+
+            upserted_blobs: list[str] = []
+            for version in sorted(
+                identities.current_pdf_versions,
+                key=lambda item: item.logical_path,
+            ):
+                identity = {"sha256": version.sha256, "size_bytes": version.size_bytes}
+                if state["blobs"].setdefault(version.logical_path, identity) != identity:
+                    raise BackupError("Source Document SHA path resolved to different PDF bytes.")
+                if previous["blobs"].get(version.logical_path) == identity:
+                    continue
+                if version.logical_path in upserted_blobs:
+                    continue
+                blob_store = blob_store or SourceDocumentBlobStore()
+                with archive.open(
+                    f"{base_name}/{version.logical_path}",
+                    "w",
+                    force_zip64=True,
+                ) as member:
+                    blob_store.copy_version(version, member)
+                upserted_blobs.append(version.logical_path)
+            changes["blobs"] = {
+                "upserted": upserted_blobs,
+                "deleted": sorted(set(previous["blobs"]) - set(state["blobs"])),
+            }
+        handle.flush()
+        os.fsync(handle.fileno())
+    return (
+        state,
+        changes,
+        [
+            {
+                "collection": item.collection,
+                "record_id": item.record_id,
+                "legacy_id": item.legacy_identity[0],
+                "legacy_source": item.legacy_identity[1],
+                "canonical_id": item.canonical_identity[0],
+                "canonical_source": item.canonical_identity[1],
+            }
+            for item in normalizations
+        ],
+    )
+
+
+def _timestamped_archive(output_root: Path, prefix: str) -> Path:
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S_%f")
+    archive_path = output_root / f"{prefix}_{timestamp}.zip"
+    return validate_mutable_path(archive_path, allowed_root=output_root)
+
+
+def create_incremental_backup(
+    mongo: Any,
+    parent_manifest: str | Path,
+    *,
+    config: AppConfig | None = None,
+    source_document_blob_store: SourceDocumentBlobStore | None = None,
+) -> tuple[Path, Path]:
+    """Write only what changed since ``parent_manifest`` into a chained delta archive.
+
+    Documents are compared by ``_id`` and content hash, media by size and
+    mtime (then SHA-256), PDF blobs by their content address. The manifest
+    records the full chain state, so the next run only reads its parent.
+    """
+    database = getattr(mongo, "db", None)
+    if database is None or not hasattr(database, "list_collections"):
+        raise BackupError("Verified backup requires an explicit MongoDB database handle.")
+    database_name = str(getattr(database, "name", "") or "")
+    chain = _backup_chain(parent_manifest)
+    parent_path, parent, parent_archive = chain[-1]
+    if database_name != parent["source"]["database"]:
+        raise BackupError("Incremental backup must read the database of its base backup.")
+    previous = (
+        parent["state"]
+        if parent["format"] == INCREMENTAL_BACKUP_FORMAT
+        else _full_backup_state(parent_archive)
+    )
+    output_root = validate_mutable_path(parent_path.parent)
+    archive_path = _timestamped_archive(output_root, "mathkb_delta")
+
+    before = database_structure(database)
+    try:
+        state, changes, normalizations = _write_incremental_archive(
+            database,
+            archive_path,
+            previous,
+            blob_store=source_document_blob_store,
+        )
+        after = database_structure(database)
+        archive_counts = _chain_state_counts(state)
+        live_counts = {name: item["count"] for name, item in after.items()}
+        if (
+            before != after
+            or any(archive_counts.get(name) != count for name, count in live_counts.items())
+            or any(count != 0 for name, count in archive_counts.items() if name not in live_counts)
+        ):
+            raise BackupError(
+                "Backup source changed while exporting or the archive collection inventory is "
+                "incomplete."
+            )
+    except BaseException:
+        archive_path.unlink(missing_ok=True)
+        raise
+
+    settings = config or resolve_config()
+    client = getattr(mongo, "client", None)
+    manifest = {
+        "format": INCREMENTAL_BACKUP_FORMAT,
+        "created_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        "source": {
+            **active_database_diagnostic(settings),
+            "database": database_name,
+        },
+        "toolchain": {
+            "git_head": _git_head(),
+            "python": platform.python_version(),
+            "pymongo": _pymongo_version(),
+            **(_server_facts(client) if client is not None else {}),
+        },
+        "parent": {"manifest": parent_path.name, "sha256": _sha256_file(parent_path)},
+        "archive": _archive_identity(archive_path),
+        "changes": changes,
+        "state": state,
+        "legacy_concept_registry_sha256": REGISTRY_SHA256,
+        "legacy_concept_normalizations": normalizations,
+        "archive_collection_counts": archive_counts,
+        "database_structure": after,
+        "restore_structure": _restore_structure(after, archive_counts),
+    }
+    manifest_path = _manifest_path(archive_path)
+    _write_manifest(manifest_path, manifest)
+    return archive_path, manifest_path
+
+
+def _newest_member(
+    archives: list[tuple[zipfile.ZipFile, str]],
+    relative_name: str,
+) -> tuple[zipfile.ZipFile, str]:
+    for archive, base_dir in reversed(archives):
+        member_name = f"{base_dir}/{relative_name}"
+        if member_name in archive.NameToInfo:
+            return archive, member_name
+    raise BackupError(f"Backup chain has no copy of {relative_name!r}.")
+
+
+def compact_backup_chain(
+    manifest_path: str | Path,
+    output_directory: str | Path | None = None,
+) -> tuple[Path, Path]:
+    """Fold a full backup and its incremental links into a new full verified backup.
+
+    Each document, media file and PDF blob is copied from the newest link that
+    holds it and checked against the tip's chain state. The result is an
+    ordinary export archive plus a ``mathmongo_verified_backup_v1`` manifest.
+    """
+    chain = _backup_chain(manifest_path)
+    tip_path, tip, _tip_archive = chain[-1]
+    if tip["format"] != INCREMENTAL_BACKUP_FORMAT:
+        raise BackupError("Only an incremental backup chain can be compacted.")
+    state = tip["state"]
+    output_root = validate_mutable_path(output_directory or tip_path.parent)
+    output_root.mkdir(parents=True, exist_ok=True, mode=0o700)
+    archive_path = _timestamped_archive(output_root, "mathkb_export")
+    base_name = archive_path.stem
+    metadata: dict[str, Any] = {
+        "format": "mathkb_legacy_export",
+        "format_version": 1,
+        "database_name": tip["source"]["database"],
+        "exported_at": tip["created_at"],
+        "timeout_seconds": EXPORT_TIMEOUT_SECONDS,
+        "collections": {},
+        "collection_encodings": {},
+        "media_files": {},
+        "media_sha256": {},
+        "source_document_blobs": {},
+        "legacy_concept_registry_sha256": tip["legacy_concept_registry_sha256"],
+        "legacy_concept_normalizations": tip["legacy_concept_normalizations"],
+        "compacted_from": [link_path.name for link_path, _manifest, _archive in chain],
+    }
+    legacy_encoder = json.JSONEncoder(ensure_ascii=False, indent=2)
+    try:
+        with ExitStack() as stack:
+            links: list[tuple[zipfile.ZipFile, str, Mapping[str, Any]]] = []
+            for _path, manifest, link_archive in chain:
+                archive = stack.enter_context(zipfile.ZipFile(link_archive))
+                base_dir = _archive_base_dir(archive)
+                if manifest["format"] == BACKUP_FORMAT:
+                    link_metadata = json.loads(archive.read(f"{base_dir}/metadata.json"))
+                    encodings = link_metadata.get("collection_encodings") or {}
+                    extended = {
+                        name: encodings.get(name) == CATALOG_EXTENDED_JSON_ENCODING
+                        for name in link_metadata.get("collections", {})
+                    }
+                else:
+                    extended = {
+                        name: item["extended_json"]
+                        for name, item in manifest["state"]["collections"].items()
+                    }
+                links.append((archive, base_dir, extended))
+            handle = stack.enter_context(_open_new_archive(archive_path))
+            output = stack.enter_context(zipfile.ZipFile(handle, "w", zipfile.ZIP_DEFLATED))
+            for name, item in sorted(state["collections"].items()):
+                expected = dict(item["documents"])
+                with output.open(
+                    f"{base_name}/collections/{name}.json",
+                    "w",
+                    force_zip64=True,
+                ) as member:
+                    writer = db_export._JsonArrayWriter(member)
+                    for archive, base_dir, extended in reversed(links):
+                        member_name = f"{base_dir}/collections/{name}.json"
+                        if not expected or member_name not in archive.NameToInfo:
+                            continue
+                        found: list[str] = []
+                        for document in _archived_documents(
+                            archive,
+                            member_name,
+                            extended_json=extended.get(name, False),
+                        ):
+                            key, digest = _document_entry(document)
+                            if expected.get(key) != digest:
+                                continue
+                            del expected[key]
+                            found.append(
+                                bson_json_dumps(
+                                    document,
+                                    json_options=CANONICAL_JSON_OPTIONS,
+                                    ensure_ascii=False,
+                                    indent=2,
+                                )
+                                if item["extended_json"]
+                                else legacy_encoder.encode(document)
+                            )
+                        writer.write_all(found)
+                    writer.close()
+                if expected:
+                    raise BackupError(f"Backup chain is missing documents of {name!r}.")
+                metadata["collections"][name] = writer.count
+                if item["extended_json"]:
+                    metadata["collection_encodings"][name] = CATALOG_EXTENDED_JSON_ENCODING
+
+            archives = [(archive, base_dir) for archive, base_dir, _extended in links]
+            for relative_name, identity in sorted(state["media"].items()):
+                archive, member_name = _newest_member(archives, relative_name)
+                with archive.open(member_name) as source, output.open(
+                    f"{base_name}/{relative_name}",
+                    "w",
+                    force_zip64=True,
+                ) as member:
+                    copy = _DigestingWriter(member)
+                    shutil.copyfileobj(source, copy)
+                if copy.digest.hexdigest() != identity["sha256"]:
+                    raise BackupError(f"Backup chain media {relative_name!r} does not match.")
+                metadata["media_files"][relative_name] = copy.size
+                metadata["media_sha256"][relative_name] = identity["sha256"]
+            for logical_path, identity in sorted(state["blobs"].items()):
+                archive, member_name = _newest_member(archives, logical_path)
+                with archive.open(member_name) as source, output.open(
+                    f"{base_name}/{logical_path}",
+                    "w",
+                    force_zip64=True,
+                ) as member:
+                    copy = _DigestingWriter(member)
+                    shutil.copyfileobj(source, copy)
+                if {"sha256": copy.digest.hexdigest(), "size_bytes": copy.size} != dict(identity):
+                    raise BackupError(f"Backup chain blob {logical_path!r} does not match.")
+                metadata["source_document_blobs"][logical_path] = dict(identity)
+            output.writestr(
+                f"{base_name}/metadata.json",
+                json.dumps(metadata, ensure_ascii=False, indent=2),
+            )
+            output.close()
+            handle.flush()
+            os.fsync(handle.fileno())
+        archive_counts = inspect_export_zip(archive_path).get("collections", {})
+        if archive_counts != _chain_state_counts(state):
+            raise BackupError("Compacted archive collection counts do not match the chain state.")
+    except BaseException:
+        archive_path.unlink(missing_ok=True)
+        raise
+
+    manifest = {
+        "format": BACKUP_FORMAT,
+        "source": tip["source"],
+        "toolchain": tip["toolchain"],
+        "compacted_from": {
+            "manifest": tip_path.name,
+            "sha256": _sha256_file(tip_path),
+            "links": len(chain),
+        },
+        "archive": _archive_identity(archive_path),
+        "archive_collection_counts": archive_counts,
+        "database_structure": tip["database_structure"],
+        "restore_structure": tip["restore_structure"],
+    }
+    manifest_path = _manifest_path(archive_path)
+    _write_manifest(manifest_path, manifest)
+    return archive_path, manifest_path
+
+
+def _with_configured_database(action: Callable[[SimpleNamespace, AppConfig], _T]) -> _T:
     settings = resolve_config()
     uri = settings.mongo_uri
     try:
@@ -405,10 +1062,9 @@ def backup_from_config(output_directory: str | Path | None = None) -> tuple[Path
 
         client = MongoClient(uri, serverSelectionTimeoutMS=5000)
         try:
-            return create_verified_backup(
+            return action(
                 SimpleNamespace(db=client[settings.mongo_database], client=client),
-                output_directory or get_backups_dir(),
-                config=settings,
+                settings,
             )
         finally:
             client.close()
@@ -418,11 +1074,40 @@ def backup_from_config(output_directory: str | Path | None = None) -> tuple[Path
         raise BackupError(sanitize_mongo_error(exc, uri)) from exc
 
 
+def backup_from_config(output_directory: str | Path | None = None) -> tuple[Path, Path]:
+    """Create a backup of the explicitly configured database."""
+    return _with_configured_database(
+        lambda mongo, settings: create_verified_backup(
+            mongo,
+            output_directory or get_backups_dir(),
+            config=settings,
+        )
+    )
+
+
+def incremental_backup_from_config(parent_manifest: str | Path) -> tuple[Path, Path]:
+    """Chain an incremental backup of the configured database to ``parent_manifest``."""
+    return _with_configured_database(
+        lambda mongo, settings: create_incremental_backup(mongo, parent_manifest, config=settings)
+    )
+
+
 def _parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(prog="python -m mathmongo.backup")
     subparsers = parser.add_subparsers(dest="command", required=True)
     backup = subparsers.add_parser("backup", help="Create a verified backup of the configured database.")
     backup.add_argument("--output-dir", type=Path)
+    incremental = subparsers.add_parser(
+        "incremental-backup",
+        help="Write only changes since a verified backup, chained to its manifest.",
+    )
+    incremental.add_argument("parent_manifest", type=Path)
+    compact = subparsers.add_parser(
+        "compact-backup",
+        help="Fold an incremental backup chain into a new full verified backup.",
+    )
+    compact.add_argument("manifest", type=Path)
+    compact.add_argument("--output-dir", type=Path)
     verify = subparsers.add_parser("verify-backup", help="Verify a backup manifest and archive hashes.")
     verify.add_argument("manifest", type=Path)
     restore = subparsers.add_parser("restore-to-new-database", help="Restore only to a new non-MathV0 database.")
@@ -442,6 +1127,14 @@ def main(argv: list[str] | None = None) -> int:
             archive, manifest = backup_from_config(args.output_dir)
             print(f"Backup: {archive}")
             print(f"Manifest: {manifest}")
+        elif args.command == "incremental-backup":
+            archive, manifest = incremental_backup_from_config(args.parent_manifest)
+            print(f"Incremental backup: {archive}")
+            print(f"Manifest: {manifest}")
+        elif args.command == "compact-backup":
+            archive, manifest = compact_backup_chain(args.manifest, args.output_dir)
+            print(f"Backup: {archive}")
+            print(f"Manifest: {manifest}")
         elif args.command in {"verify-backup", "doctor-backup"}:
             result = verify_backup(args.manifest)
             print(json.dumps(result, ensure_ascii=False, default=str, indent=2))
@@ -0,0 +1,354 @@
+"""Ranked token search over legacy concept metadata and LaTeX bodies.
+
+The ``concept_search_index`` collection holds one derived entry per concept:
+accent-folded tokens (``suggestion_key``) from titles, ids, categories, tags,
+types and the LaTeX body, plus per-token metadata weights. It is opt-in: a
+full rebuild writes a ready marker, writers refresh the identities they touch,
+and every search falls back to the caller's regex path while the marker is
+absent. Entries only ever yield identities; callers resolve the projected
+concept metadata themselves.
+"""
+
+from __future__ import annotations
+
+import heapq
+import re
+import uuid
+from collections.abc import Iterable
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import datetime
+from datetime import timezone
+from typing import Any
+
+from pymongo import ASCENDING
+from pymongo import DeleteOne
+from pymongo import ReplaceOne
+from pymongo.database import Database
+from pymongo.errors import PyMongoError
+
+from mathmongo.source_catalog.normalization import suggestion_key
+
+CONCEPT_SEARCH_INDEX_COLLECTION = "concept_search_index"
+READY_MARKER_ID = "__concept_search_index__"
+FIELD_WEIGHTS = {
+    "titulo": 8,
+    "title": 8,
+    "nombre": 6,
+    "name": 6,
+    "id": 5,
+    "categorias": 3,
+    "categories": 3,
+    "tags": 3,
+    "tipo": 2,
+    "type": 2,
+    "source": 1,
+}
+BODY_WEIGHT = 1
+TITLE_PHRASE_BONUS = 10
+MAX_BODY_TERMS = 5_000
+MAX_QUERY_TERMS = 12
+MAX_RANK_CANDIDATES = 2_000
+INDEX_BATCH_SIZE = 500
+_LATEX_COMMAND = re.compile(r"\\(?:begin|end)\{[^}]*\}|\\[A-Za-z@]+")
+_INDEXED_DATABASES: set[tuple[int, str]] = set()
+
+
+@dataclass(frozen=True, slots=True)
+class ConceptSearchHits:
+    """Ranked ``(id, source)`` identities for one requested window."""
+
+    identities: tuple[tuple[str, str], ...]
+    has_more: bool
+
+
+def search_terms(*values: Any) -> tuple[str, ...]:
+    """Return unique folded tokens, in first-seen order, for strings or lists of strings."""
+    terms: dict[str, None] = {}
+    for value in values:
+        items = value if isinstance(value, (list, tuple, set, frozenset)) else (value,)
+        for item in items:
+            if isinstance(item, str):
+                terms.update(dict.fromkeys(suggestion_key(item).split()))
+    return tuple(terms)
+
+
+def _latex_terms(latex: Any) -> list[str]:
+    if not isinstance(latex, str) or not latex:
+        return []
+    body = _LATEX_COMMAND.sub(" ", latex)
+    return [term for term in search_terms(body) if len(term) > 1][:MAX_BODY_TERMS]
+
+
+def _raw_values(*values: Any) -> list[str]:
+    result: dict[str, None] = {}
+    for value in values:
+        items = value if isinstance(value, (list, tuple, set, frozenset)) else (value,)
+        result.update(dict.fromkeys(item for item in items if isinstance(item, str) and item))
+    return list(result)
+
+
+def build_search_entry(concept: Mapping[str, Any], latex: Any = None) -> dict[str, Any] | None:
+    """Derive the index entry for one concept, or ``None`` without a usable identity."""
+    concept_id, source = concept.get("id"), concept.get("source")
+    if not isinstance(concept_id, str) or not isinstance(source, str):
+        return None
+    if not concept_id or not source:
+        return None
+    weights: dict[str, int] = {}
+    for field, weight in FIELD_WEIGHTS.items():
+        for term in search_terms(concept.get(field)):
+            weights[term] = weights.get(term, 0) + weight
+    if latex is None:
+        latex = concept.get("contenido_latex")
+    body = [term for term in _latex_terms(latex) if term not in weights]
+    title = concept.get("titulo") or concept.get("title") or concept.get("nombre") or ""
+    return {
+        "id": concept_id,
+        "source": source,
+        "types": _raw_values(concept.get("tipo"), concept.get("type")),
+        "categories": _raw_values(concept.get("categorias"), concept.get("categories")),
+        "title_key": suggestion_key(title) if isinstance(title, str) else "",
+        "terms": [*weights, *body],
+        "weights": weights,
+    }
+
+
+def _database(database: Any) -> Any:
+    # Editor pages pass the MathMongo wrapper; attribute access on a real
+    # pymongo Database would return a collection, hence the isinstance checks.
+    if isinstance(database, Database):
+        return database
+    inner = getattr(database, "db", None)
+    return inner if isinstance(inner, Database) else database
+
+
+def _index_collection(database: Any) -> Any:
+    list_names = getattr(database, "list_collection_names", None)
+    if list_names is None:
+        return None
+    # Once seen, the collection is remembered per client and database; a later
+    # drop also drops the marker, which is still read on every call.
+    client = getattr(database, "client", None)
+    key = (id(client), str(database.name)) if client is not None else None
+    try:
+        if key not in _INDEXED_DATABASES:
+            if CONCEPT_SEARCH_INDEX_COLLECTION not in list_names():
+                return None
+            if key is not None:
+                _INDEXED_DATABASES.add(key)
+        collection = database[CONCEPT_SEARCH_INDEX_COLLECTION]
+        marker = collection.find_one({"_id": READY_MARKER_ID})
+    except PyMongoError:
+        return None
+    if not isinstance(marker, Mapping) or marker.get("ready") is not True:
+        return None
+    return collection
+
+
+def concept_search_index_ready(database: Any) -> bool:
+    """Return whether a complete rebuild has run and no refresh has failed since."""
+    return _index_collection(_database(database)) is not None
+
+
+def _score(entry: Mapping[str, Any], terms: tuple[str, ...], phrase: str) -> int:
+    weights = entry.get("weights")
+    weights = weights if isinstance(weights, Mapping) else {}
+    score = 0
+    for term in terms[:-1]:
+        score += int(weights.get(term, BODY_WEIGHT))
+    last = terms[-1]
+    if last in weights:
+        score += int(weights[last])
+    else:
+        prefixed = [int(weight) for term, weight in weights.items() if term.startswith(last)]
+        score += max(prefixed) // 2 if prefixed else BODY_WEIGHT
+    if phrase and phrase in str(entry.get("title_key") or ""):
+        score += TITLE_PHRASE_BONUS
+    return score
+
+
+def rank_concept_identities(
+    database: Any,
+    query: str,
+    *,
+    source: str | None = None,
+    concept_types: Iterable[str] = (),
+    category: str | None = None,
+    offset: int = 0,
+    limit: int = MAX_RANK_CANDIDATES,
+) -> ConceptSearchHits | None:
+    """Rank concepts matching every query token, the last one as a prefix.
+
+    Returns ``None`` when the index is not ready, or when the query folds to
+    no indexable terms (for example ``"∂"`` or ``"$"``), so callers keep
+    their existing search. Every match is scored; only the best
+    ``offset + limit + 1`` are kept in memory.
+    """
+    collection = _index_collection(_database(database))
+    if collection is None:
+        return None
+    terms = search_terms(query)[:MAX_QUERY_TERMS]
+    if not terms:
+        return None
+    clauses: list[dict[str, Any]] = [{"terms": term} for term in terms[:-1]]
+    clauses.append({"terms": {"$regex": f"^{re.escape(terms[-1])}"}})
+    if source is not None:
+        clauses.append({"source": source})
+    types = [value for value in concept_types if isinstance(value, str)]
+    if types:
+        clauses.append({"types": {"$in": types}})
+    if category is not None:
+        clauses.append({"categories": category})
+    projection = {"_id": 0, "id": 1, "source": 1, "weights": 1, "title_key": 1}
+    phrase = " ".join(terms)
+    start, limit = max(0, int(offset)), max(1, int(limit))
+    try:
+        cursor = collection.find({"$and": clauses}, projection)
+        ranked = heapq.nsmallest(
+            start + limit + 1,
+            (entry for entry in cursor if isinstance(entry, Mapping)),
+            key=lambda entry: (
+                -_score(entry, terms, phrase),
+                str(entry.get("source")),
+                str(entry.get("id")),
+            ),
+        )
+    except PyMongoError:
+        return None
+    window = ranked[start:]
+    identities = tuple((str(item["id"]), str(item["source"])) for item in window)
+    return ConceptSearchHits(identities[:limit], len(identities) > limit)
+
+
+def _identity_query(identities: list[tuple[str, str]]) -> dict[str, Any]:
+    ids_by_source: dict[str, list[str]] = {}
+    for concept_id, source in identities:
+        ids_by_source.setdefault(source, []).append(concept_id)
+    clauses = [{"source": source, "id": {"$in": ids}} for source, ids in ids_by_source.items()]
+    return clauses[0] if len(clauses) == 1 else {"$or": clauses}
+
+
+def _latex_by_identity(database: Any, identities: list[tuple[str, str]]) -> dict:
+    if not identities:
+        return {}
+    cursor = database["latex_documents"].find(
+        _identity_query(identities),
+        {"_id": 0, "id": 1, "source": 1, "contenido_latex": 1},
+    )
+    return {(doc.get("id"), doc.get("source")): doc.get("contenido_latex") for doc in cursor}
+
+
+def _entry_writes(database: Any, concepts: list[Mapping[str, Any]], build: str) -> list:
+    identities = [(doc.get("id"), doc.get("source")) for doc in concepts]
+    latex = _latex_by_identity(database, identities)
+    writes = []
+    for concept in concepts:
+        identity = (concept.get("id"), concept.get("source"))
+        entry = build_search_entry(concept, latex.get(identity))
+        if entry is not None:
+            entry["build"] = build
+            query = {"id": entry["id"], "source": entry["source"]}
+            writes.append(ReplaceOne(query, entry, upsert=True))
+    return writes
+
+
+def _mark_stale(database: Any) -> None:
+    try:
+        database[CONCEPT_SEARCH_INDEX_COLLECTION].delete_one({"_id": READY_MARKER_ID})
+    except PyMongoError:
+        pass
+
+
+def refresh_concept_search_entries(
+    database: Any,
+    identities: Iterable[tuple[str, str]],
+) -> bool:
+    """Re-derive entries for written or deleted concepts; no-op until the index is ready.
+
+    A failed refresh removes the ready marker so searches fall back instead
+    of serving stale rankings; the write that triggered it is unaffected.
+    """
+    database = _database(database)
+    collection = _index_collection(database)
+    if collection is None:
+        return False
+    wanted = list(dict.fromkeys((str(cid), str(src)) for cid, src in identities))
+    if not wanted:
+        return True
+    try:
+        marker = collection.find_one({"_id": READY_MARKER_ID}) or {}
+        concepts = []
+        for start in range(0, len(wanted), INDEX_BATCH_SIZE):
+            chunk = wanted[start : start + INDEX_BATCH_SIZE]
+            concepts.extend(database["concepts"].find(_identity_query(chunk)))
+        writes = _entry_writes(database, concepts, str(marker.get("build", "")))
+        present = {(doc.get("id"), doc.get("source")) for doc in concepts}
+        writes.extend(
+            DeleteOne({"id": concept_id, "source": source})
+            for concept_id, source in wanted
+            if (concept_id, source) not in present
+        )
+        collection.bulk_write(writes, ordered=False)
+    except PyMongoError:
+        _mark_stale(database)
+        return False
+    return True
+
+
+def rebuild_concept_search_index(database: Any, *, batch_size: int = INDEX_BATCH_SIZE) -> int:
+    """Rebuild every entry from ``concepts``/``latex_documents`` and mark the index ready."""
+    database = _database(database)
+    collection = database[CONCEPT_SEARCH_INDEX_COLLECTION]
+    collection.delete_one({"_id": READY_MARKER_ID})
+    collection.create_index(
+        [("id", ASCENDING), ("source", ASCENDING)],
+        name="concept_search_identity",
+        unique=True,
+        partialFilterExpression={"id": {"$exists": True}},
+    )
+    collection.create_index([("terms", ASCENDING)], name="concept_search_terms")
+    build = uuid.uuid4().hex
+    size = max(1, int(batch_size))
+    indexed = 0
+    batch: list[Mapping[str, Any]] = []
+
+    def flush() -> None:
+        nonlocal indexed
+        writes = _entry_writes(database, batch, build)
+        if writes:
+            collection.bulk_write(writes, ordered=False)
+        indexed += len(writes)
+        batch.clear()
+
+    for concept in database["concepts"].find({}):
+        batch.append(concept)
+        if len(batch) >= size:
+            flush()
+    flush()
+    collection.delete_many({"_id": {"$ne": READY_MARKER_ID}, "build": {"$ne": build}})
+    collection.replace_one(
+        {"_id": READY_MARKER_ID},
+        {
+            "_id": READY_MARKER_ID,
+            "ready": True,
+            "build": build,
+            "entries": indexed,
+            "built_at": datetime.now(timezone.utc),
+        },
+        upsert=True,
+    )
+    return indexed
+
+
+__all__ = [
+    "CONCEPT_SEARCH_INDEX_COLLECTION",
+    "ConceptSearchHits",
+    "MAX_RANK_CANDIDATES",
+    "build_search_entry",
+    "concept_search_index_ready",
+    "rank_concept_identities",
+    "rebuild_concept_search_index",
+    "refresh_concept_search_entries",
+    "search_terms",
+]
@@ -1,5 +1,6 @@
 """S4.2 logical page maps for persistent PDF Documents."""
 
+from mathmongo.document_page_maps.compiled import CompiledPageMap
 from mathmongo.document_page_maps.indexes import DOCUMENT_PAGE_MAPS_COLLECTION
 from mathmongo.document_page_maps.indexes import DocumentPageMapIndexManager
 from mathmongo.document_page_maps.models import DocumentPageMap
@@ -12,11 +13,13 @@ from mathmongo.document_page_maps.repository import DocumentPageMapRepository
 from mathmongo.document_page_maps.service import DocumentPageMapService
 from mathmongo.document_page_maps.service import PageLabelComputation
 from mathmongo.document_page_maps.service import PageLabelMatch
+from mathmongo.document_page_maps.service import PageLabelRange
 from mathmongo.document_page_maps.service import PageMapOperationStatus
 from mathmongo.document_page_maps.service import PageMapServiceResult
 
 __all__ = [
     "DOCUMENT_PAGE_MAPS_COLLECTION",
+    "CompiledPageMap",
     "DocumentPageMap",
     "DocumentPageMapIndexManager",
     "DocumentPageMapRepository",
@@ -24,6 +27,7 @@ __all__ = [
     "ManualPageOverride",
     "PageLabelComputation",
     "PageLabelMatch",
+    "PageLabelRange",
     "PageLabelRule",
     "PageLabelStyle",
     "PageMapOperationStatus",
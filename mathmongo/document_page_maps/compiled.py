@@ -0,0 +1,185 @@
+"""Compiled page-label index: override lookups plus bisected rule intervals."""
+
+# ruff: noqa: D101,D102,D107
+
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_right
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from mathmongo.document_page_maps.models import DocumentPageMap
+from mathmongo.document_page_maps.models import PageLabelRule
+from mathmongo.document_page_maps.models import compute_book_page_label
+
+COMPILED_PAGE_MAP_CACHE_ENTRIES = 64
+COMPILED_PAGE_MAP_TTL_SECONDS = 10.0
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class CompiledPageMap:
+    """One page-map revision as an override dict plus sorted rule intervals.
+
+    ``DocumentPageMap`` keeps rules sorted and non-overlapping, so the only
+    candidate rule for a page is the last one starting at or before it. Each
+    rule is kept as a one-rule map so labels still come from
+    ``compute_book_page_label``.
+    """
+
+    overrides: dict[int, str]
+    rules: tuple[PageLabelRule, ...]
+    rule_starts: tuple[int, ...]
+    rule_maps: tuple[DocumentPageMap, ...]
+    unmapped: DocumentPageMap
+
+    @classmethod
+    def from_page_map(cls, page_map: DocumentPageMap) -> CompiledPageMap:
+        rules = tuple(page_map.rules)
+        return cls(
+            overrides={item.pdf_page: item.book_page_label for item in page_map.manual_overrides},
+            rules=rules,
+            rule_starts=tuple(item.pdf_start_page for item in rules),
+            rule_maps=tuple(
+                page_map.model_copy(update={"rules": [rule], "manual_overrides": []})
+                for rule in rules
+            ),
+            unmapped=page_map.model_copy(update={"rules": [], "manual_overrides": []}),
+        )
+
+    def _rule_index(self, pdf_page: int) -> int | None:
+        index = bisect_right(self.rule_starts, pdf_page) - 1
+        if index < 0:
+            return None
+        end = self.rules[index].pdf_end_page
+        return None if end is not None and pdf_page > end else index
+
+    def rule_for(self, pdf_page: int) -> PageLabelRule | None:
+        index = self._rule_index(pdf_page)
+        return None if index is None else self.rules[index]
+
+    def label(self, pdf_page: int) -> str | None:
+        """Return what ``compute_book_page_label`` returns for this revision."""
+        # Non-integers, including bools, reach compute_book_page_label unmatched
+        # so they fail its validation exactly as before.
+        valid = type(pdf_page) is int
+        override = self.overrides.get(pdf_page) if valid else None
+        if override is not None:
+            return override
+        index = self._rule_index(pdf_page) if valid else None
+        page_map = self.unmapped if index is None else self.rule_maps[index]
+        return compute_book_page_label(page_map, pdf_page)
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledPageMapCacheStats:
+    hits: int
+    misses: int
+    entries: int
+
+
+@dataclass(frozen=True, slots=True)
+class _Entry:
+    page_map: DocumentPageMap
+    compiled: CompiledPageMap
+    versions: tuple[int, ...]
+    loaded_at: float
+
+
+class CompiledPageMapCache:
+    """Bounded LRU of active compiled page maps keyed by database, Document and scope.
+
+    An entry is served without reading Mongo while the caller's write
+    versions are unchanged and it is younger than ``ttl_seconds``; the TTL
+    bounds how long writes made by other processes stay unseen.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = COMPILED_PAGE_MAP_CACHE_ENTRIES,
+        ttl_seconds: float = COMPILED_PAGE_MAP_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("Compiled page-map cache requires at least one entry")
+        if ttl_seconds <= 0:
+            raise ValueError("Compiled page-map cache requires a positive TTL")
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[tuple[str, str, str], _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def lookup(
+        self,
+        key: tuple[str, str, str],
+        versions: tuple[int, ...],
+    ) -> tuple[DocumentPageMap, CompiledPageMap] | None:
+        """Return the cached map and index for ``key`` or count a miss."""
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if (
+                entry is not None
+                and entry.versions == versions
+                and now - entry.loaded_at <= self._ttl_seconds
+            ):
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry.page_map, entry.compiled
+            if entry is not None:
+                del self._entries[key]
+            self._misses += 1
+        return None
+
+    def store(
+        self,
+        key: tuple[str, str, str],
+        versions: tuple[int, ...],
+        page_map: DocumentPageMap,
+    ) -> CompiledPageMap:
+        """Compile ``page_map`` and keep it under the versions read before loading it."""
+        compiled = CompiledPageMap.from_page_map(page_map)
+        with self._lock:
+            self._entries[key] = _Entry(page_map, compiled, versions, self._clock())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return compiled
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def stats(self) -> CompiledPageMapCacheStats:
+        with self._lock:
+            return CompiledPageMapCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                entries=len(self._entries),
+            )
+
+
+_PROCESS_COMPILED_PAGE_MAPS = CompiledPageMapCache()
+
+
+def process_compiled_page_maps() -> CompiledPageMapCache:
+    """Return the compiled page-map cache shared by every service in this process."""
+    return _PROCESS_COMPILED_PAGE_MAPS
+
+
+__all__ = [
+    "COMPILED_PAGE_MAP_CACHE_ENTRIES",
+    "COMPILED_PAGE_MAP_TTL_SECONDS",
+    "CompiledPageMap",
+    "CompiledPageMapCache",
+    "CompiledPageMapCacheStats",
+    "process_compiled_page_maps",
+]
@@ -19,6 +19,8 @@ from mathmongo.document_page_maps.models import DocumentPageMap
 from mathmongo.document_page_maps.models import PageMapStatus
 from mathmongo.document_page_maps.models import utc_now
 from mathmongo.document_page_maps.models import validate_page_map_id
+from mathmongo.query_cache import bump_collection_versions
+from mathmongo.query_cache import bump_document_versions
 from mathmongo.source_documents.models import validate_document_id
 
 
@@ -87,6 +89,8 @@ class DocumentPageMapRepository:
             ) from exc
         except Exception as exc:
             raise DocumentPageMapRepositoryError("Document page-map insert failed") from exc
+        bump_collection_versions(self.database, self.COLLECTION)
+        bump_document_versions(self.database, candidate.document_id)
         return candidate
 
     def get_by_id(self, page_map_id: str) -> DocumentPageMap | None:
@@ -156,6 +160,8 @@ class DocumentPageMapRepository:
             ) from exc
         except Exception as exc:
             raise DocumentPageMapRepositoryError("Document page-map update failed") from exc
+        bump_collection_versions(self.database, self.COLLECTION)
+        bump_document_versions(self.database, candidate.document_id)
         return candidate if getattr(result, "matched_count", 0) else None
 
     def archive(
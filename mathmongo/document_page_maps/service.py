@@ -12,20 +12,24 @@ from typing import TypeVar
 
 from pydantic import ValidationError
 
+from mathmongo.document_page_maps.compiled import CompiledPageMap
+from mathmongo.document_page_maps.compiled import CompiledPageMapCache
+from mathmongo.document_page_maps.compiled import process_compiled_page_maps
 from mathmongo.document_page_maps.errors import DocumentPageMapConflictError
 from mathmongo.document_page_maps.errors import DocumentPageMapIndexConflictError
 from mathmongo.document_page_maps.errors import DocumentPageMapRepositoryError
+from mathmongo.document_page_maps.indexes import DOCUMENT_PAGE_MAPS_COLLECTION
 from mathmongo.document_page_maps.indexes import DocumentPageMapIndexManager
 from mathmongo.document_page_maps.models import DocumentPageMap
 from mathmongo.document_page_maps.models import ManualPageOverride
 from mathmongo.document_page_maps.models import PageLabelRule
 from mathmongo.document_page_maps.models import PageLabelStyle
 from mathmongo.document_page_maps.models import PageMapStatus
-from mathmongo.document_page_maps.models import compute_book_page_label
 from mathmongo.document_page_maps.models import utc_now
 from mathmongo.document_page_maps.models import validate_rule_id
 from mathmongo.document_page_maps.repository import DocumentPageMapPage
 from mathmongo.document_page_maps.repository import DocumentPageMapRepository
+from mathmongo.query_cache import COLLECTION_VERSIONS
 from mathmongo.source_catalog.models import Source
 from mathmongo.source_catalog.repository import SourceRepository
 from mathmongo.source_documents.models import DocumentKind
@@ -34,6 +38,9 @@ from mathmongo.source_documents.models import SourceDocument
 from mathmongo.source_documents.repository import SourceDocumentRepository
 
 T = TypeVar("T")
+MAX_PAGE_LABEL_RANGE = 5_000
+# Sources bump their collection; Documents and page maps also bump the Document.
+_COMPILED_PAGE_MAP_COLLECTIONS = (SourceRepository.COLLECTION, DOCUMENT_PAGE_MAPS_COLLECTION)
 
 
 class PageMapOperationStatus(str, Enum):
@@ -72,6 +79,14 @@ class PageLabelComputation:
     rule_id: str | None = None
 
 
+@dataclass(frozen=True, slots=True)
+class PageLabelRange:
+    page_map: DocumentPageMap
+    first_page: int
+    last_page: int
+    labels: tuple[str | None, ...]
+
+
 @dataclass(frozen=True, slots=True)
 class PageMapDocumentContext:
     document: SourceDocument
@@ -89,6 +104,7 @@ class DocumentPageMapService:
         documents: SourceDocumentRepository | None = None,
         sources: SourceRepository | None = None,
         index_manager: DocumentPageMapIndexManager | None = None,
+        compiled_page_maps: CompiledPageMapCache | None = None,
     ) -> None:
         if database is None or not hasattr(database, "__getitem__"):
             raise ValueError("DocumentPageMapService requires an explicit database")
@@ -97,6 +113,7 @@ class DocumentPageMapService:
         self.documents = documents or SourceDocumentRepository(database)
         self.sources = sources or SourceRepository(database)
         self.index_manager = index_manager or DocumentPageMapIndexManager(database)
+        self.compiled_page_maps = compiled_page_maps or process_compiled_page_maps()
 
     @staticmethod
     def _result(
@@ -283,6 +300,27 @@ class DocumentPageMapService:
             )
         return self._result(PageMapOperationStatus.SUCCESS, result)
 
+    def _compiled_page_map(
+        self,
+        document_id: str,
+        *,
+        user_scope: str,
+    ) -> PageMapServiceResult[tuple[DocumentPageMap, CompiledPageMap]]:
+        # Versions are read before the page map, so a write racing the read
+        # can only make the next caller load again.
+        versions = COLLECTION_VERSIONS.document_snapshot(
+            self.database, document_id, _COMPILED_PAGE_MAP_COLLECTIONS
+        )
+        key = (str(getattr(self.database, "name", "")), str(document_id), str(user_scope))
+        cached = self.compiled_page_maps.lookup(key, versions)
+        if cached is not None:
+            return self._result(PageMapOperationStatus.SUCCESS, cached)
+        current = self.get_page_map(document_id, user_scope=user_scope)
+        if not current.completed or current.value is None:
+            return self._result(current.status, message=current.message)
+        compiled = self.compiled_page_maps.store(key, versions, current.value)
+        return self._result(PageMapOperationStatus.SUCCESS, (current.value, compiled))
+
     def compute_page_label(
         self,
         document_id: str,
@@ -290,26 +328,16 @@ class DocumentPageMapService:
         *,
         user_scope: str = "local",
     ) -> PageMapServiceResult[PageLabelComputation]:
-        current = self.get_page_map(document_id, user_scope=user_scope)
+        current = self._compiled_page_map(document_id, user_scope=user_scope)
         if not current.completed or current.value is None:
             return self._result(current.status, message=current.message)
+        page_map, compiled = current.value
         try:
-            label = compute_book_page_label(current.value, pdf_page)
+            label = compiled.label(pdf_page)
         except (ValidationError, ValueError) as exc:
             return self._result(PageMapOperationStatus.INVALID_STATE, message=str(exc))
-        override = next(
-            (item for item in current.value.manual_overrides if item.pdf_page == pdf_page),
-            None,
-        )
-        rule = next(
-            (
-                item
-                for item in current.value.rules
-                if item.pdf_start_page <= pdf_page
-                and (item.pdf_end_page is None or pdf_page <= item.pdf_end_page)
-            ),
-            None,
-        )
+        override = compiled.overrides.get(pdf_page)
+        rule = compiled.rule_for(pdf_page)
         matched_by = (
             PageLabelMatch.OVERRIDE
             if override is not None
@@ -320,7 +348,7 @@ class DocumentPageMapService:
         return self._result(
             PageMapOperationStatus.SUCCESS,
             PageLabelComputation(
-                page_map=current.value,
+                page_map=page_map,
                 pdf_page=pdf_page,
                 book_page_label=label,
                 matched_by=matched_by,
@@ -328,6 +356,40 @@ class DocumentPageMapService:
             ),
         )
 
+    def compute_page_labels(
+        self,
+        document_id: str,
+        first_page: int,
+        last_page: int,
+        *,
+        user_scope: str = "local",
+    ) -> PageMapServiceResult[PageLabelRange]:
+        """Label a whole page range from one page-map read and one compiled index."""
+        pages = (first_page, last_page)
+        if any(isinstance(page, bool) or not isinstance(page, int) or page < 1 for page in pages):
+            return self._result(
+                PageMapOperationStatus.INVALID_STATE,
+                message="PDF pages must be integers greater than or equal to 1.",
+            )
+        if last_page < first_page or last_page - first_page >= MAX_PAGE_LABEL_RANGE:
+            return self._result(
+                PageMapOperationStatus.INVALID_STATE,
+                message=f"PDF page ranges must span 1 to {MAX_PAGE_LABEL_RANGE} ordered pages.",
+            )
+        current = self._compiled_page_map(document_id, user_scope=user_scope)
+        if not current.completed or current.value is None:
+            return self._result(current.status, message=current.message)
+        page_map, compiled = current.value
+        return self._result(
+            PageMapOperationStatus.SUCCESS,
+            PageLabelRange(
+                page_map=page_map,
+                first_page=first_page,
+                last_page=last_page,
+                labels=tuple(compiled.label(page) for page in range(first_page, last_page + 1)),
+            ),
+        )
+
     def _active_or_new(
         self,
         context: PageMapDocumentContext,
@@ -622,9 +684,11 @@ def _rules_overlap(left: PageLabelRule, right: PageLabelRule) -> bool:
 
 
 __all__ = [
+    "MAX_PAGE_LABEL_RANGE",
     "DocumentPageMapService",
     "PageLabelComputation",
     "PageLabelMatch",
+    "PageLabelRange",
     "PageMapDocumentContext",
     "PageMapOperationStatus",
     "PageMapServiceResult",
@@ -0,0 +1,192 @@
+"""Batched ingestion of a folder of ``.md`` notes into ``concepts``/``latex_documents``.
+
+Files are read and hashed in the caller, parsed and validated across a
+process pool, and written with one ``bulk_write`` per collection and batch.
+The SHA-256 of each file's bytes is stored on its ``latex_documents`` entry
+as ``hash_ingesta``; re-ingesting a folder skips files whose bytes match.
+Editor writes clear the field, so an edited note is rewritten from its file.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from collections.abc import Iterator
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import repeat
+from pathlib import Path
+from typing import Any
+
+from pymongo import UpdateOne
+
+from mathkb_config import IMPORT_BATCH_SIZE
+from mathkb_config import INGEST_WORKERS
+from mathmongo.concept_search_index import refresh_concept_search_entries
+from mathmongo.query_cache import bump_collection_versions
+
+INGEST_HASH_FIELD = "hash_ingesta"
+INGEST_STAGES = ("read", "lookup", "parse", "write", "search_index")
+
+
+@dataclass(frozen=True, slots=True)
+class FolderIngestReport:
+    """Outcome and per-stage wall-clock seconds of one folder ingestion."""
+
+    concepts: tuple[Any, ...]
+    skipped_unchanged: tuple[str, ...]
+    invalid: tuple[tuple[str, str], ...]
+    dry_run: bool
+    timings: Mapping[str, float]
+
+
+def _file_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _parse_note(name: str, texto: str, source: str) -> tuple[str, Any, str | None]:
+    """Return ``(name, concept, None)`` or ``(name, None, error)``; runs in pool workers."""
+    import yaml
+
+    from parsers.yaml_latex_parser import YamlLatexParser
+    from schemas.schemas import ConceptoBase
+
+    try:
+        meta, contenido_latex = YamlLatexParser.separar_yaml_y_contenido(texto, name)
+        if not isinstance(meta, dict):
+            raise ValueError(f"Archivo {name} no tiene encabezado YAML bien formado.")
+        meta["source"] = source
+        return name, ConceptoBase(**meta, contenido_latex=contenido_latex), None
+    except (ValueError, yaml.YAMLError) as exc:
+        return name, None, str(exc)
+
+
+def _parsed_notes(
+    notes: list[tuple[str, str]],
+    source: str,
+    max_workers: int,
+) -> Iterator[tuple[str, Any, str | None]]:
+    workers = max(1, min(max_workers, len(notes)))
+    names = [name for name, _texto in notes]
+    texts = [texto for _name, texto in notes]
+    if workers <= 1:
+        yield from map(_parse_note, names, texts, repeat(source))
+        return
+    chunksize = max(1, len(notes) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(_parse_note, names, texts, repeat(source), chunksize=chunksize)
+
+
+def _ingested_hashes(latex_documents: Any, source: str, hashes: list[str], size: int) -> set[str]:
+    found: set[str] = set()
+    unique = list(dict.fromkeys(hashes))
+    for start in range(0, len(unique), size):
+        chunk = unique[start : start + size]
+        query = {"source": source, INGEST_HASH_FIELD: {"$in": chunk}}
+        for document in latex_documents.find(query, {INGEST_HASH_FIELD: 1}):
+            found.add(document.get(INGEST_HASH_FIELD))
+    return found
+
+
+def ingest_folder(
+    database: Any,
+    folder: str | Path,
+    source: str,
+    *,
+    dry_run: bool = False,
+    max_workers: int | None = None,
+    batch_size: int = IMPORT_BATCH_SIZE,
+) -> FolderIngestReport:
+    """Upsert every valid ``*.md`` note of ``folder`` under ``source``.
+
+    Notes are written in file-name order with ordered bulk writes, so when two
+    files share an ``id`` the later one wins, as with one upsert per file.
+    ``dry_run`` reads, hashes, looks up and validates but writes nothing.
+    """
+    size = max(1, int(batch_size))
+    timings = dict.fromkeys(INGEST_STAGES, 0.0)
+
+    started = time.perf_counter()
+    pending: list[tuple[str, str, str]] = []
+    for file_path in sorted(Path(folder).glob("*.md")):
+        data = file_path.read_bytes()
+        # Same newline handling as reading the note in text mode.
+        texto = data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+        pending.append((file_path.name, texto, _file_hash(data)))
+    timings["read"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    known = _ingested_hashes(
+        database["latex_documents"], source, [digest for *_note, digest in pending], size
+    )
+    skipped = tuple(name for name, _texto, digest in pending if digest in known)
+    pending = [note for note in pending if note[2] not in known]
+    timings["lookup"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    digests = {name: digest for name, _texto, digest in pending}
+    concepts: list[tuple[Any, str]] = []
+    invalid: list[tuple[str, str]] = []
+    notes = [(name, texto) for name, texto, _digest in pending]
+    for name, concept, error in _parsed_notes(notes, source, max_workers or INGEST_WORKERS):
+        if concept is None:
+            invalid.append((name, str(error)))
+        else:
+            concepts.append((concept, digests[name]))
+    timings["parse"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    if not dry_run:
+        for start in range(0, len(concepts), size):
+            _write_batch(database, concepts[start : start + size], source)
+    timings["write"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    if not dry_run and concepts:
+        refresh_concept_search_entries(database, ((c.id, source) for c, _digest in concepts))
+    timings["search_index"] = time.perf_counter() - started
+
+    return FolderIngestReport(
+        concepts=tuple(concept for concept, _digest in concepts),
+        skipped_unchanged=skipped,
+        invalid=tuple(invalid),
+        dry_run=dry_run,
+        timings=timings,
+    )
+
+
+def _write_batch(database: Any, batch: list[tuple[Any, str]], source: str) -> None:
+    now = datetime.now()
+    concept_writes = []
+    latex_writes = []
+    for concept, digest in batch:
+        identity = {"id": concept.id, "source": source}
+        fields = concept.model_dump(mode="python", exclude={"contenido_latex"}, exclude_none=True)
+        concept_writes.append(UpdateOne(identity, {"$set": fields}, upsert=True))
+        latex_writes.append(
+            UpdateOne(
+                identity,
+                {
+                    "$set": {
+                        "contenido_latex": concept.contenido_latex,
+                        "ultima_actualizacion": now,
+                        INGEST_HASH_FIELD: digest,
+                    },
+                    "$setOnInsert": {"fecha_creacion": now},
+                },
+                upsert=True,
+            )
+        )
+    database["concepts"].bulk_write(concept_writes, ordered=True)
+    database["latex_documents"].bulk_write(latex_writes, ordered=True)
+    bump_collection_versions(database, "concepts", "latex_documents")
+
+
+__all__ = [
+    "INGEST_HASH_FIELD",
+    "INGEST_STAGES",
+    "FolderIngestReport",
+    "ingest_folder",
+]
@@ -0,0 +1,227 @@
+"""Opaque keyset cursors for stable MongoDB listings.
+
+A cursor carries the sort-key values of the last returned document, a
+fingerprint of the query and sort it belongs to, the 1-based page number and
+the total counted once when the first keyset page was opened. Following a
+cursor therefore costs one indexed range scan of ``page_size + 1`` documents
+instead of a ``skip`` over every earlier row plus a fresh ``count_documents``.
+The carried total is a snapshot: writes made while paging are not reflected.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import hashlib
+from collections.abc import Mapping
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from bson import json_util
+from bson.errors import InvalidBSON
+
+FIRST_PAGE_CURSOR = "*"
+CURSOR_VERSION = 1
+MAX_CURSOR_LENGTH = 4_096
+_JSON_OPTIONS = json_util.CANONICAL_JSON_OPTIONS
+
+
+class InvalidCursorError(ValueError):
+    """A cursor is malformed or was issued for another listing or filter."""
+
+
+@dataclass(frozen=True, slots=True)
+class KeysetState:
+    """Decoded cursor position for one listing."""
+
+    values: tuple[Any, ...]
+    page: int
+    total: int
+
+
+@dataclass(frozen=True, slots=True)
+class KeysetWindow:
+    """Raw documents for one keyset page plus the cursor of the next one."""
+
+    documents: tuple[Mapping[str, Any], ...]
+    page: int
+    total: int
+    next_cursor: str | None
+
+
+def keyset_fingerprint(query: Mapping[str, Any], sort: Sequence[tuple[str, int]]) -> str:
+    """Return a short digest binding cursors to one filter and ordering."""
+    payload = json_util.dumps(
+        {"query": query, "sort": [[field, int(direction)] for field, direction in sort]},
+        json_options=_JSON_OPTIONS,
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def encode_cursor(fingerprint: str, state: KeysetState) -> str:
+    """Serialize a position as URL-safe base64 without padding."""
+    payload = json_util.dumps(
+        {
+            "v": CURSOR_VERSION,
+            "f": fingerprint,
+            "k": list(state.values),
+            "p": state.page,
+            "t": state.total,
+        },
+        json_options=_JSON_OPTIONS,
+    )
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, fingerprint: str, *, key_count: int) -> KeysetState:
+    """Decode a cursor issued for ``fingerprint`` or raise ``InvalidCursorError``."""
+    if not isinstance(cursor, str) or not cursor or len(cursor) > MAX_CURSOR_LENGTH:
+        raise InvalidCursorError("cursor is not a valid page cursor")
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json_util.loads(raw.decode("utf-8"), json_options=_JSON_OPTIONS)
+    except (binascii.Error, UnicodeDecodeError, InvalidBSON, TypeError, ValueError) as exc:
+        raise InvalidCursorError("cursor is not a valid page cursor") from exc
+    if not isinstance(payload, Mapping) or payload.get("v") != CURSOR_VERSION:
+        raise InvalidCursorError("cursor is not a valid page cursor")
+    if payload.get("f") != fingerprint:
+        raise InvalidCursorError("cursor belongs to a different listing or filter")
+    values, page, total = payload.get("k"), payload.get("p"), payload.get("t")
+    if not isinstance(values, list) or len(values) != key_count:
+        raise InvalidCursorError("cursor is not a valid page cursor")
+    for number in (page, total):
+        if isinstance(number, bool) or not isinstance(number, int) or number < 0:
+            raise InvalidCursorError("cursor is not a valid page cursor")
+    if page < 2:
+        raise InvalidCursorError("cursor is not a valid page cursor")
+    return KeysetState(tuple(values), page, total)
+
+
+def _sort_value(document: Mapping[str, Any], field: str) -> Any:
+    value: Any = document
+    for part in field.split("."):
+        value = value.get(part) if isinstance(value, Mapping) else None
+    return value
+
+
+def _after(field: str, direction: int, value: Any) -> dict[str, Any] | None:
+    # MongoDB sorts null/missing first ascending and last descending, and its
+    # range operators never match null, so the null bucket is handled apart.
+    if direction >= 0:
+        return {field: {"$ne": None}} if value is None else {field: {"$gt": value}}
+    if value is None:
+        return None
+    return {"$or": [{field: {"$lt": value}}, {field: None}]}
+
+
+def keyset_filter(sort: Sequence[tuple[str, int]], values: Sequence[Any]) -> dict[str, Any]:
+    """Match documents strictly after ``values`` in ``sort`` order.
+
+    The last sort key must be unique so that ties never hide documents.
+    """
+    branches: list[dict[str, Any]] = []
+    for index, (field, direction) in enumerate(sort):
+        after = _after(field, direction, values[index])
+        if after is not None:
+            prefix = [{name: values[position]} for position, (name, _) in enumerate(sort[:index])]
+            branches.append({"$and": [*prefix, after]} if prefix else after)
+    if not branches:
+        return {"_id": {"$exists": False}}
+    return branches[0] if len(branches) == 1 else {"$or": branches}
+
+
+def _window(
+    rows: list[Mapping[str, Any]],
+    fingerprint: str,
+    state: KeysetState,
+    *,
+    sort: Sequence[tuple[str, int]],
+    page_size: int,
+) -> KeysetWindow:
+    documents = tuple(rows[:page_size])
+    next_cursor = None
+    if len(rows) > page_size and documents:
+        position = KeysetState(
+            tuple(_sort_value(documents[-1], field) for field, _ in sort),
+            state.page + 1,
+            state.total,
+        )
+        next_cursor = encode_cursor(fingerprint, position)
+    return KeysetWindow(documents, state.page, state.total, next_cursor)
+
+
+def keyset_find(
+    collection: Any,
+    query: dict[str, Any],
+    *,
+    sort: list[tuple[str, int]],
+    page_size: int,
+    cursor: str,
+    projection: dict[str, int] | None = None,
+) -> KeysetWindow:
+    """Return the page at ``cursor``; :data:`FIRST_PAGE_CURSOR` opens a listing.
+
+    Only the first page counts matching documents; later pages reuse the
+    total carried by their cursor. ``projection`` must keep every sort field.
+    """
+    fingerprint = keyset_fingerprint(query, sort)
+    if cursor == FIRST_PAGE_CURSOR:
+        state = KeysetState((), 1, int(collection.count_documents(query)))
+        selector = query
+    else:
+        state = decode_cursor(cursor, fingerprint, key_count=len(sort))
+        selector = {"$and": [query, keyset_filter(sort, state.values)]}
+    rows = list(collection.find(selector, projection).sort(sort).limit(page_size + 1))
+    return _window(rows, fingerprint, state, sort=sort, page_size=page_size)
+
+
+def keyset_aggregate(
+    collection: Any,
+    pipeline: list[dict[str, Any]],
+    *,
+    sort: list[tuple[str, int]],
+    page_size: int,
+    cursor: str,
+    finalize: Sequence[dict[str, Any]] = (),
+) -> KeysetWindow:
+    """Keyset variant of :func:`keyset_find` for filtering/joining pipelines.
+
+    ``pipeline`` must end before sorting; ``finalize`` stages run on the
+    page rows only and must keep every sort field.
+    """
+    fingerprint = keyset_fingerprint({"pipeline": pipeline}, sort)
+    page_stages = [{"$sort": dict(sort)}, {"$limit": page_size + 1}, *finalize]
+    if cursor == FIRST_PAGE_CURSOR:
+        rows = list(
+            collection.aggregate(
+                [*pipeline, {"$facet": {"items": page_stages, "total": [{"$count": "value"}]}}]
+            )
+        )
+        facet = rows[0] if rows else {}
+        counted = facet.get("total", [])
+        state = KeysetState((), 1, int(counted[0].get("value", 0)) if counted else 0)
+        items = list(facet.get("items", []))
+    else:
+        state = decode_cursor(cursor, fingerprint, key_count=len(sort))
+        items = list(
+            collection.aggregate(
+                [*pipeline, {"$match": keyset_filter(sort, state.values)}, *page_stages]
+            )
+        )
+    return _window(items, fingerprint, state, sort=sort, page_size=page_size)
+
+
+__all__ = [
+    "FIRST_PAGE_CURSOR",
+    "InvalidCursorError",
+    "KeysetState",
+    "KeysetWindow",
+    "decode_cursor",
+    "encode_cursor",
+    "keyset_aggregate",
+    "keyset_filter",
+    "keyset_find",
+    "keyset_fingerprint",
+]
@@ -29,11 +29,16 @@ def normalize_legacy_concept_documents(
     documents: Iterable[Any],
     *,
     registry: AliasRegistry | None = None,
+    start: int = 1,
 ) -> tuple[tuple[Any, ...], tuple[LegacyConceptNormalization, ...]]:
-    """Rewrite registered pairs only; schema/portability rejects unknown pairs."""
+    """Rewrite registered pairs only; schema/portability rejects unknown pairs.
+
+    ``start`` is the ordinal of the first document, so a collection normalized in
+    batches reports the same fallback record IDs as one normalized at once.
+    """
     selected = registry or LEGACY_CONCEPT_ALIAS_REGISTRY
     normalized, changes = [], []
-    for ordinal, raw in enumerate(documents, 1):
+    for ordinal, raw in enumerate(documents, start):
         if not isinstance(raw, Mapping):
             normalized.append(raw)
             continue
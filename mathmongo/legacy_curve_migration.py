@@ -13,6 +13,7 @@ from typing import Any
 from bson.json_util import CANONICAL_JSON_OPTIONS
 from bson.json_util import dumps as bson_json_dumps
 
+from mathmongo.concept_search_index import refresh_concept_search_entries
 from mathmongo.legacy_concept_aliases import LEGACY_CONCEPT_ALIAS_REGISTRY
 from mathmongo.legacy_concept_aliases import REGISTRY_SHA256
 from mathmongo.legacy_concept_aliases import Identity
@@ -178,6 +179,10 @@ def _rollback(
             continue
         result = database["concepts"].delete_one({"_id": document.get("_id")})
         verified &= getattr(result, "deleted_count", 0) == 1
+    refresh_concept_search_entries(
+        database,
+        ((document.get("id"), document.get("source")) for document in inserted),
+    )
     return bool(verified)
 
 
@@ -227,6 +232,7 @@ def apply_legacy_curve_migration(
         if not _rollback(database, inserted, marker):
             raise LegacyCurveMigrationError("Migration failed and rollback was incomplete") from exc
         raise LegacyCurveMigrationError("Migration failed; rollback verified") from exc
+    refresh_concept_search_entries(database, to_restore)
     return {
         "already_applied": False,
         "concepts_restored": len(inserted),
@@ -0,0 +1,271 @@
+"""Process-wide cache for repeated editor reads, invalidated by collection versions.
+
+Streamlit reruns the whole page script on every widget interaction. Reads
+wrapped in :func:`cached_query` are served from memory while the collections
+they depend on keep their version. Writers call
+:func:`bump_collection_versions` after a write; entries also expire after
+``max_age`` seconds so writes made by other processes are eventually seen.
+Per-document writers call :func:`bump_document_versions` so readers that
+cache one Document at a time are not invalidated by writes to its siblings.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import Callable
+from collections.abc import Hashable
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+from typing import TypeVar
+
+from pymongo.database import Database
+
+T = TypeVar("T")
+QUERY_CACHE_MAX_AGE_SECONDS = 60.0
+QUERY_CACHE_MAX_ENTRIES = 512
+
+
+def _database(database: Any) -> Any:
+    # Editor pages pass the MathMongo wrapper; attribute access on a real
+    # pymongo Database would return a collection, hence the isinstance checks.
+    if isinstance(database, Database):
+        return database
+    inner = getattr(database, "db", None)
+    return inner if isinstance(inner, Database) else database
+
+
+def _database_name(database: Any) -> str:
+    if isinstance(database, str):
+        return database
+    return str(getattr(_database(database), "name", ""))
+
+
+def query_params(value: Any) -> str:
+    """Return a stable hashable key for a query document or projection."""
+    return json.dumps(value, sort_keys=True, default=str, ensure_ascii=False)
+
+
+class CollectionVersions:
+    """Monotonic write counters per database name and collection.
+
+    Counters are keyed by database name only, so a write through any client
+    invalidates reads cached through every other client of that name.
+    """
+
+    def __init__(self) -> None:
+        """Start every counter at zero."""
+        self._versions: dict[tuple[str, str], int] = {}
+        self._generations: dict[str, int] = {}
+        self._documents: dict[tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def bump(self, database: Any, collections: Iterable[str] = ()) -> None:
+        """Advance ``collections``, or every collection of ``database`` when empty."""
+        name = _database_name(database)
+        wanted = tuple(collections)
+        with self._lock:
+            if not wanted:
+                self._generations[name] = self._generations.get(name, 0) + 1
+            for collection in wanted:
+                key = (name, collection)
+                self._versions[key] = self._versions.get(key, 0) + 1
+
+    def bump_documents(self, database: Any, document_ids: Iterable[str]) -> None:
+        """Advance the counter of every id in ``document_ids``."""
+        name = _database_name(database)
+        with self._lock:
+            for document_id in document_ids:
+                key = (name, str(document_id))
+                self._documents[key] = self._documents.get(key, 0) + 1
+
+    def snapshot(self, database: Any, collections: Iterable[str]) -> tuple[int, ...]:
+        """Return the database generation followed by each collection version."""
+        name = _database_name(database)
+        with self._lock:
+            return (
+                self._generations.get(name, 0),
+                *(self._versions.get((name, collection), 0) for collection in collections),
+            )
+
+    def document_snapshot(
+        self,
+        database: Any,
+        document_id: str,
+        collections: Iterable[str] = (),
+    ) -> tuple[int, ...]:
+        """Return :meth:`snapshot` of ``collections`` followed by the document counter."""
+        name = _database_name(database)
+        with self._lock:
+            return (
+                self._generations.get(name, 0),
+                *(self._versions.get((name, collection), 0) for collection in collections),
+                self._documents.get((name, str(document_id)), 0),
+            )
+
+
+@dataclass(slots=True)
+class QueryCacheStats:
+    """Hit and miss counts for one named query."""
+
+    hits: int = 0
+    misses: int = 0
+
+
+@dataclass(slots=True)
+class _Entry:
+    value: Any
+    versions: tuple[int, ...]
+    loaded_at: float
+    owner: weakref.ref
+
+
+class VersionedQueryCache:
+    """Bounded LRU of query results keyed by scope, database, query and parameters.
+
+    An entry is served while the versions of its collections are unchanged
+    and it is younger than ``max_age`` seconds. Values are deep-copied on the
+    way out so callers may mutate what they receive.
+    """
+
+    def __init__(
+        self,
+        *,
+        versions: CollectionVersions,
+        max_age: float = QUERY_CACHE_MAX_AGE_SECONDS,
+        max_entries: int = QUERY_CACHE_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Share ``versions`` with writers and keep at most ``max_entries`` results."""
+        self.versions = versions
+        self.max_age = max_age
+        self.max_entries = max(1, int(max_entries))
+        self._clock = clock
+        self._entries: OrderedDict[tuple[Any, ...], _Entry] = OrderedDict()
+        self._stats: dict[str, QueryCacheStats] = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        database: Any,
+        query: str,
+        loader: Callable[[], T],
+        *,
+        collections: Iterable[str],
+        scope: str = "",
+        params: Hashable = (),
+    ) -> T:
+        """Return the cached result of ``query`` or call ``loader`` and keep it."""
+        target = _database(database)
+        owner = getattr(target, "client", target)
+        key = (scope, id(owner), _database_name(target), query, params)
+        versions = self.versions.snapshot(target, tuple(collections))
+        now = self._clock()
+        with self._lock:
+            stats = self._stats.setdefault(query, QueryCacheStats())
+            entry = self._entries.get(key)
+            # The weak reference guards against a new client reusing the id()
+            # of a collected one.
+            if (
+                entry is not None
+                and entry.owner() is owner
+                and entry.versions == versions
+                and now - entry.loaded_at <= self.max_age
+            ):
+                stats.hits += 1
+                self._entries.move_to_end(key)
+                return copy.deepcopy(entry.value)
+            stats.misses += 1
+        # Versions are read before loading: a write racing the load leaves
+        # the entry stale for the next caller instead of hiding the write.
+        value = loader()
+        try:
+            reference = weakref.ref(owner)
+        except TypeError:
+            return value
+        with self._lock:
+            self._entries[key] = _Entry(value, versions, now, reference)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return copy.deepcopy(value)
+
+    def stats(self) -> dict[str, QueryCacheStats]:
+        """Return a copy of the hit/miss counters by query name."""
+        with self._lock:
+            return {
+                query: QueryCacheStats(item.hits, item.misses)
+                for query, item in sorted(self._stats.items())
+            }
+
+    def clear(self) -> None:
+        """Drop every entry and counter."""
+        with self._lock:
+            self._entries.clear()
+            self._stats.clear()
+
+
+COLLECTION_VERSIONS = CollectionVersions()
+EDITOR_QUERY_CACHE = VersionedQueryCache(versions=COLLECTION_VERSIONS)
+
+
+def bump_collection_versions(database: Any, *collections: str) -> None:
+    """Invalidate cached reads of ``collections``; with none, of the whole database.
+
+    ``database`` may be a database, the MathMongo wrapper or a database name.
+    """
+    COLLECTION_VERSIONS.bump(database, collections)
+
+
+def bump_document_versions(database: Any, *document_ids: str) -> None:
+    """Invalidate per-document cached reads of ``document_ids``."""
+    COLLECTION_VERSIONS.bump_documents(database, document_ids)
+
+
+def cached_query(
+    database: Any,
+    query: str,
+    loader: Callable[[], T],
+    *,
+    collections: Iterable[str],
+    scope: str = "",
+    params: Hashable = (),
+) -> T:
+    """Serve ``loader()`` from :data:`EDITOR_QUERY_CACHE`."""
+    return EDITOR_QUERY_CACHE.get(
+        database, query, loader, collections=collections, scope=scope, params=params
+    )
+
+
+def cached_distinct(database: Any, collection: str, field: str, *, scope: str = "") -> list:
+    """Return ``distinct(field)`` of ``collection`` through the shared cache."""
+    target = _database(database)
+    return cached_query(
+        target,
+        f"{collection}.distinct",
+        lambda: list(target[collection].distinct(field)),
+        collections=(collection,),
+        scope=scope,
+        params=field,
+    )
+
+
+__all__ = [
+    "COLLECTION_VERSIONS",
+    "EDITOR_QUERY_CACHE",
+    "QUERY_CACHE_MAX_AGE_SECONDS",
+    "QUERY_CACHE_MAX_ENTRIES",
+    "CollectionVersions",
+    "QueryCacheStats",
+    "VersionedQueryCache",
+    "bump_collection_versions",
+    "bump_document_versions",
+    "cached_distinct",
+    "cached_query",
+    "query_params",
+]
@@ -16,6 +16,8 @@ from typing import TypeVar
 from pydantic import BaseModel
 from pymongo.errors import DuplicateKeyError
 
+from mathmongo.keyset_pagination import keyset_aggregate
+from mathmongo.keyset_pagination import keyset_find
 from mathmongo.reading_annotations.errors import ReadingAnnotationConflictError
 from mathmongo.reading_annotations.errors import ReadingAnnotationRepositoryError
 from mathmongo.reading_annotations.indexes import CONCEPT_EVIDENCE_LINKS_COLLECTION
@@ -46,6 +48,7 @@ class S4Page(Generic[T]):
     page: int
     page_size: int
     total: int
+    next_cursor: str | None = None
 
     @property
     def pages(self) -> int:
@@ -134,8 +137,22 @@ def _page(
     sort: list[tuple[str, int]],
     model_type: type[T],
     projection: dict[str, int] | None = None,
+    cursor: str | None = None,
 ) -> S4Page[T]:
     page, page_size = _pagination(page, page_size)
+    if cursor is not None:
+        window = keyset_find(
+            collection,
+            query,
+            sort=sort,
+            page_size=page_size,
+            cursor=cursor,
+            projection=projection,
+        )
+        items = tuple(
+            item for raw in window.documents if (item := _model(raw, model_type)) is not None
+        )
+        return S4Page(items, window.page, page_size, window.total, window.next_cursor)
     total = int(collection.count_documents(query))
     cursor = (
         collection.find(query, projection).sort(sort).skip((page - 1) * page_size).limit(page_size)
@@ -231,6 +248,7 @@ class AnnotationRepository:
         kind: AnnotationKind | str | None = None,
         page: int = 1,
         page_size: int = 50,
+        cursor: str | None = None,
     ) -> AnnotationPage:
         query = self._visual_query(
             document_id,
@@ -246,6 +264,7 @@ class AnnotationRepository:
             sort=[("page_number", 1), ("updated_at", -1), ("annotation_id", 1)],
             model_type=DocumentAnnotation,
             projection=DOCUMENT_ANNOTATION_PROJECTION,
+            cursor=cursor,
         )
 
     def list_visual_by_page(
@@ -258,6 +277,7 @@ class AnnotationRepository:
         kind: AnnotationKind | str | None = None,
         page: int = 1,
         page_size: int = 50,
+        cursor: str | None = None,
     ) -> AnnotationPage:
         if not isinstance(pdf_page, int) or isinstance(pdf_page, bool) or pdf_page < 1:
             raise ValueError("pdf_page must be a positive strict integer")
@@ -276,6 +296,7 @@ class AnnotationRepository:
             sort=[("updated_at", -1), ("annotation_id", 1)],
             model_type=DocumentAnnotation,
             projection=DOCUMENT_ANNOTATION_PROJECTION,
+            cursor=cursor,
         )
 
     def list_by_document(
@@ -287,6 +308,7 @@ class AnnotationRepository:
         kind: AnnotationKind | str | None = None,
         page: int = 1,
         page_size: int = 50,
+        cursor: str | None = None,
     ) -> AnnotationPage:
         query: dict[str, Any] = {"document_id": document_id, "user_scope": user_scope}
         if status is not None:
@@ -300,6 +322,7 @@ class AnnotationRepository:
             page_size=page_size,
             sort=[("updated_at", -1), ("annotation_id", 1)],
             model_type=DocumentAnnotation,
+            cursor=cursor,
         )
 
     def list_by_source(
@@ -311,6 +334,7 @@ class AnnotationRepository:
         kind: AnnotationKind | str | None = None,
         page: int = 1,
         page_size: int = 50,
+        cursor: str | None = None,
     ) -> AnnotationPage:
         query: dict[str, Any] = {"source_id": source_id, "user_scope": user_scope}
         if status is not None:
@@ -324,6 +348,7 @@ class AnnotationRepository:
             page_size=page_size,
             sort=[("updated_at", -1), ("annotation_id", 1)],
             model_type=DocumentAnnotation,
+            cursor=cursor,
         )
 
     def search(
@@ -337,6 +362,7 @@ class AnnotationRepository:
         kind: AnnotationKind | str | None = None,
         page: int = 1,
         page_size: int = 50,
+        cursor: str | None = None,
     ) -> AnnotationPage:
         pattern = _search_pattern(query)
         selector: dict[str, Any] = {
@@ -363,6 +389,7 @@ class AnnotationRepository:
             page_size=page_size,
             sort=[("updated_at", -1), ("annotation_id", 1)],
             model_type=DocumentAnnotation,
+            cursor=cursor,
         )
 
     def _replace(self, annotation: DocumentAnnotation) -> DocumentAnnotation | None:
@@ -526,6 +553,7 @@ class ReadingNoteRepository:
         *,
         page: int,
         page_size: int,
+        cursor: str | None = None,
     ) -> ReadingNotePage:
         return _page(
             self._collection,
@@ -534,6 +562,7 @@ class ReadingNoteRepository:
             page_size=page_size,
             sort=[("updated_at", -1), ("note_id", 1)],
             model_type=ReadingNote,
+            cursor=cursor,
         )
 
     def list_by_document(
@@ -545,13 +574,14 @@ class ReadingNoteRepository:
         note_type: ReadingNoteType | str | None = None,
         page: int = 1,
         page_size: int = 50,
+        cursor: str | None = None,
     ) -> ReadingNotePage:
         query: dict[str, Any] = {"document_id": document_id, "user_scope": user_scope}
         if status is not None:
             query["status"] = ReadingNoteStatus(status).value
         if note_type is not None:
             query["note_type"] = ReadingNoteType(note_type).value
-        return self._list(query, page=page, page_size=page_size)
+        return self._list(query, page=page, page_size=page_size, cursor=cursor)
 
     def list_by_source(
         self,
@@ -563,6 +593,7 @@ class ReadingNoteRepository:
         note_type: ReadingNoteType | str | None = None,
         page: int = 1,
         page_size: int = 50,
+        cursor: str | None = None,
     ) -> ReadingNotePage:
         query: dict[str, Any] = {"source_id": source_id, "user_scope": user_scope}
         if source_only:
@@ -571,7 +602,7 @@ class ReadingNoteRepository:
             query["status"] = ReadingNoteStatus(status).value
         if note_type is not None:
             query["note_type"] = ReadingNoteType(note_type).value
-        return self._list(query, page=page, page_size=page_size)
+        return self._list(query, page=page, page_size=page_size, cursor=cursor)
 
     def search(
         self,
@@ -585,6 +616,7 @@ class ReadingNoteRepository:
         note_type: ReadingNoteType | str | None = None,
         page: int = 1,
         page_size: int = 50,
+        cursor: str | None = None,
     ) -> ReadingNotePage:
         pattern = _search_pattern(query)
         selector: dict[str, Any] = {
@@ -605,7 +637,7 @@ class ReadingNoteRepository:
             selector["status"] = ReadingNoteStatus(status).value
         if note_type is not None:
             selector["note_type"] = ReadingNoteType(note_type).value
-        return self._list(selector, page=page, page_size=page_size)
+        return self._list(selector, page=page, page_size=page_size, cursor=cursor)
 
     def _replace(self, note: ReadingNote) -> ReadingNote | None:
         try:
@@ -764,6 +796,7 @@ class ConceptEvidenceRepository:
         *,
         page: int,
         page_size: int,
+        cursor: str | None = None,
     ) -> ConceptEvidencePage:
         return _page(
             self._collection,
@@ -772,6 +805,7 @@ class ConceptEvidenceRepository:
             page_size=page_size,
             sort=[("updated_at", -1), ("evidence_link_id", 1)],
             model_type=ConceptEvidenceLink,
+            cursor=cursor,
         )
 
     def list_by_concept(
@@ -782,6 +816,7 @@ class ConceptEvidenceRepository:
         status: EvidenceLinkStatus | str | None = EvidenceLinkStatus.ACTIVE,
         page: int = 1,
         page_size: int = 50,
+        cursor: str | None = None,
     ) -> ConceptEvidencePage:
         query: dict[str, Any] = {
             "concept_legacy_id": concept_legacy_id,
@@ -789,7 +824,7 @@ class ConceptEvidenceRepository:
         }
         if status is not None:
             query["status"] = EvidenceLinkStatus(status).value
-        return self._list(query, page=page, page_size=page_size)
+        return self._list(query, page=page, page_size=page_size, cursor=cursor)
 
     def list_by_document(
         self,
@@ -798,6 +833,7 @@ class ConceptEvidenceRepository:
         status: EvidenceLinkStatus | str | None = EvidenceLinkStatus.ACTIVE,
         page: int = 1,
         page_size: int = 50,
+        cursor: str | None = None,
     ) -> ConceptEvidencePage:
         """Join indirect targets before server-side sorting and pagination."""
         page, page_size = _pagination(page, page_size)
@@ -828,6 +864,28 @@ class ConceptEvidenceRepository:
                 }
             },
             {"$match": target_match},
+        ]
+        if cursor is not None:
+            window = keyset_aggregate(
+                self._collection,
+                pipeline,
+                sort=[("updated_at", -1), ("evidence_link_id", 1)],
+                page_size=page_size,
+                cursor=cursor,
+                finalize=[{"$unset": ["_annotation", "_note"]}],
+            )
+            return S4Page(
+                tuple(
+                    item
+                    for raw in window.documents
+                    if (item := _model(raw, ConceptEvidenceLink)) is not None
+                ),
+                window.page,
+                page_size,
+                window.total,
+                window.next_cursor,
+            )
+        pipeline += [
             {"$sort": {"updated_at": -1, "evidence_link_id": 1}},
             {
                 "$facet": {
@@ -858,11 +916,12 @@ class ConceptEvidenceRepository:
         status: EvidenceLinkStatus | str | None = EvidenceLinkStatus.ACTIVE,
         page: int = 1,
         page_size: int = 50,
+        cursor: str | None = None,
     ) -> ConceptEvidencePage:
         query: dict[str, Any] = {"annotation_id": annotation_id}
         if status is not None:
             query["status"] = EvidenceLinkStatus(status).value
-        return self._list(query, page=page, page_size=page_size)
+        return self._list(query, page=page, page_size=page_size, cursor=cursor)
 
     def list_by_note(
         self,
@@ -871,11 +930,12 @@ class ConceptEvidenceRepository:
         status: EvidenceLinkStatus | str | None = EvidenceLinkStatus.ACTIVE,
         page: int = 1,
         page_size: int = 50,
+        cursor: str | None = None,
     ) -> ConceptEvidencePage:
         query: dict[str, Any] = {"note_id": note_id}
         if status is not None:
             query["status"] = EvidenceLinkStatus(status).value
-        return self._list(query, page=page, page_size=page_size)
+        return self._list(query, page=page, page_size=page_size, cursor=cursor)
 
     def list_by_source(
         self,
@@ -884,11 +944,12 @@ class ConceptEvidenceRepository:
         status: EvidenceLinkStatus | str | None = EvidenceLinkStatus.ACTIVE,
         page: int = 1,
         page_size: int = 50,
+        cursor: str | None = None,
     ) -> ConceptEvidencePage:
         query: dict[str, Any] = {"source_id": source_id}
         if status is not None:
             query["status"] = EvidenceLinkStatus(status).value
-        return self._list(query, page=page, page_size=page_size)
+        return self._list(query, page=page, page_size=page_size, cursor=cursor)
 
     def search(
         self,
@@ -898,6 +959,7 @@ class ConceptEvidenceRepository:
         status: EvidenceLinkStatus | str | None = EvidenceLinkStatus.ACTIVE,
         page: int = 1,
         page_size: int = 50,
+        cursor: str | None = None,
     ) -> ConceptEvidencePage:
         pattern = _search_pattern(query)
         selector: dict[str, Any] = {
@@ -911,7 +973,7 @@ class ConceptEvidenceRepository:
             selector["source_id"] = source_id
         if status is not None:
             selector["status"] = EvidenceLinkStatus(status).value
-        return self._list(selector, page=page, page_size=page_size)
+        return self._list(selector, page=page, page_size=page_size, cursor=cursor)
 
     def _replace(self, link: ConceptEvidenceLink) -> ConceptEvidenceLink | None:
         try:
@@ -13,6 +13,7 @@ from typing import TypeVar
 
 from pydantic import ValidationError
 
+from mathmongo.keyset_pagination import InvalidCursorError
 from mathmongo.reading_annotations.errors import ReadingAnnotationConflictError
 from mathmongo.reading_annotations.errors import ReadingAnnotationIndexConflictError
 from mathmongo.reading_annotations.errors import ReadingAnnotationRepositoryError
@@ -60,6 +61,7 @@ class ReadingAnnotationOperationStatus(str, Enum):
     NOT_FOUND = "not_found"
     ARCHIVED = "archived"
     INVALID_STATE = "invalid_state"
+    INVALID_CURSOR = "invalid_cursor"
     CONFLICT = "conflict"
     BLOCKED = "blocked"
     ERROR = "error"
@@ -408,6 +410,7 @@ class ReadingAnnotationService:
         search: str | None = None,
         page: int = 1,
         page_size: int = 50,
+        cursor: str | None = None,
         user_scope: str = "local",
     ) -> ReadingAnnotationServiceResult[AnnotationPage]:
         scope = self._scope_is_local(user_scope)
@@ -426,6 +429,7 @@ class ReadingAnnotationService:
                     kind=kind,
                     page=page,
                     page_size=page_size,
+                    cursor=cursor,
                 )
                 if search and search.strip()
                 else self.annotations.list_by_document(
@@ -435,9 +439,12 @@ class ReadingAnnotationService:
                     kind=kind,
                     page=page,
                     page_size=page_size,
+                    cursor=cursor,
                 )
             )
             return self._result(ReadingAnnotationOperationStatus.SUCCESS, value)
+        except InvalidCursorError as exc:
+            return self._result(ReadingAnnotationOperationStatus.INVALID_CURSOR, message=str(exc))
         except (ValidationError, ValueError, TypeError) as exc:
             return self._result(ReadingAnnotationOperationStatus.INVALID_STATE, message=str(exc))
         except Exception:
@@ -454,6 +461,7 @@ class ReadingAnnotationService:
         search: str | None = None,
         page: int = 1,
         page_size: int = 50,
+        cursor: str | None = None,
         user_scope: str = "local",
     ) -> ReadingAnnotationServiceResult[AnnotationPage]:
         scope = self._scope_is_local(user_scope)
@@ -472,6 +480,7 @@ class ReadingAnnotationService:
                     kind=kind,
                     page=page,
                     page_size=page_size,
+                    cursor=cursor,
                 )
                 if search and search.strip()
                 else self.annotations.list_by_source(
@@ -481,9 +490,12 @@ class ReadingAnnotationService:
                     kind=kind,
                     page=page,
                     page_size=page_size,
+                    cursor=cursor,
                 )
             )
             return self._result(ReadingAnnotationOperationStatus.SUCCESS, value)
+        except InvalidCursorError as exc:
+            return self._result(ReadingAnnotationOperationStatus.INVALID_CURSOR, message=str(exc))
         except (ValidationError, ValueError, TypeError) as exc:
             return self._result(ReadingAnnotationOperationStatus.INVALID_STATE, message=str(exc))
         except Exception:
@@ -866,6 +878,7 @@ class ReadingAnnotationService:
         kind: AnnotationKind | str | None = None,
         page: int = 1,
         page_size: int = 50,
+        cursor: str | None = None,
         user_scope: str = "local",
     ) -> ReadingAnnotationServiceResult[AnnotationPage]:
         scope = self._scope_is_local(user_scope)
@@ -884,6 +897,7 @@ class ReadingAnnotationService:
                     kind=kind,
                     page=page,
                     page_size=page_size,
+                    cursor=cursor,
                 )
                 if pdf_page is not None
                 else self.annotations.list_visual_by_document(
@@ -893,9 +907,12 @@ class ReadingAnnotationService:
                     kind=kind,
                     page=page,
                     page_size=page_size,
+                    cursor=cursor,
                 )
             )
             return self._result(ReadingAnnotationOperationStatus.SUCCESS, value)
+        except InvalidCursorError as exc:
+            return self._result(ReadingAnnotationOperationStatus.INVALID_CURSOR, message=str(exc))
         except (ValidationError, ValueError, TypeError) as exc:
             return self._result(ReadingAnnotationOperationStatus.INVALID_STATE, message=str(exc))
         except Exception:
@@ -1117,6 +1134,7 @@ class ReadingAnnotationService:
         page_size: int,
         user_scope: str,
         source_only: bool = False,
+        cursor: str | None = None,
     ) -> ReadingAnnotationServiceResult[ReadingNotePage]:
         scope = self._scope_is_local(user_scope)
         if scope is not None:
@@ -1133,6 +1151,7 @@ class ReadingAnnotationService:
                     note_type=note_type,
                     page=page,
                     page_size=page_size,
+                    cursor=cursor,
                 )
             elif document_id is not None:
                 value = self.notes.list_by_document(
@@ -1142,6 +1161,7 @@ class ReadingAnnotationService:
                     note_type=note_type,
                     page=page,
                     page_size=page_size,
+                    cursor=cursor,
                 )
             else:
                 value = self.notes.list_by_source(
@@ -1152,8 +1172,11 @@ class ReadingAnnotationService:
                     note_type=note_type,
                     page=page,
                     page_size=page_size,
+                    cursor=cursor,
                 )
             return self._result(ReadingAnnotationOperationStatus.SUCCESS, value)
+        except InvalidCursorError as exc:
+            return self._result(ReadingAnnotationOperationStatus.INVALID_CURSOR, message=str(exc))
         except (ValidationError, ValueError, TypeError) as exc:
             return self._result(ReadingAnnotationOperationStatus.INVALID_STATE, message=str(exc))
         except Exception:
@@ -1170,6 +1193,7 @@ class ReadingAnnotationService:
         search: str | None = None,
         page: int = 1,
         page_size: int = 50,
+        cursor: str | None = None,
         user_scope: str = "local",
     ) -> ReadingAnnotationServiceResult[ReadingNotePage]:
         context = self._document(document_id, require_active=False)
@@ -1182,6 +1206,7 @@ class ReadingAnnotationService:
             search=search,
             page=page,
             page_size=page_size,
+            cursor=cursor,
             user_scope=user_scope,
         )
 
@@ -1195,6 +1220,7 @@ class ReadingAnnotationService:
         source_only: bool = False,
         page: int = 1,
         page_size: int = 50,
+        cursor: str | None = None,
         user_scope: str = "local",
     ) -> ReadingAnnotationServiceResult[ReadingNotePage]:
         source = self._source(source_id)
@@ -1208,6 +1234,7 @@ class ReadingAnnotationService:
             search=search,
             page=page,
             page_size=page_size,
+            cursor=cursor,
             user_scope=user_scope,
         )
 
@@ -1562,6 +1589,8 @@ class ReadingAnnotationService:
                 ReadingAnnotationOperationStatus.SUCCESS,
                 getattr(self.evidence, method)(*args, **kwargs),
             )
+        except InvalidCursorError as exc:
+            return self._result(ReadingAnnotationOperationStatus.INVALID_CURSOR, message=str(exc))
         except (ValidationError, ValueError, TypeError) as exc:
             return self._result(ReadingAnnotationOperationStatus.INVALID_STATE, message=str(exc))
         except Exception:
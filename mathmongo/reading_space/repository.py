@@ -14,6 +14,9 @@ from typing import Any
 from pymongo import ReturnDocument
 from pymongo.errors import DuplicateKeyError
 
+from mathmongo.keyset_pagination import keyset_aggregate
+from mathmongo.keyset_pagination import keyset_find
+from mathmongo.query_cache import bump_document_versions
 from mathmongo.reading_space.errors import ReadingStateConflictError
 from mathmongo.reading_space.errors import ReadingStateRepositoryError
 from mathmongo.reading_space.models import DocumentReadingState
@@ -33,6 +36,7 @@ class ReadingStatePage:
     page: int
     page_size: int
     total: int
+    next_cursor: str | None = None
 
     @property
     def pages(self) -> int:
@@ -57,6 +61,7 @@ class ReadableDocumentPage:
     page: int
     page_size: int
     total: int
+    next_cursor: str | None = None
 
     @property
     def pages(self) -> int:
@@ -199,6 +204,7 @@ class ReadingStateRepository:
             ) from exc
         except Exception as exc:
             raise ReadingStateRepositoryError("Reading state upsert failed") from exc
+        bump_document_versions(self.database, candidate.document_id)
         model = _reading_model(raw)
         if model is None:
             raise ReadingStateRepositoryError("Reading state upsert returned no document")
@@ -221,6 +227,7 @@ class ReadingStateRepository:
         user_scope: str = "local",
         page: int = 1,
         page_size: int = 20,
+        cursor: str | None = None,
     ) -> ReadingStatePage:
         page, page_size = _pagination(page, page_size)
         query = {
@@ -232,6 +239,7 @@ class ReadingStateRepository:
             page=page,
             page_size=page_size,
             sort=[("last_opened_at", -1), ("updated_at", -1), ("reading_state_id", 1)],
+            cursor=cursor,
         )
 
     def list_by_source(
@@ -242,6 +250,7 @@ class ReadingStateRepository:
         status: ReadingStatus | str | None = None,
         page: int = 1,
         page_size: int = 50,
+        cursor: str | None = None,
     ) -> ReadingStatePage:
         page, page_size = _pagination(page, page_size)
         query: dict[str, Any] = {
@@ -255,6 +264,7 @@ class ReadingStateRepository:
             page=page,
             page_size=page_size,
             sort=[("updated_at", -1), ("reading_state_id", 1)],
+            cursor=cursor,
         )
 
     def _page(
@@ -264,13 +274,25 @@ class ReadingStateRepository:
         page: int,
         page_size: int,
         sort: list[tuple[str, int]],
+        cursor: str | None = None,
     ) -> ReadingStatePage:
+        if cursor is not None:
+            window = keyset_find(
+                self._collection, query, sort=sort, page_size=page_size, cursor=cursor
+            )
+            return ReadingStatePage(
+                tuple(
+                    model for raw in window.documents if (model := _reading_model(raw)) is not None
+                ),
+                window.page,
+                page_size,
+                window.total,
+                window.next_cursor,
+            )
         total = int(self._collection.count_documents(query))
-        cursor = (
-            self._collection.find(query).sort(sort).skip((page - 1) * page_size).limit(page_size)
-        )
+        rows = self._collection.find(query).sort(sort).skip((page - 1) * page_size).limit(page_size)
         return ReadingStatePage(
-            tuple(model for raw in cursor if (model := _reading_model(raw)) is not None),
+            tuple(model for raw in rows if (model := _reading_model(raw)) is not None),
             page,
             page_size,
             total,
@@ -292,6 +314,7 @@ class ReadingStateRepository:
             raise ReadingStateConflictError("Concurrent reading-state conflict") from exc
         except Exception as exc:
             raise ReadingStateRepositoryError("Reading state update failed") from exc
+        bump_document_versions(self.database, state.document_id)
         if not getattr(result, "matched_count", 0):
             raise ReadingStateConflictError("Reading state changed concurrently")
         return state
@@ -400,6 +423,7 @@ class ReadingStateRepository:
             raise ReadingStateConflictError("Concurrent reading-state conflict") from exc
         except Exception as exc:
             raise ReadingStateRepositoryError("Could not mark the document opened") from exc
+        bump_document_versions(self.database, document_id)
         model = _reading_model(raw)
         if model is None:
             raise ReadingStateConflictError("Reading state changed concurrently")
@@ -414,6 +438,7 @@ class ReadingStateRepository:
         result = self._collection.delete_one(
             {"user_scope": validate_user_scope(user_scope), "document_id": document_id}
         )
+        bump_document_versions(self.database, document_id)
         return bool(getattr(result, "deleted_count", 0))
 
     def count_by_status(
@@ -522,6 +547,7 @@ class ReadableDocumentRepository:
         user_scope: str = "local",
         page: int = 1,
         page_size: int = 50,
+        cursor: str | None = None,
     ) -> ReadableDocumentPage:
         page, page_size = _pagination(page, page_size)
         scope = validate_user_scope(user_scope)
@@ -548,24 +574,41 @@ class ReadableDocumentRepository:
                     else {"$and": joined_conditions}
                 }
             )
-        pipeline.append(
-            {
-                "$facet": {
-                    "items": [
-                        {"$sort": dict(self._sort(selected.order))},
-                        {"$skip": (page - 1) * page_size},
-                        {"$limit": page_size},
-                    ],
-                    "total": [{"$count": "value"}],
+        next_cursor = None
+        if cursor is not None:
+            window = keyset_aggregate(
+                self._collection,
+                pipeline,
+                sort=self._sort(selected.order),
+                page_size=page_size,
+                cursor=cursor,
+            )
+            rows, page, total, next_cursor = (
+                window.documents,
+                window.page,
+                window.total,
+                window.next_cursor,
+            )
+        else:
+            pipeline.append(
+                {
+                    "$facet": {
+                        "items": [
+                            {"$sort": dict(self._sort(selected.order))},
+                            {"$skip": (page - 1) * page_size},
+                            {"$limit": page_size},
+                        ],
+                        "total": [{"$count": "value"}],
+                    }
                 }
-            }
-        )
-        result = tuple(self._collection.aggregate(pipeline))
-        facet = result[0] if result else {}
-        count_rows = facet.get("total", [])
-        total = int(count_rows[0].get("value", 0)) if count_rows else 0
+            )
+            result = tuple(self._collection.aggregate(pipeline))
+            facet = result[0] if result else {}
+            count_rows = facet.get("total", [])
+            total = int(count_rows[0].get("value", 0)) if count_rows else 0
+            rows = tuple(facet.get("items", []))
         items: list[ReadableDocumentItem] = []
-        for raw in facet.get("items", []):
+        for raw in rows:
             payload = dict(raw)
             state_raw = payload.pop("_reading_state", None)
             payload.pop("_reading_states", None)
@@ -576,7 +619,7 @@ class ReadableDocumentRepository:
                     _reading_model(state_raw),
                 )
             )
-        return ReadableDocumentPage(tuple(items), page, page_size, total)
+        return ReadableDocumentPage(tuple(items), page, page_size, total, next_cursor)
 
     def list_recent(
         self,
@@ -584,6 +627,7 @@ class ReadableDocumentRepository:
         user_scope: str = "local",
         page: int = 1,
         page_size: int = 20,
+        cursor: str | None = None,
     ) -> ReadableDocumentPage:
         """Join existing Documents before sorting and paginating recent reads."""
         page, page_size = _pagination(page, page_size)
@@ -612,29 +656,43 @@ class ReadableDocumentRepository:
             },
             {"$match": {"_reading_states.0": {"$exists": True}}},
             {"$set": {"_reading_state": {"$arrayElemAt": ["$_reading_states", 0]}}},
-            {
-                "$facet": {
-                    "items": [
-                        {
-                            "$sort": {
-                                "_reading_state.last_opened_at": -1,
-                                "_reading_state.updated_at": -1,
-                                "document_id": 1,
-                            }
-                        },
-                        {"$skip": (page - 1) * page_size},
-                        {"$limit": page_size},
-                    ],
-                    "total": [{"$count": "value"}],
-                }
-            },
         ]
-        result = tuple(self._collection.aggregate(pipeline))
-        facet = result[0] if result else {}
-        count_rows = facet.get("total", [])
-        total = int(count_rows[0].get("value", 0)) if count_rows else 0
+        sort = [
+            ("_reading_state.last_opened_at", -1),
+            ("_reading_state.updated_at", -1),
+            ("document_id", 1),
+        ]
+        next_cursor = None
+        if cursor is not None:
+            window = keyset_aggregate(
+                self._collection, pipeline, sort=sort, page_size=page_size, cursor=cursor
+            )
+            rows, page, total, next_cursor = (
+                window.documents,
+                window.page,
+                window.total,
+                window.next_cursor,
+            )
+        else:
+            pipeline.append(
+                {
+                    "$facet": {
+                        "items": [
+                            {"$sort": dict(sort)},
+                            {"$skip": (page - 1) * page_size},
+                            {"$limit": page_size},
+                        ],
+                        "total": [{"$count": "value"}],
+                    }
+                }
+            )
+            result = tuple(self._collection.aggregate(pipeline))
+            facet = result[0] if result else {}
+            count_rows = facet.get("total", [])
+            total = int(count_rows[0].get("value", 0)) if count_rows else 0
+            rows = tuple(facet.get("items", []))
         items: list[ReadableDocumentItem] = []
-        for raw in facet.get("items", []):
+        for raw in rows:
             payload = dict(raw)
             state_raw = payload.pop("_reading_state", None)
             payload.pop("_reading_states", None)
@@ -642,7 +700,7 @@ class ReadableDocumentRepository:
             if state is None:
                 continue
             items.append(ReadableDocumentItem(_source_document_model(payload), state))
-        return ReadableDocumentPage(tuple(items), page, page_size, total)
+        return ReadableDocumentPage(tuple(items), page, page_size, total, next_cursor)
 
     def source_summary(
         self,
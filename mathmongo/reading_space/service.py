@@ -95,6 +95,7 @@ class RecentDocumentPage:
     page: int
     page_size: int
     total: int
+    next_cursor: str | None = None
 
     @property
     def pages(self) -> int:
@@ -364,6 +365,7 @@ class ReadingSpaceService:
         user_scope: str = "local",
         page: int = 1,
         page_size: int = 50,
+        cursor: str | None = None,
     ) -> ReadingServiceResult[ReadableDocumentPage]:
         try:
             result = self.readable_documents.list(
@@ -371,6 +373,7 @@ class ReadingSpaceService:
                 user_scope=user_scope,
                 page=page,
                 page_size=page_size,
+                cursor=cursor,
             )
             source_cache: dict[str, Source | None] = {}
             reference_cache: dict[str, Reference | None] = {}
@@ -403,7 +406,13 @@ class ReadingSpaceService:
             )
         return ReadingServiceResult(
             ReadingOperationStatus.SUCCESS,
-            ReadableDocumentPage(tuple(enriched), result.page, result.page_size, result.total),
+            ReadableDocumentPage(
+                tuple(enriched),
+                result.page,
+                result.page_size,
+                result.total,
+                result.next_cursor,
+            ),
         )
 
     def list_recent_documents(
@@ -412,12 +421,14 @@ class ReadingSpaceService:
         user_scope: str = "local",
         page: int = 1,
         page_size: int = 20,
+        cursor: str | None = None,
     ) -> ReadingServiceResult[RecentDocumentPage]:
         try:
             documents_page = self.readable_documents.list_recent(
                 user_scope=user_scope,
                 page=page,
                 page_size=page_size,
+                cursor=cursor,
             )
             items: list[RecentDocumentItem] = []
             for item in documents_page.items:
@@ -452,6 +463,7 @@ class ReadingSpaceService:
                 documents_page.page,
                 documents_page.page_size,
                 documents_page.total,
+                documents_page.next_cursor,
             ),
         )
 
@@ -0,0 +1,160 @@
+"""Structured, indexable endpoint fields for legacy ``"id@source"`` relations.
+
+Relations keep ``desde``/``hasta`` as the canonical identity. The derived
+``desde_id``/``desde_source``/``hasta_id``/``hasta_source`` fields are a pure
+function of those strings: writers set them, and source-scoped reads use
+equality or ``$in`` on them instead of ``$regex`` suffix scans.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from pymongo import UpdateOne
+
+ENDPOINT_FIELDS = ("desde_id", "desde_source", "hasta_id", "hasta_source")
+BACKFILL_BATCH_SIZE = 500
+
+
+def split_relation_endpoint(value: Any) -> tuple[str, str] | None:
+    """Return ``(id, source)`` using the last ``@``, or ``None`` when malformed."""
+    if not isinstance(value, str) or "@" not in value:
+        return None
+    concept_id, source = value.rsplit("@", 1)
+    if not concept_id or not source:
+        return None
+    return concept_id, source
+
+
+def relation_endpoint_fields(desde: Any, hasta: Any) -> dict[str, str]:
+    """Derive the structured fields for every well-formed endpoint."""
+    fields: dict[str, str] = {}
+    for prefix, value in (("desde", desde), ("hasta", hasta)):
+        endpoint = split_relation_endpoint(value)
+        if endpoint is not None:
+            fields[f"{prefix}_id"], fields[f"{prefix}_source"] = endpoint
+    return fields
+
+
+def with_relation_endpoint_fields(document: Any) -> Any:
+    """Return a copy whose derived fields agree with ``desde``/``hasta``.
+
+    Non-mapping values are returned unchanged so callers keep their own
+    validation and error reporting.
+    """
+    if not isinstance(document, Mapping):
+        return document
+    updated = {key: value for key, value in document.items() if key not in ENDPOINT_FIELDS}
+    updated.update(relation_endpoint_fields(document.get("desde"), document.get("hasta")))
+    return updated
+
+
+def relation_source_query(sources: Iterable[str]) -> dict[str, Any]:
+    """Match relations with either endpoint in ``sources``.
+
+    Each ``$or`` branch is served by an endpoint index. Relations written
+    before the backfill have no ``*_source`` field; the ``$exists: false``
+    branches keep them visible (they use the null range of the same index)
+    until :func:`apply_relation_endpoint_backfill` has run.
+    """
+    clean = sorted({source for source in sources if isinstance(source, str) and source})
+    if not clean:
+        return {"_id": {"$exists": False}}
+    condition: Any = clean[0] if len(clean) == 1 else {"$in": clean}
+    suffix = "|".join(re.escape(source) for source in clean)
+    return {
+        "$or": [
+            {"desde_source": condition},
+            {"hasta_source": condition},
+            {"desde_source": {"$exists": False}, "desde": {"$regex": f"@({suffix})$"}},
+            {"hasta_source": {"$exists": False}, "hasta": {"$regex": f"@({suffix})$"}},
+        ]
+    }
+
+
+@dataclass(frozen=True, slots=True)
+class RelationEndpointBackfillReport:
+    """Counts from one idempotent backfill pass over ``relations``."""
+
+    scanned: int
+    updated: int
+    malformed: int
+    dry_run: bool
+
+
+def _needs_backfill(document: Mapping[str, Any]) -> bool:
+    expected = relation_endpoint_fields(document.get("desde"), document.get("hasta"))
+    return any(document.get(field) != expected.get(field) for field in ENDPOINT_FIELDS)
+
+
+def apply_relation_endpoint_backfill(
+    relations: Any,
+    *,
+    dry_run: bool = False,
+    batch_size: int = BACKFILL_BATCH_SIZE,
+) -> RelationEndpointBackfillReport:
+    """Set derived endpoint fields on every relation that lacks or disagrees with them.
+
+    Each update is guarded by the ``desde``/``hasta`` values it was derived
+    from, so a concurrent endpoint edit is never overwritten with stale data.
+    """
+    projection = {"_id": 1, "desde": 1, "hasta": 1, **{field: 1 for field in ENDPOINT_FIELDS}}
+    scanned = updated = malformed = 0
+    batch: list[UpdateOne] = []
+
+    def flush() -> int:
+        if not batch or dry_run:
+            count = len(batch)
+            batch.clear()
+            return count
+        result = relations.bulk_write(list(batch), ordered=False)
+        batch.clear()
+        return int(getattr(result, "modified_count", 0))
+
+    for document in relations.find({}, projection):
+        scanned += 1
+        fields = relation_endpoint_fields(document.get("desde"), document.get("hasta"))
+        if len(fields) != len(ENDPOINT_FIELDS):
+            malformed += 1
+        if not _needs_backfill(document):
+            continue
+        stale = [field for field in ENDPOINT_FIELDS if field not in fields and field in document]
+        update: dict[str, Any] = {}
+        if fields:
+            update["$set"] = fields
+        if stale:
+            update["$unset"] = {field: "" for field in stale}
+        batch.append(
+            UpdateOne(
+                {
+                    "_id": document["_id"],
+                    "desde": document.get("desde"),
+                    "hasta": document.get("hasta"),
+                },
+                update,
+            )
+        )
+        if len(batch) >= max(1, int(batch_size)):
+            updated += flush()
+    updated += flush()
+    return RelationEndpointBackfillReport(
+        scanned=scanned,
+        updated=updated,
+        malformed=malformed,
+        dry_run=dry_run,
+    )
+
+
+__all__ = [
+    "ENDPOINT_FIELDS",
+    "RelationEndpointBackfillReport",
+    "apply_relation_endpoint_backfill",
+    "relation_endpoint_fields",
+    "relation_source_query",
+    "split_relation_endpoint",
+    "with_relation_endpoint_fields",
+]
@@ -20,6 +20,8 @@ from typing import TypeVar
 from pydantic import BaseModel
 from pymongo.errors import DuplicateKeyError
 
+from mathmongo.keyset_pagination import keyset_find
+from mathmongo.query_cache import bump_collection_versions
 from mathmongo.source_catalog.models import Reference
 from mathmongo.source_catalog.models import Source
 from mathmongo.source_catalog.models import utc_now
@@ -61,6 +63,7 @@ class PageResult(Generic[T]):
     page: int
     page_size: int
     total: int
+    next_cursor: str | None = None
 
     @property
     def pages(self) -> int:
@@ -153,11 +156,22 @@ def _cursor_page(
     page_size: int,
     sort: list[tuple[str, int]],
     model_type: type[T],
+    cursor: str | None = None,
 ) -> PageResult[T]:
     page, page_size = _pagination(page, page_size)
+    if cursor is not None:
+        window = keyset_find(collection, query, sort=sort, page_size=page_size, cursor=cursor)
+        items = tuple(_model_document(document, model_type) for document in window.documents)
+        return PageResult(
+            items=items,  # type: ignore[arg-type]
+            page=window.page,
+            page_size=page_size,
+            total=window.total,
+            next_cursor=window.next_cursor,
+        )
     total = int(collection.count_documents(query))
-    cursor = collection.find(query).sort(sort).skip((page - 1) * page_size).limit(page_size)
-    items = tuple(_model_document(document, model_type) for document in cursor)
+    rows = collection.find(query).sort(sort).skip((page - 1) * page_size).limit(page_size)
+    items = tuple(_model_document(document, model_type) for document in rows)
     return PageResult(items=items, page=page, page_size=page_size, total=total)  # type: ignore[arg-type]
 
 
@@ -200,6 +214,7 @@ class SourceRepository:
             self._collection.insert_one(_mongo_document(model))
         except DuplicateKeyError as exc:
             raise RepositoryConflictError(f"Source ID already exists: {model.source_id}") from exc
+        bump_collection_versions(self.database, self.COLLECTION)
         return model
 
     def get_by_id(self, source_id: str) -> Source | None:
@@ -244,6 +259,7 @@ class SourceRepository:
         status: str | None = None,
         source_type: str | None = None,
         tag: str | None = None,
+        cursor: str | None = None,
     ) -> PageResult[Source]:
         """List a bounded Source page with stable ordering."""
         query: dict[str, Any] = {}
@@ -260,6 +276,7 @@ class SourceRepository:
             page_size=page_size,
             sort=[("updated_at", -1), ("source_id", 1)],
             model_type=Source,
+            cursor=cursor,
         )
 
     def search(
@@ -271,6 +288,7 @@ class SourceRepository:
         status: str | None = None,
         source_type: str | None = None,
         tag: str | None = None,
+        cursor: str | None = None,
     ) -> PageResult[Source]:
         """Search approved Source fields with an escaped bounded regex."""
         _value, escaped = _search_pattern(term)
@@ -298,6 +316,7 @@ class SourceRepository:
             page_size=page_size,
             sort=[("name_normalized", 1), ("source_id", 1)],
             model_type=Source,
+            cursor=cursor,
         )
 
     def update(self, source_id: str, changes: Mapping[str, Any]) -> Source | None:
@@ -326,6 +345,7 @@ class SourceRepository:
             )
         except DuplicateKeyError as exc:
             raise RepositoryConflictError(f"Concurrent Source conflict: {source_id}") from exc
+        bump_collection_versions(self.database, self.COLLECTION)
         if not result.matched_count:
             return None
         return self.get_by_id(source_id)
@@ -445,6 +465,7 @@ class SourceRepository:
         if blockers:
             raise PhysicalDeletionBlockedError(source_id, blockers)
         result = self._collection.delete_one({"source_id": source_id})
+        bump_collection_versions(self.database, self.COLLECTION)
         return bool(result.deleted_count)
 
 
@@ -502,6 +523,7 @@ class ReferenceRepository:
             raise RepositoryConflictError(
                 f"Reference ID already exists: {model.reference_id}"
             ) from exc
+        bump_collection_versions(self.database, self.COLLECTION)
         return model
 
     def get_by_id(self, reference_id: str) -> Reference | None:
@@ -534,6 +556,7 @@ class ReferenceRepository:
         source_id: str | None = None,
         reference_type: str | None = None,
         year: int | None = None,
+        cursor: str | None = None,
     ) -> PageResult[Reference]:
         """List a bounded Reference page with stable ordering."""
         query: dict[str, Any] = {}
@@ -552,6 +575,7 @@ class ReferenceRepository:
             page_size=page_size,
             sort=[("updated_at", -1), ("reference_id", 1)],
             model_type=Reference,
+            cursor=cursor,
         )
 
     def list_quality_candidates(
@@ -603,6 +627,7 @@ class ReferenceRepository:
         page_size: int = 50,
         status: str | None = None,
         source_id: str | None = None,
+        cursor: str | None = None,
     ) -> PageResult[Reference]:
         """Search approved bibliographic fields with escaped input."""
         value, escaped = _search_pattern(term)
@@ -636,6 +661,7 @@ class ReferenceRepository:
             page_size=page_size,
             sort=[("year", -1), ("title", 1), ("reference_id", 1)],
             model_type=Reference,
+            cursor=cursor,
         )
 
     def update(self, reference_id: str, changes: Mapping[str, Any]) -> Reference | None:
@@ -665,6 +691,7 @@ class ReferenceRepository:
             raise RepositoryConflictError(
                 f"Concurrent Reference conflict: {reference_id}"
             ) from exc
+        bump_collection_versions(self.database, self.COLLECTION)
         if not result.matched_count:
             return None
         return self.get_by_id(reference_id)
@@ -718,6 +745,7 @@ class ReferenceRepository:
                 "$set": {"updated_at": associated.updated_at},
             },
         )
+        bump_collection_versions(self.database, self.COLLECTION)
         return self.get_by_id(reference_id) if result.matched_count else None
 
     def disassociate_source(self, reference_id: str, source_id: str) -> Reference | None:
@@ -735,6 +763,7 @@ class ReferenceRepository:
                 "$set": {"updated_at": disassociated.updated_at},
             },
         )
+        bump_collection_versions(self.database, self.COLLECTION)
         return self.get_by_id(reference_id) if result.matched_count else None
 
     def duplicate_candidates(
@@ -829,6 +858,7 @@ class ReferenceRepository:
         if blockers:
             raise PhysicalDeletionBlockedError(reference_id, blockers)
         result = self._collection.delete_one({"reference_id": reference_id})
+        bump_collection_versions(self.database, self.COLLECTION)
         return bool(result.deleted_count)
 
 
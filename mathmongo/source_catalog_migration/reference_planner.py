@@ -97,6 +97,9 @@ _COMPATIBILITY_FIELDS = (
     "language",
     "other_fields",
 )
+_EQUALITY_FIELDS = (*_COMPATIBILITY_FIELDS, "doi")
+_INTERSECTION_FIELDS = ("valid_isbns", "citekeys")
+_GROUPING_RULES = ("doi", "isbn", "citekey", "author_title_year")
 
 
 @dataclass(frozen=True, slots=True)
@@ -147,6 +150,18 @@ class _PendingConflict:
     right_keys: tuple[tuple[str, str], ...]
     contradictory_fields: tuple[str, ...]
     matching_fields: tuple[str, ...]
+    # Planning passes that observed this exact pair; conflict keys hash the
+    # evidence with this multiplicity, so it is part of the plan digest.
+    count: int = 1
+
+
+@dataclass(slots=True)
+class _Summary:
+    """Per-field value sets that decide group compatibility without pairwise scans."""
+
+    blocked: bool
+    values: dict[str, list[Any]]
+    sets: dict[str, list[frozenset[str]]]
 
 
 def is_valid_doi(value: Any) -> bool:
@@ -517,52 +532,187 @@ def _group_keys(group: _Group) -> tuple[tuple[str, str], ...]:
     )
 
 
+def _add_distinct(values: list[Any], value: Any) -> None:
+    if value not in values:
+        values.append(value)
+
+
+def _summary(observations: Iterable[ReferenceObservation]) -> _Summary:
+    summary = _Summary(
+        blocked=False,
+        values={field: [] for field in _EQUALITY_FIELDS},
+        sets={field: [] for field in _INTERSECTION_FIELDS},
+    )
+    for observation in observations:
+        summary.blocked = summary.blocked or bool(_flag_contradictory_fields(observation.flags))
+        for field in _EQUALITY_FIELDS:
+            value = observation.normalized.get(field)
+            if _populated(value):
+                _add_distinct(summary.values[field], value)
+        for field in _INTERSECTION_FIELDS:
+            value = frozenset(observation.normalized.get(field) or ())
+            if value:
+                _add_distinct(summary.sets[field], value)
+    return summary
+
+
+def _summaries_compatible(left: _Summary, right: _Summary) -> bool:
+    """Return what ``_groups_compatible`` decides, from the value sets alone."""
+    if left.blocked or right.blocked:
+        return False
+    for field in _EQUALITY_FIELDS:
+        if not all(a == b for a in left.values[field] for b in right.values[field]):
+            return False
+    for field in _INTERSECTION_FIELDS:
+        if not all(a & b for a in left.sets[field] for b in right.sets[field]):
+            return False
+    return True
+
+
+class _GroupForest:
+    """Disjoint-set forest over the initial groups.
+
+    A root is always the lowest initial position of its set, so roots sort
+    in the order the groups would keep in a list where merges fold the
+    later group into the earlier one.
+    """
+
+    def __init__(self, groups: list[_Group]) -> None:
+        """Start with every initial group in its own set."""
+        self.parent = list(range(len(groups)))
+        self.groups = groups
+        self.summaries = [_summary(group.observations) for group in groups]
+        self._unsorted: set[int] = set()
+
+    def find(self, index: int) -> int:
+        """Return the root of ``index``, compressing the path."""
+        root = index
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[index] != root:
+            self.parent[index], index = root, self.parent[index]
+        return root
+
+    def group(self, root: int) -> _Group:
+        """Return the merged group of ``root`` with observations in legacy-key order."""
+        group = self.groups[root]
+        if root in self._unsorted:
+            group.observations.sort(key=lambda item: item.sort_key)
+            self._unsorted.discard(root)
+        return group
+
+    def compatible(self, left: int, right: int) -> bool:
+        """Return whether two roots may merge."""
+        return _summaries_compatible(self.summaries[left], self.summaries[right])
+
+    def union(self, left: int, right: int, rule: str) -> None:
+        """Fold root ``right`` into root ``left`` as evidence for ``rule``."""
+        target = self.groups[left]
+        source = self.groups[right]
+        target.observations.extend(source.observations)
+        target.rules.update(source.rules)
+        target.rules.add(rule)
+        summary = self.summaries[left]
+        other = self.summaries[right]
+        summary.blocked = summary.blocked or other.blocked
+        for field, values in other.values.items():
+            for value in values:
+                _add_distinct(summary.values[field], value)
+        for field, values in other.sets.items():
+            for value in values:
+                _add_distinct(summary.sets[field], value)
+        self.parent[right] = left
+        self._unsorted.add(left)
+        self._unsorted.discard(right)
+        source.observations = []
+
+    def consistent(self, root: int) -> bool:
+        """Return whether every observation pair inside ``root`` is compatible."""
+        if len(self.groups[root].observations) < 2:
+            return True
+        summary = self.summaries[root]
+        return (
+            not summary.blocked
+            and all(len(values) <= 1 for values in summary.values.values())
+            and all(a & b for values in summary.sets.values() for a in values for b in values)
+        )
+
+    def roots(self) -> list[int]:
+        """Return the current roots in group order."""
+        return [index for index in range(len(self.parent)) if self.parent[index] == index]
+
+
 def _merge_by_rule(
-    groups: list[_Group],
+    forest: _GroupForest,
     rule: str,
     conflicts: list[_PendingConflict],
 ) -> None:
-    while True:
-        merged = False
-        token_groups: dict[str, list[int]] = defaultdict(list)
-        for index, group in enumerate(groups):
-            tokens = {
-                token for observation in group.observations for token in _tokens(observation, rule)
-            }
-            for token in sorted(tokens):
-                token_groups[token].append(index)
-        for token in sorted(token_groups):
-            indices = sorted(set(token_groups[token]))
-            for position, left_index in enumerate(indices):
-                for right_index in indices[position + 1 :]:
-                    left = groups[left_index]
-                    right = groups[right_index]
-                    compatible, matching, contradictory = _groups_compatible(left, right)
-                    if not compatible:
-                        conflicts.append(
-                            _PendingConflict(
-                                rule=rule,
-                                token=token,
-                                left_keys=_group_keys(left),
-                                right_keys=_group_keys(right),
-                                contradictory_fields=contradictory,
-                                matching_fields=matching,
-                            )
-                        )
-                        continue
-                    left.observations.extend(right.observations)
-                    left.observations.sort(key=lambda item: item.sort_key)
-                    left.rules.update(right.rules)
-                    left.rules.add(rule)
-                    del groups[right_index]
-                    merged = True
-                    break
-                if merged:
-                    break
-            if merged:
-                break
-        if not merged:
-            return
+    """Merge every compatible pair of groups sharing a ``rule`` token.
+
+    Token buckets are visited once in sorted order and pairs in group order,
+    so merges happen in the same order as rescanning all tokens after each
+    merge would produce: a merge never makes an earlier pair compatible.
+    Conflicting pairs stay "live" until one side grows; each pair version
+    is recorded once with the number of planning passes that saw it.
+    """
+    token_members: dict[str, set[int]] = defaultdict(set)
+    for index, group in enumerate(forest.groups):
+        for observation in group.observations:
+            for token in _tokens(observation, rule):
+                token_members[token].add(index)
+
+    passes = 1
+    live: dict[tuple[str, int, int], int] = {}
+    live_by_root: dict[int, set[tuple[str, int, int]]] = defaultdict(set)
+
+    def close(pair: tuple[str, int, int]) -> None:
+        token, left_root, right_root = pair
+        left = forest.group(left_root)
+        right = forest.group(right_root)
+        _compatible_pair, matching, contradictory = _groups_compatible(left, right)
+        conflicts.append(
+            _PendingConflict(
+                rule=rule,
+                token=token,
+                left_keys=_group_keys(left),
+                right_keys=_group_keys(right),
+                contradictory_fields=contradictory,
+                matching_fields=matching,
+                count=passes - live.pop(pair) + 1,
+            )
+        )
+
+    def track(pair: tuple[str, int, int], first_pass: int) -> None:
+        if pair not in live:
+            live[pair] = first_pass
+            live_by_root[pair[1]].add(pair)
+            live_by_root[pair[2]].add(pair)
+
+    for token in sorted(token_members):
+        roots = sorted({forest.find(index) for index in token_members[token]})
+        position = 0
+        while position < len(roots):
+            left = roots[position]
+            cursor = position + 1
+            while cursor < len(roots):
+                right = roots[cursor]
+                if not forest.compatible(left, right):
+                    track((token, left, right), passes)
+                    cursor += 1
+                    continue
+                touched = live_by_root.pop(left, set()) | live_by_root.pop(right, set())
+                for pair in sorted(touched):
+                    close(pair)
+                    live_by_root[pair[2] if pair[1] in (left, right) else pair[1]].discard(pair)
+                forest.union(left, right, rule)
+                for pair_token, pair_left, pair_right in sorted(touched):
+                    other = pair_right if pair_left in (left, right) else pair_left
+                    track((pair_token, min(left, other), max(left, other)), passes + 1)
+                passes += 1
+                del roots[cursor]
+            position += 1
+    for pair in sorted(live):
+        close(pair)
 
 
 def _identity_sufficient(observation: ReferenceObservation) -> bool:
@@ -792,13 +942,17 @@ def plan_references(
                 observation.legacy_key.id,
             )
         by_fingerprint[grouping_key].append(observation)
-    groups = [
-        _Group(observations=sorted(items, key=lambda item: item.sort_key), rules=set())
-        for _fingerprint, items in sorted(by_fingerprint.items())
-    ]
+    forest = _GroupForest(
+        [
+            _Group(observations=sorted(items, key=lambda item: item.sort_key), rules=set())
+            for _fingerprint, items in sorted(by_fingerprint.items())
+        ]
+    )
     pending_conflicts: list[_PendingConflict] = []
-    for rule in ("doi", "isbn", "citekey", "author_title_year"):
-        _merge_by_rule(groups, rule, pending_conflicts)
+    for rule in _GROUPING_RULES:
+        _merge_by_rule(forest, rule, pending_conflicts)
+    roots = forest.roots()
+    groups = [forest.group(root) for root in roots]
 
     conflict_keys = {
         key for conflict in pending_conflicts for key in (*conflict.left_keys, *conflict.right_keys)
@@ -833,9 +987,7 @@ def plan_references(
         pending_by_candidates[candidate_keys].append(pending)
 
     conflicts_by_key: dict[str, Conflict] = {}
-    rule_priority = {
-        rule: index for index, rule in enumerate(("doi", "isbn", "citekey", "author_title_year"))
-    }
+    rule_priority = {rule: index for index, rule in enumerate(_GROUPING_RULES)}
     for candidate_keys, evidence in sorted(pending_by_candidates.items()):
         primary = min(evidence, key=lambda item: (rule_priority[item.rule], item.token))
         models = [candidate_models[key] for key in candidate_keys]
@@ -843,7 +995,9 @@ def plan_references(
             "conflict",
             {
                 "candidates": candidate_keys,
-                "evidence": sorted((item.rule, item.token) for item in evidence),
+                "evidence": sorted(
+                    (item.rule, item.token) for item in evidence for _pass in range(item.count)
+                ),
             },
         )
         conflicts_by_key[conflict_key] = Conflict(
@@ -938,14 +1092,7 @@ def plan_references(
         review_items=review_items,
         weak_suggestions=tuple(sorted(weak_suggestions, key=lambda item: item.suggestion_key)),
         conflict_safety_passed=conflict_safety_passed
-        and all(
-            all(
-                _compatible(left, right)[0]
-                for index, left in enumerate(group.observations)
-                for right in group.observations[index + 1 :]
-            )
-            for group in groups
-        ),
+        and all(forest.consistent(root) for root in roots),
     )
 
 
@@ -954,15 +1101,20 @@ def weak_reference_suggestions(
 ) -> tuple[tuple[str, str], ...]:
     """Return warning-only candidate pairs with weak title similarity; never merge them."""
     values = tuple(sorted(candidates, key=lambda item: item.reference_candidate_key))
+    titles = [suggestion_key(item.proposed_bibliography.get("title")) for item in values]
+    by_title: dict[str, list[str]] = defaultdict(list)
+    for candidate, title in zip(values, titles, strict=True):
+        if title:
+            by_title[title].append(candidate.reference_candidate_key)
     suggestions: list[tuple[str, str]] = []
-    for index, left in enumerate(values):
-        left_title = suggestion_key(left.proposed_bibliography.get("title"))
-        if not left_title:
+    visited: Counter[str] = Counter()
+    for title in titles:
+        if not title:
             continue
-        for right in values[index + 1 :]:
-            right_title = suggestion_key(right.proposed_bibliography.get("title"))
-            if left_title == right_title:
-                suggestions.append((left.reference_candidate_key, right.reference_candidate_key))
+        keys = by_title[title]
+        position = visited[title]
+        visited[title] += 1
+        suggestions.extend((keys[position], right) for right in keys[position + 1 :])
     return tuple(suggestions)
 
 
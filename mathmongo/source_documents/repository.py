@@ -12,6 +12,8 @@ from typing import Any
 
 from pymongo.errors import DuplicateKeyError
 
+from mathmongo.keyset_pagination import keyset_find
+from mathmongo.query_cache import bump_document_versions
 from mathmongo.source_documents.indexes import SourceDocumentIndexManager
 from mathmongo.source_documents.models import DocumentKind
 from mathmongo.source_documents.models import DocumentStatus
@@ -33,6 +35,7 @@ class SourceDocumentPage:
     page: int
     page_size: int
     total: int
+    next_cursor: str | None = None
 
     @property
     def pages(self) -> int:
@@ -115,6 +118,7 @@ class SourceDocumentRepository:
             raise SourceDocumentRepositoryConflictError(
                 f"Source Document identity already exists: {candidate.document_id}"
             ) from exc
+        bump_document_versions(self.database, candidate.document_id)
         return candidate
 
     def get_by_id(self, document_id: str) -> SourceDocument | None:
@@ -150,6 +154,7 @@ class SourceDocumentRepository:
         page_size: int = 50,
         status: DocumentStatus | str | None = None,
         kind: DocumentKind | str | None = None,
+        cursor: str | None = None,
     ) -> SourceDocumentPage:
         if isinstance(page, bool) or not isinstance(page, int) or page < 1:
             raise ValueError("page must be a positive integer")
@@ -164,21 +169,36 @@ class SourceDocumentRepository:
             query["status"] = getattr(status, "value", status)
         if kind is not None:
             query["kind"] = getattr(kind, "value", kind)
+        if cursor is not None:
+            window = keyset_find(
+                self._collection,
+                query,
+                sort=[("updated_at", -1), ("document_id", 1)],
+                page_size=page_size,
+                cursor=cursor,
+            )
+            return SourceDocumentPage(
+                tuple(model for raw in window.documents if (model := _model(raw)) is not None),
+                window.page,
+                page_size,
+                window.total,
+                window.next_cursor,
+            )
         total = int(self._collection.count_documents(query))
-        cursor = self._collection.find(query)
-        sort = getattr(cursor, "sort", None)
+        rows = self._collection.find(query)
+        sort = getattr(rows, "sort", None)
         if callable(sort):
-            cursor = sort([("updated_at", -1), ("document_id", 1)])
-        skip = getattr(cursor, "skip", None)
+            rows = sort([("updated_at", -1), ("document_id", 1)])
+        skip = getattr(rows, "skip", None)
         if callable(skip):
-            cursor = skip((page - 1) * page_size)
-        limit = getattr(cursor, "limit", None)
+            rows = skip((page - 1) * page_size)
+        limit = getattr(rows, "limit", None)
         if callable(limit):
-            cursor = limit(page_size)
+            rows = limit(page_size)
         else:
-            cursor = list(cursor)[(page - 1) * page_size : page * page_size]
+            rows = list(rows)[(page - 1) * page_size : page * page_size]
         return SourceDocumentPage(
-            tuple(model for raw in cursor if (model := _model(raw)) is not None),
+            tuple(model for raw in rows if (model := _model(raw)) is not None),
             page,
             page_size,
             total,
@@ -209,6 +229,7 @@ class SourceDocumentRepository:
             raise SourceDocumentRepositoryConflictError(
                 f"Concurrent Source Document conflict: {document_id}"
             ) from exc
+        bump_document_versions(self.database, document_id)
         return candidate if getattr(result, "matched_count", 0) else None
 
     def replace(self, document: SourceDocument) -> SourceDocument | None:
@@ -222,6 +243,7 @@ class SourceDocumentRepository:
             raise SourceDocumentRepositoryConflictError(
                 f"Concurrent Source Document conflict: {document.document_id}"
             ) from exc
+        bump_document_versions(self.database, document.document_id)
         return document if getattr(result, "matched_count", 0) else None
 
     def archive(self, document_id: str) -> SourceDocument | None:
@@ -4,11 +4,16 @@
 
 from __future__ import annotations
 
+import mmap
 from collections.abc import Iterable
+from collections.abc import Iterator
 from collections.abc import Mapping
+from contextlib import AbstractContextManager
 from dataclasses import dataclass
+from dataclasses import field
 from enum import Enum
 from typing import Any
+from typing import BinaryIO
 
 from pydantic import ValidationError
 
@@ -20,6 +25,7 @@ from mathmongo.source_catalog.repository import SourceRepository
 from mathmongo.source_documents.models import DocumentKind
 from mathmongo.source_documents.models import DocumentStatus
 from mathmongo.source_documents.models import PdfDocument
+from mathmongo.source_documents.models import PdfVersion
 from mathmongo.source_documents.models import SourceDocument
 from mathmongo.source_documents.models import WebDocument
 from mathmongo.source_documents.models import normalize_web_url
@@ -27,7 +33,9 @@ from mathmongo.source_documents.repository import SourceDocumentPage
 from mathmongo.source_documents.repository import SourceDocumentRepository
 from mathmongo.source_documents.repository import SourceDocumentRepositoryConflictError
 from mathmongo.source_documents.storage import BlobStorageError
+from mathmongo.source_documents.storage import PreparedPdf
 from mathmongo.source_documents.storage import SourceDocumentBlobStore
+from mathmongo.source_documents.storage import StagedPdf
 from mathmongo.source_documents.storage import pdf_version_from_prepared
 
 
@@ -67,10 +75,27 @@ class DocumentIntegrityInspection:
 
 @dataclass(frozen=True, slots=True)
 class DocumentPdfPayload:
+    """A verified PDF version whose bytes stay in the blob store until opened."""
+
     document: SourceDocument
-    pdf_bytes: bytes
-    file_name: str
-    sha256: str
+    version: PdfVersion
+    storage: SourceDocumentBlobStore = field(repr=False, compare=False)
+
+    @property
+    def file_name(self) -> str:
+        return self.version.original_filename
+
+    @property
+    def sha256(self) -> str:
+        return self.version.sha256
+
+    def open(self) -> AbstractContextManager[mmap.mmap]:
+        """Map the version read-only, re-verified, for the duration of the block."""
+        return self.storage.open_version(self.version)
+
+    def iter_bytes(self) -> Iterator[bytes]:
+        """Yield the re-verified version in bounded chunks."""
+        return self.storage.iter_version(self.version)
 
 
 def _rights(value: SourceRights | Mapping[str, Any] | None) -> SourceRights:
@@ -152,7 +177,7 @@ class SourceDocumentService:
         self,
         *,
         source_id: str,
-        pdf_bytes: bytes,
+        pdf_bytes: bytes | bytearray | memoryview | BinaryIO,
         original_filename: str,
         title: str,
         description: str = "",
@@ -163,7 +188,13 @@ class SourceDocumentService:
         document_id: str | None = None,
         version_id: str | None = None,
     ) -> DocumentOperationResult:
-        """Validate, deduplicate, publish a PDF blob, then insert its MongoDB metadata."""
+        """Validate, deduplicate, publish a PDF blob, then insert its MongoDB metadata.
+
+        A binary file object is streamed into a pending blob file instead of
+        being read into memory; its size and ``%PDF-`` header are checked while
+        staging.
+        """
+        prepared: PreparedPdf | StagedPdf | None = None
         try:
             if self._source(source_id) is None:
                 return DocumentOperationResult(
@@ -171,7 +202,11 @@ class SourceDocumentService:
                     message="Source does not exist.",
                 )
             self._reference(reference_id, source_id)
-            prepared = self.storage.prepare_pdf(pdf_bytes)
+            prepared = (
+                self.storage.prepare_pdf(bytes(pdf_bytes))
+                if isinstance(pdf_bytes, (bytes, bytearray, memoryview))
+                else self.storage.stage_pdf(pdf_bytes)
+            )
             version = pdf_version_from_prepared(
                 prepared,
                 original_filename=original_filename,
@@ -231,7 +266,11 @@ class SourceDocumentService:
                 )
 
             self.documents.ensure_indexes()
-            published = self.storage.publish(prepared)
+            published = (
+                self.storage.publish_staged(prepared)
+                if isinstance(prepared, StagedPdf)
+                else self.storage.publish(prepared)
+            )
             try:
                 stored = self.documents.insert(candidate)
             except SourceDocumentRepositoryConflictError:
@@ -269,6 +308,9 @@ class SourceDocumentService:
                 DocumentOperationStatus.ERROR,
                 message="Unexpected database or storage error.",
             )
+        finally:
+            if isinstance(prepared, StagedPdf):
+                prepared.discard()
         return DocumentOperationResult(
             DocumentOperationStatus.CREATED,
             stored,
@@ -386,6 +428,7 @@ class SourceDocumentService:
         page_size: int = 50,
         status: DocumentStatus | str | None = None,
         kind: DocumentKind | str | None = None,
+        cursor: str | None = None,
     ) -> SourceDocumentPage:
         return self.documents.list(
             source_id,
@@ -393,6 +436,7 @@ class SourceDocumentService:
             page_size=page_size,
             status=status,
             kind=kind,
+            cursor=cursor,
         )
 
     def update_document_metadata(
@@ -512,13 +556,10 @@ class SourceDocumentService:
         if document.kind != DocumentKind.PDF or document.pdf is None:
             raise ValueError("Selected Source Document is not a PDF")
         version = document.pdf.current_version
-        data = self.storage.read_version(version)
-        return DocumentPdfPayload(
-            document,
-            data,
-            version.original_filename,
-            version.sha256,
-        )
+        # Verify once over the read-only mapping; viewers re-verify when they open it.
+        with self.storage.open_version(version):
+            pass
+        return DocumentPdfPayload(document, version, self.storage)
 
 
 __all__ = [
@@ -5,10 +5,17 @@
 from __future__ import annotations
 
 import hashlib
+import mmap
 import os
 import stat
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass
+from dataclasses import field
 from pathlib import Path
+from typing import BinaryIO
 from uuid import uuid4
 
 from mathmongo.paths import find_symlink_component
@@ -22,6 +29,7 @@ from mathmongo.source_documents.models import SHA256_RE
 from mathmongo.source_documents.models import PdfVersion
 
 PDF_HEADER = b"%PDF-"
+BLOB_IO_CHUNK_BYTES = 1024 * 1024
 
 
 class BlobStorageError(RuntimeError):
@@ -42,6 +50,35 @@ class PreparedPdf:
     sha256: str
     size_bytes: int
     logical_path: str
+    # Set only by prepare_pdf, so publish can trust the identity without re-hashing;
+    # dataclasses.replace() and direct construction leave it False.
+    _verified: bool = field(default=False, init=False, repr=False, compare=False)
+
+
+@dataclass(frozen=True, slots=True)
+class StagedPdf:
+    """A validated PDF streamed into a private pending file awaiting publication.
+
+    Use it as a context manager, or call :meth:`discard`, so the pending file
+    is removed whether or not it was published.
+    """
+
+    path: Path
+    sha256: str
+    size_bytes: int
+    logical_path: str
+
+    def discard(self) -> None:
+        """Remove the pending file."""
+        self.path.unlink(missing_ok=True)
+
+    def __enter__(self) -> StagedPdf:
+        """Return the staged PDF."""
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        """Remove the pending file."""
+        self.discard()
 
 
 @dataclass(frozen=True, slots=True)
@@ -60,6 +97,85 @@ class BlobInspection:
     size_bytes: int | None = None
 
 
+def _logical_path(sha256: str) -> str:
+    return f"source_documents/blobs/sha256/{sha256[:2]}/{sha256}.pdf"
+
+
+def _payload_chunks(payload: BinaryIO | Iterable[bytes]) -> Iterator[bytes]:
+    read = getattr(payload, "read", None)
+    if callable(read):
+        return iter(lambda: read(BLOB_IO_CHUNK_BYTES), b"")
+    return iter(payload)
+
+
+def _validated_chunks(
+    payload: BinaryIO | Iterable[bytes],
+    *,
+    max_bytes: int,
+) -> Iterator[bytes | bytearray | memoryview]:
+    """Yield payload chunks while enforcing the PDF size limit and ``%PDF-`` header."""
+    header = b""
+    size = 0
+    for chunk in _payload_chunks(payload):
+        if not isinstance(chunk, (bytes, bytearray, memoryview)):
+            raise BlobValidationError("PDF payload must be bytes")
+        size += len(chunk)
+        if size > max_bytes:
+            raise BlobValidationError(f"PDF payload exceeds the {max_bytes}-byte limit")
+        if len(header) < len(PDF_HEADER):
+            header += bytes(chunk[: len(PDF_HEADER) - len(header)])
+            if not PDF_HEADER.startswith(header):
+                raise BlobValidationError("PDF payload does not have a valid %PDF- header")
+        yield chunk
+    if not size:
+        raise BlobValidationError("PDF payload cannot be empty")
+    if header != PDF_HEADER:
+        raise BlobValidationError("PDF payload does not have a valid %PDF- header")
+
+
+def _memory_chunks(data: bytes) -> Iterator[memoryview]:
+    view = memoryview(data)
+    for start in range(0, len(view), BLOB_IO_CHUNK_BYTES):
+        yield view[start : start + BLOB_IO_CHUNK_BYTES]
+
+
+def _file_chunks(path: Path) -> Iterator[bytes]:
+    with path.open("rb") as handle:
+        yield from iter(lambda: handle.read(BLOB_IO_CHUNK_BYTES), b"")
+
+
+def _write_all(descriptor: int, chunk: bytes | memoryview) -> None:
+    view = memoryview(chunk)
+    written = 0
+    while written < len(view):
+        count = os.write(descriptor, view[written:])
+        if count <= 0:
+            raise OSError("Could not complete Source PDF blob staging")
+        written += count
+
+
+def _same_bytes(descriptor: int, size: int, expected: Iterable[bytes | memoryview]) -> bool:
+    """Compare ``size`` stored bytes with ``expected`` one bounded chunk at a time."""
+    remaining = size
+    for piece in expected:
+        view = memoryview(piece)
+        while view:
+            if not remaining:
+                return False
+            chunk = os.read(descriptor, min(len(view), BLOB_IO_CHUNK_BYTES, remaining))
+            if not chunk:
+                raise BlobConflictError("Stored PDF blob changed during reading")
+            if view[: len(chunk)] != chunk:
+                return False
+            view = view[len(chunk) :]
+            remaining -= len(chunk)
+    if remaining:
+        return False
+    if os.read(descriptor, 1):
+        raise BlobConflictError("Stored PDF blob grew during reading")
+    return True
+
+
 class SourceDocumentBlobStore:
     """Store immutable PDF blobs beneath one explicit XDG data root."""
 
@@ -89,8 +205,56 @@ class SourceDocumentBlobStore:
         if not data.startswith(PDF_HEADER):
             raise BlobValidationError("PDF payload does not have a valid %PDF- header")
         digest = hashlib.sha256(data).hexdigest()
-        logical_path = f"source_documents/blobs/sha256/{digest[:2]}/{digest}.pdf"
-        return PreparedPdf(data, digest, len(data), logical_path)
+        prepared = PreparedPdf(data, digest, len(data), _logical_path(digest))
+        object.__setattr__(prepared, "_verified", True)
+        return prepared
+
+    @staticmethod
+    def digest_pdf(
+        payload: BinaryIO | Iterable[bytes],
+        *,
+        max_bytes: int = MAX_SOURCE_PDF_UPLOAD_BYTES,
+    ) -> tuple[str, int]:
+        """Validate and hash a streamed PDF without storing it; return ``(sha256, size)``."""
+        digest = hashlib.sha256()
+        size = 0
+        for chunk in _validated_chunks(payload, max_bytes=max_bytes):
+            digest.update(chunk)
+            size += len(chunk)
+        return digest.hexdigest(), size
+
+    def stage_pdf(
+        self,
+        payload: BinaryIO | Iterable[bytes],
+        *,
+        max_bytes: int = MAX_SOURCE_PDF_UPLOAD_BYTES,
+    ) -> StagedPdf:
+        """Stream a PDF into a private pending file, validating and hashing each byte once.
+
+        ``payload`` is a binary file object or an iterable of byte chunks; memory
+        use is bounded by the chunk size rather than the PDF size.
+        """
+        self._ensure_private_directories(self.blob_root)
+        temporary = self.blob_root / f".pending-{uuid4().hex}"
+        flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_CLOEXEC", 0)
+        flags |= getattr(os, "O_NOFOLLOW", 0)
+        descriptor = os.open(temporary, flags, 0o600)
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            for chunk in _validated_chunks(payload, max_bytes=max_bytes):
+                digest.update(chunk)
+                size += len(chunk)
+                _write_all(descriptor, chunk)
+            os.fchmod(descriptor, 0o600)
+            os.fsync(descriptor)
+        except BaseException:
+            os.close(descriptor)
+            temporary.unlink(missing_ok=True)
+            raise
+        os.close(descriptor)
+        sha256 = digest.hexdigest()
+        return StagedPdf(temporary, sha256, size, _logical_path(sha256))
 
     def path_for_sha(self, sha256: str) -> Path:
         """Derive a controlled absolute path solely from a canonical SHA-256."""
@@ -106,8 +270,7 @@ class SourceDocumentBlobStore:
 
     def path_for_version(self, version: PdfVersion) -> Path:
         """Resolve a validated version without trusting its logical path as an absolute path."""
-        expected = f"source_documents/blobs/sha256/{version.sha256[:2]}/{version.sha256}.pdf"
-        if version.logical_path != expected:
+        if version.logical_path != _logical_path(version.sha256):
             raise BlobValidationError("PDF version logical path is not canonical")
         return self.path_for_sha(version.sha256)
 
@@ -124,7 +287,9 @@ class SourceDocumentBlobStore:
             directory.chmod(0o700)
 
     @staticmethod
-    def _read_stable(path: Path, *, max_bytes: int) -> tuple[bytes, os.stat_result]:
+    @contextmanager
+    def _open_stable(path: Path, *, max_bytes: int) -> Iterator[tuple[int, os.stat_result]]:
+        """Open a stored blob without following links; fail if it changes while open."""
         if find_symlink_component(path) is not None:
             raise BlobConflictError("Source PDF blob path contains a symbolic link")
         flags = os.O_RDONLY | getattr(os, "O_CLOEXEC", 0) | getattr(os, "O_NOFOLLOW", 0)
@@ -141,39 +306,76 @@ class SourceDocumentBlobStore:
                 raise BlobConflictError("Source PDF blob is not a regular file")
             if before.st_size <= 0 or before.st_size > max_bytes:
                 raise BlobValidationError("Stored PDF blob has an invalid size")
-            chunks: list[bytes] = []
-            remaining = before.st_size
-            while remaining:
-                chunk = os.read(descriptor, min(1024 * 1024, remaining))
-                if not chunk:
-                    raise BlobConflictError("Stored PDF blob changed during reading")
-                chunks.append(chunk)
-                remaining -= len(chunk)
-            if os.read(descriptor, 1):
-                raise BlobConflictError("Stored PDF blob grew during reading")
+            yield descriptor, before
             after = os.fstat(descriptor)
             identity = ("st_dev", "st_ino", "st_size", "st_mtime_ns", "st_ctime_ns")
-            if any(getattr(before, field) != getattr(after, field) for field in identity):
+            if any(getattr(before, name) != getattr(after, name) for name in identity):
                 raise BlobConflictError("Stored PDF blob changed during reading")
-            return b"".join(chunks), after
         finally:
             os.close(descriptor)
 
+    def _require_stored(
+        self,
+        path: Path,
+        size: int,
+        expected: Iterable[bytes | memoryview],
+        message: str,
+        cause: BaseException | None = None,
+    ) -> None:
+        with self._open_stable(path, max_bytes=MAX_SOURCE_PDF_UPLOAD_BYTES) as (
+            descriptor,
+            observed,
+        ):
+            same = observed.st_size == size and _same_bytes(descriptor, size, expected)
+        if not same or stat.S_IMODE(observed.st_mode) != 0o600:
+            raise BlobConflictError(message) from cause
+
+    def _link_pending(
+        self,
+        temporary: Path,
+        destination: Path,
+        size: int,
+        expected: Callable[[], Iterable[bytes | memoryview]],
+    ) -> bool:
+        try:
+            os.link(temporary, destination, follow_symlinks=False)
+            created = True
+        except FileExistsError as exc:
+            self._require_stored(
+                destination,
+                size,
+                expected(),
+                "Concurrent PDF blob publication conflicted",
+                exc,
+            )
+            created = False
+        directory_descriptor = os.open(
+            destination.parent,
+            os.O_RDONLY
+            | getattr(os, "O_DIRECTORY", 0)
+            | getattr(os, "O_CLOEXEC", 0)
+            | getattr(os, "O_NOFOLLOW", 0),
+        )
+        try:
+            os.fsync(directory_descriptor)
+        finally:
+            os.close(directory_descriptor)
+        return created
+
     def publish(self, prepared: PreparedPdf) -> BlobPublishResult:
         """Publish once without overwrite, returning identical for a matching existing blob."""
-        expected = self.prepare_pdf(prepared.data)
-        if expected != prepared:
+        if not prepared._verified and self.prepare_pdf(prepared.data) != prepared:
             raise BlobValidationError("Prepared PDF identity does not match its bytes")
         destination = self.path_for_sha(prepared.sha256)
         self._ensure_private_directories(destination.parent)
 
         if destination.exists() or destination.is_symlink():
-            data, observed = self._read_stable(
+            self._require_stored(
                 destination,
-                max_bytes=MAX_SOURCE_PDF_UPLOAD_BYTES,
+                prepared.size_bytes,
+                _memory_chunks(prepared.data),
+                "Canonical PDF blob path contains incompatible data",
             )
-            if data != prepared.data or stat.S_IMODE(observed.st_mode) != 0o600:
-                raise BlobConflictError("Canonical PDF blob path contains incompatible data")
             return BlobPublishResult(
                 prepared.logical_path,
                 prepared.sha256,
@@ -187,39 +389,17 @@ class SourceDocumentBlobStore:
             flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_CLOEXEC", 0)
             flags |= getattr(os, "O_NOFOLLOW", 0)
             descriptor = os.open(temporary, flags, 0o600)
-            view = memoryview(prepared.data)
-            written = 0
-            while written < len(view):
-                count = os.write(descriptor, view[written:])
-                if count <= 0:
-                    raise OSError("Could not complete Source PDF blob staging")
-                written += count
+            _write_all(descriptor, prepared.data)
             os.fchmod(descriptor, 0o600)
             os.fsync(descriptor)
             os.close(descriptor)
             descriptor = None
-            try:
-                os.link(temporary, destination, follow_symlinks=False)
-                created = True
-            except FileExistsError as exc:
-                data, observed = self._read_stable(
-                    destination,
-                    max_bytes=MAX_SOURCE_PDF_UPLOAD_BYTES,
-                )
-                if data != prepared.data or stat.S_IMODE(observed.st_mode) != 0o600:
-                    raise BlobConflictError("Concurrent PDF blob publication conflicted") from exc
-                created = False
-            directory_descriptor = os.open(
-                destination.parent,
-                os.O_RDONLY
-                | getattr(os, "O_DIRECTORY", 0)
-                | getattr(os, "O_CLOEXEC", 0)
-                | getattr(os, "O_NOFOLLOW", 0),
+            created = self._link_pending(
+                temporary,
+                destination,
+                prepared.size_bytes,
+                lambda: _memory_chunks(prepared.data),
             )
-            try:
-                os.fsync(directory_descriptor)
-            finally:
-                os.close(directory_descriptor)
         finally:
             if descriptor is not None:
                 os.close(descriptor)
@@ -232,17 +412,92 @@ class SourceDocumentBlobStore:
             created,
         )
 
-    def read_version(self, version: PdfVersion) -> bytes:
-        """Read and verify one stored version before handing bytes to a viewer or export."""
+    def publish_staged(self, staged: StagedPdf) -> BlobPublishResult:
+        """Publish a staged PDF by linking its pending file; existing blobs compare in chunks."""
+        if staged.path.parent != self.blob_root or not staged.path.name.startswith(".pending-"):
+            raise BlobValidationError("Staged PDF does not belong to this blob store")
+        destination = self.path_for_sha(staged.sha256)
+        self._ensure_private_directories(destination.parent)
+        if destination.exists() or destination.is_symlink():
+            self._require_stored(
+                destination,
+                staged.size_bytes,
+                _file_chunks(staged.path),
+                "Canonical PDF blob path contains incompatible data",
+            )
+            created = False
+        else:
+            created = self._link_pending(
+                staged.path,
+                destination,
+                staged.size_bytes,
+                lambda: _file_chunks(staged.path),
+            )
+        return BlobPublishResult(staged.logical_path, staged.sha256, staged.size_bytes, created)
+
+    @contextmanager
+    def open_version(self, version: PdfVersion) -> Iterator[mmap.mmap]:
+        """Map one verified stored version read-only for the duration of the block.
+
+        Permissions, size, header and SHA-256 are checked once over the mapping
+        before it is yielded, and the file identity is checked again when the
+        block ends, so a blob rewritten or touched while mapped raises
+        ``BlobConflictError``. Memoryviews taken from the mapping must be
+        released before the block ends.
+        """
         path = self.path_for_version(version)
-        data, observed = self._read_stable(path, max_bytes=MAX_SOURCE_PDF_UPLOAD_BYTES)
-        if stat.S_IMODE(observed.st_mode) != 0o600:
-            raise BlobConflictError("Stored PDF blob permissions are not 0600")
-        if len(data) != version.size_bytes or not data.startswith(PDF_HEADER):
-            raise BlobValidationError("Stored PDF blob size or header is invalid")
-        if hashlib.sha256(data).hexdigest() != version.sha256:
-            raise BlobConflictError("Stored PDF blob SHA-256 does not match metadata")
-        return data
+        with self._open_stable(path, max_bytes=MAX_SOURCE_PDF_UPLOAD_BYTES) as (
+            descriptor,
+            observed,
+        ):
+            if stat.S_IMODE(observed.st_mode) != 0o600:
+                raise BlobConflictError("Stored PDF blob permissions are not 0600")
+            if observed.st_size != version.size_bytes:
+                raise BlobValidationError("Stored PDF blob size or header is invalid")
+            mapping = mmap.mmap(descriptor, 0, access=mmap.ACCESS_READ)
+            try:
+                if mapping[: len(PDF_HEADER)] != PDF_HEADER:
+                    raise BlobValidationError("Stored PDF blob size or header is invalid")
+                if hashlib.sha256(mapping).hexdigest() != version.sha256:
+                    raise BlobConflictError("Stored PDF blob SHA-256 does not match metadata")
+                # Yield while the descriptor is open: leaving the block re-runs
+                # the fstat identity check after the consumer is done.
+                yield mapping
+            finally:
+                mapping.close()
+
+    def iter_version(
+        self,
+        version: PdfVersion,
+        *,
+        chunk_size: int = BLOB_IO_CHUNK_BYTES,
+    ) -> Iterator[bytes]:
+        """Yield one verified stored version in bounded chunks."""
+        with self.open_version(version) as mapping:
+            for start in range(0, len(mapping), chunk_size):
+                yield mapping[start : start + chunk_size]
+
+    def copy_version(self, version: PdfVersion, destination: BinaryIO) -> int:
+        """Write one verified stored version to ``destination`` and return its size."""
+        with self.open_version(version) as mapping:
+            for start in range(0, len(mapping), BLOB_IO_CHUNK_BYTES):
+                destination.write(mapping[start : start + BLOB_IO_CHUNK_BYTES])
+            return len(mapping)
+
+    def version_matches(self, version: PdfVersion, data: bytes) -> bool:
+        """Whether the verified stored version holds exactly ``data``."""
+        with self.open_version(version) as mapping, memoryview(mapping) as view:
+            return view == data
+
+    def read_version(self, version: PdfVersion) -> bytes:
+        """Read and verify one stored version before handing bytes to a viewer.
+
+        This is a full in-memory copy on purpose: callers keep the bytes after
+        the mapping is closed. Streaming callers use :meth:`iter_version` or
+        :meth:`copy_version` instead.
+        """
+        with self.open_version(version) as mapping:
+            return mapping[:]
 
     def _controlled_directory_issues(self, path: Path) -> tuple[str, ...]:
         """Check private controlled directories without exposing their absolute names."""
@@ -273,7 +528,8 @@ class SourceDocumentBlobStore:
             directory_issues = self._controlled_directory_issues(path)
             if directory_issues:
                 return BlobInspection(False, directory_issues)
-            data = self.read_version(version)
+            with self.open_version(version) as mapping:
+                size_bytes = len(mapping)
         except FileNotFoundError:
             return BlobInspection(False, ("blob_missing",))
         except BlobStorageError as exc:
@@ -282,16 +538,12 @@ class SourceDocumentBlobStore:
             return BlobInspection(False, ("unsafe_blob_path",))
         except OSError:
             return BlobInspection(False, ("blob_unreadable",))
-        return BlobInspection(
-            True,
-            (),
-            sha256=hashlib.sha256(data).hexdigest(),
-            size_bytes=len(data),
-        )
+        # open_version verified the SHA-256 against the metadata.
+        return BlobInspection(True, (), sha256=version.sha256, size_bytes=size_bytes)
 
 
 def pdf_version_from_prepared(
-    prepared: PreparedPdf,
+    prepared: PreparedPdf | StagedPdf,
     *,
     original_filename: str,
     version_id: str | None = None,
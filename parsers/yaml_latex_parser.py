@@ -1,12 +1,91 @@
 # conversion/yaml_latex_parser.py
 import os
 import re
+from collections import defaultdict
 from rapidfuzz import fuzz
+from rapidfuzz import process
 import yaml
 
+UMBRAL_ALIAS = 85
+# Alias puntuados por llamada a cdist: acota la matriz a lote × 2·candidatos.
+ALIAS_POR_LOTE = 256
+# Longitud del prefijo de token que usa el bloqueo opcional ("grupos" ~ "grupo").
+PREFIJO_BLOQUEO = 4
+
 def normalize(text: str) -> str:
     return re.sub(r'[\s\.\-_]+', ' ', text.lower()).strip()
 
+
+def _claves_bloqueo(texto: str) -> set[str]:
+    return {token[:PREFIJO_BLOQUEO] for token in texto.split()}
+
+
+class AliasMatcher:
+    """Resuelve alias contra títulos e ids de candidatos normalizados una sola vez.
+
+    Cada candidato aporta dos entradas al corpus (``titulo`` e ``id``). Un alias
+    se asocia al primer candidato con la mejor puntuación
+    ``fuzz.token_set_ratio`` si alcanza ``UMBRAL_ALIAS``, igual que el recorrido
+    candidato por candidato. Sin bloqueo se puntúa por lotes con
+    ``process.cdist(workers=-1)``; con ``bloqueo_tokens`` sólo se comparan las
+    entradas que comparten un prefijo de token con el alias, lo que es mucho más
+    rápido pero puede perder coincidencias sin ningún token en común.
+    """
+
+    def __init__(self, candidatos: list[dict], *, bloqueo_tokens: bool = False):
+        """Normaliza los títulos e ids de ``candidatos`` y, si se pide, indexa sus prefijos."""
+        self._candidatos = candidatos
+        self._corpus = [
+            normalize(campo)
+            for candidato in candidatos
+            for campo in (candidato.get("titulo") or "", candidato.get("id") or "")
+        ]
+        self._bloques: dict[str, list[int]] | None = None
+        if bloqueo_tokens:
+            self._bloques = defaultdict(list)
+            for indice, texto in enumerate(self._corpus):
+                for clave in _claves_bloqueo(texto):
+                    self._bloques[clave].append(indice)
+
+    def resolver(self, alias: list[str]) -> list[dict | None]:
+        """Devuelve, para cada alias, el candidato asociado o ``None``."""
+        normalizados = [normalize(texto) for texto in alias]
+        if not self._corpus:
+            return [None] * len(normalizados)
+        if self._bloques is not None:
+            return [self._resolver_bloqueado(texto) for texto in normalizados]
+        resultados: list[dict | None] = []
+        for inicio in range(0, len(normalizados), ALIAS_POR_LOTE):
+            puntuaciones = process.cdist(
+                normalizados[inicio:inicio + ALIAS_POR_LOTE],
+                self._corpus,
+                scorer=fuzz.token_set_ratio,
+                dtype="float64",
+                workers=-1,
+            )
+            # argmax devuelve la primera posición máxima: mismo desempate que el bucle.
+            for fila, indice in enumerate(puntuaciones.argmax(axis=1)):
+                if puntuaciones[fila, indice] >= UMBRAL_ALIAS:
+                    resultados.append(self._candidatos[indice // 2])
+                else:
+                    resultados.append(None)
+        return resultados
+
+    def _resolver_bloqueado(self, alias: str) -> dict | None:
+        assert self._bloques is not None
+        indices = sorted(
+            {indice for clave in _claves_bloqueo(alias) for indice in self._bloques.get(clave, ())}
+        )
+        if not indices:
+            return None
+        mejor = process.extractOne(
+            alias,
+            [self._corpus[indice] for indice in indices],
+            scorer=fuzz.token_set_ratio,
+            score_cutoff=UMBRAL_ALIAS,
+        )
+        return self._candidatos[indices[mejor[2]] // 2] if mejor is not None else None
+
 class YamlLatexParser:
     @staticmethod
     def extraer_yaml_y_contenido(tex_path: str) -> tuple[dict, str]:
@@ -19,9 +98,16 @@ class YamlLatexParser:
         """
         with open(tex_path, encoding="utf-8") as f:
             texto = f.read()
-        
+        return YamlLatexParser.separar_yaml_y_contenido(texto, tex_path)
+
+    @staticmethod
+    def separar_yaml_y_contenido(texto: str, origen: str) -> tuple[dict, str]:
+        """Separa el encabezado YAML del contenido LaTeX de un texto ya leído.
+
+        ``origen`` sólo se usa en el mensaje de error.
+        """
         if texto.count("---") < 2:
-            raise ValueError(f"Archivo {tex_path} no tiene encabezado YAML bien formado.")
+            raise ValueError(f"Archivo {origen} no tiene encabezado YAML bien formado.")
 
         partes = texto.split("---", 2)
         datos_yaml = yaml.safe_load(partes[1].strip())
@@ -30,7 +116,12 @@ class YamlLatexParser:
         return datos_yaml, contenido_latex
     
     @staticmethod
-    def procesar_directorio(carpeta: str, conceptos_db: list[dict], generar_relaciones: bool = True) -> list[dict]:
+    def procesar_directorio(
+        carpeta: str,
+        conceptos_db: list[dict],
+        generar_relaciones: bool = True,
+        bloqueo_tokens: bool = False,
+    ) -> list[dict]:
         """
         Procesa todos los archivos en un directorio, devuelve lista con:
             {
@@ -38,6 +129,10 @@ class YamlLatexParser:
                 'contenido_latex': str,
                 'relations': [ ... ]
             }
+
+        Los ``alias_previos_pendientes`` de todos los archivos se resuelven en
+        un único lote con ``AliasMatcher``; ``bloqueo_tokens`` activa su
+        prefiltro aproximado por tokens.
         """
         resultados = []
         archivos = [f for f in os.listdir(carpeta) if f.endswith((".md", ".tex"))]
@@ -53,24 +148,25 @@ class YamlLatexParser:
                 print(f"❌ Error en {archivo}: {e}")
 
         candidatos = conceptos_db + docs_local
+        coincidencias: dict[int, list[dict | None]] = {}
+        if generar_relaciones:
+            matcher = AliasMatcher(candidatos, bloqueo_tokens=bloqueo_tokens)
+            todos = [
+                alias for doc in docs_local for alias in doc.get("alias_previos_pendientes") or []
+            ]
+            resueltos = iter(matcher.resolver(todos))
+            for posicion, doc in enumerate(docs_local):
+                alias_doc = doc.get("alias_previos_pendientes") or []
+                coincidencias[posicion] = [next(resueltos) for _ in alias_doc]
 
-        for doc in docs_local:
+        for posicion, doc in enumerate(docs_local):
             pendientes = []
             relations = []
 
             if generar_relaciones:
-                for alias in doc.get("alias_previos_pendientes") or []:
-                    alias_norm = normalize(alias)
-                    best_score = 0
-                    match = None
-
-                    for c in candidatos:
-                        for field in [c.get("titulo") or "", c.get("id", "")]:
-                            score = fuzz.token_set_ratio(alias_norm, normalize(field))
-                            if score > best_score:
-                                best_score, match = score, c
-                    
-                    if best_score >= 85 and match:
+                alias_doc = doc.get("alias_previos_pendientes") or []
+                for alias, match in zip(alias_doc, coincidencias[posicion], strict=True):
+                    if match is not None:
                         relations.append({
                             "desde_id": doc["id"],
                             "desde_source": doc["source"],
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""Backfill indexed endpoint fields on relations stored as ``id@source`` strings."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from mathmongo.config import resolve_config  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line options."""
+    settings = resolve_config()
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mongo-uri", default=settings.mongo_uri)
+    parser.add_argument("--db-name", default=settings.mongo_database)
+    parser.add_argument(
+        "--apply",
+        action="store_true",
+        help="Write the derived fields. Without it, only report what would change.",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    """Report or apply the idempotent relation endpoint backfill."""
+    args = parse_args()
+    from mathdatabase.mathmongo import MathMongo
+
+    db = MathMongo(args.mongo_uri, args.db_name)
+    report = db.backfill_relation_endpoints(dry_run=not args.apply)
+    verb = "Would update" if report.dry_run else "Updated"
+    print(f"Scanned {report.scanned} relations. {verb} {report.updated}.")
+    if report.malformed:
+        print(f"{report.malformed} relations have an endpoint without 'id@source' form.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Compare regex and indexed concept search latency on synthetic databases.
+
+Seeds a scratch database with N synthetic concepts and LaTeX bodies for each
+requested size, times ``search_legacy_concepts`` before and after building the
+concept search index, and drops the scratch database unless ``--keep`` is set.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from pymongo import MongoClient  # noqa: E402
+
+from mathmongo.advanced_reader.concept_search import search_legacy_concepts  # noqa: E402
+from mathmongo.concept_search_index import rebuild_concept_search_index  # noqa: E402
+from mathmongo.config import resolve_config  # noqa: E402
+
+WORDS = (
+    "grupo", "anillo", "cuerpo", "topología", "compacidad", "métrica", "espacio",
+    "límite", "continuidad", "derivada", "integral", "serie", "función", "conjunto",
+    "álgebra", "módulo", "homomorfismo", "ideal", "vector", "matriz", "norma",
+    "convergencia", "medida", "probabilidad", "grafo", "árbol", "orden", "retículo",
+)
+TYPES = ("definicion", "teorema", "proposicion", "lema", "ejemplo")
+QUERIES = ("compacidad", "grupo abel", "topologia", "homo", "espacio metrico", "deriv")
+
+
+def _seed(db, size: int, rng: random.Random, batch_size: int = 5_000) -> None:
+    concepts, latex = [], []
+    for index in range(size):
+        words = rng.sample(WORDS, 3)
+        concept_id = f"c{index:06d}"
+        source = f"Source{index % 40:02d}"
+        concepts.append(
+            {
+                "id": concept_id,
+                "source": source,
+                "titulo": " ".join(words).capitalize(),
+                "tipo": rng.choice(TYPES),
+                "categorias": rng.sample(WORDS, 2),
+            }
+        )
+        body = " ".join(rng.choice(WORDS) for _ in range(60))
+        latex.append(
+            {
+                "id": concept_id,
+                "source": source,
+                "contenido_latex": f"\\begin{{definition}} {body} \\end{{definition}}",
+            }
+        )
+        if len(concepts) >= batch_size:
+            db.concepts.insert_many(concepts)
+            db.latex_documents.insert_many(latex)
+            concepts, latex = [], []
+    if concepts:
+        db.concepts.insert_many(concepts)
+        db.latex_documents.insert_many(latex)
+    db.concepts.create_index([("id", 1), ("source", 1)], unique=True)
+    db.latex_documents.create_index([("id", 1), ("source", 1)], unique=True)
+
+
+def _time_queries(db, repeat: int) -> tuple[float, float]:
+    samples = []
+    for _ in range(repeat):
+        for query in QUERIES:
+            started = time.perf_counter()
+            search_legacy_concepts(db, query, limit=20)
+            samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line options."""
+    settings = resolve_config()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mongo-uri", default=settings.mongo_uri)
+    parser.add_argument("--db-name", default="mathkb_concept_search_benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--keep", action="store_true", help="Keep the last scratch database.")
+    return parser.parse_args()
+
+
+def main() -> int:
+    """Seed, time both search paths and report p50/p95 latency per size."""
+    args = parse_args()
+    client = MongoClient(args.mongo_uri)
+    if args.db_name in client.list_database_names():
+        print(f"Refusing to reuse existing database {args.db_name!r}; drop it or pick another.")
+        return 2
+    rng = random.Random(args.seed)
+    try:
+        for size in args.sizes:
+            client.drop_database(args.db_name)
+            db = client[args.db_name]
+            _seed(db, size, rng)
+            regex_p50, regex_p95 = _time_queries(db, args.repeat)
+            started = time.perf_counter()
+            rebuild_concept_search_index(db)
+            build_seconds = time.perf_counter() - started
+            index_p50, index_p95 = _time_queries(db, args.repeat)
+            print(
+                f"{size:>7} concepts  regex p50={regex_p50:8.1f} ms p95={regex_p95:8.1f} ms  "
+                f"indexed p50={index_p50:8.1f} ms p95={index_p95:8.1f} ms  "
+                f"build={build_seconds:6.1f} s"
+            )
+    finally:
+        if not args.keep:
+            client.drop_database(args.db_name)
+        client.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
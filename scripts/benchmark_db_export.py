@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Measure peak Python memory and throughput of the streaming database export.
+
+Feeds ``export_database_to_zip`` a synthetic in-memory database whose cursors
+generate documents lazily (LaTeX-sized concept bodies plus relations), and a
+scratch media folder, then reports wall time, documents per second and the
+``tracemalloc`` peak for each requested size. With streaming the peak should
+stay roughly flat as the database grows. Needs no MongoDB server.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from bson import ObjectId  # noqa: E402
+
+from editor.utils import db_export  # noqa: E402
+
+WORDS = ("grupo", "anillo", "ideal", "módulo", "espacio", "medida", "variedad", "haz")
+
+
+class _Cursor:
+    def __init__(self, factory, count: int) -> None:
+        self._factory = factory
+        self._count = count
+
+    def max_time_ms(self, _milliseconds: int) -> _Cursor:
+        return self
+
+    def __iter__(self):
+        return (self._factory(index) for index in range(self._count))
+
+
+class _Database:
+    name = "benchmark"
+
+    def __init__(self, concepts: int, body_bytes: int, seed: int) -> None:
+        rng = random.Random(seed)
+        self._body = " ".join(rng.choice(WORDS) for _ in range(body_bytes // 7))
+        self._sizes = {"concepts": concepts, "relations": concepts // 2}
+
+    def list_collection_names(self) -> list[str]:
+        return list(self._sizes)
+
+    def _concept(self, index: int) -> dict:
+        return {
+            "_id": ObjectId(),
+            "id": f"c{index:07d}",
+            "source": f"Fuente{index % 40:02d}",
+            "titulo": f"Concepto {index}",
+            "contenido_latex": f"\\begin{{teorema}}{self._body} {index}\\end{{teorema}}",
+            "tags": [WORDS[index % len(WORDS)]],
+        }
+
+    def _relation(self, index: int) -> dict:
+        return {
+            "_id": ObjectId(),
+            "desde": f"c{index:07d}@Fuente{index % 40:02d}",
+            "hasta": f"c{index + 1:07d}@Fuente{(index + 1) % 40:02d}",
+            "tipo": "implica",
+        }
+
+    def __getitem__(self, name: str) -> _Collection:
+        factory = {"concepts": self._concept, "relations": self._relation}.get(name)
+        return _Collection(factory, self._sizes.get(name, 0))
+
+
+class _Collection:
+    def __init__(self, factory, count: int) -> None:
+        self._factory = factory
+        self._count = count
+
+    def find(self, _query: dict) -> _Cursor:
+        return _Cursor(self._factory, self._count)
+
+
+def _write_media(root: Path, files: int, file_bytes: int, seed: int) -> None:
+    rng = random.Random(seed)
+    images = root / "images"
+    images.mkdir(parents=True)
+    for index in range(files):
+        (images / f"figura_{index:04d}.png").write_bytes(rng.randbytes(file_bytes))
+
+
+def _export(out_dir: Path, size: int, args: argparse.Namespace) -> Path:
+    database = _Database(size, args.body_bytes, args.seed)
+    mongo = type("BenchmarkMongo", (), {"db": database})()
+    return db_export.export_database_to_zip(mongo, out_dir)
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000,50000", help="Comma-separated concepts.")
+    parser.add_argument("--body-bytes", type=int, default=2000, help="LaTeX bytes per concept.")
+    parser.add_argument("--media-files", type=int, default=20)
+    parser.add_argument("--media-bytes", type=int, default=4 * 1024 * 1024)
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args()
+
+
+def main() -> int:
+    """Export each synthetic database once and print time, throughput and peak memory."""
+    args = parse_args()
+    with tempfile.TemporaryDirectory(prefix="mathkb_export_benchmark_") as scratch:
+        scratch_dir = Path(scratch)
+        media_root = scratch_dir / "media"
+        _write_media(media_root, args.media_files, args.media_bytes, args.seed)
+        db_export.EXPORT_COLLECTIONS = ("concepts", "relations")
+        db_export.LEGACY_PROJECT_ROOT = scratch_dir / "no-legacy-project"
+        db_export.LOCAL_MEDIA_ROOT = media_root
+        media_mib = args.media_files * args.media_bytes / 2**20
+        for size in (int(value) for value in args.sizes.split(",") if value.strip()):
+            # Time an untraced run; tracemalloc slows every allocation down.
+            started = time.perf_counter()
+            zip_path = _export(scratch_dir / f"timed_{size}", size, args)
+            elapsed = time.perf_counter() - started
+            zip_mib = zip_path.stat().st_size / 2**20
+            zip_path.unlink()
+            tracemalloc.start()
+            _export(scratch_dir / f"traced_{size}", size, args).unlink()
+            _current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            documents = size + size // 2
+            print(
+                f"{size:>7} concepts + {media_mib:.0f} MiB media: {elapsed:7.2f} s  "
+                f"{documents / elapsed:9.0f} docs/s  peak {peak / 2**20:7.1f} MiB  "
+                f"zip {zip_mib:7.1f} MiB"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
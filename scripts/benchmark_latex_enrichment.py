@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Compare MongoDB round trips for per-concept and bulk LaTeX enrichment.
+
+Read-only: both strategies only issue ``find``/``getMore`` commands against
+``concepts`` and ``latex_documents`` of the selected database.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from pymongo import MongoClient  # noqa: E402
+from pymongo import monitoring  # noqa: E402
+
+from mathdatabase.mathmongo import LATEX_LOOKUP_CHUNK_SIZE  # noqa: E402
+from mathdatabase.mathmongo import attach_latex_contents  # noqa: E402
+from mathmongo.config import resolve_config  # noqa: E402
+
+
+class RoundTripCounter(monitoring.CommandListener):
+    """Count commands sent to the server, grouped by command name."""
+
+    def __init__(self) -> None:
+        """Start with no recorded commands."""
+        self.counts: dict[str, int] = {}
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        """Record one round trip."""
+        self.counts[event.command_name] = self.counts.get(event.command_name, 0) + 1
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        """Ignore completion events."""
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        """Ignore failure events."""
+
+    def total(self) -> int:
+        """Return all counted round trips."""
+        return sum(self.counts.values())
+
+    def reset(self) -> None:
+        """Forget previous counts."""
+        self.counts.clear()
+
+
+def _per_concept(db, concepts: list[dict]) -> list[dict]:
+    enriched = []
+    for concept in concepts:
+        doc = dict(concept)
+        latex_doc = db.latex_documents.find_one({"id": doc.get("id"), "source": doc.get("source")})
+        doc["contenido_latex"] = (latex_doc or {}).get("contenido_latex", "")
+        enriched.append(doc)
+    return enriched
+
+
+def _bulk(db, concepts: list[dict], chunk_size: int) -> list[dict]:
+    return attach_latex_contents(db.latex_documents, concepts, chunk_size=chunk_size)
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line options."""
+    settings = resolve_config()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--source", required=True, help="Concept source to enrich.")
+    parser.add_argument("--mongo-uri", default=settings.mongo_uri)
+    parser.add_argument("--db-name", default=settings.mongo_database)
+    parser.add_argument("--chunk-size", type=int, default=LATEX_LOOKUP_CHUNK_SIZE)
+    return parser.parse_args()
+
+
+def main() -> int:
+    """Run both strategies and print round trips and wall time."""
+    args = parse_args()
+    counter = RoundTripCounter()
+    client = MongoClient(args.mongo_uri, event_listeners=[counter])
+    db = client[args.db_name]
+    concepts = list(db.concepts.find({"source": args.source}))
+    print(f"Source {args.source!r}: {len(concepts)} concepts")
+
+    rows = []
+    for label, strategy in (
+        ("per-concept find_one", lambda: _per_concept(db, concepts)),
+        ("bulk $in enrichment", lambda: _bulk(db, concepts, args.chunk_size)),
+    ):
+        counter.reset()
+        started = time.perf_counter()
+        enriched = strategy()
+        elapsed = time.perf_counter() - started
+        rows.append((label, counter.total(), elapsed, sum(bool(c["contenido_latex"]) for c in enriched)))
+
+    for label, round_trips, elapsed, with_latex in rows:
+        print(
+            f"{label:<22} round trips={round_trips:>6}  "
+            f"time={elapsed * 1000:>9.1f} ms  with LaTeX={with_latex}"
+        )
+    client.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
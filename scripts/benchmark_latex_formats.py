@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Compare per-fragment pdflatex latency with and without a preloaded format.
+
+Compiles the same set of small concept fragments inside the validation
+preamble (``miestilo``/``coloredtheorem``/``graphicx``) twice: once with the
+plain command and once through a scratch format cache, whose one-off dump time
+is reported separately. Requires a working ``pdflatex``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from exporters_latex import latex_formats  # noqa: E402
+from exporters_latex.latex_compile import run_latex_command  # noqa: E402
+from exporters_latex.latex_formats import LatexFormatCache  # noqa: E402
+from exporters_latex.latex_validation import TEMPLATES_LATEX_DIR  # noqa: E402
+from exporters_latex.latex_validation import VALIDATION_PREAMBLE  # noqa: E402
+from exporters_latex.unified_document import copy_latex_styles  # noqa: E402
+
+FRAGMENTS = (
+    r"Sea $G$ un grupo y $H \le G$. Entonces $|H|$ divide a $|G|$.",
+    r"\[ \int_0^1 x^n\,dx = \frac{1}{n+1}. \]",
+    r"\begin{itemize}\item $\mathbb{R}^n$ es completo.\item $\mathbb{Q}$ no lo es.\end{itemize}",
+    r"Para todo $\varepsilon>0$ existe $\delta>0$ tal que $|f(x)-f(y)|<\varepsilon$.",
+)
+
+
+def _document(fragment: str) -> str:
+    return "\n".join([*VALIDATION_PREAMBLE, r"\begin{document}", fragment, r"\end{document}", ""])
+
+
+def _time_compiles(work_dir: Path, repeat: int, use_format_cache: bool) -> list[float]:
+    samples = []
+    for round_number in range(repeat):
+        for index, fragment in enumerate(FRAGMENTS):
+            tex = work_dir / f"frag_{int(use_format_cache)}_{round_number}_{index}.tex"
+            tex.write_text(_document(fragment), encoding="utf-8")
+            started = time.perf_counter()
+            result = run_latex_command(
+                ["pdflatex", "-interaction=nonstopmode", "-halt-on-error", tex.name],
+                cwd=work_dir,
+                tex_file=tex.name,
+                use_format_cache=use_format_cache,
+            )
+            samples.append((time.perf_counter() - started) * 1000)
+            if result.returncode != 0:
+                raise RuntimeError(f"pdflatex failed on fragment {index}:\n{result.stdout[-2000:]}")
+    return samples
+
+
+def _summary(samples: list[float]) -> str:
+    ordered = sorted(samples)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    return f"p50={statistics.median(ordered):7.1f} ms p95={p95:7.1f} ms"
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="Rounds over the fragment set.")
+    return parser.parse_args()
+
+
+def main() -> int:
+    """Time plain and format-backed compiles and print p50/p95 per fragment."""
+    args = parse_args()
+    if shutil.which("pdflatex") is None:
+        print("pdflatex not found; install TeX Live to run this benchmark.", file=sys.stderr)
+        return 2
+    with tempfile.TemporaryDirectory(prefix="mathkb_format_benchmark_") as scratch:
+        scratch_dir = Path(scratch)
+        work_dir = scratch_dir / "work"
+        copy_latex_styles(work_dir, TEMPLATES_LATEX_DIR)
+        latex_formats._DEFAULT_CACHE = LatexFormatCache(scratch_dir / "formats")
+        latex_formats.LATEX_FORMAT_CACHE_ENABLED = True
+
+        plain = _time_compiles(work_dir, args.repeat, use_format_cache=False)
+        started = time.perf_counter()
+        _time_compiles(work_dir, 1, use_format_cache=True)
+        first_round = (time.perf_counter() - started) * 1000
+        if not list((scratch_dir / "formats").glob("*.fmt")):
+            print("The preamble could not be dumped; see formats/*.failed.", file=sys.stderr)
+            return 1
+        preloaded = _time_compiles(work_dir, args.repeat, use_format_cache=True)
+
+    speedup = statistics.median(plain) / statistics.median(preloaded)
+    print(f"{len(plain)} compiles per mode, {len(FRAGMENTS)} fragments")
+    print(f"plain      {_summary(plain)}")
+    print(f"preloaded  {_summary(preloaded)}  (x{speedup:.1f} at p50)")
+    print(f"first round with dump: {first_round:7.1f} ms for {len(FRAGMENTS)} fragments")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Time legacy reference planning on synthetic embedded bibliographies.
+
+Builds N concepts that cite a pool of about N/8 works with realistic drift
+(DOI only on some citations, ISBN-10/13 spellings, title casing, missing
+years, citekeys and a small share of contradictory years), then times
+``plan_references`` for each requested size. Runs entirely in memory.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from mathmongo.source_catalog_migration.inventory import LegacyInventory  # noqa: E402
+from mathmongo.source_catalog_migration.models import CoupledCollections  # noqa: E402
+from mathmongo.source_catalog_migration.models import LegacyKey  # noqa: E402
+from mathmongo.source_catalog_migration.reference_planner import plan_references  # noqa: E402
+from mathmongo.source_catalog_migration.source_planner import plan_source_keys  # noqa: E402
+
+WORDS = (
+    "álgebra", "topología", "análisis", "geometría", "grupos", "anillos", "medida",
+    "probabilidad", "categorías", "variedades", "funcional", "números", "lineal", "ecuaciones",
+)
+AUTHORS = ("Ada Author", "Emmy Noether", "Kurt Gödel", "Sofia Kovalevskaya", "Henri Cartan")
+
+
+def _isbn13(rng: random.Random) -> str:
+    digits = [9, 7, 8, *(rng.randrange(10) for _ in range(9))]
+    check = (10 - sum(d * (1 if i % 2 == 0 else 3) for i, d in enumerate(digits)) % 10) % 10
+    return "".join(map(str, digits)) + str(check)
+
+
+def _works(count: int, rng: random.Random) -> list[dict]:
+    works = []
+    for index in range(count):
+        works.append(
+            {
+                "autor": rng.choice(AUTHORS),
+                "fuente": " ".join(rng.sample(WORDS, 3)).capitalize() + f" {index}",
+                "anio": rng.randint(1950, 2025),
+                "doi": f"10.5555/work.{index}" if rng.random() < 0.5 else None,
+                "isbn": _isbn13(rng) if rng.random() < 0.3 else None,
+                "citekey": f"work{index}",
+            }
+        )
+    return works
+
+
+def _citation(work: dict, rng: random.Random) -> dict:
+    reference = {"tipo_referencia": "libro", "autor": work["autor"], "fuente": work["fuente"]}
+    if rng.random() < 0.3:
+        reference["fuente"] = work["fuente"].upper()
+    if rng.random() < 0.85:
+        reference["anio"] = work["anio"] + (1 if rng.random() < 0.01 else 0)
+    if work["doi"] and rng.random() < 0.7:
+        reference["doi"] = work["doi"]
+    if work["isbn"] and rng.random() < 0.8:
+        isbn = work["isbn"]
+        reference["isbn"] = f"{isbn[:3]}-{isbn[3:]}" if rng.random() < 0.5 else isbn
+    if rng.random() < 0.2:
+        reference["citekey"] = work["citekey"]
+    if rng.random() < 0.5:
+        reference["paginas"] = f"{rng.randint(1, 300)}"
+    return reference
+
+
+def synthetic_inventory(size: int, seed: int) -> LegacyInventory:
+    """Return an in-memory inventory with ``size`` concepts that carry a reference."""
+    rng = random.Random(seed)
+    works = _works(max(1, size // 8), rng)
+    concepts = []
+    for index in range(size):
+        source = f"Source{index % 25:02d}"
+        concepts.append(
+            {
+                "id": f"c{index:06d}",
+                "source": source,
+                "referencia": _citation(rng.choice(works), rng),
+            }
+        )
+    source_counts: dict[str, int] = {}
+    for concept in concepts:
+        source_counts[concept["source"]] = source_counts.get(concept["source"], 0) + 1
+    return LegacyInventory(
+        concepts=tuple(concepts),
+        legacy_keys=tuple(LegacyKey(id=item["id"], source=item["source"]) for item in concepts),
+        source_counts=source_counts,
+        source_reference_counts={name: (count, 0) for name, count in source_counts.items()},
+        concepts_with_reference=size,
+        concepts_without_reference=0,
+        malformed_reference_count=0,
+        collection_counts={"concepts": size},
+        coupled_collections=CoupledCollections(
+            consumers=(),
+            concept_counterparts_in_latex_documents=0,
+            orphan_latex_documents=0,
+            relations=0,
+            knowledge_graph_maps=0,
+            media_assets=0,
+            latex_notes=0,
+        ),
+        warnings=(),
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        default="1000,10000,50000",
+        help="Comma-separated observation counts.",
+    )
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args()
+
+
+def main() -> int:
+    """Plan each synthetic inventory and print timings and plan sizes."""
+    args = parse_args()
+    for size in (int(value) for value in args.sizes.split(",") if value.strip()):
+        inventory = synthetic_inventory(size, args.seed)
+        source_keys = plan_source_keys(inventory)
+        started = time.perf_counter()
+        result = plan_references(inventory, source_keys)
+        elapsed = time.perf_counter() - started
+        print(
+            f"{size:>7} observations: {elapsed:8.2f} s  "
+            f"{len(result.candidates)} candidates, {len(result.conflicts)} conflicts, "
+            f"{len(result.weak_suggestions)} weak suggestions"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
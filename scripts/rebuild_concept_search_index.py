@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""Rebuild the ranked concept search index and enable it for concept searches."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from mathmongo.config import resolve_config  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line options."""
+    settings = resolve_config()
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mongo-uri", default=settings.mongo_uri)
+    parser.add_argument("--db-name", default=settings.mongo_database)
+    return parser.parse_args()
+
+
+def main() -> int:
+    """Rebuild every entry from concepts and latex_documents."""
+    args = parse_args()
+    from mathdatabase.mathmongo import MathMongo
+
+    db = MathMongo(args.mongo_uri, args.db_name)
+    started = time.perf_counter()
+    indexed = db.rebuild_concept_search_index()
+    elapsed = time.perf_counter() - started
+    print(f"Indexed {indexed} concepts in {elapsed:.1f} s.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -11,10 +11,12 @@ PROJECT_ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
 from exporters_latex.latex_validation import default_report_paths  # noqa: E402
+from exporters_latex.latex_validation import default_validation_cache  # noqa: E402
 from exporters_latex.latex_validation import validate_concept_from_mongo  # noqa: E402
 from exporters_latex.latex_validation import validate_source_from_mongo  # noqa: E402
 from exporters_latex.latex_validation import write_json_report  # noqa: E402
 from exporters_latex.latex_validation import write_markdown_report  # noqa: E402
+from mathkb_config import LATEX_VALIDATION_BATCH_SIZE  # noqa: E402
 from mathmongo.config import resolve_config  # noqa: E402
 from mathmongo.paths import resolve_home_path  # noqa: E402
 
@@ -23,7 +25,7 @@ def parse_args() -> argparse.Namespace:
     """Parse command-line options."""
     settings = resolve_config()
     parser = argparse.ArgumentParser(description="Validate LaTeX concepts from MongoDB.")
-    parser.add_argument("--source", required=True, help="Concept source to validate.")
+    parser.add_argument("--source", help="Concept source to validate.")
     parser.add_argument("--concept-id", help="Validate a single concept id.")
     parser.add_argument("--mongo-uri", default=settings.mongo_uri)
     parser.add_argument("--db-name", default=settings.mongo_database)
@@ -46,12 +48,55 @@ def parse_args() -> argparse.Namespace:
     )
     parser.add_argument("--no-compile", action="store_true", help="Skip pdflatex compile validation.")
     parser.add_argument("--no-linters", action="store_true", help="Skip chktex/lacheck.")
-    return parser.parse_args()
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Concepts validated in parallel (default: LATEX_VALIDATION_WORKERS or CPU count).",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=LATEX_VALIDATION_BATCH_SIZE,
+        help="Fragments compiled per pdflatex run (1 compiles every concept on its own).",
+    )
+    parser.add_argument("--quiet", action="store_true", help="Do not print per-concept progress.")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Revalidate every concept instead of reusing cached results.",
+    )
+    parser.add_argument(
+        "--clear-cache",
+        action="store_true",
+        help="Drop every cached validation result (alone, or before validating --source).",
+    )
+    args = parser.parse_args()
+    if not args.source and not args.clear_cache:
+        parser.error("--source is required unless --clear-cache is given.")
+    return args
+
+
+def print_progress(done: int, total: int, result) -> None:
+    """Report one finished concept on stderr."""
+    print(f"[{done}/{total}] {result.status:<7} {result.concept_id}", file=sys.stderr)
 
 
 def main() -> int:
     """Run LaTeX validation for one concept or a full source."""
     args = parse_args()
+    if args.jobs is not None and args.jobs < 1:
+        print("--jobs must be at least 1.", file=sys.stderr)
+        return 2
+    if args.batch_size < 1:
+        print("--batch-size must be at least 1.", file=sys.stderr)
+        return 2
+    cache = None if args.no_cache else default_validation_cache()
+    if args.clear_cache:
+        removed = (cache or default_validation_cache()).invalidate()
+        print(f"Cleared {removed} cached validation results.")
+        if not args.source:
+            return 0
     from mathdatabase.mathmongo import MathMongo
 
     db = MathMongo(args.mongo_uri, args.db_name)
@@ -65,6 +110,7 @@ def main() -> int:
             apply_fixes=apply_fixes,
             run_compile=not args.no_compile,
             run_linters=not args.no_linters,
+            cache=cache,
         )
         report = {
             "source": args.source,
@@ -81,12 +127,19 @@ def main() -> int:
             apply_fixes=apply_fixes,
             run_compile=not args.no_compile,
             run_linters=not args.no_linters,
+            max_workers=args.jobs,
+            progress=None if args.quiet else print_progress,
+            cache=cache,
+            batch_size=args.batch_size,
         )
 
     print(
         f"Validated {report['total']} concepts: "
         f"{report['ok']} ok, {report['warnings']} warnings, {report['errors']} errors"
     )
+    if cache is not None:
+        stats = cache.stats()
+        print(f"Validation cache: {stats['hits']} reused, {stats['misses']} computed")
 
     json_path, md_path = default_report_paths(args.source)
     if args.json_output:
@@ -14,6 +14,7 @@ from fastapi.testclient import TestClient
 
 from mathmongo.advanced_reader.app import create_app
 from mathmongo.advanced_reader.dependencies import AdvancedReaderDependencies
+from mathmongo.advanced_reader.verification_cache import VerifiedBlobCache
 from mathmongo.document_page_maps.service import PageMapOperationStatus
 from mathmongo.document_page_maps.service import PageMapServiceResult
 from mathmongo.reading_space.models import DocumentReadingState
@@ -143,6 +144,17 @@ class FakePageMapService:
             SimpleNamespace(book_page_label=label),
         )
 
+    def compute_page_labels(self, document_id: str, first_page: int, last_page: int):
+        self.calls.append((document_id, first_page))
+        pages = range(first_page, last_page + 1)
+        labels = tuple(self.labels.get((document_id, page)) for page in pages)
+        if not any(labels):
+            return PageMapServiceResult(PageMapOperationStatus.NOT_FOUND)
+        return PageMapServiceResult(
+            PageMapOperationStatus.SUCCESS,
+            SimpleNamespace(labels=labels),
+        )
+
 
 @dataclass
 class BackendHarness:
@@ -268,6 +280,7 @@ def make_backend_harness(
         page_map_service=page_map_service,  # type: ignore[arg-type]
         frontend_root=frontend_root,
         health_check=health_check,
+        verification_cache=VerifiedBlobCache(),
     )
     return BackendHarness(
         app=create_app(dependencies),
@@ -319,6 +332,8 @@ def test_health_is_bounded_and_read_only(harness: BackendHarness) -> None:
         "service": "mathmongo-advanced-reader",
         "database": "FocusedDb",
         "frontend_ready": True,
+        "pdf_verification_cache": {"hits": 0, "misses": 0, "entries": 0},
+        "reader_context_cache": {"hits": 0, "misses": 0, "entries": 0},
     }
     assert harness.health_calls == ["ping"]
     assert harness.document_service.inspection_calls == []
@@ -483,6 +498,36 @@ def test_page_above_known_total_is_a_page_invalid_error(harness: BackendHarness)
     assert _error_code(response) == "page_invalid"
 
 
+def test_page_labels_cover_a_range_in_one_response(harness: BackendHarness) -> None:
+    path = f"{API_PREFIX}/documents/{harness.pdf.document_id}/page-labels"
+    harness.page_map_service.labels[(harness.pdf.document_id, 2)] = "ii"
+    with harness.client() as client:
+        whole = client.get(path)
+        window = client.get(path, params={"from": 2, "to": 3})
+        past_end = client.get(path, params={"to": 11})
+        reversed_range = client.get(path, params={"from": 3, "to": 2})
+        unmapped = client.get(path, params={"from": 4, "to": 5})
+
+    assert whole.status_code == 200
+    payload = whole.json()
+    assert (payload["first_page"], payload["last_page"], len(payload["labels"])) == (1, 10, 10)
+    assert window.json()["labels"] == [
+        {"pdf_page": 2, "book_page_label": "ii", "display_label": "Book page ii · PDF page 2"},
+        {"pdf_page": 3, "book_page_label": None, "display_label": "PDF page 3"},
+    ]
+    assert (past_end.status_code, _error_code(past_end)) == (422, "page_invalid")
+    assert (reversed_range.status_code, _error_code(reversed_range)) == (422, "page_invalid")
+    assert [item["display_label"] for item in unmapped.json()["labels"]] == [
+        "PDF page 4",
+        "PDF page 5",
+    ]
+    assert harness.page_map_service.calls == [
+        (harness.pdf.document_id, 1),
+        (harness.pdf.document_id, 2),
+        (harness.pdf.document_id, 4),
+    ]
+
+
 def test_page_map_resolves_and_absence_remains_nonblocking(harness: BackendHarness) -> None:
     path = f"{API_PREFIX}/documents/{harness.pdf.document_id}/page-label"
     harness.page_map_service.labels[(harness.pdf.document_id, 9)] = "1"
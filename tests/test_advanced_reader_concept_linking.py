@@ -154,7 +154,7 @@ class ConceptService:
         self.links[candidate.evidence_link_id] = candidate
         return self._result(ReadingAnnotationOperationStatus.SUCCESS, candidate)
 
-    def list_annotation_evidence(self, annotation_id: str, *, status, page, page_size):
+    def list_annotation_evidence(self, annotation_id: str, *, status, page, page_size, cursor=None):
         items = [item for item in self.links.values() if item.annotation_id == annotation_id]
         if status is not None:
             items = [item for item in items if item.status == status]
@@ -0,0 +1,157 @@
+"""Reader-context cache: hot endpoints, write-through and per-Document invalidation."""
+
+# ruff: noqa: D101,D102,D103,D107
+
+from __future__ import annotations
+
+from pathlib import Path
+from types import SimpleNamespace
+
+from test_advanced_reader_api import API_PREFIX
+from test_advanced_reader_api import BASE_URL
+from test_advanced_reader_api import make_backend_harness
+
+from mathmongo.advanced_reader.context_cache import ReaderContextCache
+from mathmongo.query_cache import COLLECTION_VERSIONS
+from mathmongo.query_cache import CollectionVersions
+from mathmongo.query_cache import bump_collection_versions
+from mathmongo.query_cache import bump_document_versions
+from mathmongo.reading_space.service import ReadingOperationStatus
+from mathmongo.reading_space.service import ReadingServiceResult
+from mathmongo.source_catalog.models import Source
+from mathmongo.source_documents.models import SourceDocument
+from mathmongo.source_documents.models import WebDocument
+from mathmongo.source_documents.repository import SourceDocumentRepository
+
+
+def test_hot_endpoints_share_one_context_lookup(tmp_path: Path) -> None:
+    harness = make_backend_harness(tmp_path)
+    document_id = harness.pdf.document_id
+    calls = harness.reading_service.context_calls
+    with harness.client() as client:
+        client.get(f"{API_PREFIX}/documents/{document_id}")
+        client.get(f"{API_PREFIX}/documents/{document_id}/pdf", headers={"Range": "bytes=0-7"})
+        client.get(f"{API_PREFIX}/documents/{document_id}/page-label?pdf_page=2")
+        first = len(calls)
+        client.put(
+            f"{API_PREFIX}/documents/{document_id}/reading-state/page",
+            json={"pdf_page": 4},
+            headers={"Origin": BASE_URL},
+        )
+        state = client.get(f"{API_PREFIX}/documents/{document_id}/reading-state")
+        after_fake_write = len(calls)
+        bump_collection_versions(harness.dependencies.database_name, "sources")
+        client.get(f"{API_PREFIX}/documents/{document_id}/page-label?pdf_page=3")
+        health = client.get(f"{API_PREFIX}/health")
+
+    assert first == 1
+    # The fake service does not bump the Document counter, so the write drops
+    # the entry and the next read reloads instead of serving the old page.
+    assert state.json()["current_page"] == 4
+    assert after_fake_write == 2
+    assert len(calls) == 3
+    assert health.json()["reader_context_cache"] == {"hits": 3, "misses": 3, "entries": 1}
+
+
+def test_saved_pages_are_written_through_when_the_write_bumps(tmp_path: Path) -> None:
+    harness = make_backend_harness(tmp_path)
+    document_id = harness.pdf.document_id
+    service = harness.reading_service
+    update = service.update_current_page
+
+    def update_and_bump(document_id: str, current_page: int, **kwargs):
+        result = update(document_id, current_page, **kwargs)
+        bump_document_versions(harness.dependencies.database_name, document_id)
+        return result
+
+    service.update_current_page = update_and_bump
+    with harness.client() as client:
+        for page in (2, 3, 4):
+            client.put(
+                f"{API_PREFIX}/documents/{document_id}/reading-state/page",
+                json={"pdf_page": page},
+                headers={"Origin": BASE_URL},
+            )
+            label = client.get(f"{API_PREFIX}/documents/{document_id}/page-label?pdf_page={page}")
+            assert label.status_code == 200
+        state = client.get(f"{API_PREFIX}/documents/{document_id}/reading-state")
+
+    assert state.json()["current_page"] == 4
+    assert service.context_calls == [document_id]
+
+
+def test_entries_expire_evict_and_skip_database_errors() -> None:
+    now = [0.0]
+    versions = CollectionVersions()
+    cache = ReaderContextCache(
+        max_entries=2, ttl_seconds=10.0, clock=lambda: now[0], versions=versions
+    )
+    loads: list[str] = []
+
+    def get(document_id: str, status=ReadingOperationStatus.NOT_FOUND):
+        def load():
+            loads.append(document_id)
+            return ReadingServiceResult(status)
+
+        return cache.get("kb", document_id, load)
+
+    get("a")
+    get("a")
+    now[0] = 11.0
+    get("a")
+    versions.bump_documents("other-kb", ["a"])
+    get("a")
+    versions.bump_documents("kb", ["a"])
+    get("a")
+    get("b")
+    get("c")
+    get("a")
+    get("d", ReadingOperationStatus.ERROR)
+    get("d", ReadingOperationStatus.ERROR)
+
+    assert loads == ["a", "a", "a", "b", "c", "a", "d", "d"]
+    assert cache.stats().hits == 2
+    assert cache.stats().entries == 2
+
+    before = cache.versions("kb", "c")
+    versions.bump_documents("kb", ["c"])
+    versions.bump_documents("kb", ["c"])
+    written = ReadingServiceResult(ReadingOperationStatus.SUCCESS)
+    assert not cache.record_write("kb", "c", before, written)
+    assert cache.stats().entries == 1
+
+
+class _Documents:
+    def insert_one(self, document: dict) -> None:
+        self.stored = document
+
+    def replace_one(self, query: dict, document: dict, upsert: bool) -> SimpleNamespace:
+        return SimpleNamespace(matched_count=1)
+
+
+class _Database:
+    name = "context-cache-kb"
+
+    def __init__(self) -> None:
+        self.documents = _Documents()
+
+    def __getitem__(self, name: str) -> _Documents:
+        return self.documents
+
+
+def test_document_repository_writes_bump_the_document_counter() -> None:
+    database = _Database()
+    repository = SourceDocumentRepository(database, index_manager=object())
+    document = SourceDocument(
+        source_id=Source(name="Libro").source_id,
+        kind="web",
+        title="Web",
+        web=WebDocument(url_raw="https://example.test/resource"),
+    )
+
+    before = COLLECTION_VERSIONS.document_snapshot(database, document.document_id)
+    repository.insert(document)
+    repository.replace(document)
+
+    after = COLLECTION_VERSIONS.document_snapshot(database, document.document_id)
+    assert after[-1] == before[-1] + 2
@@ -16,6 +16,8 @@ from mathmongo.advanced_reader.range_requests import RangeErrorCode
 from mathmongo.advanced_reader.range_requests import RangeRequestError
 from mathmongo.advanced_reader.range_requests import parse_range_header
 from mathmongo.advanced_reader.security import sanitized_inline_filename
+from mathmongo.advanced_reader.verification_cache import VerifiedBlobCache
+from mathmongo.advanced_reader.verification_cache import VerifiedBlobIdentity
 from mathmongo.reading_space.service import ReaderContext
 from mathmongo.source_documents.models import PdfDocument
 
@@ -194,6 +196,77 @@ def test_range_streaming_uses_bounded_pread_and_never_full_payload_service(
     assert 32 in observed_sizes
 
 
+def test_repeated_range_requests_reuse_the_recorded_verification(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    pdf_bytes = b"%PDF-1.7\n" + b"x" * (3 * document_access.VERIFY_CHUNK_BYTES)
+    harness = make_backend_harness(tmp_path, pdf_bytes=pdf_bytes)
+    observed_sizes: list[int] = []
+    real_pread = document_access.os.pread
+
+    def tracked_pread(descriptor: int, size: int, offset: int) -> bytes:
+        observed_sizes.append(size)
+        return real_pread(descriptor, size, offset)
+
+    monkeypatch.setattr(document_access.os, "pread", tracked_pread)
+    with harness.client() as client:
+        first = client.get(_pdf_url(harness), headers={"Range": "bytes=0-31"})
+        hashed_reads = observed_sizes.count(document_access.VERIFY_CHUNK_BYTES)
+        observed_sizes.clear()
+        second = client.get(_pdf_url(harness), headers={"Range": "bytes=32-63"})
+        head = client.head(_pdf_url(harness), headers={"Range": "bytes=64-95"})
+        health = client.get(f"{API_PREFIX}/health")
+
+    assert first.status_code == second.status_code == head.status_code == 206
+    assert second.content == pdf_bytes[32:64]
+    assert hashed_reads == 3
+    assert document_access.VERIFY_CHUNK_BYTES not in observed_sizes
+    assert health.json()["pdf_verification_cache"] == {
+        "hits": 2,
+        "misses": 1,
+        "entries": 1,
+    }
+
+
+def test_identity_change_after_verification_forces_a_full_rehash(tmp_path: Path) -> None:
+    harness = make_backend_harness(tmp_path)
+    version = harness.pdf.pdf.current_version
+    blob = harness.document_service.storage.path_for_version(version)
+    with harness.client() as client:
+        assert client.get(_pdf_url(harness)).status_code == 200
+        blob.chmod(0o600)
+        blob.write_bytes(b"%PDF-1.7\n" + b"z" * (len(harness.pdf_bytes) - 9))
+        blob.chmod(0o600)
+        tampered = client.get(_pdf_url(harness))
+
+    assert (tampered.status_code, _error_code(tampered)) == (409, "integrity_error")
+    stats = harness.dependencies.verification_cache.stats()
+    assert (stats.hits, stats.misses) == (0, 2)
+
+
+def test_verification_cache_expires_evicts_and_replaces_stale_identities() -> None:
+    now = [0.0]
+    cache = VerifiedBlobCache(max_entries=2, ttl_seconds=10.0, clock=lambda: now[0])
+    first = VerifiedBlobIdentity("a" * 64, 1, 1, 10, 100, 100)
+    replaced = VerifiedBlobIdentity("a" * 64, 1, 1, 10, 200, 200)
+    other = VerifiedBlobIdentity("b" * 64, 1, 2, 10, 100, 100)
+    third = VerifiedBlobIdentity("c" * 64, 1, 3, 10, 100, 100)
+
+    cache.record(first)
+    assert cache.is_verified(first)
+    cache.record(replaced)
+    assert not cache.is_verified(first)
+    cache.record(other)
+    cache.record(third)
+    assert not cache.is_verified(replaced)
+    now[0] = 11.0
+    assert not cache.is_verified(third)
+    assert cache.stats().entries == 1
+    with pytest.raises(ValueError):
+        VerifiedBlobCache(max_entries=0)
+
+
 def test_missing_blob_integrity_tamper_and_symlink_fail_closed(tmp_path: Path) -> None:
     cases = ("missing", "tampered", "symlink")
     for case in cases:
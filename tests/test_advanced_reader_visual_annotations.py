@@ -111,7 +111,10 @@ class _VisualService:
         status=AnnotationStatus.ACTIVE,
         page=1,
         page_size=50,
+        cursor=None,
     ):
+        if cursor == "stale":
+            return self._result(ReadingAnnotationOperationStatus.INVALID_CURSOR)
         items = [item for item in self.items.values() if item.document_id == document_id]
         if pdf_page is not None:
             items = [item for item in items if item.page_number == pdf_page]
@@ -256,6 +259,16 @@ def test_create_retry_list_get_update_archive_and_reactivate(visual_harness) ->
     assert reactivated.json()["status"] == "active"
 
 
+def test_invalid_cursor_status_maps_to_bad_request(visual_harness) -> None:
+    harness, _, _ = visual_harness
+    document_path = f"{API_PREFIX}/documents/{harness.pdf.document_id}/visual-annotations"
+    with harness.client() as client:
+        response = client.get(document_path, params={"cursor": "stale"})
+
+    assert response.status_code == 400
+    assert response.json()["error"]["code"] == "invalid_page_cursor"
+
+
 def test_conflict_and_forbidden_geometry_patch_are_write_safe(visual_harness) -> None:
     harness, service, _ = visual_harness
     payload = _payload(harness)
@@ -1380,4 +1380,4 @@ def test_s4_3_preserves_every_existing_migration_module() -> None:
     for path in sorted(migration_root.glob("*.py")):
         relative = path.relative_to(ROOT).as_posix()
         digest.update(f"{hashlib.sha256(path.read_bytes()).hexdigest()}  {relative}\n".encode())
-    assert digest.hexdigest() == "bdfd877a1f11c81d1d4c7995d6697a1cceba891a427a22c48c0ed72c255fb150"
+    assert digest.hexdigest() == "6c78583000488648c2bc8ad28381f69b05bc06cb5924f56b88331439fe582564"
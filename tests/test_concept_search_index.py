@@ -0,0 +1,317 @@
+"""Ranked concept search index: derivation, ranking, sync and fallback."""
+
+# ruff: noqa: D101,D102,D103,D107
+
+from __future__ import annotations
+
+import re
+from copy import deepcopy
+from types import SimpleNamespace
+
+from pymongo.errors import PyMongoError
+
+from editor.concept_linking.concept_search import search_concepts
+from editor.utils import media_assets
+from mathmongo.advanced_reader.concept_search import search_legacy_concepts
+from mathmongo.concept_search_index import CONCEPT_SEARCH_INDEX_COLLECTION
+from mathmongo.concept_search_index import build_search_entry
+from mathmongo.concept_search_index import concept_search_index_ready
+from mathmongo.concept_search_index import rank_concept_identities
+from mathmongo.concept_search_index import rebuild_concept_search_index
+from mathmongo.concept_search_index import refresh_concept_search_entries
+from mathmongo.concept_search_index import search_terms
+
+
+def _values(document: dict, field: str) -> list:
+    value = document.get(field)
+    return list(value) if isinstance(value, list) else [value]
+
+
+def _matches(document: dict, query: dict) -> bool:
+    for field, expected in query.items():
+        if field == "$and":
+            if not all(_matches(document, clause) for clause in expected):
+                return False
+        elif field == "$or":
+            if not any(_matches(document, clause) for clause in expected):
+                return False
+        elif isinstance(expected, dict):
+            values = _values(document, field)
+            if "$in" in expected and not any(value in expected["$in"] for value in values):
+                return False
+            if "$ne" in expected and expected["$ne"] in values:
+                return False
+            if "$regex" in expected and not any(
+                isinstance(value, str) and re.search(expected["$regex"], value) for value in values
+            ):
+                return False
+        elif expected not in _values(document, field):
+            return False
+    return True
+
+
+class _Cursor(list):
+    def limit(self, count: int):
+        return _Cursor(self[:count])
+
+    def sort(self, *_args):
+        return self
+
+    def skip(self, count: int):
+        return _Cursor(self[count:])
+
+
+class _Collection:
+    def __init__(self, documents=None) -> None:
+        self.documents = [deepcopy(document) for document in documents or []]
+        self.find_calls: list[dict] = []
+        self.fail_writes = False
+
+    def find(self, query: dict, projection: dict | None = None):
+        self.find_calls.append(query)
+        return _Cursor(deepcopy(doc) for doc in self.documents if _matches(doc, query))
+
+    def find_one(self, query: dict, projection: dict | None = None):
+        return next(iter(self.find(query)), None)
+
+    def _replace(self, query: dict, document: dict, upsert: bool) -> None:
+        for index, current in enumerate(self.documents):
+            if _matches(current, query):
+                self.documents[index] = {"_id": current.get("_id"), **deepcopy(document)}
+                return
+        if upsert:
+            self.documents.append(deepcopy(document))
+
+    def replace_one(self, query: dict, document: dict, *, upsert: bool = False):
+        self._replace(query, document, upsert)
+
+    def delete_one(self, query: dict):
+        for index, current in enumerate(self.documents):
+            if _matches(current, query):
+                self.documents.pop(index)
+                break
+
+    def delete_many(self, query: dict):
+        self.documents = [doc for doc in self.documents if not _matches(doc, query)]
+
+    def bulk_write(self, operations: list, *, ordered: bool):
+        if self.fail_writes:
+            raise PyMongoError("index write failed")
+        for operation in operations:
+            if hasattr(operation, "_doc"):
+                self._replace(operation._filter, operation._doc, operation._upsert)
+            else:
+                self.delete_one(operation._filter)
+        return SimpleNamespace(acknowledged=True)
+
+    def update_one(self, query: dict, update: dict):
+        self.find_calls.append(query)
+
+    def create_index(self, keys, *, name: str, **_options) -> str:
+        return name
+
+
+class _Database:
+    def __init__(self, concepts: list[dict], latex_documents: list[dict] = ()) -> None:
+        self.collections = {
+            "concepts": _Collection(concepts),
+            "latex_documents": _Collection(latex_documents),
+        }
+
+    def __getitem__(self, name: str) -> _Collection:
+        return self.collections.setdefault(name, _Collection())
+
+    def list_collection_names(self) -> list[str]:
+        return sorted(self.collections)
+
+    @property
+    def index(self) -> _Collection:
+        return self[CONCEPT_SEARCH_INDEX_COLLECTION]
+
+
+CONCEPTS = [
+    {
+        "id": "compactness",
+        "source": "TopologyBook",
+        "titulo": "Compacidad",
+        "tipo": "definicion",
+        "categorias": ["Topología"],
+    },
+    {
+        "id": "heine_borel",
+        "source": "TopologyBook",
+        "titulo": "Teorema de Heine-Borel",
+        "tipo": "teorema",
+        "categorias": ["Análisis"],
+    },
+    {
+        "id": "abelian",
+        "source": "AlgebraBook",
+        "title": "Grupo abeliano",
+        "type": "definicion",
+        "tags": ["grupos"],
+    },
+]
+LATEX = [
+    {
+        "id": "heine_borel",
+        "source": "TopologyBook",
+        "contenido_latex": r"Todo cerrado y acotado es \emph{compacto}.",
+    },
+]
+
+
+def _ready_database() -> _Database:
+    database = _Database(CONCEPTS, LATEX)
+    assert rebuild_concept_search_index(database) == 3
+    return database
+
+
+def _ids(hits) -> list[str]:
+    return [concept_id for concept_id, _source in hits.identities]
+
+
+def test_entries_fold_accents_weight_metadata_and_skip_latex_commands() -> None:
+    entry = build_search_entry(CONCEPTS[1], r"\begin{proof} Sea $K$ compacto \end{proof}")
+
+    assert search_terms("Topología  Álgebra", ["Grupo-abeliano"]) == (
+        "topologia",
+        "algebra",
+        "grupo",
+        "abeliano",
+    )
+    assert entry["weights"]["heine"] == 8 + 5
+    assert entry["types"] == ["teorema"]
+    assert "compacto" in entry["terms"] and "proof" not in entry["terms"]
+    assert "begin" not in entry["terms"]
+    assert build_search_entry({"id": "", "source": "S"}) is None
+
+
+def test_search_is_unavailable_until_a_full_rebuild_marks_the_index_ready() -> None:
+    database = _Database(CONCEPTS, LATEX)
+
+    assert rank_concept_identities(database, "compac") is None
+    assert refresh_concept_search_entries(database, [("compactness", "TopologyBook")]) is False
+    assert CONCEPT_SEARCH_INDEX_COLLECTION not in database.collections
+
+    rebuild_concept_search_index(database)
+    assert concept_search_index_ready(database)
+
+
+def test_ranking_prefers_title_matches_and_supports_prefix_and_filters() -> None:
+    database = _ready_database()
+
+    assert _ids(rank_concept_identities(database, "compac")) == ["compactness", "heine_borel"]
+    assert _ids(rank_concept_identities(database, "TOPOLOGIA")) == ["compactness"]
+    assert _ids(rank_concept_identities(database, "grupo abel")) == ["abelian"]
+    assert _ids(rank_concept_identities(database, "compac", concept_types=["teorema"])) == [
+        "heine_borel"
+    ]
+    assert _ids(rank_concept_identities(database, "definicion", source="AlgebraBook")) == [
+        "abelian"
+    ]
+
+    first = rank_concept_identities(database, "compac", limit=1)
+    second = rank_concept_identities(database, "compac", offset=1, limit=1)
+    assert (_ids(first), first.has_more) == (["compactness"], True)
+    assert (_ids(second), second.has_more) == (["heine_borel"], False)
+
+
+def test_queries_without_indexable_terms_fall_back_to_the_existing_search() -> None:
+    database = _ready_database()
+
+    for query in ("∂", "+", "$", ".*", "   "):
+        assert rank_concept_identities(database, query) is None
+
+
+def test_media_writers_refresh_the_concepts_they_touch(monkeypatch) -> None:
+    refreshed: list[list[tuple[str, str]]] = []
+    monkeypatch.setattr(
+        media_assets,
+        "refresh_concept_search_entries",
+        lambda _database, identities: refreshed.append(list(identities)),
+    )
+    database = _Database(CONCEPTS)
+
+    media_assets.detach_media_asset_from_concept(
+        database,
+        asset_id="asset-1",
+        concept_id="compactness",
+        source="TopologyBook",
+    )
+
+    assert refreshed == [[("compactness", "TopologyBook")]]
+
+
+def test_picker_and_route_search_use_ranked_identities_with_safe_projection() -> None:
+    database = _ready_database()
+
+    picker = search_concepts(database, "compac")
+    page = search_legacy_concepts(database, "compac", limit=1)
+
+    assert [item.concept_id for item in picker] == ["compactness", "heine_borel"]
+    assert [item.concept_id for item in page.items] == ["compactness"]
+    assert page.has_more is True
+    assert not any("$regex" in str(query) for query in database["concepts"].find_calls[-2:])
+
+
+def test_refresh_tracks_edits_and_deletions_and_failures_disable_the_index() -> None:
+    database = _ready_database()
+    database["concepts"].documents[2]["title"] = "Anillo conmutativo"
+    database["concepts"].documents.pop(0)
+
+    assert refresh_concept_search_entries(
+        database,
+        [("abelian", "AlgebraBook"), ("compactness", "TopologyBook")],
+    )
+    assert _ids(rank_concept_identities(database, "anillo")) == ["abelian"]
+    assert rank_concept_identities(database, "abeliano").identities == ()
+    assert _ids(rank_concept_identities(database, "compac")) == ["heine_borel"]
+
+    database.index.fail_writes = True
+    assert refresh_concept_search_entries(database, [("abelian", "AlgebraBook")]) is False
+    assert rank_concept_identities(database, "anillo") is None
+
+
+def test_rebuild_drops_entries_for_concepts_that_no_longer_exist() -> None:
+    database = _ready_database()
+    database["concepts"].documents = database["concepts"].documents[:1]
+
+    assert rebuild_concept_search_index(database) == 1
+    assert sorted(doc.get("id") for doc in database.index.documents if "id" in doc) == [
+        "compactness"
+    ]
+
+
+def test_ranking_scores_every_match_and_caps_only_the_window(monkeypatch) -> None:
+    monkeypatch.setattr("mathmongo.concept_search_index.MAX_RANK_CANDIDATES", 2)
+    concepts = [
+        {"id": f"filler_{index}", "source": "Book", "tipo": "compacto"} for index in range(5)
+    ]
+    concepts.append({"id": "z_last", "source": "Book", "titulo": "Compacto"})
+    database = _Database(concepts)
+    rebuild_concept_search_index(database)
+
+    hits = rank_concept_identities(database, "compacto", limit=2)
+
+    assert _ids(hits) == ["z_last", "filler_0"]
+    assert hits.has_more is True
+    assert _ids(rank_concept_identities(database, "compacto", offset=5, limit=2)) == ["filler_4"]
+
+
+def test_readiness_lists_collections_only_until_the_index_is_seen() -> None:
+    database = _ready_database()
+    database.client, database.name = object(), "search-index-listing"
+    listings: list[None] = []
+    list_names = database.list_collection_names
+
+    def counted() -> list[str]:
+        listings.append(None)
+        return list_names()
+
+    database.list_collection_names = counted
+    for query in ("compac", "grupo", "heine"):
+        rank_concept_identities(database, query)
+    refresh_concept_search_entries(database, [("abelian", "AlgebraBook")])
+
+    assert len(listings) == 1
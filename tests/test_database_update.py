@@ -15,6 +15,7 @@ from types import SimpleNamespace
 import pytest
 from bson.json_util import CANONICAL_JSON_OPTIONS
 from bson.json_util import dumps as bson_json_dumps
+from pymongo.errors import BulkWriteError
 
 from editor import database_import_page
 from editor.utils import db_export
@@ -50,6 +51,7 @@ class _Collection:
         self.insert_calls = 0
         self.replace_calls = 0
         self.delete_calls = 0
+        self.find_calls = 0
         self.indexes = [{"name": "_id_", "key": {"_id": 1}}]
 
     @staticmethod
@@ -65,11 +67,20 @@ class _Collection:
     @classmethod
     def _matches(cls, document: dict, query: dict) -> bool:
         return all(
-            expected in cls._values(document, tuple(field.split(".")))
+            any(cls._matches(document, branch) for branch in expected)
+            if field == "$or"
+            else cls._field_matches(cls._values(document, tuple(field.split("."))), expected)
             for field, expected in query.items()
         )
 
+    @staticmethod
+    def _field_matches(values: list[object], expected) -> bool:
+        if isinstance(expected, dict) and "$in" in expected:
+            return any(item in values for item in expected["$in"])
+        return expected in values
+
     def find(self, query: dict) -> _Cursor:
+        self.find_calls += 1
         return _Cursor(
             deepcopy(document) for document in self.documents if self._matches(document, query)
         )
@@ -89,6 +100,11 @@ class _Collection:
         self.documents.append(deepcopy(document))
         return SimpleNamespace(inserted_id=document.get("_id"))
 
+    def insert_many(self, documents: list[dict], *, ordered: bool):
+        return SimpleNamespace(
+            inserted_ids=[self.insert_one(document).inserted_id for document in documents]
+        )
+
     def replace_one(self, query: dict, document: dict, *, upsert: bool):
         self.exists = True
         self.replace_calls += 1
@@ -675,6 +691,20 @@ def test_metadata_count_mismatch_and_path_traversal_are_rejected(
         db_update.inspect_update_archive(traversal)
 
 
+def test_media_digest_mismatch_is_rejected(tmp_path: Path) -> None:
+    archive = tmp_path / "media-digest.zip"
+    media_path = "media/images/figure.png"
+    _write_archive(
+        archive,
+        {},
+        media={media_path: b"image-bytes"},
+        metadata_overrides={"media_sha256": {media_path: "0" * 64}},
+    )
+
+    with pytest.raises(ValueError, match="media SHA-256"):
+        db_update.inspect_update_archive(archive)
+
+
 @pytest.mark.parametrize("database_name", ["admin", "config", "local"])
 def test_protected_update_targets_are_blocked(database_name: str) -> None:
     with pytest.raises(ValueError, match="protected"):
@@ -1085,3 +1115,91 @@ def test_alternate_identity_cannot_collide_with_another_destination_document() -
     assert action.replace_allowed is False
     assert issue is not None
     assert "multiple destination documents" in issue.reason
+
+
+def test_dry_run_resolves_identities_with_batched_queries(
+    tmp_path: Path,
+    configured_paths: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(db_update, "IMPORT_BATCH_SIZE", 4)
+    destination = [_latex(f"s{index}", f"c{index}", "local") for index in range(10)]
+    incoming = [_latex(f"s{index}", f"c{index}", "local") for index in range(5)]
+    incoming += [_latex(f"s{index}", f"c{index}", "backup") for index in range(5, 10)]
+    incoming += [_latex(f"n{index}", f"n{index}", "insert") for index in range(5)]
+    relations = [
+        {
+            "_id": f"r{index}",
+            "desde": f"c{index}@fixture",
+            "hasta": "missing@fixture",
+            "tipo": "implica",
+        }
+        for index in range(10)
+    ]
+    archive = tmp_path / "batched.zip"
+    _write_archive(archive, {"latex_documents": incoming, "relations": relations})
+    database = _Database(
+        "MathV0",
+        {"latex_documents": destination, "concepts": [{"id": "c0", "source": "fixture"}]},
+    )
+
+    plan = db_update.analyze_database_update(
+        archive,
+        _Mongo(database),
+        source_document_blob_store=SourceDocumentBlobStore(configured_paths),
+        data_root=configured_paths,
+    )
+
+    latex = next(item for item in plan.collection_plans if item.name == "latex_documents")
+    assert (latex.identical, latex.new, latex.conflicts, latex.invalid) == (5, 5, 5, 0)
+    # Fifteen (id, source) and fifteen _id identities, each group in chunks of four.
+    assert database["latex_documents"].find_calls == 8
+    assert database["concepts"].find_calls == 3
+    missing = [item for item in plan.blocking_issues if "absent from archive" in item.reason]
+    assert len(missing) == 10
+
+
+def _failing_insert_many(database: _Database, collection: str, code: int) -> None:
+    target = database[collection]
+
+    def insert_many(documents: list[dict], *, ordered: bool):
+        target.insert_one(documents[0])
+        raise BulkWriteError(
+            {"nInserted": 1, "writeErrors": [{"index": 1, "code": code, "errmsg": "failed"}]}
+        )
+
+    target.insert_many = insert_many
+
+
+def _insert_action(identity: str) -> db_update.DocumentAction:
+    document = _latex(f"s-{identity}", identity, "backup")
+    return db_update.DocumentAction(
+        "latex_documents",
+        db_update.DocumentClassification.INSERT,
+        identity,
+        identity_query={"id": identity, "source": "fixture"},
+        match_query={"_id": document["_id"]},
+        incoming=document,
+    )
+
+
+@pytest.mark.parametrize(
+    ("code", "expected"),
+    [(11000, db_update.StaleUpdatePlanError), (121, BulkWriteError)],
+)
+def test_partial_insert_records_written_prefix_and_maps_only_duplicate_keys(
+    code: int,
+    expected: type[Exception],
+) -> None:
+    database = _Database("MathV0", {"latex_documents": []})
+    _failing_insert_many(database, "latex_documents", code)
+    actions = [_insert_action(identity) for identity in ("a", "b", "c")]
+    operations: list[db_update.AppliedOperation] = []
+
+    with pytest.raises(expected):
+        db_update._insert_actions(database, "latex_documents", actions, operations)
+
+    assert [operation.kind for operation in operations] == ["document_inserted"]
+    assert operations[0].query == {"id": "a", "source": "fixture"}
+    assert operations[0].after == actions[0].incoming
+    assert [item["_id"] for item in database["latex_documents"].documents] == ["s-a"]
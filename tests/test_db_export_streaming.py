@@ -0,0 +1,159 @@
+"""Streaming database export: batched collection members and chunked media copies."""
+
+# ruff: noqa: D101,D102,D103,D107
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from editor.utils import db_export
+from editor.utils import db_import
+from mathmongo import legacy_concept_aliases
+
+
+class _OneShotCursor:
+    """A cursor that can be iterated once, like a live MongoDB cursor."""
+
+    def __init__(self, documents: list[dict]) -> None:
+        self._documents = iter(documents)
+
+    def max_time_ms(self, _milliseconds: int) -> _OneShotCursor:
+        return self
+
+    def __iter__(self):
+        return self._documents
+
+
+class _Collection:
+    def __init__(self, documents: list[dict]) -> None:
+        self.documents = documents
+
+    def find(self, _query: dict) -> _OneShotCursor:
+        return _OneShotCursor(self.documents)
+
+
+class _Database:
+    name = "streaming-db"
+
+    def __init__(self, documents: dict[str, list[dict]]) -> None:
+        self.documents = documents
+
+    def list_collection_names(self) -> list[str]:
+        return list(self.documents)
+
+    def __getitem__(self, name: str) -> _Collection:
+        return _Collection(self.documents.get(name, []))
+
+
+def _export(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, documents: dict) -> dict:
+    monkeypatch.setattr(db_export, "EXPORT_COLLECTIONS", tuple(documents))
+    mongo = type("FakeMongo", (), {"db": _Database(documents)})()
+    zip_path = db_export.export_database_to_zip(mongo, tmp_path / "backups")
+    with zipfile.ZipFile(zip_path) as archive:
+        return {name.split("/", 1)[1]: archive.read(name) for name in archive.namelist()}
+
+
+@pytest.fixture(autouse=True)
+def _no_media(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(db_export, "LEGACY_PROJECT_ROOT", tmp_path / "legacy-project")
+    monkeypatch.setattr(db_export, "LOCAL_MEDIA_ROOT", tmp_path / "xdg" / "media")
+
+
+def test_batched_collections_match_a_single_json_dump(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(db_export, "EXPORT_BATCH_SIZE", 2)
+    monkeypatch.setattr(
+        legacy_concept_aliases,
+        "LEGACY_CONCEPT_ALIAS_REGISTRY",
+        {("viejo", "Algebra"): (("nuevo", "Algebra"),)},
+    )
+    concepts = [
+        {"id": f"c{index}", "source": "Algebra", "latex": f'$x^{index}$\n"á"', "tags": []}
+        for index in range(5)
+    ]
+    relations = [{"desde": "c0@Algebra", "hasta": "c1@Algebra"} for _ in range(4)]
+    relations.append({"desde": "viejo@Algebra", "hasta": "c1@Algebra"})
+
+    members = _export(
+        tmp_path, monkeypatch, {"concepts": concepts, "relations": relations, "x": []}
+    )
+
+    assert members["collections/concepts.json"].decode() == json.dumps(
+        concepts, ensure_ascii=False, indent=2
+    )
+    assert members["collections/x.json"] == b"[]"
+    metadata = json.loads(members["metadata.json"])
+    assert metadata["collections"] == {"concepts": 5, "relations": 5, "x": 0}
+    # Fallback record IDs keep counting across batch boundaries.
+    assert [item["record_id"] for item in metadata["legacy_concept_normalizations"]] == ["5"]
+    assert json.loads(members["collections/relations.json"])[4]["desde"] == "nuevo@Algebra"
+
+
+def test_media_is_copied_in_chunks_and_xdg_overrides_legacy(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(db_export, "MEDIA_CHUNK_BYTES", 3)
+    legacy = tmp_path / "legacy-project" / db_export.MEDIA_ROOT / "images"
+    xdg = tmp_path / "xdg" / "media" / "images"
+    legacy.mkdir(parents=True)
+    xdg.mkdir(parents=True)
+    (legacy / "shared.png").write_bytes(b"legacy")
+    (legacy / "old.png").write_bytes(b"only in the legacy tree")
+    (xdg / "shared.png").write_bytes(b"current xdg bytes")
+
+    members = _export(tmp_path, monkeypatch, {"concepts": []})
+
+    media_root = db_export.MEDIA_ROOT.as_posix()
+    assert members[f"{media_root}/images/shared.png"] == b"current xdg bytes"
+    assert members[f"{media_root}/images/old.png"] == b"only in the legacy tree"
+    metadata = json.loads(members["metadata.json"])
+    assert metadata["media_files"] == {
+        f"{media_root}/images/old.png": 23,
+        f"{media_root}/images/shared.png": 17,
+    }
+    assert metadata["media_sha256"] == {
+        f"{media_root}/images/old.png": hashlib.sha256(b"only in the legacy tree").hexdigest(),
+        f"{media_root}/images/shared.png": hashlib.sha256(b"current xdg bytes").hexdigest(),
+    }
+
+
+def test_import_checks_the_streamed_media_digests(tmp_path, monkeypatch) -> None:
+    media = tmp_path / "xdg" / "media" / "images"
+    media.mkdir(parents=True)
+    (media / "figure.png").write_bytes(b"figure bytes")
+    monkeypatch.setattr(db_export, "EXPORT_COLLECTIONS", ("concepts",))
+    mongo = type("FakeMongo", (), {"db": _Database({"concepts": []})})()
+    exported = db_export.export_database_to_zip(mongo, tmp_path / "backups")
+    assert db_import.inspect_export_zip(exported)["collections"] == {"concepts": 0}
+
+    tampered = tmp_path / "tampered.zip"
+    with zipfile.ZipFile(exported) as source, zipfile.ZipFile(tampered, "w") as target:
+        for info in source.infolist():
+            data = source.read(info)
+            if info.filename.endswith("/metadata.json"):
+                metadata = json.loads(data)
+                (name,) = metadata["media_sha256"]
+                metadata["media_sha256"][name] = hashlib.sha256(b"other bytes").hexdigest()
+                data = json.dumps(metadata).encode("utf-8")
+            target.writestr(info, data)
+
+    with pytest.raises(ValueError, match="media SHA-256 does not match"):
+        db_import.inspect_export_zip(tampered)
+
+
+def test_media_changing_during_the_copy_is_rejected(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(db_export, "MEDIA_CHUNK_BYTES", 4)
+    source = tmp_path / "figure.png"
+    source.write_bytes(b"0123456789")
+
+    class _GrowingDestination(io.BytesIO):
+        def write(self, data: bytes) -> int:
+            with source.open("ab") as handle:
+                handle.write(b"!")
+            return super().write(data)
+
+    with pytest.raises(ValueError, match="Media changed during export"):
+        db_export._copy_stable_media_file(source, _GrowingDestination())
@@ -10,12 +10,26 @@ from editor.database_scope import DOCUMENT_BUILDER_SCOPE_KEY
 from editor.database_scope import database_scope_token
 from editor.database_scope import sync_document_builder_scope
 from editor.document_builder import _concepts_for_keys
+from mathdatabase.mathmongo import attach_latex_contents
 
 ROOT = Path(__file__).resolve().parents[1]
 BUILDER_SOURCE = ROOT / "editor" / "document_builder.py"
 APP_SOURCE = ROOT / "editor" / "editor_streamlit.py"
 
 
+def _matches(document: dict, query: dict) -> bool:
+    for key, value in query.items():
+        if key == "$or":
+            if not any(_matches(document, clause) for clause in value):
+                return False
+        elif isinstance(value, dict) and "$in" in value:
+            if document.get(key) not in value["$in"]:
+                return False
+        elif document.get(key) != value:
+            return False
+    return True
+
+
 class _ReadOnlyCollection:
     def __init__(self, documents: list[dict]) -> None:
         self.documents = documents
@@ -24,14 +38,14 @@ class _ReadOnlyCollection:
     def find_one(self, query: dict, *_args, **_kwargs):
         self.queries.append(query)
         return next(
-            (
-                dict(document)
-                for document in self.documents
-                if all(document.get(key) == value for key, value in query.items())
-            ),
+            (dict(document) for document in self.documents if _matches(document, query)),
             None,
         )
 
+    def find(self, query: dict, *_args, **_kwargs):
+        self.queries.append(query)
+        return [dict(document) for document in self.documents if _matches(document, query)]
+
     def __getattr__(self, name: str):
         if name.startswith(("insert", "update", "delete", "replace", "bulk")):
             raise AssertionError(f"Document Builder attempted MongoDB write: {name}")
@@ -147,6 +161,33 @@ def test_modern_and_legacy_concepts_resolve_read_only_inside_own_database() -> N
         ("modern", "modern body"),
         ("legacy", "legacy body"),
     ]
+    assert len(database.concepts.queries) == 1
+    assert len(database.latex_documents.queries) == 1
+
+
+def test_latex_enrichment_uses_one_query_per_chunk_and_keeps_selection_order() -> None:
+    concepts = [{"id": f"c{index}", "source": "S"} for index in range(5)]
+    latex_documents = [
+        {"id": f"c{index}", "source": "S", "contenido_latex": f"body {index}"}
+        for index in range(4)
+    ]
+    database = _ReadOnlyDatabase(concepts=concepts, latex_documents=latex_documents)
+
+    enriched = attach_latex_contents(
+        database.latex_documents,
+        list(reversed(concepts)),
+        chunk_size=2,
+    )
+
+    assert [item["contenido_latex"] for item in enriched] == [
+        "",
+        "body 3",
+        "body 2",
+        "body 1",
+        "body 0",
+    ]
+    assert len(database.latex_documents.queries) == 3
+    assert "contenido_latex" not in concepts[0]
 
 
 def test_builder_sync_precedes_database_reads_and_context_is_visible() -> None:
@@ -12,6 +12,8 @@ import pytest
 from pydantic import ValidationError
 from source_catalog_migration_fakes import FakeDatabase
 
+from mathmongo.document_page_maps.compiled import CompiledPageMap
+from mathmongo.document_page_maps.compiled import CompiledPageMapCache
 from mathmongo.document_page_maps.errors import DocumentPageMapConflictError
 from mathmongo.document_page_maps.indexes import DOCUMENT_PAGE_MAP_INDEXES
 from mathmongo.document_page_maps.indexes import DOCUMENT_PAGE_MAPS_COLLECTION
@@ -240,6 +242,13 @@ def test_label_computation_supports_all_styles_prefixes_gaps_and_override_preced
     with pytest.raises(ValueError, match="strict integer"):
         compute_book_page_label(page_map, True)
 
+    compiled = CompiledPageMap.from_page_map(page_map)
+    assert [compiled.label(page) for page in range(1, 25)] == [
+        compute_book_page_label(page_map, page) for page in range(1, 25)
+    ]
+    with pytest.raises(ValueError, match="strict integer"):
+        compiled.label(True)
+
 
 def test_repository_and_index_construction_are_lazy_and_apply_is_explicit() -> None:
     database, *_ = _database(ready=False)
@@ -407,6 +416,61 @@ def test_service_override_wins_upserts_and_reset_retains_active_identity() -> No
     )
 
 
+def test_service_labels_ranges_from_one_compiled_revision() -> None:
+    database, _, _, pdf, _, _ = _database()
+    cache = CompiledPageMapCache()
+    service = DocumentPageMapService(database, compiled_page_maps=cache)
+    service.set_quick_rule(pdf.document_id, current_pdf_page=3)
+    service.upsert_override(pdf.document_id, pdf_page=5, book_page_label="plate")
+
+    labels = service.compute_page_labels(pdf.document_id, 1, 8)
+    single = [service.compute_page_label(pdf.document_id, page) for page in range(1, 9)]
+
+    assert labels.value.labels == (None, None, "1", "2", "plate", "4", "5", "6")
+    assert labels.value.labels == tuple(item.value.book_page_label for item in single)
+    assert (cache.stats().misses, cache.stats().hits) == (1, 8)
+
+    service.upsert_override(pdf.document_id, pdf_page=5, book_page_label="plate B")
+    relabelled = service.compute_page_labels(pdf.document_id, 5, 5)
+    too_long = service.compute_page_labels(pdf.document_id, 1, 5_001)
+    reversed_range = service.compute_page_labels(pdf.document_id, 4, 3)
+
+    assert relabelled.value.labels == ("plate B",)
+    assert cache.stats().misses == 2
+    assert too_long.status == reversed_range.status == PageMapOperationStatus.INVALID_STATE
+    assert service.compute_page_labels(pdf.document_id, 0, 3).status == (
+        PageMapOperationStatus.INVALID_STATE
+    )
+
+
+def test_service_serves_cached_labels_without_reading_the_page_map() -> None:
+    database, _, _, pdf, _, _ = _database()
+    now = [0.0]
+    cache = CompiledPageMapCache(ttl_seconds=10.0, clock=lambda: now[0])
+    service = DocumentPageMapService(database, compiled_page_maps=cache)
+    service.set_quick_rule(pdf.document_id, current_pdf_page=3)
+    reads: list[str] = []
+    get_page_map = service.get_page_map
+
+    def counted(document_id: str, **kwargs):
+        reads.append(document_id)
+        return get_page_map(document_id, **kwargs)
+
+    service.get_page_map = counted
+    labels = [service.compute_page_label(pdf.document_id, page) for page in (3, 4, 5)]
+    assert [item.value.book_page_label for item in labels] == ["1", "2", "3"]
+    assert len(reads) == 1
+
+    now[0] = 11.0
+    service.compute_page_labels(pdf.document_id, 1, 4)
+    service.upsert_override(pdf.document_id, pdf_page=4, book_page_label="plate")
+    relabelled = service.compute_page_label(pdf.document_id, 4)
+
+    assert relabelled.value.book_page_label == "plate"
+    assert len(reads) == 3
+    assert (cache.stats().hits, cache.stats().misses) == (2, 3)
+
+
 def test_service_archive_new_active_and_reactivation_conflict() -> None:
     database, _, _, pdf, _, _ = _database()
     service = DocumentPageMapService(database)
@@ -15,6 +15,7 @@ import pytest
 
 from editor.db.concept_edit_service import ConceptEditStatus
 from editor.db.concept_edit_service import update_concept_fields_preserving_identity
+from mathmongo.folder_ingest import INGEST_HASH_FIELD
 
 CONCEPT_ID = "definition:identity-contract"
 SOURCE = "Historical snapshot"
@@ -577,3 +578,16 @@ def test_media_manager_receives_only_the_original_identity() -> None:
     assert "original_source" in manager_block
     assert "edit_id" not in manager_block
     assert "edit_source" not in manager_block
+
+
+@pytest.mark.parametrize("transactional", [False, True])
+def test_edit_clears_the_folder_ingest_hash(transactional: bool) -> None:
+    concept, latex = _documents()
+    latex[INGEST_HASH_FIELD] = "a" * 64
+    database = _Database(concept, latex, transactional=transactional)
+
+    result = _update(database)
+
+    assert result.status is ConceptEditStatus.SUCCESS
+    assert INGEST_HASH_FIELD not in database.latex_documents.documents[0]
+    assert database.latex_documents.documents[0]["contenido_latex"] == "after latex"
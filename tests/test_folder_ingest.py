@@ -0,0 +1,99 @@
+"""Folder ingestion: pooled parsing, batched upserts, hash skips and dry runs."""
+
+# ruff: noqa: D101,D102,D103,D107
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from mathmongo import folder_ingest
+
+
+class _Collection:
+    def __init__(self) -> None:
+        self.documents: dict[tuple[str, str], dict] = {}
+        self.bulk_calls: list[int] = []
+
+    def find(self, query: dict, _projection: dict) -> list[dict]:
+        wanted = query[folder_ingest.INGEST_HASH_FIELD]["$in"]
+        return [
+            document
+            for document in self.documents.values()
+            if document["source"] == query["source"]
+            and document.get(folder_ingest.INGEST_HASH_FIELD) in wanted
+        ]
+
+    def bulk_write(self, requests: list, ordered: bool) -> None:
+        assert ordered
+        self.bulk_calls.append(len(requests))
+        for request in requests:
+            identity = (request._filter["id"], request._filter["source"])
+            document = self.documents.setdefault(identity, dict(request._filter))
+            if len(document) == 2:
+                document.update(request._doc.get("$setOnInsert", {}))
+            document.update(request._doc["$set"])
+
+
+class _Database(dict):
+    def __init__(self) -> None:
+        super().__init__(concepts=_Collection(), latex_documents=_Collection())
+
+
+def _note(folder: Path, name: str, concept_id: str, body: str, newline: str = "\n") -> None:
+    text = f"---\nid: {concept_id}\ntipo: definicion\ncategorias: [algebra]\n---\n{body}\n"
+    (folder / name).write_bytes(text.replace("\n", newline).encode("utf-8"))
+
+
+def test_ingest_batches_upserts_and_skips_unchanged_files(tmp_path) -> None:
+    _note(tmp_path, "a.md", "grupo", "$G$")
+    _note(tmp_path, "b.md", "anillo", "$R$", newline="\r\n")
+    _note(tmp_path, "c.md", "cuerpo", "$K$")
+    (tmp_path / "roto.md").write_text("---\nid: roto\ntipo: desconocido\n---\nx\n", "utf-8")
+    database = _Database()
+
+    report = folder_ingest.ingest_folder(database, tmp_path, "Algebra", max_workers=2, batch_size=2)
+
+    assert [concept.id for concept in report.concepts] == ["grupo", "anillo", "cuerpo"]
+    assert [name for name, _error in report.invalid] == ["roto.md"]
+    assert set(report.timings) == set(folder_ingest.INGEST_STAGES)
+    assert database["concepts"].bulk_calls == [2, 1]
+    assert database["latex_documents"].bulk_calls == [2, 1]
+    stored = database["latex_documents"].documents[("anillo", "Algebra")]
+    assert stored["contenido_latex"] == "$R$"
+    assert "fecha_creacion" in stored
+    assert "contenido_latex" not in database["concepts"].documents[("grupo", "Algebra")]
+
+    _note(tmp_path, "b.md", "anillo", "$R[x]$")
+    again = folder_ingest.ingest_folder(database, tmp_path, "Algebra", max_workers=1)
+
+    assert again.skipped_unchanged == ("a.md", "c.md")
+    assert [concept.id for concept in again.concepts] == ["anillo"]
+    assert database["concepts"].bulk_calls == [2, 1, 1]
+    assert database["latex_documents"].documents[("anillo", "Algebra")]["contenido_latex"] == (
+        "$R[x]$"
+    )
+
+
+def test_dry_run_validates_without_writing(tmp_path) -> None:
+    _note(tmp_path, "a.md", "grupo", "$G$")
+    database = _Database()
+
+    report = folder_ingest.ingest_folder(database, tmp_path, "Algebra", dry_run=True)
+
+    assert report.dry_run
+    assert [concept.id for concept in report.concepts] == ["grupo"]
+    assert database["concepts"].bulk_calls == []
+    assert database["latex_documents"].documents == {}
+
+
+def test_malformed_yaml_headers_are_reported_as_invalid(tmp_path) -> None:
+    _note(tmp_path, "a.md", "grupo", "$G$")
+    (tmp_path / "llaves.md").write_text("---\nid: [roto\n---\nx\n", "utf-8")
+    (tmp_path / "lista.md").write_text("---\n- id\n- tipo\n---\nx\n", "utf-8")
+    database = _Database()
+
+    report = folder_ingest.ingest_folder(database, tmp_path, "Algebra", max_workers=1)
+
+    assert [concept.id for concept in report.concepts] == ["grupo"]
+    assert [name for name, _error in report.invalid] == ["lista.md", "llaves.md"]
+    assert all(error for _name, error in report.invalid)
@@ -0,0 +1,85 @@
+"""Memoized SVG node rendering and the shared SVG atlas of the graph HTML export."""
+
+# ruff: noqa: D101,D102,D103,D107
+
+from __future__ import annotations
+
+import json
+import re
+
+from visualizations import grafoconocimiento
+from visualizations.grafoconocimiento import SVG_ATLAS_PREFIX
+from visualizations.grafoconocimiento import GrafoConocimiento
+from visualizations.grafoconocimiento import svg_render_cache_info
+
+
+def _graph() -> GrafoConocimiento:
+    # The same lemma title in three sources renders three identical SVG images.
+    concepts = [
+        {"id": f"lema{index}", "source": source, "titulo": "Lema de Zorn", "tipo": "lema"}
+        for index, source in enumerate(("Conjuntos", "Algebra", "Topologia"))
+    ]
+    concepts += [
+        {"id": "ejemplo", "source": "Algebra", "titulo": "Ejemplo de anillo", "tipo": "ejemplo"},
+        {"id": "grupo", "source": "Algebra", "titulo": "Grupo", "tipo": "definicion"},
+    ]
+    relations = [{"desde": "lema1@Algebra", "hasta": "grupo@Algebra", "tipo": "implica"}]
+    grafo = GrafoConocimiento(concepts, relations)
+    grafo.construir_grafo()
+    return grafo
+
+
+def _pyvis_nodes(html: str) -> list[dict]:
+    match = re.search(r"nodes = new vis\.DataSet\(mmResolveSvgAtlas\((.*?)\)\);\n", html)
+    assert match is not None
+    return json.loads(match.group(1))
+
+
+def test_svg_rendering_is_memoized_across_instances() -> None:
+    first, second = GrafoConocimiento([], []), GrafoConocimiento([], [])
+    wrapped = first._wrap_label("Teorema de la convergencia dominada de Lebesgue")
+    before = svg_render_cache_info().hits
+
+    image = first._make_svg_polygon_node(wrapped, "#F17A7A", "diamond", "lem")
+    again = second._make_svg_polygon_node(wrapped, "#F17A7A", "diamond", "lem")
+
+    assert again is image and image.startswith("data:image/svg+xml")
+    assert svg_render_cache_info().hits >= before + 1
+    assert wrapped == "Teorema de la\nconvergencia\ndominada de Lebesgue"
+    assert first._make_svg_polygon_node(wrapped, "#F17A7A", "triangle", "lem") != image
+
+
+def test_export_emits_each_svg_image_once_and_resolves_references() -> None:
+    grafo = _graph()
+    state = grafo.to_graph_state()
+
+    html = grafo.exportar_html(initial_state=state)
+
+    nodes = {node["id"]: node for node in _pyvis_nodes(html)}
+    lemmas = enumerate(("Conjuntos", "Algebra", "Topologia"))
+    lemma_refs = {nodes[f"lema{index}@{source}"]["image"] for index, source in lemmas}
+    assert len(lemma_refs) == 1 and next(iter(lemma_refs)).startswith(SVG_ATLAS_PREFIX)
+    assert nodes["grupo@Algebra"]["shape"] != "image"
+    for image in {node["image"] for node in state["nodes"] if node.get("shape") == "image"}:
+        assert html.count(image) == 1
+    assert html.count('<script id="mm-svg-atlas">') == 1
+    assert "const stateJson = mmResolveSvgAtlasState(" in html
+
+    metrics = grafo.export_metrics
+    assert metrics["svg_unique_images"] == 2
+    # Four image nodes, each in the pyvis DataSet and in ``nodes``/``fullNodes`` of the state.
+    assert metrics["svg_references"] == 12
+    saved = metrics["svg_inline_bytes"] - metrics["svg_atlas_bytes"]
+    assert metrics["svg_saved_bytes"] == saved > 0
+    assert metrics["html_bytes"] == len(html.encode("utf-8"))
+
+
+def test_unknown_pyvis_template_falls_back_to_inline_images(monkeypatch) -> None:
+    monkeypatch.setattr(grafoconocimiento._SvgAtlas, "_NODES_MARKER", "missing marker")
+    grafo = _graph()
+
+    html = grafo.exportar_html()
+
+    assert SVG_ATLAS_PREFIX not in html and "mm-svg-atlas" not in html
+    assert html.count("data:image/svg+xml") == 4
+    assert grafo.export_metrics["svg_saved_bytes"] == 0
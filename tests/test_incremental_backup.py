@@ -0,0 +1,274 @@
+"""Incremental backups: content-hash deltas, chain verification and compaction."""
+
+# ruff: noqa: D101,D102,D103,D107
+
+from __future__ import annotations
+
+import hashlib
+import json
+import zipfile
+from pathlib import Path
+from types import SimpleNamespace
+
+import pymongo
+import pytest
+
+from editor.utils import db_export
+from editor.utils import db_import
+from mathmongo import backup
+from mathmongo.config import AppConfig
+
+CONFIG = AppConfig(mongo_uri="mongodb://localhost:27017/kb", mongo_database="kb")
+
+
+class _Cursor(list):
+    def max_time_ms(self, _milliseconds: int) -> _Cursor:
+        return self
+
+
+class _Collection:
+    def __init__(self, documents: list[dict]) -> None:
+        self.documents = documents
+
+    def find(self, _query: dict) -> _Cursor:
+        return _Cursor(dict(document) for document in self.documents)
+
+    def count_documents(self, _query: dict) -> int:
+        return len(self.documents)
+
+    def list_indexes(self):
+        return iter([{"name": "_id_", "key": {"_id": 1}}])
+
+
+class _Database:
+    name = "kb"
+
+    def __init__(self, documents: dict[str, list[dict]]) -> None:
+        self.collections = {name: _Collection(items) for name, items in documents.items()}
+
+    def list_collections(self) -> list[dict]:
+        return [{"name": name, "options": {}} for name in self.collections]
+
+    def list_collection_names(self) -> list[str]:
+        return list(self.collections)
+
+    def __getitem__(self, name: str) -> _Collection:
+        return self.collections[name]
+
+
+class _TargetCollection(_Collection):
+    """Collection of a restore target; exists only once written or created."""
+
+    def __init__(self) -> None:
+        super().__init__([])
+        self.created = False
+
+    def find(self, query: dict | None = None, *_args, **_kwargs) -> _Cursor:
+        return _Cursor(
+            dict(document)
+            for document in self.documents
+            if all(document.get(key) == value for key, value in (query or {}).items())
+        )
+
+    def find_one(self, query: dict | None = None, *_args, **_kwargs) -> dict | None:
+        return next(iter(self.find(query)), None)
+
+    def insert_many(self, documents: list[dict], ordered: bool = True) -> None:
+        self.documents.extend(dict(document) for document in documents)
+        self.created = True
+
+
+class _TargetDatabase(_Database):
+    def __init__(self, name: str) -> None:
+        super().__init__({})
+        self.name = name
+
+    def __getitem__(self, name: str) -> _TargetCollection:
+        return self.collections.setdefault(name, _TargetCollection())
+
+    def create_collection(self, name: str) -> None:
+        self[name].created = True
+
+    def list_collections(self) -> list[dict]:
+        return [
+            {"name": name, "options": {}}
+            for name, collection in self.collections.items()
+            if collection.created
+        ]
+
+    def list_collection_names(self) -> list[str]:
+        return [item["name"] for item in self.list_collections()]
+
+
+class _Client:
+    databases: dict[str, _TargetDatabase] = {}
+
+    def __init__(self, *_args, **_kwargs) -> None:
+        pass
+
+    def list_database_names(self) -> list[str]:
+        return [name for name, database in self.databases.items() if database.list_collections()]
+
+    def __getitem__(self, name: str) -> _TargetDatabase:
+        return self.databases.setdefault(name, _TargetDatabase(name))
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.fixture
+def media_root(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setattr(db_export, "EXPORT_COLLECTIONS", ("concepts", "relations"))
+    monkeypatch.setattr(db_export, "LEGACY_PROJECT_ROOT", tmp_path / "legacy-project")
+    monkeypatch.setattr(db_export, "LOCAL_MEDIA_ROOT", tmp_path / "media")
+    (tmp_path / "media" / "images").mkdir(parents=True)
+    return tmp_path / "media"
+
+
+def _concept(index: int, body: str = "x") -> dict:
+    return {"_id": f"c{index}", "id": f"c{index}", "source": "Algebra", "latex": body}
+
+
+def _members(archive_path: Path, suffix: str) -> list:
+    with zipfile.ZipFile(archive_path) as archive:
+        name = next(item for item in archive.namelist() if item.endswith(suffix))
+        return json.loads(archive.read(name))
+
+
+def test_deltas_hold_only_changes_and_compact_into_a_full_backup(tmp_path, media_root) -> None:
+    concepts = [_concept(index) for index in range(4)]
+    relations = [{"_id": "r0", "desde": "c0@Algebra", "hasta": "c1@Algebra", "tipo": "implica"}]
+    (media_root / "images" / "kept.png").write_bytes(b"kept")
+    database = _Database({"concepts": concepts, "relations": relations})
+    mongo = SimpleNamespace(db=database)
+    out = tmp_path / "backups"
+    _full, base = backup.create_verified_backup(mongo, out, config=CONFIG)
+
+    concepts[1] = _concept(1, "changed")
+    del concepts[2]
+    concepts.append(_concept(9))
+    (media_root / "images" / "new.png").write_bytes(b"new figure")
+    first, first_manifest = backup.create_incremental_backup(mongo, base, config=CONFIG)
+    second, second_manifest = backup.create_incremental_backup(mongo, first_manifest, config=CONFIG)
+
+    assert [item["_id"] for item in _members(first, "concepts.json")] == ["c1", "c9"]
+    assert _members(first, "relations.json") == []
+    manifest = json.loads(first_manifest.read_text(encoding="utf-8"))
+    assert manifest["changes"]["collections"]["concepts"]["deleted"] == ['"c2"']
+    assert manifest["changes"]["media"]["upserted"] == ["media/images/new.png"]
+    with zipfile.ZipFile(first) as archive:
+        assert not any(name.endswith("kept.png") for name in archive.namelist())
+    assert _members(second, "concepts.json") == []
+    assert backup.verify_backup(second_manifest)["chain_length"] == 3
+
+    compacted, compacted_manifest = backup.compact_backup_chain(second_manifest)
+
+    assert backup.verify_backup(compacted_manifest)["collections"] == {
+        "concepts": 4,
+        "relations": 1,
+    }
+    restored = sorted(_members(compacted, "concepts.json"), key=lambda item: item["_id"])
+    assert restored == sorted(concepts, key=lambda item: item["_id"])
+    with zipfile.ZipFile(compacted) as archive:
+        metadata = json.loads(archive.read(f"{compacted.stem}/metadata.json"))
+    assert metadata["media_files"] == {"media/images/kept.png": 4, "media/images/new.png": 10}
+    assert metadata["media_sha256"] == {
+        "media/images/kept.png": hashlib.sha256(b"kept").hexdigest(),
+        "media/images/new.png": hashlib.sha256(b"new figure").hexdigest(),
+    }
+
+
+def test_tampered_middle_link_breaks_the_chain(tmp_path, media_root) -> None:
+    database = _Database({"concepts": [_concept(0)], "relations": []})
+    mongo = SimpleNamespace(db=database)
+    _full, base = backup.create_verified_backup(mongo, tmp_path / "backups", config=CONFIG)
+    database.collections["concepts"].documents.append(_concept(1))
+    first, first_manifest = backup.create_incremental_backup(mongo, base, config=CONFIG)
+    _second, second_manifest = backup.create_incremental_backup(
+        mongo, first_manifest, config=CONFIG
+    )
+
+    original = first_manifest.read_bytes()
+    first_manifest.write_bytes(original.replace(b'"created_at": "', b'"created_at": "1999'))
+
+    with pytest.raises(backup.BackupError, match="parent manifest does not match"):
+        backup.verify_backup(second_manifest)
+    with pytest.raises(backup.BackupError, match="parent manifest does not match"):
+        backup.compact_backup_chain(second_manifest)
+    first_manifest.write_bytes(original)
+    with zipfile.ZipFile(first, "a") as archive:
+        archive.writestr("extra.txt", "tampered")
+    with pytest.raises(backup.BackupError, match="SHA-256"):
+        backup.verify_backup(second_manifest)
+
+
+def test_restoring_a_chain_replays_changes_and_deletions(tmp_path, media_root, monkeypatch) -> None:
+    concepts = [_concept(index) for index in range(3)]
+    database = _Database({"concepts": concepts, "relations": []})
+    mongo = SimpleNamespace(db=database)
+    _full, base = backup.create_verified_backup(mongo, tmp_path / "backups", config=CONFIG)
+    concepts[1] = _concept(1, "changed")
+    del concepts[2]
+    _delta, delta_manifest = backup.create_incremental_backup(mongo, base, config=CONFIG)
+    monkeypatch.setattr(db_import, "IMPORT_COLLECTIONS", ("concepts", "relations"))
+    monkeypatch.setattr(_Client, "databases", {})
+    monkeypatch.setattr(pymongo, "MongoClient", _Client)
+
+    report = backup.restore_to_new_database(
+        delta_manifest, target_database="kb_restored", mongo_uri=CONFIG.mongo_uri
+    )
+
+    assert report["imported_counts"] == {"concepts": 2, "relations": 0}
+    assert report["structure_matches"] is True
+    restored = _Client.databases["kb_restored"]["concepts"].documents
+    assert sorted(restored, key=lambda item: item["_id"]) == [_concept(0), _concept(1, "changed")]
+
+
+def test_archived_collections_are_parsed_incrementally(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(backup, "_JSON_CHUNK_CHARS", 7)
+    archive_path = tmp_path / "chunks.zip"
+    legacy = [{"_id": "c0", "latex": "α, ]"}, {"_id": "c1", "nested": {"items": [1, 2]}}]
+    with zipfile.ZipFile(archive_path, "w") as archive:
+        archive.writestr("base/legacy.json", json.dumps(legacy, ensure_ascii=False, indent=2))
+        archive.writestr("base/extended.json", '[{"_id": {"$numberLong": "5"}}]')
+        archive.writestr("base/empty.json", " [ ] ")
+        archive.writestr("base/trailing.json", '[{"_id": 1},]')
+        archive.writestr("base/scalars.json", "[1]")
+        archive.writestr("base/extra.json", '[{"_id": 1}] {}')
+
+    with zipfile.ZipFile(archive_path) as archive:
+        assert list(
+            backup._archived_documents(archive, "base/legacy.json", extended_json=False)
+        ) == (legacy)
+        assert list(
+            backup._archived_documents(archive, "base/extended.json", extended_json=True)
+        ) == [{"_id": 5}]
+        assert (
+            list(backup._archived_documents(archive, "base/empty.json", extended_json=False)) == []
+        )
+        for name in ("trailing", "scalars", "extra"):
+            with pytest.raises(backup.BackupError, match="not a valid JSON document array"):
+                list(backup._archived_documents(archive, f"base/{name}.json", extended_json=False))
+
+
+def test_compaction_streams_archive_members(tmp_path, media_root, monkeypatch) -> None:
+    concepts = [_concept(index) for index in range(3)]
+    (media_root / "images" / "kept.png").write_bytes(b"kept")
+    database = _Database({"concepts": concepts, "relations": []})
+    mongo = SimpleNamespace(db=database)
+    _full, base = backup.create_verified_backup(mongo, tmp_path / "backups", config=CONFIG)
+    concepts[0] = _concept(0, "changed")
+    _delta, delta_manifest = backup.create_incremental_backup(mongo, base, config=CONFIG)
+    read = zipfile.ZipFile.read
+
+    def metadata_only(archive: zipfile.ZipFile, name, *args):
+        assert str(getattr(name, "filename", name)).endswith("metadata.json"), name
+        return read(archive, name, *args)
+
+    monkeypatch.setattr(zipfile.ZipFile, "read", metadata_only)
+
+    compacted, compacted_manifest = backup.compact_backup_chain(delta_manifest)
+
+    monkeypatch.setattr(zipfile.ZipFile, "read", read)
+    assert backup.verify_backup(compacted_manifest)["collections"]["concepts"] == 3
+    assert sorted(_members(compacted, "concepts.json"), key=lambda item: item["_id"]) == concepts
@@ -0,0 +1,245 @@
+"""Incremental knowledge-graph views: parity with full builds, deltas and base caching."""
+
+# ruff: noqa: D101,D102,D103,D107
+
+from __future__ import annotations
+
+from mathmongo.query_cache import bump_collection_versions
+from mathmongo.relation_endpoints import split_relation_endpoint
+from visualizations.grafoconocimiento import GrafoConocimiento
+from visualizations.incremental_graph import GraphFilters
+from visualizations.incremental_graph import KnowledgeGraphBase
+from visualizations.incremental_graph import KnowledgeGraphBaseCache
+from visualizations.incremental_graph import apply_graph_state_delta
+from visualizations.incremental_graph import graph_state_delta
+
+CONCEPTS = [
+    {"id": "grupo", "source": "Algebra", "titulo": "Grupo", "tipo": "definicion"},
+    {"id": "lagrange", "source": "Algebra", "titulo": "Teorema de Lagrange", "tipo": "teorema"},
+    {"id": "orden", "source": "Algebra", "titulo": "Orden de un elemento", "tipo": "lema"},
+    {"id": "compacto", "source": "Topologia", "titulo": "Compacidad", "tipo": "Definición"},
+    {"id": "heine", "source": "Topologia", "titulo": "Heine-Borel", "tipo": "teorema"},
+    {"id": "aviso", "source": "Topologia", "titulo": "Nota sobre Heine-Borel", "tipo": "nota"},
+    {"id": "tychonoff", "source": "Topologia", "titulo": "Tychonoff", "tipo": ["teorema"]},
+]
+RELATIONS = [
+    {
+        "desde": "lagrange@Algebra",
+        "hasta": "grupo@Algebra",
+        "tipo": "requiere_concepto",
+        "desde_source": "Algebra",
+        "hasta_source": "Algebra",
+    },
+    {
+        "desde": "orden@Algebra",
+        "hasta": "lagrange@Algebra",
+        "tipo": "implica",
+        "desde_source": "Algebra",
+        "hasta_source": "Algebra",
+    },
+    # Written before the endpoint backfill: no ``*_source`` fields.
+    {"desde": "heine@Topologia", "hasta": "compacto@Topologia", "tipo": "requiere_concepto"},
+    {"desde": "aviso@Topologia", "hasta": "heine@Topologia", "tipo": "deriva_de"},
+    {
+        "desde_id": "heine",
+        "desde_source": "Topologia",
+        "hasta_id": "falta",
+        "hasta_source": "Analisis",
+        "tipo": "implica",
+    },
+    {
+        "desde": "grupo@Algebra",
+        "hasta": "compacto@Topologia",
+        "tipo": "contrasta_con",
+        "desde_source": "Algebra",
+        "hasta_source": "Topologia",
+    },
+]
+FILTERS = [
+    GraphFilters(),
+    GraphFilters(sources=("Algebra",)),
+    GraphFilters(sources=("Topologia",), relation_types=("requiere_concepto", "implica")),
+    GraphFilters(concept_types=("teorema", "definicion")),
+    GraphFilters(sources=("Analisis",)),
+]
+
+
+def _in(value, allowed) -> bool:
+    values = value if isinstance(value, list) else [value]
+    return any(item in allowed for item in values)
+
+
+def _endpoint_source(relation: dict, prefix: str):
+    if f"{prefix}_source" in relation:
+        return relation[f"{prefix}_source"]
+    endpoint = split_relation_endpoint(relation.get(prefix))
+    return endpoint and endpoint[1]
+
+
+def _legacy_state(filters: GraphFilters, previous_state: dict | None = None) -> dict:
+    # The editor's former path: Mongo queries for the filters, then a full build.
+    concepts = [
+        doc
+        for doc in CONCEPTS
+        if (not filters.sources or doc["source"] in filters.sources)
+        and (not filters.concept_types or _in(doc.get("tipo"), filters.concept_types))
+    ]
+    relations = [
+        rel
+        for rel in RELATIONS
+        if (
+            not filters.sources
+            or _endpoint_source(rel, "desde") in filters.sources
+            or _endpoint_source(rel, "hasta") in filters.sources
+        )
+        and (not filters.relation_types or rel.get("tipo") in filters.relation_types)
+    ]
+    grafo = GrafoConocimiento(concepts, relations)
+    grafo.construir_grafo(
+        tipos_relacion=list(filters.relation_types), tipos_concepto=list(filters.concept_types)
+    )
+    return grafo.to_graph_state(previous_state=previous_state)
+
+
+def _without_timestamp(state: dict) -> dict:
+    return {key: value for key, value in state.items() if key != "exportedAt"}
+
+
+def _by_id(items: list[dict]) -> dict[str, dict]:
+    return {item["id"]: item for item in items}
+
+
+def test_views_match_full_builds_for_every_filter() -> None:
+    base = KnowledgeGraphBase(CONCEPTS, RELATIONS)
+    previous = {"nodes": [{"id": "heine@Topologia", "x": 40, "y": -15, "fixed": True}]}
+
+    for filters in FILTERS:
+        expected = _without_timestamp(_legacy_state(filters, previous))
+        assert _without_timestamp(base.graph_state(filters, previous)) == expected
+
+    everything = base.graph_state(GraphFilters())
+    placeholder = _by_id(everything["nodes"])["falta@Analisis"]
+    assert placeholder["type"] == "placeholder"
+    typed = base.graph_state(GraphFilters(concept_types=("teorema",)))
+    assert "falta@Analisis" not in _by_id(typed["nodes"])
+
+
+def test_filter_switch_delta_patches_the_previous_state() -> None:
+    base = KnowledgeGraphBase(CONCEPTS, RELATIONS)
+    algebra = base.graph_state(GraphFilters(sources=("Algebra",)))
+    algebra["nodes"][0]["x"], algebra["nodes"][0]["y"] = 500, 600
+
+    topology, delta = base.graph_state_update(GraphFilters(sources=("Topologia",)), algebra)
+
+    assert set(delta.removed_node_ids) == {"lagrange@Algebra", "orden@Algebra"}
+    assert {node["id"] for node in delta.added_nodes} == {
+        "heine@Topologia",
+        "aviso@Topologia",
+        "tychonoff@Topologia",
+        "falta@Analisis",
+    }
+    # Placeholders in one view become concepts in the other, and vice versa.
+    assert {node["id"] for node in delta.updated_nodes} == {"grupo@Algebra", "compacto@Topologia"}
+    assert delta.summary()["removed_edges"] == 2
+    patched = apply_graph_state_delta(algebra, delta)
+    assert _by_id(patched["fullNodes"]) == _by_id(topology["nodes"])
+    assert _by_id(patched["edges"]) == _by_id(topology["edges"])
+    assert patched["layout"] == topology["layout"]
+    assert _by_id(topology["nodes"])["grupo@Algebra"]["x"] == 500
+
+    payload = delta.to_payload()
+    assert payload["removeEdgeIds"] == list(delta.removed_edge_ids)
+    assert graph_state_delta(topology, topology).is_empty
+
+
+def test_switching_back_reuses_memoized_node_payloads(monkeypatch) -> None:
+    base = KnowledgeGraphBase(CONCEPTS, RELATIONS)
+    rendered: list[str] = []
+    node_state = base._grafo._node_state
+
+    def counting_node_state(node_id, *args):
+        rendered.append(node_id)
+        return node_state(node_id, *args)
+
+    monkeypatch.setattr(base._grafo, "_node_state", counting_node_state)
+    first = base.graph_state(GraphFilters())
+    base.graph_state(GraphFilters(sources=("Algebra",)), first)
+    switched = len(rendered)
+    again = base.graph_state(GraphFilters(), first)
+
+    assert switched == len(first["nodes"]) + 1
+    assert len(rendered) == switched
+    assert _without_timestamp(again) == _without_timestamp(base.graph_state(GraphFilters(), first))
+    assert again["nodes"][0] is not first["nodes"][0]
+
+
+class _Collection:
+    def __init__(self, documents: list[dict]) -> None:
+        self.documents = documents
+        self.finds = 0
+
+    def find(self, query: dict):
+        self.finds += 1
+        return [dict(document) for document in self.documents]
+
+    def estimated_document_count(self) -> int:
+        return len(self.documents)
+
+
+class _Database:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.collections = {
+            "concepts": _Collection(list(CONCEPTS)),
+            "relations": _Collection(list(RELATIONS)),
+        }
+
+    def __getitem__(self, name: str) -> _Collection:
+        return self.collections[name]
+
+
+def test_base_cache_reloads_on_count_change_age_and_invalidation() -> None:
+    now = [0.0]
+    cache = KnowledgeGraphBaseCache(max_age=30, clock=lambda: now[0])
+    database, other = _Database("main"), _Database("other")
+    concepts = database["concepts"]
+
+    base = cache.get(database)
+    assert cache.get(database) is base and concepts.finds == 1
+    assert cache.get(other) is not base
+
+    concepts.documents.append({"id": "nuevo", "source": "Algebra", "tipo": "lema"})
+    reloaded = cache.get(database)
+    assert reloaded is not base and reloaded.size == (8, 6)
+
+    now[0] = 31.0
+    assert cache.get(database) is not reloaded
+    cache.invalidate(database)
+    cache.get(database)
+    assert concepts.finds == 4
+
+
+def _edge_ends(state: dict) -> set[tuple[str, str]]:
+    return {(edge["from"], edge["to"]) for edge in state["edges"]}
+
+
+def test_base_cache_drops_a_relation_replaced_in_place() -> None:
+    cache = KnowledgeGraphBaseCache()
+    database = _Database("graph-base-in-place")
+    relations = database["relations"]
+
+    state, _ = cache.get(database).graph_state_update(GraphFilters())
+    assert ("lagrange@Algebra", "grupo@Algebra") in _edge_ends(state)
+
+    # Delete one relation and add another: the counts alone cannot notice.
+    relations.documents[0] = {**RELATIONS[0], "hasta": "orden@Algebra"}
+    stale, _ = cache.get(database).graph_state_update(GraphFilters(), state)
+    assert ("lagrange@Algebra", "grupo@Algebra") in _edge_ends(stale)
+    # What the editor's relation update and delete handlers do after writing.
+    bump_collection_versions(database, "relations")
+    updated, delta = cache.get(database).graph_state_update(GraphFilters(), state)
+
+    assert relations.finds == 2
+    assert ("lagrange@Algebra", "grupo@Algebra") not in _edge_ends(updated)
+    assert ("lagrange@Algebra", "orden@Algebra") in _edge_ends(updated)
+    assert delta.removed_edge_ids or delta.updated_edges
@@ -0,0 +1,221 @@
+"""Keyset cursors: ordering parity with offset pages, null keys and cursor binding."""
+
+# ruff: noqa: D101,D102,D103,D107
+
+from __future__ import annotations
+
+import argparse
+import functools
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from typing import Any
+
+import pytest
+from bson import BSON
+
+from mathmongo.academic_cli.common import page_payload
+from mathmongo.keyset_pagination import FIRST_PAGE_CURSOR
+from mathmongo.keyset_pagination import InvalidCursorError
+from mathmongo.keyset_pagination import keyset_filter
+from mathmongo.keyset_pagination import keyset_find
+from mathmongo.source_catalog.models import Source
+from mathmongo.source_catalog.repository import SourceRepository
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _field(document: dict, path: str) -> Any:
+    value: Any = document
+    for part in path.split("."):
+        value = value.get(part) if isinstance(value, dict) else None
+    return _plain(value)
+
+
+def _matches(document: dict, query: dict) -> bool:
+    for key, condition in query.items():
+        if key == "$and":
+            if not all(_matches(document, clause) for clause in condition):
+                return False
+            continue
+        if key == "$or":
+            if not any(_matches(document, clause) for clause in condition):
+                return False
+            continue
+        value = _field(document, key)
+        if not isinstance(condition, dict):
+            if value != _plain(condition):
+                return False
+            continue
+        for operator, expected in condition.items():
+            expected = _plain(expected)
+            # Range operators never match null, as in MongoDB.
+            if operator == "$gt" and (value is None or not value > expected):
+                return False
+            if operator == "$lt" and (value is None or not value < expected):
+                return False
+            if operator == "$ne" and value == expected:
+                return False
+            if operator == "$exists" and (value is not None) != expected:
+                return False
+    return True
+
+
+def _compare(sort: list[tuple[str, int]], left: dict, right: dict) -> int:
+    for field, direction in sort:
+        first, second = _field(left, field), _field(right, field)
+        if first == second:
+            continue
+        if first is None or second is None:
+            order = -1 if first is None else 1
+        else:
+            order = -1 if first < second else 1
+        return order * (1 if direction > 0 else -1)
+    return 0
+
+
+class _Cursor:
+    def __init__(self, documents: list[dict]) -> None:
+        self.documents = documents
+
+    def sort(self, sort: list[tuple[str, int]]) -> _Cursor:
+        key = functools.cmp_to_key(functools.partial(_compare, sort))
+        return _Cursor(sorted(self.documents, key=key))
+
+    def skip(self, count: int) -> _Cursor:
+        return _Cursor(self.documents[count:])
+
+    def limit(self, count: int) -> _Cursor:
+        return _Cursor(self.documents[:count])
+
+    def __iter__(self):
+        return iter(self.documents)
+
+
+class _Collection:
+    def __init__(self, documents: list[dict]) -> None:
+        # A BSON round trip stores datetimes as naive UTC milliseconds.
+        self.documents = [BSON.encode(document).decode() for document in documents]
+        self.counts = 0
+        self.queries: list[dict] = []
+
+    def count_documents(self, query: dict) -> int:
+        self.counts += 1
+        return sum(1 for document in self.documents if _matches(document, query))
+
+    def find(self, query: dict, projection: dict | None = None) -> _Cursor:
+        self.queries.append(query)
+        return _Cursor([dict(doc) for doc in self.documents if _matches(doc, query)])
+
+
+class _Database:
+    def __init__(self, collections: dict[str, _Collection]) -> None:
+        self.collections = collections
+
+    def __getitem__(self, name: str) -> _Collection:
+        return self.collections[name]
+
+
+def _walk(collection: _Collection, query: dict, sort: list, page_size: int) -> list[list]:
+    pages, cursor = [], FIRST_PAGE_CURSOR
+    while cursor is not None:
+        window = keyset_find(collection, query, sort=sort, page_size=page_size, cursor=cursor)
+        pages.append([document["key"] for document in window.documents])
+        cursor = window.next_cursor
+    return pages
+
+
+def test_keyset_pages_match_offset_order_with_ties_and_null_keys() -> None:
+    base = datetime(2024, 5, 1, tzinfo=timezone.utc)
+    documents = [
+        {
+            "key": index,
+            "year": None if index % 4 == 0 else 2000 + index % 3,
+            "title": None if index % 5 == 0 else f"T{index % 2}",
+            "updated_at": base + timedelta(seconds=index % 3),
+        }
+        for index in range(23)
+    ]
+    collection = _Collection(documents)
+    for sort in (
+        [("year", -1), ("title", 1), ("key", 1)],
+        [("title", 1), ("year", 1), ("key", 1)],
+        [("updated_at", -1), ("key", 1)],
+    ):
+        expected = [doc["key"] for doc in _Cursor(collection.documents).sort(sort)]
+        pages = _walk(collection, {}, sort, page_size=5)
+        assert [key for page in pages for key in page] == expected
+        assert [len(page) for page in pages] == [5, 5, 5, 5, 3]
+
+
+def test_total_is_counted_once_and_carried_by_cursors() -> None:
+    collection = _Collection([{"key": index, "status": "active"} for index in range(7)])
+    query, sort = {"status": "active"}, [("key", 1)]
+
+    first = keyset_find(collection, query, sort=sort, page_size=3, cursor=FIRST_PAGE_CURSOR)
+    collection.documents.append({"key": 99, "status": "active"})
+    second = keyset_find(collection, query, sort=sort, page_size=3, cursor=first.next_cursor)
+
+    assert (first.page, first.total, second.page, second.total) == (1, 7, 2, 7)
+    assert collection.counts == 1
+    assert "$skip" not in str(collection.queries)
+
+
+def test_cursors_are_bound_to_their_filter_and_reject_garbage() -> None:
+    collection = _Collection([{"key": index, "status": "active"} for index in range(4)])
+    sort = [("key", 1)]
+    first = keyset_find(
+        collection, {"status": "active"}, sort=sort, page_size=2, cursor=FIRST_PAGE_CURSOR
+    )
+
+    with pytest.raises(InvalidCursorError, match="different listing"):
+        keyset_find(
+            collection, {"status": "archived"}, sort=sort, page_size=2, cursor=first.next_cursor
+        )
+    for garbage in ("not-a-cursor", "e30", "", "x" * 5_000):
+        with pytest.raises(InvalidCursorError, match="cursor"):
+            keyset_find(collection, {}, sort=sort, page_size=2, cursor=garbage)
+
+
+def test_filter_keeps_nulls_after_descending_values_and_skips_exhausted_keys() -> None:
+    assert keyset_filter([("year", -1), ("id", 1)], [None, "b"]) == {
+        "$and": [{"year": None}, {"id": {"$gt": "b"}}]
+    }
+    assert keyset_filter([("year", -1)], [2001]) == {
+        "$or": [{"year": {"$lt": 2001}}, {"year": None}]
+    }
+    assert keyset_filter([("year", -1)], [None]) == {"_id": {"$exists": False}}
+
+
+def test_source_repository_cursor_mode_and_cli_payload() -> None:
+    stamp = datetime(2024, 5, 1, 12, tzinfo=timezone.utc)
+    sources = [
+        Source(name=f"Fuente {index}", created_at=stamp, updated_at=stamp).model_dump(
+            mode="python"
+        )
+        for index in range(5)
+    ]
+    collection = _Collection(sources)
+    repository = SourceRepository(_Database({"sources": collection}))
+
+    offset = [repository.list(page=page, page_size=2) for page in (1, 2, 3)]
+    first = repository.list(page_size=2, cursor=FIRST_PAGE_CURSOR)
+    second = repository.list(page_size=2, cursor=first.next_cursor)
+    third = repository.list(page_size=2, cursor=second.next_cursor)
+
+    keyset = [first, second, third]
+    assert [[s.source_id for s in page.items] for page in keyset] == [
+        [s.source_id for s in page.items] for page in offset
+    ]
+    assert [page.page for page in keyset] == [1, 2, 3]
+    assert third.next_cursor is None and third.total == 5
+    assert offset[0].next_cursor is None
+
+    plain = page_payload(argparse.Namespace(cursor=None), first, [])
+    paged = page_payload(argparse.Namespace(cursor=FIRST_PAGE_CURSOR), first, [])
+    assert "next_cursor" not in plain
+    assert paged["next_cursor"] == first.next_cursor
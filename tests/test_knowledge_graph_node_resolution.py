@@ -0,0 +1,98 @@
+"""Knowledge-graph node resolution: batched lookups match the per-node queries."""
+
+# ruff: noqa: D101,D102,D103,D107
+
+from __future__ import annotations
+
+from editor.utils.knowledge_graph_sync import ConceptNodeResolver
+from editor.utils.knowledge_graph_sync import concept_resolver_for_graph
+from editor.utils.knowledge_graph_sync import find_concept_for_node
+from editor.utils.knowledge_graph_sync import incomplete_node_ids
+from editor.utils.knowledge_graph_sync import map_node_rows
+from editor.utils.knowledge_graph_sync import repair_incomplete_graph_nodes
+
+
+def _matches(document: dict, query: dict) -> bool:
+    for field, wanted in query.items():
+        stored = document.get(field)
+        values = wanted["$in"] if isinstance(wanted, dict) else [wanted]
+        stored_values = stored if isinstance(stored, list) else [stored]
+        if not any(value in values for value in stored_values):
+            return False
+    return True
+
+
+class _Concepts:
+    def __init__(self, documents: list[dict]) -> None:
+        self.documents = documents
+        self.queries: list[dict] = []
+
+    def find(self, query: dict) -> list[dict]:
+        self.queries.append(query)
+        return [document for document in self.documents if _matches(document, query)]
+
+    def find_one(self, query: dict) -> dict | None:
+        self.queries.append(query)
+        return next((document for document in self.documents if _matches(document, query)), None)
+
+
+class _Mongo:
+    def __init__(self, documents: list[dict]) -> None:
+        self.concepts = _Concepts(documents)
+
+
+DOCUMENTS = [
+    {"_id": 1, "id": "grupo", "source": "Algebra", "titulo": "Grupo", "tipo": "definicion"},
+    {"_id": 2, "id": "grupo", "source": "Topologia", "titulo": "Grupo topologico"},
+    {"_id": 3, "id": "anillo@Algebra", "titulo": "Anillo"},
+    {"_id": 4, "concept_id": "ideal", "source": "Algebra", "titulo": "Ideal"},
+    {"_id": 5, "conceptId": "cuerpo", "titulo": "Cuerpo"},
+    {"_id": 6, "id": ["modulo", "modulo_libre"], "source": ["Algebra", "Lineal"]},
+]
+NODES = [
+    {"id": "grupo@Topologia", "concept_id": "grupo", "source": "Topologia"},
+    {"id": "grupo@Geometria"},
+    {"id": "anillo@Algebra"},
+    {"id": "ideal@Algebra", "concept_id": "ideal", "source": "Algebra"},
+    {"id": "cuerpo@Analisis"},
+    {"id": "modulo_libre@Lineal"},
+    {"id": "fantasma@Algebra"},
+    {"id": ""},
+]
+
+
+def test_resolver_returns_what_the_per_node_lookups_return() -> None:
+    mongo = _Mongo(DOCUMENTS)
+    expected = [find_concept_for_node(mongo, node) for node in NODES]
+    mongo.concepts.queries.clear()
+
+    resolver = ConceptNodeResolver(mongo, NODES, chunk_size=2)
+
+    assert [resolver.find(node) for node in NODES] == expected
+    assert [concept and concept["_id"] for concept in expected] == [2, 1, 3, 4, 5, 6, None, None]
+    assert len(mongo.concepts.queries) == resolver.query_count
+    assert all(
+        "$in" in condition for query in mongo.concepts.queries for condition in query.values()
+    )
+
+
+def test_graph_helpers_share_one_batched_resolution() -> None:
+    mongo = _Mongo(DOCUMENTS)
+    graph_state = {"nodes": [dict(node) for node in NODES[:4] + NODES[6:7]]}
+
+    resolver = concept_resolver_for_graph(mongo, graph_state)
+    queries = len(mongo.concepts.queries)
+    rows = map_node_rows(mongo, graph_state, resolver)
+    incomplete = incomplete_node_ids(mongo, graph_state, resolver)
+    _state, repaired, unresolved = repair_incomplete_graph_nodes(mongo, graph_state, resolver)
+
+    assert queries == 3
+    assert len(mongo.concepts.queries) == queries
+    assert len(rows) == len(graph_state["nodes"])
+    assert "fantasma@Algebra" in incomplete
+    assert repaired > 0
+    assert unresolved == 1
+
+    mongo.concepts.queries.clear()
+    map_node_rows(mongo, graph_state)
+    assert len(mongo.concepts.queries) == 3
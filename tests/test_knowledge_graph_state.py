@@ -0,0 +1,77 @@
+"""Indexed GraphState: round trips, incremental indexes and copy-on-write edits."""
+
+# ruff: noqa: D101,D102,D103,D107
+
+from __future__ import annotations
+
+import copy
+import json
+
+from editor.utils import knowledge_graph_sync as sync
+from editor.utils.knowledge_graph_sync import GraphState
+
+
+def _state() -> dict:
+    return {
+        "title": "Algebra",
+        "nodes": [
+            {"id": "grupo@Algebra", "concept_id": "grupo", "source": "Algebra", "x": 0, "y": 0},
+            {"id": "anillo@Algebra", "x": 100, "y": 50},
+            "roto",
+        ],
+        "edges": [
+            {"from": "grupo@Algebra", "to": "anillo@Algebra", "title": "generaliza"},
+            {"id": "e2", "from": "anillo@Algebra", "to": "ideal@Algebra", "title": "usa"},
+        ],
+        "selection": ["grupo@Algebra", "anillo@Algebra"],
+        "uiControls": {"selectedNodeId": "anillo@Algebra", "visibleEdgeIds": ["e2"]},
+    }
+
+
+def test_round_trip_and_read_helpers_match_the_raw_dict() -> None:
+    raw = _state()
+    index = GraphState(raw)
+
+    assert json.dumps(index.to_dict()) == json.dumps(
+        {**raw, "fullNodes": raw["nodes"], "fullEdges": raw["edges"]}
+    )
+    for helper in (
+        sync.graph_node_items,
+        sync.graph_edge_items,
+        sync.graph_concept_keys,
+        sync.edge_counts_by_node,
+        sync.isolated_node_ids,
+    ):
+        assert helper(index) == helper(raw)
+    for concept in ({"id": "grupo"}, {"id": "anillo", "source": "Topologia"}, {"id": "ideal"}):
+        assert index.contains_concept(concept) == sync.graph_contains_concept(raw, concept)
+
+
+def test_edits_update_indexes_without_touching_the_input(monkeypatch) -> None:
+    monkeypatch.setattr(sync, "utc_timestamp", lambda: "2026-01-01T00:00:00Z")
+    raw = _state()
+    before = copy.deepcopy(raw)
+
+    removed, removed_count, removed_edges = sync.remove_nodes_from_graph_state(
+        raw, ["anillo@Algebra"]
+    )
+    index = GraphState(raw)
+    index.add_node({"id": "ideal@Algebra", "concept_id": "ideal", "source": "Algebra"})
+    index.add_edge({"id": "e2", "from": "anillo@Algebra", "to": "ideal@Algebra"})
+    index.add_edge({"from": "ideal@Algebra", "to": "grupo@Algebra", "title": "usa"})
+
+    assert raw == before
+    assert (removed_count, removed_edges) == (1, 2)
+    assert [node["id"] for node in removed["nodes"]] == ["grupo@Algebra"]
+    assert removed["selection"] == ["grupo@Algebra"]
+    assert removed["uiControls"] == {"selectedNodeId": "", "visibleEdgeIds": []}
+    assert removed["nodes"][0] is raw["nodes"][0]
+    assert index.edge_counts() == {
+        "grupo@Algebra": {"incoming": 1, "outgoing": 1},
+        "anillo@Algebra": {"incoming": 1, "outgoing": 1},
+        "ideal@Algebra": {"incoming": 1, "outgoing": 1},
+    }
+    assert index.contains_concept({"id": "ideal", "source": "Algebra"})
+    assert len(index.get("fullEdges")) == 3
+    fresh = GraphState(index.to_dict())
+    assert (fresh.nodes(), fresh.edge_counts()) == (index.nodes(), index.edge_counts())
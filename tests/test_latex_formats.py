@@ -0,0 +1,190 @@
+"""Precompiled preamble formats: preamble splitting, reuse, rebuilds and fallbacks."""
+
+# ruff: noqa: D101,D102,D103,D107
+
+from __future__ import annotations
+
+import json
+import os
+import stat
+import sys
+from pathlib import Path
+
+import pytest
+
+from exporters_latex import latex_formats
+from exporters_latex.latex_compile import run_latex_command
+from exporters_latex.latex_compile import run_latex_until_stable
+from exporters_latex.latex_formats import LatexFormatCache
+from exporters_latex.latex_formats import split_preloadable_preamble
+
+# A stand-in for pdflatex: "-ini" dumps the preamble into <jobname>.fmt and a
+# normal run checks that a preloaded document no longer loads its class.
+FAKE_ENGINE = r'''
+import json, os, pathlib, sys
+
+args = sys.argv[1:]
+with open(os.environ["FAKE_TEX_LOG"], "a", encoding="utf-8") as log:
+    log.write(json.dumps(args) + "\n")
+if args == ["--version"]:
+    print("pdfTeX 3.141592653 (fake)")
+    sys.exit(0)
+options = {a.lstrip("-").split("=", 1)[0]: a.split("=", 1)[-1] for a in args if a.startswith("-")}
+source = pathlib.Path(args[-1])
+text = source.read_text(encoding="utf-8")
+if "ini" in options:
+    if "broken" in text:
+        print("! LaTeX Error: File `broken.sty' not found.")
+        sys.exit(1)
+    pathlib.Path(options["jobname"] + ".fmt").write_text(text, encoding="utf-8")
+    sys.exit(0)
+jobname = options.get("jobname", source.stem)
+if "fmt" in options:
+    folders = os.environ["TEXFORMATS"].split(os.pathsep)
+    found = [pathlib.Path(d) / (options["fmt"] + ".fmt") for d in folders if d]
+    found = [path for path in found if path.is_file()]
+    if not found:
+        print("I can't find the format file `%s.fmt'!" % options["fmt"])
+        sys.exit(1)
+    if "STALE" in found[0].read_text(encoding="utf-8"):
+        print("---! %s was written by another engine" % found[0])
+        sys.exit(1)
+    if "\\documentclass" in text:
+        print("! LaTeX Error: Two \\documentclass or \\documentstyle commands.")
+        sys.exit(1)
+out = pathlib.Path(options.get("output-directory", "."))
+lines = len(text.split("\n"))
+(out / (jobname + ".pdf")).write_bytes(b"%PDF-1.5")
+(out / (jobname + ".log")).write_text(
+    "lines=%d\nOutput written on %s.pdf (1 page).\n" % (lines, jobname), encoding="utf-8"
+)
+'''
+
+DOCUMENT = "\n".join(
+    [
+        r"\documentclass[12pt]{article}",
+        r"\usepackage{miestilo}",
+        "% comentario",
+        r"\usepackage{graphicx}",
+        r"\providecommand{\Inv}{\mathrm{Inv}}",
+        r"\begin{document}",
+        r"$\Inv$",
+        r"\end{document}",
+        "",
+    ]
+)
+
+
+class _Engine:
+    def __init__(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        bin_dir = tmp_path / "bin"
+        bin_dir.mkdir()
+        engine = bin_dir / "pdflatex"
+        engine.write_text(f"#!{sys.executable}\n{FAKE_ENGINE}", encoding="utf-8")
+        engine.chmod(engine.stat().st_mode | stat.S_IEXEC)
+        self.log = tmp_path / "engine.log"
+        self.log.touch()
+        monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+        monkeypatch.setenv("FAKE_TEX_LOG", str(self.log))
+        self.cache = LatexFormatCache(tmp_path / "formats")
+        monkeypatch.setattr(latex_formats, "LATEX_FORMAT_CACHE_ENABLED", True)
+        monkeypatch.setattr(latex_formats, "_DEFAULT_CACHE", self.cache)
+        latex_formats.engine_fingerprint.cache_clear()
+        self.work = tmp_path / "work"
+        self.work.mkdir()
+        (self.work / "miestilo.sty").write_text(r"\ProvidesPackage{miestilo}", encoding="utf-8")
+
+    def calls(self) -> list[list[str]]:
+        lines = self.log.read_text(encoding="utf-8").splitlines()
+        return [args for args in map(json.loads, lines) if args != ["--version"]]
+
+    def compile(self, latex: str = DOCUMENT, name: str = "fragment.tex", *options: str) -> dict:
+        tex = self.work / name
+        tex.write_text(latex, encoding="utf-8")
+        return run_latex_until_stable(
+            ["pdflatex", "-interaction=nonstopmode", *options, str(tex)],
+            cwd=self.work,
+            tex_file=tex,
+            pdf_path=tex.with_suffix(".pdf"),
+            max_passes=1,
+        )
+
+
+@pytest.fixture
+def engine(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> _Engine:
+    return _Engine(tmp_path, monkeypatch)
+
+
+def test_preloadable_prefix_stops_at_the_first_other_command() -> None:
+    preamble = split_preloadable_preamble(DOCUMENT)
+    assert preamble is not None
+    assert preamble.lines == tuple(DOCUMENT.splitlines()[:4])
+    assert preamble.dependencies == ("article.cls", "miestilo.sty", "graphicx.sty")
+
+    with_hyperref = "\\documentclass{article}\n\\usepackage{amsmath,hyperref}\n\\usepackage{x}\n"
+    assert split_preloadable_preamble(with_hyperref).lines == ("\\documentclass{article}",)
+    assert split_preloadable_preamble("\\usepackage{x}\n\\documentclass{article}\n") is None
+    assert split_preloadable_preamble("Hola") is None
+
+
+def test_compiles_dump_the_preamble_once_and_reuse_the_format(engine: _Engine) -> None:
+    first = engine.compile()
+    second = engine.compile(DOCUMENT.replace("$\\Inv$", "$x$"), "other.tex")
+
+    dumps = [args for args in engine.calls() if "-ini" in args]
+    runs = [args for args in engine.calls() if "-ini" not in args]
+    assert len(dumps) == 1 and "&pdflatex" in dumps[0]
+    assert all(args[0].startswith("-fmt=") for args in runs)
+    assert runs[0][2] == "-jobname=fragment" and runs[1][2] == "-jobname=other"
+    assert (first["status"], second["status"]) == ("success", "success")
+    assert f"lines={len(DOCUMENT.split(chr(10)))}" in first["log_text"]
+    assert not list(engine.work.glob("*.preloaded.tex"))
+    assert len(list(engine.cache.root.glob("*.fmt"))) == 1
+
+
+def test_editing_a_local_style_file_builds_a_new_format(engine: _Engine) -> None:
+    engine.compile()
+    (engine.work / "miestilo.sty").write_text(r"\ProvidesPackage{miestilo}%v2", encoding="utf-8")
+    engine.compile()
+
+    assert len([args for args in engine.calls() if "-ini" in args]) == 2
+
+
+def test_undumpable_preambles_fall_back_and_are_not_retried(engine: _Engine) -> None:
+    broken = DOCUMENT.replace("{graphicx}", "{broken}")
+    engine.compile(broken)
+    result = engine.compile(broken)
+
+    calls = engine.calls()
+    assert [("-ini" in args, any(a.startswith("-fmt") for a in args)) for args in calls] == [
+        (True, False),
+        (False, False),
+        (False, False),
+    ]
+    assert result["status"] == "success"
+    assert len(list(engine.cache.root.glob("*.failed"))) == 1
+
+
+def test_rejected_formats_are_dropped_and_the_compile_reruns_plain(engine: _Engine) -> None:
+    engine.compile()
+    (fmt,) = engine.cache.root.glob("*.fmt")
+    fmt.write_text("STALE", encoding="utf-8")
+
+    result = engine.compile()
+
+    assert result["status"] == "success"
+    assert not fmt.exists() and fmt.with_suffix(".failed").exists()
+    assert not any(a.startswith("-fmt") for a in engine.calls()[-1])
+
+
+def test_explicit_job_options_and_opt_out_use_the_plain_command(engine: _Engine) -> None:
+    engine.compile(DOCUMENT, "job.tex", "-jobname=job")
+    tex = engine.work / "plain.tex"
+    tex.write_text(DOCUMENT, encoding="utf-8")
+
+    run_latex_command(
+        ["pdflatex", tex.name], cwd=engine.work, tex_file=tex.name, use_format_cache=False
+    )
+
+    assert not any("-ini" in args for args in engine.calls())
+    assert engine.cache.invalidate() == 0
@@ -0,0 +1,118 @@
+"""Batched pdflatex validation: error attribution, isolated reruns and bisection."""
+
+# ruff: noqa: D101,D102,D103,D107
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+
+import pytest
+
+from exporters_latex import latex_validation
+from exporters_latex.latex_validation import BATCH_DOCUMENT_NAME
+from exporters_latex.latex_validation import validate_latex_jobs
+from exporters_latex.latex_validation_cache import LatexValidationCache
+
+TYPEOUT_RE = re.compile(r"\\typeout\{(.+)\}")
+
+
+class _Engine:
+    r"""Stands in for pdflatex: ``\oops`` is an error, ``\stop`` a fatal one."""
+
+    def __init__(self) -> None:
+        self.runs: list[tuple[str, int]] = []
+
+    def __call__(self, command, *, cwd, tex_file, pdf_path, **kwargs):
+        lines = (Path(cwd) / tex_file).read_text(encoding="utf-8").split("\n")
+        batch = tex_file == BATCH_DOCUMENT_NAME
+        self.runs.append((tex_file, sum("-BEGIN" in line for line in lines) if batch else 1))
+        log, failed, stopped = [], False, False
+        for number, line in enumerate(lines, start=1):
+            marker = TYPEOUT_RE.fullmatch(line)
+            if marker:
+                log.append(marker.group(1))
+            elif r"\oops" in line or r"\stop" in line:
+                failed, stopped = True, r"\stop" in line
+                message = "Emergency stop." if stopped else "Undefined control sequence."
+                log.append(f"./{tex_file}:{number}: {message}" if batch else f"! {message}")
+                if stopped:
+                    break
+        # Without -halt-on-error a batch still writes the pages it got through.
+        if not stopped and not (failed and not batch):
+            Path(pdf_path).write_bytes(b"%PDF")
+        log_text = "\n".join(log)
+        status = "failed" if failed else "success"
+        return {
+            "status": status,
+            "log_text": log_text,
+            "log_excerpt": f"isolated: {log_text}",
+            "pdf_valid": Path(pdf_path).exists(),
+        }
+
+    def batches(self) -> list[int]:
+        return [size for name, size in self.runs if name == BATCH_DOCUMENT_NAME]
+
+    def isolated(self) -> int:
+        return sum(name != BATCH_DOCUMENT_NAME for name, _size in self.runs)
+
+
+@pytest.fixture
+def engine(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> _Engine:
+    fake = _Engine()
+    monkeypatch.setattr(latex_validation, "get_latex_runtime_dir", lambda: tmp_path / "runtime")
+    monkeypatch.setattr(latex_validation, "copy_latex_styles", lambda *args: [])
+    monkeypatch.setattr(latex_validation, "copy_media_tree_for_latex", lambda *args: None)
+    monkeypatch.setattr(latex_validation, "run_latex_until_stable", fake)
+    return fake
+
+
+def _jobs(*bodies: str) -> list[tuple[dict, str]]:
+    return [({"id": f"c{index}", "source": "Algebra"}, body) for index, body in enumerate(bodies)]
+
+
+def _validate(jobs, **options):
+    options = {"run_linters": False, "max_workers": 1, "batch_size": 10, **options}
+    return validate_latex_jobs(jobs, **options)
+
+
+def test_clean_fragments_share_one_run_and_are_cached(tmp_path, engine) -> None:
+    cache = LatexValidationCache(tmp_path / "cache.sqlite3")
+    seen = []
+    jobs = _jobs("$a$", "$b$", "$c$", "$d$", "$e$")
+
+    results = _validate(jobs, cache=cache, progress=lambda done, total, r: seen.append(done))
+    again = _validate(jobs, cache=cache)
+
+    assert engine.batches() == [5] and engine.isolated() == 0
+    assert [(r.concept_id, r.status, r.compile_success) for r in results] == [
+        (f"c{index}", "ok", True) for index in range(5)
+    ]
+    assert seen == [1, 2, 3, 4, 5]
+    assert [r.status for r in again] == ["ok"] * 5 and len(engine.runs) == 1
+
+
+def test_blamed_fragments_are_recompiled_alone(engine) -> None:
+    results = _validate(_jobs("$a$", r"$\oops$", "$c$"))
+
+    assert engine.batches() == [3] and engine.isolated() == 1
+    assert [r.status for r in results] == ["ok", "error", "ok"]
+    assert results[1].log_excerpt.startswith("isolated: ")
+    assert "Undefined control sequence" in results[1].log_excerpt
+
+
+def test_fatal_stops_are_decided_by_rebatching_the_rest(engine) -> None:
+    results = _validate(_jobs("$a$", "$b$", r"\stop", "$d$"))
+
+    # The stop leaves no PDF: the blamed fragment runs alone, the rest again together.
+    assert engine.batches() == [4, 3] and engine.isolated() == 1
+    assert [r.status for r in results] == ["ok", "ok", "error", "ok"]
+
+
+def test_chunks_and_unbalanced_fragments(engine) -> None:
+    results = _validate(_jobs("$a$", "{", "$c$", "$d$", "$e$"), batch_size=2)
+
+    assert sorted(engine.batches()) == [2, 2] and engine.isolated() == 1
+    assert [r.status for r in results] == ["ok", "error", "ok", "ok", "ok"]
+    assert validate_latex_jobs(_jobs("$a$", "$b$"), run_linters=False, batch_size=1)
+    assert engine.isolated() == 3
@@ -0,0 +1,150 @@
+"""Content-addressed LaTeX validation cache: reuse, key invalidation and LRU bounds."""
+
+# ruff: noqa: D101,D102,D103,D107
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from exporters_latex import latex_validation
+from exporters_latex.latex_validation import validate_latex_fragment
+from exporters_latex.latex_validation import validate_source_from_mongo
+from exporters_latex.latex_validation_cache import LatexValidationCache
+
+
+class _Compiler:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.timeout = False
+
+    def __call__(self, command, *, cwd, pdf_path, **kwargs):
+        self.calls += 1
+        if self.timeout:
+            return {"status": "failed", "log_excerpt": "pdflatex timed out after 1 seconds."}
+        Path(pdf_path).write_bytes(b"%PDF")
+        return {"status": "success", "log_excerpt": f"compiled in {cwd}"}
+
+
+@pytest.fixture
+def compiler(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> _Compiler:
+    fake = _Compiler()
+    monkeypatch.setattr(latex_validation, "get_latex_runtime_dir", lambda: tmp_path / "runtime")
+    monkeypatch.setattr(latex_validation, "copy_latex_styles", lambda *args: [])
+    monkeypatch.setattr(latex_validation, "copy_media_tree_for_latex", lambda *args: None)
+    monkeypatch.setattr(latex_validation, "run_latex_until_stable", fake)
+    return fake
+
+
+def _cache(tmp_path: Path, tools: str = "pdfTeX 3.141592653", **kwargs) -> LatexValidationCache:
+    environments = {"templates": {"miestilo.sty": "abc"}, "tools": {"pdflatex": tools}}
+    return LatexValidationCache(
+        tmp_path / "cache" / "results.sqlite3",
+        environment=lambda kind: environments.get(kind, {"kind": kind}),
+        **kwargs,
+    )
+
+
+def _validate(latex: str, cache: LatexValidationCache, **concept):
+    return validate_latex_fragment(latex, concept=concept, run_linters=False, cache=cache)
+
+
+def test_unchanged_fragments_are_answered_from_the_cache(tmp_path, compiler) -> None:
+    cache = _cache(tmp_path)
+
+    first = _validate(r"$\alpha$", cache, id="a", source="Algebra", titulo="Alfa")
+    again = _validate(r"$\alpha$", cache, id="b", source="Topologia", titulo="Beta", tipo="lema")
+    reopened = _validate(r"$\alpha$", _cache(tmp_path), id="a", source="Algebra")
+
+    assert compiler.calls == 1
+    assert (first.status, first.compile_success) == ("ok", True)
+    assert again.log_excerpt == first.log_excerpt
+    assert (again.concept_id, again.source, again.title, again.type) == (
+        "b",
+        "Topologia",
+        "Beta",
+        "lema",
+    )
+    assert reopened.concept_id == "a"
+    assert cache.stats() == {"hits": 1, "misses": 1, "evictions": 0}
+
+
+def test_fragment_options_and_environment_changes_miss(tmp_path, compiler) -> None:
+    cache = _cache(tmp_path)
+    _validate(r"$\alpha$", cache)
+
+    _validate(r"$\beta$", cache)
+    validate_latex_fragment(r"$\alpha$", run_linters=False, apply_fixes=True, cache=cache)
+    _validate(r"$\alpha$", _cache(tmp_path, tools="pdfTeX 3.141592653-2.6"))
+    assert compiler.calls == 4
+
+    # A work directory and checks that run no tool bypass the cache.
+    validate_latex_fragment(r"$\alpha$", run_linters=False, work_dir=tmp_path / "w", cache=cache)
+    validate_latex_fragment(r"$\alpha$", run_linters=False, run_compile=False, cache=cache)
+    assert compiler.calls == 5 and len(cache) == 4
+
+
+def test_timeouts_are_not_cached(tmp_path, compiler) -> None:
+    cache = _cache(tmp_path)
+    compiler.timeout = True
+    assert _validate(r"$\gamma$", cache).status == "error"
+
+    compiler.timeout = False
+    assert _validate(r"$\gamma$", cache).status == "ok"
+    assert compiler.calls == 2
+
+
+def test_least_recently_used_entries_are_evicted_and_invalidate_clears(tmp_path) -> None:
+    now = [0.0]
+    cache = _cache(tmp_path, max_entries=2, clock=lambda: now[0])
+    for key in ("a", "b"):
+        now[0] += 1
+        cache.put(key, {"status": key})
+
+    now[0] += 1
+    assert cache.get("a") == {"status": "a"}
+    now[0] += 1
+    cache.put("c", {"status": "c"})
+
+    assert (cache.get("b"), len(cache), cache.stats()["evictions"]) == (None, 2, 1)
+    assert cache.invalidate(["a", "missing"]) == 1
+    assert cache.invalidate() == 1 and len(cache) == 0
+    assert _cache(tmp_path / "never-created").invalidate() == 0
+
+
+class _Collection:
+    def __init__(self, documents: list[dict]) -> None:
+        self.documents = documents
+
+    def find(self, query: dict):
+        return [doc for doc in self.documents if all(doc.get(k) == v for k, v in query.items())]
+
+    def find_one(self, query: dict):
+        return next(iter(self.find(query)), None)
+
+
+class _Database:
+    def __init__(self, bodies: list[str]) -> None:
+        self.concepts = _Collection(
+            [{"id": f"c{index}", "source": "Algebra"} for index in range(len(bodies))]
+        )
+        self.latex_documents = _Collection(
+            [
+                {"id": f"c{index}", "source": "Algebra", "contenido_latex": body}
+                for index, body in enumerate(bodies)
+            ]
+        )
+
+
+def test_revalidating_a_source_only_compiles_edited_concepts(tmp_path, compiler) -> None:
+    db = _Database(["$a$", "$b$", "$c$", "$d$"])
+    options = {"run_linters": False, "max_workers": 2, "cache": _cache(tmp_path)}
+    first = validate_source_from_mongo("Algebra", db, **options)
+
+    db.latex_documents.documents[2]["contenido_latex"] = "$c'$"
+    second = validate_source_from_mongo("Algebra", db, **options)
+
+    assert compiler.calls == 5
+    assert (first["ok"], second["ok"]) == (4, 4)
+    assert [item["concept_id"] for item in second["results"]] == ["c0", "c1", "c2", "c3"]
@@ -0,0 +1,142 @@
+"""Parallel LaTeX validation: ordering, concurrency, progress and per-job isolation."""
+
+# ruff: noqa: D101,D102,D103,D107
+
+from __future__ import annotations
+
+import threading
+import time
+
+from exporters_latex import latex_validation
+from exporters_latex.latex_validation import validate_latex_jobs
+from exporters_latex.latex_validation import validate_selected_concepts_from_mongo
+from exporters_latex.latex_validation import validate_source_from_mongo
+
+_validate_without_tools = latex_validation.validate_latex_fragment
+
+
+class _FakeValidator:
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.threads: set[str] = set()
+        self.lock = threading.Lock()
+
+    def __call__(self, latex, concept=None, **options):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.threads.add(threading.current_thread().name)
+        try:
+            # Later concepts finish first, so completion order differs from input order.
+            time.sleep(self.delay * (10 - int(concept["id"][1:]) % 10))
+            if "boom" in latex:
+                raise RuntimeError("pdflatex crashed")
+            return _validate_without_tools(
+                latex, concept=concept, run_compile=False, run_linters=False
+            )
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+def _install(monkeypatch, validator: _FakeValidator) -> None:
+    monkeypatch.setattr(latex_validation, "validate_latex_fragment", validator)
+
+
+def _jobs(count: int) -> list[tuple[dict, str]]:
+    return [
+        ({"id": f"c{index}", "source": "Algebra", "titulo": f"Concepto {index}"}, f"$x_{index}$")
+        for index in range(count)
+    ]
+
+
+def test_pool_keeps_input_order_and_reports_progress_on_the_caller(monkeypatch) -> None:
+    validator = _FakeValidator(delay=0.005)
+    _install(monkeypatch, validator)
+    seen: list[tuple[int, int, str, str]] = []
+    caller = threading.current_thread().name
+
+    def progress(done, total, result):
+        seen.append((done, total, result.concept_id, threading.current_thread().name))
+
+    results = validate_latex_jobs(_jobs(8), max_workers=4, progress=progress)
+
+    assert [result.concept_id for result in results] == [f"c{index}" for index in range(8)]
+    assert all(result.status == "ok" for result in results)
+    assert [entry[:2] for entry in seen] == [(done, 8) for done in range(1, 9)]
+    assert {entry[3] for entry in seen} == {caller}
+    assert [entry[2] for entry in seen] != [result.concept_id for result in results]
+    assert 1 < validator.peak <= 4
+    assert all(name.startswith("latex-validation") for name in validator.threads)
+
+
+def test_single_worker_runs_inline_and_failures_stay_isolated(monkeypatch) -> None:
+    validator = _FakeValidator()
+    _install(monkeypatch, validator)
+    jobs = _jobs(3)
+    jobs[1] = (jobs[1][0], r"\boom")
+
+    results = validate_latex_jobs(jobs, max_workers=1)
+
+    assert validator.threads == {threading.current_thread().name}
+    assert [result.status for result in results] == ["ok", "error", "ok"]
+    assert results[1].concept_id == "c1" and results[1].title == "Concepto 1"
+    assert "RuntimeError: pdflatex crashed" in results[1].log_excerpt
+    assert validate_latex_jobs([], max_workers=4) == []
+
+
+class _Collection:
+    def __init__(self, documents: list[dict]) -> None:
+        self.documents = documents
+        self.find_ones = 0
+
+    def find(self, query: dict):
+        return [doc for doc in self.documents if all(doc.get(k) == v for k, v in query.items())]
+
+    def find_one(self, query: dict):
+        self.find_ones += 1
+        return next(iter(self.find(query)), None)
+
+
+class _Database:
+    def __init__(self) -> None:
+        self.concepts = _Collection(
+            [
+                {"id": f"c{index}", "source": "Algebra", "titulo": f"Concepto {index}"}
+                for index in range(5)
+            ]
+        )
+        self.latex_documents = _Collection(
+            [
+                {"id": f"c{index}", "source": "Algebra", "contenido_latex": latex}
+                for index, latex in enumerate(["$a$", r"\texbf{b}", "", "$d$", "$e$"])
+            ]
+        )
+
+
+def test_source_and_selection_validation_aggregate_into_the_summary_shape(monkeypatch) -> None:
+    validator = _FakeValidator()
+    _install(monkeypatch, validator)
+    db = _Database()
+    progress: list[int] = []
+
+    report = validate_source_from_mongo(
+        "Algebra", db, max_workers=3, progress=lambda done, total, result: progress.append(done)
+    )
+
+    assert (report["total"], report["ok"], report["warnings"], report["errors"]) == (5, 3, 1, 1)
+    assert [item["concept_id"] for item in report["results"]] == [f"c{i}" for i in range(5)]
+    assert sorted(progress) == [1, 2, 3, 4, 5]
+    # Concept documents listed for the source are not fetched again one by one.
+    assert db.concepts.find_ones == 0
+
+    selected = validate_selected_concepts_from_mongo(
+        ["c3@Algebra", ("c1", "Algebra"), "falta@Algebra"], db, max_workers=2
+    )
+    assert [(r.concept_id, r.status) for r in selected] == [
+        ("c3", "ok"),
+        ("c1", "warning"),
+        ("falta", "error"),
+    ]
@@ -264,3 +264,27 @@ def test_legacy_is_normalized_once_and_canonical_is_unchanged(legacy: bool) -> N
     assert len(changes) == int(legacy)
     assert repeated == normalized
     assert repeated_changes == ()
+
+
+@pytest.mark.parametrize("failure_at", (None, 2))
+def test_restored_and_rolled_back_concepts_refresh_the_search_index(
+    monkeypatch: pytest.MonkeyPatch,
+    failure_at: int | None,
+) -> None:
+    database, recovered = _fixture(monkeypatch)
+    database.fail_on_insert = failure_at
+    refreshed: list[tuple[str, str]] = []
+    monkeypatch.setattr(
+        migration,
+        "refresh_concept_search_entries",
+        lambda _database, identities: refreshed.extend(identities),
+    )
+
+    if failure_at is None:
+        migration.apply_legacy_curve_migration(database, recovered)
+    else:
+        with pytest.raises(migration.LegacyCurveMigrationError):
+            migration.apply_legacy_curve_migration(database, recovered)
+
+    expected = [(item["id"], item["source"]) for item in recovered]
+    assert refreshed == (expected if failure_at is None else expected[:failure_at])
@@ -0,0 +1,118 @@
+"""Versioned editor query cache: hits, write-through invalidation and expiry."""
+
+# ruff: noqa: D101,D102,D103,D107
+
+from __future__ import annotations
+
+from editor.db.concept_repository import insert_concept_metadata
+from mathmongo.query_cache import CollectionVersions
+from mathmongo.query_cache import VersionedQueryCache
+from mathmongo.query_cache import bump_collection_versions
+from mathmongo.query_cache import cached_distinct
+from mathmongo.query_cache import query_params
+from mathmongo.source_catalog.models import Source
+from mathmongo.source_catalog.repository import SourceRepository
+
+
+class _Collection:
+    def __init__(self, documents: list[dict]) -> None:
+        self.documents = documents
+        self.distinct_calls = 0
+
+    def distinct(self, field: str) -> list:
+        self.distinct_calls += 1
+        return list(dict.fromkeys(doc[field] for doc in self.documents if field in doc))
+
+    def insert_one(self, document: dict) -> None:
+        self.documents.append(document)
+
+
+class _Database:
+    def __init__(self, name: str, **collections: _Collection) -> None:
+        self.name = name
+        self.collections = collections
+
+    def __getitem__(self, name: str) -> _Collection:
+        return self.collections[name]
+
+    def __getattr__(self, name: str) -> _Collection:
+        try:
+            return self.collections[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+
+def _cache(clock=lambda: 0.0) -> VersionedQueryCache:
+    return VersionedQueryCache(versions=CollectionVersions(), max_age=30, clock=clock)
+
+
+def test_reruns_hit_until_a_collection_version_changes() -> None:
+    cache = _cache()
+    database = _Database("kb")
+    loads = []
+
+    def load() -> list[dict]:
+        loads.append(1)
+        return [{"id": "grupo", "tags": []}]
+
+    first = cache.get(database, "concepts.all", load, collections=("concepts",))
+    first[0]["tags"].append("mutated by the caller")
+    second = cache.get(database, "concepts.all", load, collections=("concepts",))
+    cache.versions.bump(database, ("relations",))
+    third = cache.get(database, "concepts.all", load, collections=("concepts",))
+    cache.versions.bump("kb", ("concepts",))
+    cache.get(database, "concepts.all", load, collections=("concepts",))
+    cache.versions.bump(database)
+    cache.get(database, "concepts.all", load, collections=("concepts",))
+
+    assert second == third == [{"id": "grupo", "tags": []}]
+    assert len(loads) == 3
+    stats = cache.stats()["concepts.all"]
+    assert (stats.hits, stats.misses) == (2, 3)
+
+
+def test_scope_params_and_age_partition_entries() -> None:
+    now = [0.0]
+    cache = _cache(clock=lambda: now[0])
+    database = _Database("kb")
+    calls = []
+
+    def get(scope: str, query: dict) -> list:
+        return cache.get(
+            database,
+            "concepts.newest_first",
+            lambda: calls.append((scope, query)) or [query],
+            collections=("concepts",),
+            scope=scope,
+            params=query_params(query),
+        )
+
+    get("a", {"source": "Algebra", "tipo": "teorema"})
+    get("a", {"tipo": "teorema", "source": "Algebra"})
+    get("b", {"source": "Algebra", "tipo": "teorema"})
+    get("a", {"source": "Topologia"})
+    now[0] = 31.0
+    get("a", {"source": "Topologia"})
+
+    assert [scope for scope, _query in calls] == ["a", "b", "a", "a"]
+
+
+def test_writers_invalidate_cached_distinct_values() -> None:
+    concepts = _Collection([{"id": "grupo", "source": "Algebra"}])
+    sources = _Collection([])
+    database = _Database("writers-kb", concepts=concepts, sources=sources)
+
+    assert cached_distinct(database, "concepts", "source") == ["Algebra"]
+    assert cached_distinct(database, "concepts", "source") == ["Algebra"]
+    insert_concept_metadata(database, "anillo", "Topologia", {"titulo": "Anillo"})
+
+    assert cached_distinct(database, "concepts", "source") == ["Algebra", "Topologia"]
+    assert concepts.distinct_calls == 2
+
+    cached_distinct(database, "sources", "name")
+    SourceRepository(database).insert(Source(name="Libro"))
+    cached_distinct(database, "sources", "name")
+    bump_collection_versions("writers-kb")
+    cached_distinct(database, "sources", "name")
+
+    assert sources.distinct_calls == 3
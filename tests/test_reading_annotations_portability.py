@@ -62,10 +62,14 @@ class _Collection:
 
     @classmethod
     def _matches(cls, document: dict, query: dict) -> bool:
-        return all(
-            expected in cls._values_at_path(document, tuple(key.split(".")))
-            for key, expected in query.items()
-        )
+        for key, expected in query.items():
+            values = cls._values_at_path(document, tuple(key.split(".")))
+            if isinstance(expected, dict) and "$in" in expected:
+                if not any(value in expected["$in"] for value in values):
+                    return False
+            elif expected not in values:
+                return False
+        return True
 
     def find(self, query: dict) -> _Cursor:
         return _Cursor(document for document in self.documents if self._matches(document, query))
@@ -80,6 +84,10 @@ class _Collection:
         self.insert_calls += 1
         self.documents.append(document)
 
+    def insert_many(self, documents: list[dict], *, ordered: bool) -> None:
+        for document in documents:
+            self.insert_one(document)
+
     def create_index(self, _keys, *, name: str, **_kwargs) -> str:
         self.index_names.add(name)
         return name
@@ -7,6 +7,7 @@ from __future__ import annotations
 import copy
 import hashlib
 import socket
+from contextlib import nullcontext
 from dataclasses import dataclass
 from datetime import datetime
 from datetime import timedelta
@@ -560,9 +561,8 @@ class _DocumentService:
         assert document_id == self.document.document_id
         self.read_calls += 1
         version = self.document.pdf.current_version
-        return DocumentPdfPayload(
-            self.document, PDF_BYTES, version.original_filename, version.sha256
-        )
+        blobs = SimpleNamespace(open_version=lambda _version: nullcontext(PDF_BYTES))
+        return DocumentPdfPayload(self.document, version, blobs)  # type: ignore[arg-type]
 
 
 class _ReadableStub:
@@ -586,6 +586,7 @@ class _ReadableStub:
         user_scope: str,
         page: int,
         page_size: int,
+        cursor: str | None = None,
     ) -> ReadableDocumentPage:
         assert self.database is not None and self.document is not None
         state = ReadingStateRepository(self.database).get_by_document(
@@ -629,7 +630,8 @@ def test_service_open_pdf_increments_without_publishing_and_preserves_first_open
     second = service.open_document(document.document_id)
 
     assert first.status == ReadingOperationStatus.SUCCESS
-    assert first.value.pdf_payload.pdf_bytes == PDF_BYTES
+    with first.value.pdf_payload.open() as data:
+        assert data == PDF_BYTES
     assert second.value.reading_state.open_count == 2
     assert second.value.reading_state.first_opened_at == first.value.reading_state.first_opened_at
     assert document_service.read_calls == 2
@@ -282,11 +282,11 @@ def _reader(document: SourceDocument, source: Source, *, opened: bool) -> Simple
     reading = _reading(document)
     pdf_payload = None
     if opened and document.pdf is not None:
+        blobs = SimpleNamespace(open_version=lambda _version: nullcontext(VALID_PDF))
         pdf_payload = DocumentPdfPayload(
             document,
-            VALID_PDF,
-            document.pdf.current_version.original_filename,
-            document.pdf.current_version.sha256,
+            document.pdf.current_version,
+            blobs,  # type: ignore[arg-type]
         )
     return SimpleNamespace(
         document=document,
@@ -545,7 +545,7 @@ def test_pdf_open_uses_exact_bytes_and_invalidates_by_full_identity() -> None:
     _render_pdf_reader(ui, context, service, reader, actions_enabled=True)
 
     assert service.open_calls == [document.document_id]
-    assert ui.pdf_calls[0][0] is reader.pdf_payload.pdf_bytes
+    assert ui.pdf_calls[0][0] == VALID_PDF
     assert ui.pdf_calls[0][1]["height"] == 800
     assert ui.pdf_calls[0][1]["key"].startswith("reading_space_")
     assert ui.download_calls[0]["data"] is ui.pdf_calls[0][0]
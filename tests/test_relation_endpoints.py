@@ -0,0 +1,171 @@
+"""Structured relation endpoint fields, source queries and backfill."""
+
+# ruff: noqa: D101,D102,D103,D107
+
+from __future__ import annotations
+
+import re
+from copy import deepcopy
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from editor.document_builder import _concepts_for_keys
+from editor.utils import db_import
+from mathdatabase.mathmongo import _relation_from_document
+from mathmongo.relation_endpoints import apply_relation_endpoint_backfill
+from mathmongo.relation_endpoints import relation_endpoint_fields
+from mathmongo.relation_endpoints import relation_source_query
+from mathmongo.relation_endpoints import split_relation_endpoint
+from mathmongo.relation_endpoints import with_relation_endpoint_fields
+
+
+def _matches(document: dict, query: dict) -> bool:
+    for field, expected in query.items():
+        if field == "$or":
+            if not any(_matches(document, branch) for branch in expected):
+                return False
+            continue
+        value = document.get(field)
+        if isinstance(expected, dict):
+            if "$exists" in expected and (field in document) != expected["$exists"]:
+                return False
+            if "$in" in expected and value not in expected["$in"]:
+                return False
+            if "$regex" in expected and not (
+                isinstance(value, str) and re.search(expected["$regex"], value)
+            ):
+                return False
+        elif value != expected:
+            return False
+    return True
+
+
+class _Relations:
+    def __init__(self, documents: list[dict]) -> None:
+        self.documents = [deepcopy(document) for document in documents]
+        self.bulk_calls: list[list] = []
+
+    def find(self, query: dict, projection: dict | None = None):
+        return [deepcopy(doc) for doc in self.documents if _matches(doc, query)]
+
+    def bulk_write(self, operations: list, *, ordered: bool):
+        self.bulk_calls.append(operations)
+        modified = 0
+        for operation in operations:
+            for document in self.documents:
+                if not _matches(document, operation._filter):
+                    continue
+                document.update(operation._doc.get("$set", {}))
+                for field in operation._doc.get("$unset", {}):
+                    document.pop(field, None)
+                modified += 1
+        return SimpleNamespace(modified_count=modified)
+
+
+def test_endpoint_split_uses_the_last_separator() -> None:
+    assert split_relation_endpoint("mail@user@Source") == ("mail@user", "Source")
+    assert split_relation_endpoint("missing-source@") is None
+    assert split_relation_endpoint(None) is None
+    assert relation_endpoint_fields("a@S1", "broken") == {"desde_id": "a", "desde_source": "S1"}
+
+
+def test_every_reader_splits_ids_containing_the_separator_alike() -> None:
+    relation = _relation_from_document(
+        {"desde": "mail@user@Source", "hasta": "b@Other", "tipo": "implica"}
+    )
+    concepts = SimpleNamespace(
+        find=lambda query, *_args: [
+            {"id": "mail@user", "source": "Source"}
+            for clause in query.get("$or", [query])
+            if clause.get("source") == "Source" and "mail@user" in clause["id"]["$in"]
+        ]
+    )
+    latex = SimpleNamespace(find=lambda *_args, **_kwargs: [])
+
+    assert (relation.desde_id, relation.desde_source) == ("mail@user", "Source")
+    assert _concepts_for_keys(
+        SimpleNamespace(concepts=concepts, latex_documents=latex),
+        ["mail@user@Source", "no-separator"],
+    ) == [{"id": "mail@user", "source": "Source", "contenido_latex": ""}]
+    with pytest.raises(ValueError, match="Malformed relation endpoints"):
+        _relation_from_document({"desde": "broken", "hasta": "b@Other", "tipo": "implica"})
+
+
+def test_editor_relation_filters_use_the_indexed_source_query() -> None:
+    editor = (Path(__file__).resolve().parents[1] / "editor/editor_streamlit.py").read_text(
+        encoding="utf-8"
+    )
+
+    assert '{"$regex": f"@' not in editor
+    assert editor.count("relation_source_query(") == 3
+
+
+def test_with_relation_endpoint_fields_replaces_stale_values() -> None:
+    document = {"_id": 1, "desde": "a@S1", "hasta": "b@S2", "hasta_source": "old"}
+
+    assert with_relation_endpoint_fields(document) == {
+        "_id": 1,
+        "desde": "a@S1",
+        "hasta": "b@S2",
+        "desde_id": "a",
+        "desde_source": "S1",
+        "hasta_id": "b",
+        "hasta_source": "S2",
+    }
+    assert document["hasta_source"] == "old"
+    assert with_relation_endpoint_fields("not a document") == "not a document"
+
+
+def test_source_query_matches_structured_and_legacy_relations_exactly() -> None:
+    relations = [
+        with_relation_endpoint_fields({"_id": 1, "desde": "a@Book", "hasta": "b@Other"}),
+        with_relation_endpoint_fields({"_id": 2, "desde": "a@Other", "hasta": "b@Book"}),
+        with_relation_endpoint_fields({"_id": 3, "desde": "a@Bookish", "hasta": "b@Other"}),
+        {"_id": 4, "desde": "a@Other", "hasta": "b@Book"},
+        {"_id": 5, "desde": "a@Book.v2", "hasta": "b@Other"},
+    ]
+
+    query = relation_source_query(["Book", "Book"])
+
+    assert query["$or"][0] == {"desde_source": "Book"}
+    assert [doc["_id"] for doc in relations if _matches(doc, query)] == [1, 2, 4]
+    assert relation_source_query(["Book", "Other"])["$or"][1] == {
+        "hasta_source": {"$in": ["Book", "Other"]}
+    }
+    assert relation_source_query([]) == {"_id": {"$exists": False}}
+
+
+def test_backfill_sets_fields_once_and_dry_run_writes_nothing() -> None:
+    relations = _Relations(
+        [
+            {"_id": 1, "desde": "a@S1", "hasta": "b@S2"},
+            with_relation_endpoint_fields({"_id": 2, "desde": "c@S1", "hasta": "d@S1"}),
+            {"_id": 3, "desde": "broken", "hasta": "e@S3", "desde_source": "stale"},
+        ]
+    )
+
+    preview = apply_relation_endpoint_backfill(relations, dry_run=True)
+    assert (preview.scanned, preview.updated, preview.malformed) == (3, 2, 1)
+    assert relations.bulk_calls == []
+
+    report = apply_relation_endpoint_backfill(relations, batch_size=1)
+    assert (report.updated, report.malformed, report.dry_run) == (2, 1, False)
+    assert len(relations.bulk_calls) == 2
+    assert relations.documents[0]["desde_source"] == "S1"
+    assert "desde_source" not in relations.documents[2]
+    assert relations.documents[2]["hasta_id"] == "e"
+
+    assert apply_relation_endpoint_backfill(relations).updated == 0
+
+
+def test_legacy_relation_without_derived_fields_is_identical_to_archive() -> None:
+    stored = {"_id": "r", "desde": "a@S1", "hasta": "b@S2", "tipo": "implica"}
+    archived = with_relation_endpoint_fields(stored)
+
+    assert db_import._legacy_documents_identical("relations", stored, archived)
+    assert not db_import._legacy_documents_identical(
+        "relations", stored, {**archived, "tipo": "equivalente"}
+    )
+    assert not db_import._legacy_documents_identical("concepts", stored, archived)
@@ -0,0 +1,127 @@
+"""Bulk reference enrichment for MathMongo relation listings."""
+
+# ruff: noqa: D101,D102,D103,D107
+
+from __future__ import annotations
+
+from mathdatabase.mathmongo import MathMongo
+from schemas.schemas import Referencia
+
+
+def _matches(document: dict, query: dict) -> bool:
+    for key, value in query.items():
+        if key == "$or":
+            if not any(_matches(document, clause) for clause in value):
+                return False
+        elif isinstance(value, dict) and "$in" in value:
+            if document.get(key) not in value["$in"]:
+                return False
+        elif document.get(key) != value:
+            return False
+    return True
+
+
+class _Collection:
+    def __init__(self, documents: list[dict]) -> None:
+        self.documents = documents
+        self.queries: list[dict] = []
+
+    def find(self, query: dict, *_args, **_kwargs):
+        self.queries.append(query)
+        return iter([dict(document) for document in self.documents if _matches(document, query)])
+
+    def find_one(self, *_args, **_kwargs):
+        raise AssertionError("relation enrichment must not issue per-endpoint find_one calls")
+
+
+def _reference(fuente: str) -> dict:
+    return {
+        "tipo_referencia": "libro",
+        "autor": None,
+        "fuente": fuente,
+        "anio": None,
+        "tomo": None,
+        "edicion": None,
+        "paginas": None,
+        "capitulo": None,
+        "seccion": None,
+        "editorial": None,
+        "doi": None,
+        "url": None,
+        "issbn": None,
+    }
+
+
+def _mongo(relation_count: int) -> MathMongo:
+    mongo = object.__new__(MathMongo)
+    mongo.concepts = _Collection(
+        [
+            {"id": "hub", "source": "Book", "referencia": _reference("Hub book")},
+            {"id": "bare", "source": "Book", "referencia": {"tipo_referencia": None}},
+            *(
+                {"id": f"leaf{index}", "source": "Book", "referencia": _reference(f"Leaf {index}")}
+                for index in range(relation_count - 1)
+            ),
+        ]
+    )
+    mongo.relations = _Collection(
+        [
+            {"desde": f"leaf{index}@Book", "hasta": "hub@Book", "tipo": "implica"}
+            for index in range(relation_count - 1)
+        ]
+        + [{"desde": "bare@Book", "hasta": "missing@Other", "tipo": "implica"}]
+    )
+    return mongo
+
+
+def test_relations_with_references_use_one_concept_query_and_share_the_hub_reference(
+    monkeypatch,
+) -> None:
+    validations = []
+    original = Referencia.model_validate.__func__
+
+    def counting_validate(cls, value, *args, **kwargs):
+        validations.append(value.get("fuente"))
+        return original(cls, value, *args, **kwargs)
+
+    monkeypatch.setattr(Referencia, "model_validate", classmethod(counting_validate))
+    mongo = _mongo(6)
+
+    enriched = mongo.get_relations_with_references()
+
+    assert len(mongo.concepts.queries) == 1
+    assert validations.count("Hub book") == 1
+    assert len(enriched) == 6
+    hub_refs = {id(item.hasta_ref) for item in enriched[:-1]}
+    assert len(hub_refs) == 1
+    assert enriched[0].hasta_ref.fuente == "Hub book"
+    assert enriched[0].desde_ref.fuente == "Leaf 0"
+    assert (enriched[-1].desde_ref, enriched[-1].hasta_ref) == (None, None)
+
+
+def test_streaming_variant_batches_lookups_and_skips_already_resolved_concepts() -> None:
+    mongo = _mongo(5)
+
+    stream = mongo.iter_relations_with_references(batch_size=2)
+    first = next(stream)
+    assert len(mongo.concepts.queries) == 1
+    rest = list(stream)
+
+    assert [item.relation.desde_id for item in [first, *rest]] == [
+        "leaf0",
+        "leaf1",
+        "leaf2",
+        "leaf3",
+        "bare",
+    ]
+    assert len(mongo.concepts.queries) == 3
+    later_ids = {
+        concept_id
+        for query in mongo.concepts.queries[1:]
+        for clause in query.get("$or", [query])
+        for concept_id in clause["id"]["$in"]
+    }
+    assert "hub" not in later_ids
+    assert [item.model_dump() for item in [first, *rest]] == [
+        item.model_dump() for item in mongo.get_relations_with_references()
+    ]
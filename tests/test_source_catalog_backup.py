@@ -44,13 +44,18 @@ class _Collection:
         self.insert_calls = 0
         self.replace_calls = 0
 
-    def find(self, query: dict) -> _Cursor:
-        return _Cursor(
-            document
-            for document in self.documents
-            if all(document.get(key) == value for key, value in query.items())
+    @staticmethod
+    def _matches(document: dict, query: dict) -> bool:
+        return all(
+            document.get(key) in value["$in"]
+            if isinstance(value, dict) and "$in" in value
+            else document.get(key) == value
+            for key, value in query.items()
         )
 
+    def find(self, query: dict) -> _Cursor:
+        return _Cursor(document for document in self.documents if self._matches(document, query))
+
     def find_one(self, query: dict):
         return next(
             (
@@ -65,6 +70,10 @@ class _Collection:
         self.insert_calls += 1
         self.documents.append(document)
 
+    def insert_many(self, documents: list[dict], *, ordered: bool) -> None:
+        for document in documents:
+            self.insert_one(document)
+
     def replace_one(self, query: dict, document: dict, upsert: bool) -> None:
         self.replace_calls += 1
         existing = self.find_one(query)
@@ -557,6 +566,51 @@ def test_legacy_conflict_blocks_before_media_or_database_writes(
     assert not data_dir.exists()
 
 
+def test_legacy_import_prefetches_ids_and_inserts_in_ordered_batches(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    archive = tmp_path / "legacy-batches.zip"
+    concepts = [{"_id": f"concept-{index}", "source": "incoming"} for index in range(5)]
+    _write_archive(archive, {"concepts": concepts})
+    database = _Database({"concepts": [dict(concepts[2])]})
+    collection = database["concepts"]
+    queries: list[dict] = []
+    batches: list[int] = []
+    original_find = collection.find
+    original_insert_many = collection.insert_many
+
+    def recording_find(query: dict) -> _Cursor:
+        queries.append(query)
+        return original_find(query)
+
+    def recording_insert_many(documents: list[dict], *, ordered: bool) -> None:
+        assert ordered is True
+        batches.append(len(documents))
+        original_insert_many(documents, ordered=ordered)
+
+    def forbidden_find_one(query: dict):
+        raise AssertionError("legacy import must not look documents up one by one")
+
+    collection.find = recording_find
+    collection.insert_many = recording_insert_many
+    collection.find_one = forbidden_find_one
+    monkeypatch.setattr(db_import, "DATA_DIR", tmp_path / "data")
+    monkeypatch.setattr(db_import, "IMPORT_COLLECTIONS", ("concepts",))
+    monkeypatch.setattr(db_import, "IMPORT_BATCH_SIZE", 2)
+
+    report = db_import.import_zip_into_database(archive, _mongo(database))
+
+    # Three chunked $in lookups during preflight and three more while writing.
+    assert [len(query["_id"]["$in"]) for query in queries] == [2, 2, 1, 2, 2, 1]
+    assert batches == [2, 1, 1]
+    assert report.legacy_inserted == {"concepts": 4}
+    assert report.legacy_identical == {"concepts": 1}
+    assert sorted(item["_id"] for item in collection.documents) == [
+        item["_id"] for item in concepts
+    ]
+
+
 def test_concurrent_media_symlink_is_blocked_without_overwrite_or_database_write(
     tmp_path: Path,
     monkeypatch: pytest.MonkeyPatch,
@@ -1420,3 +1474,27 @@ def test_catalog_reference_roundtrip_restores_nested_bson_types(
     assert isinstance(restored["provenance"]["imported_at"], datetime)
     assert restored["created_at"].tzinfo is not None
     assert restored["provenance"]["imported_at"].tzinfo is not None
+
+
+def test_import_refreshes_search_entries_of_imported_concepts(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    archive = tmp_path / "search-refresh.zip"
+    concepts = [
+        {"_id": "concept-a", "id": "a", "source": "Libro"},
+        {"_id": "concept-b", "id": "b", "source": "Libro"},
+    ]
+    _write_archive(archive, {"concepts": concepts})
+    refreshed: list[tuple[str, str]] = []
+    monkeypatch.setattr(
+        db_import,
+        "refresh_concept_search_entries",
+        lambda _db, identities: refreshed.extend(identities),
+    )
+    monkeypatch.setattr(db_import, "DATA_DIR", tmp_path / "data")
+    monkeypatch.setattr(db_import, "IMPORT_COLLECTIONS", ("concepts",))
+
+    db_import.import_zip_into_database(archive, _mongo(_Database()))
+
+    assert refreshed == [("a", "Libro"), ("b", "Libro")]
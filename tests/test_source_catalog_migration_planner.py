@@ -15,6 +15,7 @@ from typing import Any
 
 import pytest
 
+from mathmongo.source_catalog_migration.canonical import candidate_key
 from mathmongo.source_catalog_migration.inventory import InventoryError
 from mathmongo.source_catalog_migration.inventory import build_inventory
 from mathmongo.source_catalog_migration.models import InputSnapshot
@@ -265,6 +266,36 @@ def test_matching_doi_with_contradictory_language_stays_separate() -> None:
     }
 
 
+def test_conflict_keys_count_every_planning_pass_that_saw_the_conflict() -> None:
+    conflicted = "10.1234/a-conflict"
+    compatible = "10.1234/b-compatible"
+    plan = _plan(
+        [
+            _concept("one", "Source", _book_reference(doi=conflicted, fuente="First Work")),
+            _concept("two", "Source", _book_reference(doi=conflicted, fuente="Second Work")),
+            _concept("three", "Source", _book_reference(doi=compatible, fuente="Third")),
+            _concept(
+                "four",
+                "Source",
+                _book_reference(doi=compatible, fuente="Third", editorial="Press"),
+            ),
+        ]
+    )
+
+    # The merge of "three" and "four" comes after the conflict in token
+    # order, so the conflict is observed before and after it: the key has
+    # always hashed that evidence twice and must keep doing so.
+    (conflict,) = plan.conflicts
+    assert plan.summary.reference_candidate_count == 3
+    assert conflict.conflict_key == candidate_key(
+        "conflict",
+        {
+            "candidates": conflict.reference_candidate_keys,
+            "evidence": [("doi", conflicted), ("doi", conflicted)],
+        },
+    )
+
+
 def test_unknown_reference_types_are_preserved_and_never_collapsed() -> None:
     plan = _plan(
         [
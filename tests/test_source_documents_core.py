@@ -5,6 +5,8 @@
 from __future__ import annotations
 
 import copy
+import io
+import os
 import socket
 import stat
 from dataclasses import dataclass
@@ -407,6 +409,130 @@ def test_blob_integrity_checks_content_permissions_and_private_directories(tmp_p
     assert "directory_permissions" in inspected.issues
 
 
+def test_staged_blob_streams_hashes_once_and_reads_back_in_chunks(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    store = SourceDocumentBlobStore(tmp_path)
+    expected = store.prepare_pdf(PDF_BYTES)
+    hashed: list[int] = []
+    real_sha256 = storage_module.hashlib.sha256
+
+    class _CountingSha256:
+        def __init__(self, data: bytes = b"") -> None:
+            self._digest = real_sha256()
+            self.update(data)
+
+        def update(self, data: bytes) -> None:
+            hashed.append(len(data))
+            self._digest.update(data)
+
+        def hexdigest(self) -> str:
+            return self._digest.hexdigest()
+
+    monkeypatch.setattr(storage_module.hashlib, "sha256", _CountingSha256)
+    with store.stage_pdf(iter([PDF_BYTES[:3], PDF_BYTES[3:10], PDF_BYTES[10:]])) as staged:
+        first = store.publish_staged(staged)
+    with store.stage_pdf(io.BytesIO(PDF_BYTES)) as staged_again:
+        second = store.publish_staged(staged_again)
+
+    assert (staged.sha256, staged.size_bytes, staged.logical_path) == (
+        expected.sha256,
+        expected.size_bytes,
+        expected.logical_path,
+    )
+    assert (first.created, second.created) == (True, False)
+    assert sum(hashed) == 2 * len(PDF_BYTES)
+    assert not list(store.blob_root.rglob(".pending-*"))
+
+    version = pdf_version_from_prepared(staged, original_filename="paper.pdf")
+    hashed.clear()
+    with store.open_version(version) as mapping:
+        assert mapping[:] == PDF_BYTES
+    copied = io.BytesIO()
+    assert store.copy_version(version, copied) == len(PDF_BYTES)
+    assert copied.getvalue() == PDF_BYTES
+    assert b"".join(store.iter_version(version, chunk_size=4)) == PDF_BYTES
+    assert store.version_matches(version, PDF_BYTES)
+    assert not store.version_matches(version, PDF_BYTES[:-1] + b"X")
+    assert hashed == [len(PDF_BYTES)] * 5
+
+    path = store.path_for_sha(version.sha256)
+    path.write_bytes(PDF_BYTES[:-1] + b"X")
+    with pytest.raises(BlobConflictError, match="SHA-256"):
+        store.read_version(version)
+    with pytest.raises(BlobConflictError, match="incompatible"):
+        store.publish(expected)
+
+
+def test_open_version_rechecks_the_blob_after_the_consumer_is_done(tmp_path: Path) -> None:
+    store = SourceDocumentBlobStore(tmp_path)
+    prepared = store.prepare_pdf(PDF_BYTES)
+    store.publish(prepared)
+    version = pdf_version_from_prepared(prepared, original_filename="paper.pdf")
+    path = store.path_for_sha(prepared.sha256)
+
+    with pytest.raises(BlobConflictError, match="changed during reading"):
+        with store.open_version(version) as mapping:
+            assert mapping[:] == PDF_BYTES
+            observed = path.stat()
+            os.utime(path, ns=(observed.st_atime_ns, observed.st_mtime_ns + 1_000_000_000))
+    assert store.read_version(version) == PDF_BYTES
+
+
+def test_staging_rejects_invalid_streams_without_leaving_pending_files(tmp_path: Path) -> None:
+    store = SourceDocumentBlobStore(tmp_path)
+
+    def _never_read() -> Any:
+        yield b"%PDX"
+        raise AssertionError("staging must stop at the invalid header")
+
+    with pytest.raises(BlobValidationError, match="valid %PDF-"):
+        store.stage_pdf(_never_read())
+    with pytest.raises(BlobValidationError, match="cannot be empty"):
+        store.stage_pdf(iter([b""]))
+    with pytest.raises(BlobValidationError, match="exceeds"):
+        store.stage_pdf(iter([PDF_BYTES, PDF_BYTES]), max_bytes=len(PDF_BYTES) + 1)
+    with pytest.raises(BlobValidationError, match="must be bytes"):
+        store.stage_pdf(iter(["%PDF-"]))  # type: ignore[list-item]
+
+    assert not list(store.blob_root.glob(".pending-*"))
+
+
+def test_service_streams_file_uploads_through_the_blob_store(tmp_path: Path) -> None:
+    source = Source(name="Streamed")
+    database = _database_with_sources(source)
+    store = SourceDocumentBlobStore(tmp_path)
+    service = SourceDocumentService(database, storage=store)
+
+    created = service.create_pdf_document(
+        source_id=source.source_id,
+        pdf_bytes=io.BytesIO(PDF_BYTES),
+        original_filename="paper.pdf",
+        title="Paper",
+    )
+    identical = service.create_pdf_document(
+        source_id=source.source_id,
+        pdf_bytes=io.BytesIO(PDF_BYTES),
+        original_filename="paper.pdf",
+        title="Paper",
+    )
+
+    assert created.status == DocumentOperationStatus.CREATED
+    assert created.blob_created is True
+    assert identical.status == DocumentOperationStatus.IDENTICAL
+    assert store.read_version(created.value.pdf.current_version) == PDF_BYTES
+    assert not list(store.blob_root.rglob(".pending-*"))
+    for buffer in (bytearray(PDF_BYTES), memoryview(PDF_BYTES)):
+        result = service.create_pdf_document(
+            source_id=source.source_id,
+            pdf_bytes=buffer,
+            original_filename="paper.pdf",
+            title="Paper",
+        )
+        assert result.status == DocumentOperationStatus.IDENTICAL
+
+
 def test_repository_roundtrip_paging_metadata_and_status(tmp_path: Path) -> None:
     source = Source(name="Repository Source")
     database = _database_with_sources(source)
@@ -690,14 +816,18 @@ def test_service_integrity_and_pdf_payload_detect_tamper(tmp_path: Path) -> None
 
     healthy = service.inspect_document_integrity(document.document_id)
     payload = service.read_pdf_document(document.document_id)
+    with payload.open() as mapping:
+        assert mapping[:] == PDF_BYTES
+    assert b"".join(payload.iter_bytes()) == PDF_BYTES
     path = store.path_for_version(document.pdf.current_version)
     path.write_bytes(b"%PDF-tampered")
     path.chmod(0o600)
     damaged = service.inspect_document_integrity(document.document_id)
 
     assert healthy.ok is True
-    assert payload.pdf_bytes is PDF_BYTES or payload.pdf_bytes == PDF_BYTES
     assert payload.sha256 == document.pdf.current_version.sha256
+    with pytest.raises((BlobConflictError, BlobValidationError)), payload.open():
+        pass
     assert damaged.ok is False
     assert damaged.issues
     with pytest.raises((BlobConflictError, BlobValidationError)):
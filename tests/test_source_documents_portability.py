@@ -53,10 +53,14 @@ class _Collection:
 
     @classmethod
     def _matches(cls, document: dict, query: dict) -> bool:
-        return all(
-            expected in cls._values_at_path(document, tuple(key.split(".")))
-            for key, expected in query.items()
-        )
+        for key, expected in query.items():
+            values = cls._values_at_path(document, tuple(key.split(".")))
+            if isinstance(expected, dict) and "$in" in expected:
+                if not any(value in expected["$in"] for value in values):
+                    return False
+            elif expected not in values:
+                return False
+        return True
 
     def find(self, query: dict) -> _Cursor:
         return _Cursor(document for document in self.documents if self._matches(document, query))
@@ -71,6 +75,10 @@ class _Collection:
         self.insert_calls += 1
         self.documents.append(document)
 
+    def insert_many(self, documents: list[dict], *, ordered: bool) -> None:
+        for document in documents:
+            self.insert_one(document)
+
     def create_index(self, _keys, *, name: str, **_kwargs) -> str:
         self.index_names.add(name)
         return name
@@ -334,6 +342,29 @@ def test_source_document_pdf_and_web_roundtrip_is_idempotent(
     assert destination["source_documents"].insert_calls == 3
 
 
+def test_source_document_blob_import_streams_zip_members(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    archive, _origin_store, _documents, pdf_bytes = _export_bundle(tmp_path, monkeypatch)
+
+    def buffered(*_args: object, **_kwargs: object) -> None:
+        raise AssertionError("import must not buffer whole PDF blobs")
+
+    monkeypatch.setattr(SourceDocumentBlobStore, "prepare_pdf", buffered)
+    monkeypatch.setattr(SourceDocumentBlobStore, "read_version", buffered)
+    destination_store = SourceDocumentBlobStore(tmp_path / "destination-data")
+    result = db_import.import_zip_into_database(
+        archive,
+        _mongo(_Database()),
+        source_document_blob_store=destination_store,
+    )
+
+    assert result.source_document_blobs_created == 1
+    blobs = list(destination_store.documents_root.rglob("*.pdf"))
+    assert [blob.read_bytes() for blob in blobs] == [pdf_bytes]
+
+
 def test_source_document_metadata_conflict_blocks_before_blob_or_legacy_writes(
     tmp_path: Path,
     monkeypatch: pytest.MonkeyPatch,
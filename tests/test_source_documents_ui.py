@@ -20,8 +20,9 @@ from editor.source_catalog.document_ui import DOCUMENT_PREVIEW_SUBJECT
 from editor.source_catalog.document_ui import PDF_PREVIEW_NAMESPACE
 from editor.source_catalog.document_ui import _operation_token
 from editor.source_catalog.document_ui import render_source_documents
-from editor.source_catalog.document_ui import uploaded_pdf_bytes
+from editor.source_catalog.document_ui import uploaded_pdf_file
 from editor.source_catalog.document_ui import uploaded_pdf_filename
+from editor.source_catalog.document_ui import uploaded_pdf_identity
 from editor.source_catalog.state import ACTIVE_DATABASE_IDENTITY
 from editor.source_catalog.state import state_key
 from editor.source_catalog.state import sync_database_state
@@ -36,6 +37,7 @@ from mathmongo.source_documents.service import DocumentOperationResult
 from mathmongo.source_documents.service import DocumentOperationStatus
 from mathmongo.source_documents.service import DocumentPdfPayload
 from mathmongo.source_documents.storage import MAX_SOURCE_PDF_UPLOAD_BYTES
+from mathmongo.source_documents.storage import BlobValidationError
 from mathmongo.source_documents.storage import SourceDocumentBlobStore
 from mathmongo.source_documents.storage import pdf_version_from_prepared
 
@@ -66,6 +68,14 @@ class FakeUploadedFile:
         self.position = position
 
 
+class MemoryBlobs:
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+
+    def open_version(self, _version):
+        return nullcontext(self.data)
+
+
 class ExplodingOversizeUpload:
     name = "large.pdf"
     size = MAX_SOURCE_PDF_UPLOAD_BYTES + 1
@@ -235,7 +245,7 @@ class FakeDocumentService:
 
     def create_pdf_document(self, **kwargs) -> DocumentOperationResult:
         self.pdf_creates.append(kwargs)
-        self.pdf_bytes = kwargs["pdf_bytes"]
+        self.pdf_bytes = kwargs["pdf_bytes"].read()
         document = _pdf_document(self.source, self.pdf_bytes)
         self.documents = (*self.documents, document)
         return DocumentOperationResult(
@@ -271,9 +281,8 @@ class FakeDocumentService:
         assert document.pdf is not None
         return DocumentPdfPayload(
             document,
-            self.pdf_bytes,
-            document.pdf.current_version.original_filename,
-            document.pdf.current_version.sha256,
+            document.pdf.current_version,
+            MemoryBlobs(self.pdf_bytes),  # type: ignore[arg-type]
         )
 
     def update_document_metadata(self, document_id: str, changes: dict[str, Any]):
@@ -307,18 +316,24 @@ def _context(source: Source, references: tuple[Reference, ...] = ()) -> SimpleNa
     )
 
 
-def test_uploaded_pdf_is_bounded_validated_and_position_preserved() -> None:
+def test_uploaded_pdf_is_streamed_bounded_validated_and_rewound() -> None:
     uploaded = FakeUploadedFile(VALID_PDF)
+    uploaded.position = 3
 
     assert uploaded_pdf_filename(uploaded) == "paper.pdf"
-    assert uploaded_pdf_bytes(uploaded) == VALID_PDF
+    pdf_file = uploaded_pdf_file(uploaded)
+    assert pdf_file is uploaded and uploaded.position == 0
+    assert uploaded_pdf_identity(pdf_file) == (
+        SourceDocumentBlobStore.prepare_pdf(VALID_PDF).sha256,
+        len(VALID_PDF),
+    )
     assert uploaded.position == 0
-    assert uploaded.read_calls == [MAX_SOURCE_PDF_UPLOAD_BYTES + 1]
+    assert max(uploaded.read_calls) < MAX_SOURCE_PDF_UPLOAD_BYTES
 
     with pytest.raises(ValueError, match="límite"):
-        uploaded_pdf_bytes(ExplodingOversizeUpload())
-    with pytest.raises(ValueError, match="cabecera"):
-        uploaded_pdf_bytes(FakeUploadedFile(b"not a pdf"))
+        uploaded_pdf_file(ExplodingOversizeUpload())
+    with pytest.raises(BlobValidationError, match="header"):
+        uploaded_pdf_identity(uploaded_pdf_file(FakeUploadedFile(b"not a pdf")))
     with pytest.raises(ValueError, match="nombre PDF simple"):
         uploaded_pdf_filename(FakeUploadedFile(VALID_PDF, name="../paper.pdf"))
 
@@ -340,7 +355,8 @@ def test_add_pdf_persists_then_views_and_downloads_exact_service_bytes() -> None
     )
 
     assert len(service.pdf_creates) == 1
-    assert service.pdf_creates[0]["pdf_bytes"] == VALID_PDF
+    assert service.pdf_creates[0]["pdf_bytes"] is ui.uploaded
+    assert service.pdf_bytes == VALID_PDF
     assert ui.file_uploader_kwargs["max_upload_size"] == 50
     assert ui.pdf_calls[0][0] is service.pdf_bytes
     assert ui.pdf_calls[0][1]["height"] == 800
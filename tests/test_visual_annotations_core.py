@@ -582,3 +582,13 @@ def test_visual_reads_remain_available_without_s5b_indexes() -> None:
     listed = service.list_visual_annotations(pdf.document_id, pdf_page=1)
     assert listed.completed and listed.value.total == 1
     assert not service.visual_indexes_ready()
+
+
+def test_visual_listing_reports_bad_cursors_with_their_own_status() -> None:
+    database, _, _, pdf, _, _ = _database()
+    service, _ = _service(database)
+
+    listed = service.list_visual_annotations(pdf.document_id, cursor="not-a-cursor")
+
+    assert listed.status == ReadingAnnotationOperationStatus.INVALID_CURSOR
+    assert not listed.completed
@@ -391,6 +391,18 @@ class _ImportCollection:
     def __init__(self) -> None:
         self.documents: list[dict] = []
 
+    def find(self, query: dict) -> _ExportCursor:
+        return _ExportCursor(
+            document
+            for document in self.documents
+            if all(
+                document.get(key) in value["$in"]
+                if isinstance(value, dict) and "$in" in value
+                else document.get(key) == value
+                for key, value in query.items()
+            )
+        )
+
     def find_one(self, query: dict):
         return next(
             (
@@ -407,6 +419,9 @@ class _ImportCollection:
     def insert_one(self, document: dict) -> None:
         self.documents.append(document)
 
+    def insert_many(self, documents: list[dict], *, ordered: bool) -> None:
+        self.documents.extend(documents)
+
 
 class _ImportDatabase:
     name = "fake-import-db"
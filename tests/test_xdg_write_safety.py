@@ -222,3 +222,39 @@ def test_quarto_copies_a_read_only_installed_template_to_a_mutable_build(
     assert (result.build_dir / "references.bib").is_file()
     assert result.build_dir.stat().st_mode & 0o777 == 0o700
     assert (result.build_dir / "chapters").stat().st_mode & 0o777 == 0o700
+
+
+class _Collection:
+    def __init__(self, documents: list[dict]) -> None:
+        self.documents = documents
+        self.queries: list[dict] = []
+
+    def find(self, query: dict, projection: dict | None = None) -> list[dict]:
+        self.queries.append(query)
+        if "id" in query:
+            wanted = set(query["id"]["$in"])
+            return [doc for doc in self.documents if doc["id"] in wanted]
+        return [doc for doc in self.documents if doc["source"] == query["source"]]
+
+    def find_one(self, query: dict):
+        raise AssertionError("export must not look LaTeX up one concept at a time")
+
+
+def test_source_export_joins_latex_in_bulk(monkeypatch: pytest.MonkeyPatch) -> None:
+    concepts = [{"id": f"c{index}", "source": "S"} for index in range(3)]
+    latex = [{"id": "c0", "source": "S", "contenido_latex": "a"}]
+    latex += [{"id": "c2", "source": "S", "contenido_latex": "c"}]
+    database = type(
+        "Database", (), {"concepts": _Collection(concepts), "latex_documents": _Collection(latex)}
+    )
+    exported: list[tuple[str, str]] = []
+    monkeypatch.setattr(
+        ExportadorLatex,
+        "exportar_concepto",
+        lambda self, concept, body, salida=None: exported.append((concept["id"], body)),
+    )
+
+    ExportadorLatex().exportar_todos_de_source(database, "S")
+
+    assert exported == [("c0", "a"), ("c2", "c")]
+    assert len(database.latex_documents.queries) == 1
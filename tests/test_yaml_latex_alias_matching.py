@@ -0,0 +1,68 @@
+"""Batched alias resolution keeps the candidate-by-candidate matching semantics."""
+
+# ruff: noqa: D101,D102,D103,D107
+
+from __future__ import annotations
+
+import random
+
+from rapidfuzz import fuzz
+
+from parsers.yaml_latex_parser import AliasMatcher
+from parsers.yaml_latex_parser import YamlLatexParser
+from parsers.yaml_latex_parser import normalize
+
+WORDS = ("grupo", "anillo", "ideal", "cuerpo", "modulo", "espacio", "lineal", "abeliano", "finito")
+
+
+def _reference(alias: str, candidates: list[dict]) -> dict | None:
+    best_score, match = 0, None
+    for candidate in candidates:
+        for field in (candidate.get("titulo") or "", candidate.get("id") or ""):
+            score = fuzz.token_set_ratio(normalize(alias), normalize(field))
+            if score > best_score:
+                best_score, match = score, candidate
+    return match if best_score >= 85 else None
+
+
+def test_batched_scores_pick_the_same_first_best_candidate(monkeypatch) -> None:
+    monkeypatch.setattr("parsers.yaml_latex_parser.ALIAS_POR_LOTE", 7)
+    rng = random.Random(3)
+    candidates = [
+        {"id": f"c_{index}", "titulo": " ".join(rng.sample(WORDS, rng.randint(1, 3)))}
+        for index in range(60)
+    ]
+    candidates.append({"id": "sin-titulo", "titulo": None})
+    aliases = [" ".join(rng.sample(WORDS, rng.randint(1, 3))) for _ in range(40)]
+    aliases += ["Sin_Titulo", "nada que ver", "Grupos abelianos"]
+
+    resolved = AliasMatcher(candidates).resolver(aliases)
+
+    assert resolved == [_reference(alias, candidates) for alias in aliases]
+    assert resolved[-3] is candidates[-1]
+
+
+def test_token_blocking_only_scores_candidates_sharing_a_token_prefix() -> None:
+    candidates = [{"id": "grupo_abeliano", "titulo": "Grupo abeliano"}, {"id": "xyz", "titulo": ""}]
+    matcher = AliasMatcher(candidates, bloqueo_tokens=True)
+
+    assert matcher.resolver(["grupos abelianos", "xyz", "anillo"]) == [
+        candidates[0],
+        candidates[1],
+        None,
+    ]
+    assert AliasMatcher([]).resolver(["grupo"]) == [None]
+
+
+def test_procesar_directorio_links_aliases_and_keeps_unresolved_ones(tmp_path) -> None:
+    (tmp_path / "nota.md").write_text(
+        "---\nid: nota\nsource: Algebra\nalias_previos_pendientes:\n"
+        "  - grupo abeliano\n  - concepto inexistente\n---\n$x$\n",
+        encoding="utf-8",
+    )
+    database = [{"id": "grupo_abeliano", "source": "Algebra", "titulo": "Grupo abeliano"}]
+
+    (result,) = YamlLatexParser.procesar_directorio(str(tmp_path), database)
+
+    assert [item["hasta_id"] for item in result["relations"]] == ["grupo_abeliano"]
+    assert result["doc"]["alias_previos_pendientes"] == ["concepto inexistente"]
@@ -4,6 +4,7 @@ import math
 import os
 import urllib.parse
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
 import networkx as nx
@@ -14,6 +15,248 @@ from mathmongo.paths import validate_mutable_path
 
 
 DEBUG_KNOWLEDGE_GRAPH = os.getenv("DEBUG_KNOWLEDGE_GRAPH", "0") == "1"
+SVG_RENDER_CACHE_SIZE = 8192
+SVG_ATLAS_PREFIX = "mm-svg-atlas:"
+
+
+def _svg_data_uri(svg: str) -> str:
+    # Importante: encodear para usarlo como data URI
+    return "data:image/svg+xml;charset=utf-8," + urllib.parse.quote(svg)
+
+
+def _estimate_text_width_px(lines: list[str], font_size: int = 45) -> int:
+    # Estimación razonable sin medir en canvas:
+    # ~0.58em por carácter (depende de la fuente, pero funciona bien)
+    if not lines:
+        return 120
+    max_chars = max(len(line) for line in lines)
+    return int(max(120, min(520, max_chars * font_size * 0.58)))
+
+
+@lru_cache(maxsize=SVG_RENDER_CACHE_SIZE)
+def _render_svg_polygon_node(wrapped_label: str, fill: str, kind: str, type_badge: str = "") -> str:
+    """Data URI SVG de un nodo; la misma clave (etiqueta, color, forma, insignia) se renderiza una vez."""
+    font_size = 45
+    badge_font_size = 24
+    padding_x = 22
+    padding_y = 18
+    line_gap = 6
+
+    lines = wrapped_label.split("\n") if wrapped_label else [""]
+    text_w = _estimate_text_width_px(lines, font_size=font_size)
+    badge_w = len(type_badge) * badge_font_size * 0.62 + 30 if type_badge else 0
+    line_h = font_size + line_gap
+    text_h = len(lines) * line_h
+
+    width = max(text_w, badge_w) + 2 * padding_x
+    badge_h = badge_font_size + 16 if type_badge else 0
+    badge_gap = 8 if type_badge else 0
+    height = text_h + badge_h + badge_gap + 2 * padding_y
+
+    # límites por seguridad (evita nodos gigantes)
+    width = int(max(200, min(620, width)))
+    height = int(max(250, min(360, height)))
+
+    stroke = "#6b7280"  # gris neutro
+    stroke_w = 2
+
+    # Coordenadas del polígono (en px)
+    if kind == "hexagon":
+        cut = max(22, min(50, width * 0.18))
+        pts = [
+        (cut, 0),
+        (width - cut, 0),
+        (width, height / 2),
+        (width - cut, height),
+        (cut, height),
+        (0, height / 2),]
+    elif kind == "diamond":
+        pts = [
+        (width / 2, 0),
+        (width, height / 2),
+        (width / 2, height),
+        (0, height / 2),]
+    elif kind == "triangle":
+        # punta arriba
+        pts = [
+        (width / 2, 0),
+        (width, height),
+        (0, height),
+    ]
+    elif kind == "triangleDown":
+        # punta abajo
+        pts = [
+        (0, 0),
+        (width, 0),
+        (width / 2, height),]
+
+    else:
+        # fallback: box-like polygon
+        pts = [(0, 0), (width, 0), (width, height), (0, height)]
+    
+    points_str = " ".join(f"{x:.1f},{y:.1f}" for x, y in pts)
+    # Texto centrado: usamos dominant-baseline para que quede bien
+    # Empezamos y centramos verticalmente con un offset calculado.
+    total_text_h = len(lines) * line_h
+    content_h = total_text_h + badge_h + badge_gap
+    start_y = (height - content_h) / 2 + badge_h + badge_gap + font_size  # primera línea
+
+    # Escapar XML básico
+    def esc(s: str) -> str:
+        return (s.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;"))
+    text_items = []
+    if type_badge:
+        badge_x = width / 2
+        badge_y = (height - content_h) / 2
+        badge_width = max(48, badge_w)
+        badge_height = badge_font_size + 10
+        text_items.append(
+            f'<rect x="{badge_x - badge_width / 2:.1f}" y="{badge_y:.1f}" '
+            f'width="{badge_width:.1f}" height="{badge_height:.1f}" rx="8" '
+            f'fill="#ffffff" opacity="0.72" stroke="#6b7280" stroke-width="1" />'
+            f'<text x="{badge_x:.1f}" y="{badge_y + badge_font_size:.1f}" text-anchor="middle" '
+            f'font-family="Arial, sans-serif" font-size="{badge_font_size}" '
+            f'font-weight="700" fill="#374151">{esc(type_badge)}</text>'
+        )
+    y = start_y
+    for line in lines:
+        text_items.append(
+             f'<text x="{width/2:.1f}" y="{y:.1f}" text-anchor="middle" '
+             f'font-family="Arial, sans-serif" font-size="{font_size}" fill="#111827">{esc(line)}</text>'
+        )
+        y += line_h
+
+    scale = 3  # 2 o 3 normalmente basta
+    svg = f"""
+        <svg xmlns="http://www.w3.org/2000/svg"
+             width="{width*scale}" height="{height*scale}"
+             viewBox="0 0 {width} {height}">
+             <polygon points="{points_str}" fill="{fill}" stroke="{stroke}" stroke-width="{stroke_w}" />
+             {"".join(text_items)}
+        </svg>
+        """.strip()
+
+    return _svg_data_uri(svg)
+
+
+@lru_cache(maxsize=SVG_RENDER_CACHE_SIZE)
+def _wrap_text(text: str, max_chars: int, max_lines: int) -> str:
+    words = text.split()
+    lines = []
+    current = ""
+
+    for w in words:
+        if len(current) + (1 if current else 0) + len(w) <= max_chars:
+            current = f"{current} {w}".strip()
+        else:
+            lines.append(current)
+            current = w
+            if len(lines) >= max_lines:
+                break
+
+    if len(lines) < max_lines and current:
+        lines.append(current)
+
+    # Si truncamos por max_lines, agrega "..."
+    joined = "\n".join(lines)
+    #if len(words) > 0 and (" ".join(lines).strip() != text):
+        #if not joined.endswith("..."):
+        #    joined = joined.rstrip(".") + "..."
+    return joined
+
+
+class _SvgAtlas:
+    """Tabla compartida de imágenes SVG: cada data URI distinto se emite una sola vez.
+
+    Los nodos llevan ``mm-svg-atlas:<n>`` y el navegador resuelve la referencia
+    antes de crear el ``vis.DataSet``.
+    """
+
+    _NODES_MARKER = "nodes = new vis.DataSet("
+
+    def __init__(self) -> None:
+        self.uris: list[str] = []
+        self._index: dict[str, int] = {}
+        self.references = 0
+        self.inline_bytes = 0
+
+    def ref(self, uri):
+        if not isinstance(uri, str) or not uri.startswith("data:image/svg+xml"):
+            return uri
+        self.references += 1
+        self.inline_bytes += len(uri)
+        index = self._index.setdefault(uri, len(self.uris))
+        if index == len(self.uris):
+            self.uris.append(uri)
+        return f"{SVG_ATLAS_PREFIX}{index}"
+
+    def state(self, graph_state: dict | None) -> dict | None:
+        if not isinstance(graph_state, dict):
+            return graph_state
+        state = dict(graph_state)
+        for key in ("nodes", "fullNodes"):
+            if isinstance(state.get(key), list):
+                state[key] = [
+                    {**node, "image": self.ref(node["image"])}
+                    if isinstance(node, dict) and "image" in node
+                    else node
+                    for node in state[key]
+                ]
+        return state
+
+    def attach(self, html: str) -> str | None:
+        """Enlaza la tabla al HTML de pyvis, o ``None`` si la plantilla no es la esperada."""
+        start = html.find(self._NODES_MARKER)
+        end = html.find(");\n", start)
+        if start < 0 or end < 0 or "</head>" not in html:
+            return None
+        if not self.uris:
+            return html
+        body = start + len(self._NODES_MARKER)
+        html = f"{html[:body]}mmResolveSvgAtlas({html[body:end]}){html[end:]}"
+        return html.replace("</head>", self.script() + "\n</head>", 1)
+
+    def inline(self, html: str) -> str:
+        """Vuelve a incrustar cada imagen en su nodo (plantilla de pyvis desconocida)."""
+        for index, uri in enumerate(self.uris):
+            html = html.replace(f'"{SVG_ATLAS_PREFIX}{index}"', json.dumps(uri))
+        return html
+
+    def script(self) -> str:
+        atlas_json = json.dumps(self.uris).replace("</", "<\\/")
+        return f"""<script id="mm-svg-atlas">
+window.MM_SVG_ATLAS = {atlas_json};
+function mmResolveSvgAtlas(items) {{
+  (items || []).forEach(function (item) {{
+    if (item && typeof item.image === "string" && item.image.indexOf("{SVG_ATLAS_PREFIX}") === 0) {{
+      item.image = window.MM_SVG_ATLAS[Number(item.image.slice({len(SVG_ATLAS_PREFIX)}))] || "";
+    }}
+  }});
+  return items;
+}}
+function mmResolveSvgAtlasState(stateJson) {{
+  const state = JSON.parse(stateJson);
+  mmResolveSvgAtlas(state.nodes);
+  mmResolveSvgAtlas(state.fullNodes);
+  return JSON.stringify(state);
+}}
+</script>"""
+
+    def metrics(self, html: str, attached: bool = True) -> dict[str, int]:
+        atlas_bytes = sum(len(uri) for uri in self.uris) if attached else self.inline_bytes
+        return {
+            "svg_references": self.references,
+            "svg_unique_images": len(self.uris),
+            "svg_inline_bytes": self.inline_bytes,
+            "svg_atlas_bytes": atlas_bytes,
+            "svg_saved_bytes": max(0, self.inline_bytes - atlas_bytes),
+            "html_bytes": len(html.encode("utf-8")),
+        }
+
+
+def svg_render_cache_info():
+    """Aciertos y fallos del renderizado SVG memoizado (``functools.lru_cache``)."""
+    return _render_svg_polygon_node.cache_info()
 
 
 class GrafoConocimiento:
@@ -27,6 +270,7 @@ class GrafoConocimiento:
         self.MaxLengthLabel=20
         self.MaxLinesLabel=6
         self.G = nx.MultiDiGraph()
+        self.export_metrics: dict[str, int] = {}
 
         self.color_por_tipo = {
             "definicion": "#b5e8b8",      # green dark
@@ -210,123 +454,16 @@ class GrafoConocimiento:
         }
 
     def _svg_data_uri(self, svg: str) -> str:
-        # Importante: encodear para usarlo como data URI
-        return "data:image/svg+xml;charset=utf-8," + urllib.parse.quote(svg)
+        return _svg_data_uri(svg)
 
     def _estimate_text_width_px(self, lines: list[str], font_size: int = 45) -> int:
-        # Estimación razonable sin medir en canvas:
-        # ~0.58em por carácter (depende de la fuente, pero funciona bien)
-        if not lines:
-            return 120
-        max_chars = max(len(line) for line in lines)
-        return int(max(120, min(520, max_chars * font_size * 0.58)))
-
+        return _estimate_text_width_px(lines, font_size=font_size)
 
     def _make_svg_polygon_node(self, wrapped_label: str, fill: str, kind: str, type_badge: str = "") -> str:
         """kind: 'hexagon' | 'diamond' | 'triangle' | 'triangleDown'
-        Devuelve un data URI (SVG) con el texto SIEMPRE dentro.
+        Devuelve un data URI (SVG) con el texto SIEMPRE dentro; memoizado entre instancias.
         """  # noqa: D205
-        font_size = 45
-        badge_font_size = 24
-        padding_x = 22
-        padding_y = 18
-        line_gap = 6
-
-        lines = wrapped_label.split("\n") if wrapped_label else [""]
-        text_w = self._estimate_text_width_px(lines, font_size=font_size)
-        badge_w = len(type_badge) * badge_font_size * 0.62 + 30 if type_badge else 0
-        line_h = font_size + line_gap
-        text_h = len(lines) * line_h
-
-        width = max(text_w, badge_w) + 2 * padding_x
-        badge_h = badge_font_size + 16 if type_badge else 0
-        badge_gap = 8 if type_badge else 0
-        height = text_h + badge_h + badge_gap + 2 * padding_y
-
-        # límites por seguridad (evita nodos gigantes)
-        width = int(max(200, min(620, width)))
-        height = int(max(250, min(360, height)))
-
-        stroke = "#6b7280"  # gris neutro
-        stroke_w = 2
-
-        # Coordenadas del polígono (en px)
-        if kind == "hexagon":
-            cut = max(22, min(50, width * 0.18))
-            pts = [
-            (cut, 0),
-            (width - cut, 0),
-            (width, height / 2),
-            (width - cut, height),
-            (cut, height),
-            (0, height / 2),]
-        elif kind == "diamond":
-            pts = [
-            (width / 2, 0),
-            (width, height / 2),
-            (width / 2, height),
-            (0, height / 2),]
-        elif kind == "triangle":
-            # punta arriba
-            pts = [
-            (width / 2, 0),
-            (width, height),
-            (0, height),
-        ]
-        elif kind == "triangleDown":
-            # punta abajo
-            pts = [
-            (0, 0),
-            (width, 0),
-            (width / 2, height),]
-
-        else:
-            # fallback: box-like polygon
-            pts = [(0, 0), (width, 0), (width, height), (0, height)]
-        
-        points_str = " ".join(f"{x:.1f},{y:.1f}" for x, y in pts)
-        # Texto centrado: usamos dominant-baseline para que quede bien
-        # Empezamos y centramos verticalmente con un offset calculado.
-        total_text_h = len(lines) * line_h
-        content_h = total_text_h + badge_h + badge_gap
-        start_y = (height - content_h) / 2 + badge_h + badge_gap + font_size  # primera línea
-
-        # Escapar XML básico
-        def esc(s: str) -> str:
-            return (s.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;"))
-        text_items = []
-        if type_badge:
-            badge_x = width / 2
-            badge_y = (height - content_h) / 2
-            badge_width = max(48, badge_w)
-            badge_height = badge_font_size + 10
-            text_items.append(
-                f'<rect x="{badge_x - badge_width / 2:.1f}" y="{badge_y:.1f}" '
-                f'width="{badge_width:.1f}" height="{badge_height:.1f}" rx="8" '
-                f'fill="#ffffff" opacity="0.72" stroke="#6b7280" stroke-width="1" />'
-                f'<text x="{badge_x:.1f}" y="{badge_y + badge_font_size:.1f}" text-anchor="middle" '
-                f'font-family="Arial, sans-serif" font-size="{badge_font_size}" '
-                f'font-weight="700" fill="#374151">{esc(type_badge)}</text>'
-            )
-        y = start_y
-        for line in lines:
-            text_items.append(
-                 f'<text x="{width/2:.1f}" y="{y:.1f}" text-anchor="middle" '
-                 f'font-family="Arial, sans-serif" font-size="{font_size}" fill="#111827">{esc(line)}</text>'
-            )
-            y += line_h
-
-        scale = 3  # 2 o 3 normalmente basta
-        svg = f"""
-        <svg xmlns="http://www.w3.org/2000/svg"
-             width="{width*scale}" height="{height*scale}"
-             viewBox="0 0 {width} {height}">
-             <polygon points="{points_str}" fill="{fill}" stroke="{stroke}" stroke-width="{stroke_w}" />
-             {"".join(text_items)}
-        </svg>
-        """.strip()
-
-        return self._svg_data_uri(svg)
+        return _render_svg_polygon_node(wrapped_label, fill, kind, type_badge)
 
     def _node_render_strategy(self, tipo: str) -> str:
         """Decide si renderizamos con vis.js nativo o con SVG."""
@@ -427,28 +564,43 @@ class GrafoConocimiento:
         return positions
 
     def _layout_payload(self) -> dict[str, dict]:
-        nodes = sorted(self.G.nodes)
-        type_by_node = {node_id: str(self.G.nodes[node_id].get("tipo", "otro")) for node_id in nodes}
-        source_by_node = {node_id: self._node_source(node_id) for node_id in nodes}
-
         component_by_node = {}
         for idx, component in enumerate(nx.connected_components(self.G.to_undirected())):
             for node_id in component:
                 component_by_node[node_id] = f"componente {idx + 1}"
+        return self._layout_for(dict(self.G.nodes(data=True)), component_by_node)
 
+    def _layout_for(
+        self,
+        datos_por_nodo: dict[str, dict],
+        component_by_node: dict[str, str],
+        meta_por_nodo: dict[str, dict] | None = None,
+    ) -> dict[str, dict]:
+        """Layout inicial y metadatos por nodo para un conjunto de nodos ya filtrado.
+
+        ``meta_por_nodo`` permite reutilizar metadatos ya calculados con ``_layout_meta``.
+        """
+        nodes = sorted(datos_por_nodo)
+        type_by_node = {node_id: str(datos_por_nodo[node_id].get("tipo", "otro")) for node_id in nodes}
+        meta_por_nodo = meta_por_nodo or {}
+        meta = {}
+        for node_id in nodes:
+            node_meta = meta_por_nodo.get(node_id) or self._layout_meta(node_id, datos_por_nodo[node_id])
+            meta[node_id] = {**node_meta, "component": component_by_node.get(node_id, "")}
         return {
             "initial": self._positions_by_group(type_by_node, radius=680),
-            "meta": {
-                node_id: {
-                    "type": type_by_node.get(node_id, ""),
-                    "shortType": self._node_type_abbreviation(type_by_node.get(node_id, "")),
-                    "displayType": self._node_type_display_name(type_by_node.get(node_id, "")),
-                    "source": source_by_node.get(node_id, ""),
-                    "component": component_by_node.get(node_id, ""),
-                    "categories": self._list_or_empty(self.G.nodes[node_id].get("categorias")),
-                }
-                for node_id in nodes
-            },
+            "meta": meta,
+        }
+
+    def _layout_meta(self, node_id: str, datos: dict) -> dict:
+        tipo = str(datos.get("tipo", "otro"))
+        return {
+            "type": tipo,
+            "shortType": self._node_type_abbreviation(tipo),
+            "displayType": self._node_type_display_name(tipo),
+            "source": self._node_source(node_id),
+            "component": "",
+            "categories": self._list_or_empty(datos.get("categorias")),
         }
 
     def _relation_value(self, rel: dict) -> str:
@@ -532,10 +684,13 @@ class GrafoConocimiento:
     def _ensure_placeholder(self, node_id: str) -> None:
         if node_id in self.G.nodes:
             return
+        self.G.add_node(node_id, **self._placeholder_attributes(node_id))
+
+    def _placeholder_attributes(self, node_id: str) -> dict:
         label = node_id
         if len(label) > self.MaxLengthLabel:
             label = label[:self.MaxLengthLabel] + "..."
-        self.G.add_node(node_id, label=label, tipo="placeholder", color="#F0F0F0")
+        return {"label": label, "tipo": "placeholder", "color": "#F0F0F0"}
 
     def _wrap_label(self, text: str, max_chars: int | None = None, max_lines : int | None = None) -> str:
         """Convierte un texto en multilínea usando \\n para que vis.js lo renderice con saltos.
@@ -552,28 +707,7 @@ class GrafoConocimiento:
         if max_lines is None:
             max_lines = self.MaxLinesLabel
 
-        words = text.split()
-        lines = []
-        current = ""
-
-        for w in words:
-            if len(current) + (1 if current else 0) + len(w) <= max_chars:
-                current = f"{current} {w}".strip()
-            else:
-                lines.append(current)
-                current = w
-                if len(lines) >= max_lines:
-                    break
-
-        if len(lines) < max_lines and current:
-            lines.append(current)
-
-        # Si truncamos por max_lines, agrega "..."
-        joined = "\n".join(lines)
-        #if len(words) > 0 and (" ".join(lines).strip() != text):
-            #if not joined.endswith("..."):
-            #    joined = joined.rstrip(".") + "..."
-        return joined
+        return _wrap_text(text, max_chars, max_lines)
 
     def _shape_permitida_para_texto(self, shape: str) -> bool:
         # Shapes que se llevan bien con texto multilínea en vis.js
@@ -582,6 +716,39 @@ class GrafoConocimiento:
 
 
 
+    def _concept_node(self, doc: dict) -> tuple[str, dict]:
+        """Identificador ``id@source`` y atributos del nodo de un concepto."""
+        tipo = self._node_type_value(doc)
+        etiqueta = f"{doc['id']}@{doc['source']}"
+        return etiqueta, {
+            "label": doc.get("titulo", etiqueta),
+            "tipo": tipo,
+            "type_badge": self._node_type_abbreviation(tipo),
+            "color": self.color_por_tipo.get(self._canonical_type(tipo), self.color_por_tipo["otro"]),
+            "source": doc.get("source"),
+            "concept_id": doc.get("id"),
+            "categorias": doc.get("categorias", []),
+            "comentario": doc.get("comentario"),
+            "descripcion": doc.get("descripcion"),
+            "aclaracion": doc.get("aclaracion"),
+            "contenido_latex": doc.get("contenido_latex"),
+            "referencia": doc.get("referencia"),
+        }
+
+    def _relation_endpoints(self, rel: dict) -> tuple[str, str]:
+        # Detectar el formato de relaciones
+        if "desde" in rel and "hasta" in rel:
+            return rel["desde"], rel["hasta"]
+        return f"{rel['desde_id']}@{rel['desde_source']}", f"{rel['hasta_id']}@{rel['hasta_source']}"
+
+    def _relation_edge(self, rel: dict, tipo_rel: str) -> dict:
+        return {
+            "tipo": tipo_rel,
+            "label": self._relation_label(tipo_rel),
+            "color": self.color_por_relacion.get(tipo_rel, "black"),
+            "descripcion": rel.get("descripcion", ""),
+        }
+
     def construir_grafo(self, tipos_relacion: list[str] = None, tipos_concepto: list[str] = None)  -> None:
         """Crea el grafo con los conceptos y relaciones."""
         usar_placeholders = not tipos_concepto  # True si None o []
@@ -596,44 +763,17 @@ class GrafoConocimiento:
             if not self._concepto_permitido(tipo, tipos_concepto):
                 continue
 
-            etiqueta = f"{doc['id']}@{doc['source']}"
-            titulo = doc.get("titulo", etiqueta)
-            color = self.color_por_tipo.get(self._canonical_type(tipo), self.color_por_tipo["otro"])
-            type_badge = self._node_type_abbreviation(tipo)
-            self.G.add_node(
-                etiqueta,
-                label=titulo,
-                tipo=tipo,
-                type_badge=type_badge,
-                color=color,
-                source=doc.get("source"),
-                concept_id=doc.get("id"),
-                categorias=doc.get("categorias", []),
-                comentario=doc.get("comentario"),
-                descripcion=doc.get("descripcion"),
-                aclaracion=doc.get("aclaracion"),
-                contenido_latex=doc.get("contenido_latex"),
-                referencia=doc.get("referencia"),
-            )
+            etiqueta, atributos = self._concept_node(doc)
+            self.G.add_node(etiqueta, **atributos)
 
         # Crear aristas
         for rel in self.relaciones:
-            # Detectar el formato de relaciones
-            if "desde" in rel and "hasta" in rel:
-                desde = rel["desde"]
-                hasta = rel["hasta"]
-            else:
-                desde = f"{rel['desde_id']}@{rel['desde_source']}"
-                hasta = f"{rel['hasta_id']}@{rel['hasta_source']}"
-
+            desde, hasta = self._relation_endpoints(rel)
             tipo_rel = self._relation_value(rel)
             # 🔎 Filtrar si se pidió solo ciertos tipos
             if tipos_relacion and tipo_rel not in tipos_relacion:
                 continue
 
-            color = self.color_por_relacion.get(tipo_rel, "black")
-            relation_label = self._relation_label(tipo_rel)
-
             falta_desde = desde not in self.G.nodes
             falta_hasta = hasta not in self.G.nodes
 
@@ -650,15 +790,7 @@ class GrafoConocimiento:
                     continue
 
             # agregar SIEMPRE la arista (ya existen los nodos: reales o placeholder)
-            self.G.add_edge(
-                desde,
-                hasta,
-                key=tipo_rel,
-                tipo=tipo_rel,
-                label=relation_label,
-                color=color,
-                descripcion=rel.get("descripcion", ""),
-            )
+            self.G.add_edge(desde, hasta, key=tipo_rel, **self._relation_edge(rel, tipo_rel))
         if DEBUG_KNOWLEDGE_GRAPH:
             print("DEBUG tipos_concepto:", tipos_concepto, "usar_placeholders:", usar_placeholders)
             print(f"🧠 Nodos creados: {len(self.G.nodes)} | Relaciones creadas: {len(self.G.edges)}")
@@ -678,9 +810,8 @@ class GrafoConocimiento:
                     print(f"   - {d} -({t})-> {h}   [faltan: {', '.join(faltan)}]")
 
 
-    def to_graph_state(self, previous_state: dict | None = None) -> dict:
-        """Build a serializable vis-network state, preserving existing layout when possible."""
-        previous_state = previous_state if isinstance(previous_state, dict) else {}
+    def _graph_state_settings(self, previous_state: dict) -> dict:
+        """Posiciones, tamaños de etiqueta y controles de UI heredados de un estado previo."""
         previous_node_items = []
         if isinstance(previous_state.get("fullNodes"), list):
             previous_node_items.extend(previous_state.get("fullNodes", []))
@@ -732,104 +863,114 @@ class GrafoConocimiento:
             if isinstance(previous_ui_controls.get("visibleEdgeIds"), list)
             else None,
         }
+        return {
+            "nodes": previous_nodes,
+            "edges": previous_edges,
+            "edge_label_size": edge_label_size,
+            "node_label_size": node_label_size,
+            "ui_controls": ui_controls,
+        }
 
-        layout_payload = self._layout_payload()
-        initial_positions = layout_payload["initial"]
-        nodes = []
-        for node_id, datos in self.G.nodes(data=True):
-            raw_label = datos.get("label", node_id)
-            tipo = datos.get("tipo", "otro")
-            type_badge = datos.get("type_badge", "")
-            color = datos.get("color", "white")
-            position = initial_positions.get(node_id, {"x": 0, "y": 0})
-            wrapped_label = self._wrap_label(raw_label)
-            tooltip = f"<b>{html_lib.escape(str(raw_label))}</b><br>Tipo: {html_lib.escape(str(tipo))}"
-            if type_badge:
-                tooltip = f"{tooltip} ({html_lib.escape(str(type_badge))})"
-            node_metadata = self._node_metadata(node_id, datos)
-
-            if self._node_render_strategy(tipo) == "svg":
-                svg_kind = self._native_shape(tipo)
-                if svg_kind not in {"hexagon", "diamond", "triangle", "triangleDown"}:
-                    svg_kind = "hexagon"
-                node_data = {
-                    "id": node_id,
-                    "shape": "image",
-                    "image": self._make_svg_polygon_node(
-                        wrapped_label=wrapped_label,
-                        fill=color,
-                        kind=svg_kind,
-                        type_badge=type_badge,
-                    ),
-                    "label": "",
-                    "font": {"size": 0, "color": "rgba(0,0,0,0)"},
-                    "title": tooltip,
-                    "x": position["x"],
-                    "y": position["y"],
-                    "fixed": False,
-                    "size": max(22, round(node_label_size * 2.1)),
-                    "shapeProperties": {"useImageSize": False},
-                    **node_metadata,
-                }
-            else:
-                node_data = {
-                    "id": node_id,
-                    "label": self._node_label_with_badge(wrapped_label, type_badge),
-                    "title": tooltip,
-                    "color": color,
-                    "shape": self._native_shape(tipo),
-                    "x": position["x"],
-                    "y": position["y"],
-                    "fixed": False,
-                    "font": {
-                        "size": node_label_size,
-                        "multi": True,
-                        "bold": {"size": max(9, round(node_label_size * 0.62)), "color": "#374151"},
-                    },
-                    **node_metadata,
-                }
-
-            previous_node = previous_nodes.get(node_id, {})
-            for key in ("x", "y", "fixed", "font", "size"):
-                if key in previous_node:
-                    node_data[key] = previous_node[key]
-            nodes.append(node_data)
-
-        edges = []
-        for u, v, k, d in self.G.edges(keys=True, data=True):
-            edge_len = 340 if self.G.nodes[u].get("tipo") == "nota" or self.G.nodes[v].get("tipo") == "nota" else 260
-            edge_color = d.get("color", "black")
-            edge_id = d.get("id") or f"{u}::{k}::{v}"
-            edge_data = {
-                "id": edge_id,
-                "from": u,
-                "to": v,
-                "title": d.get("tipo", ""),
-                "label": d.get("label", "relaciona"),
-                "color": {
-                    "color": edge_color,
-                    "highlight": edge_color,
-                    "hover": edge_color,
-                },
-                "arrows": "to",
-                "font": {
-                    "size": edge_label_size,
-                    "align": "middle",
-                    "color": edge_color,
-                    "strokeWidth": 4,
-                    "strokeColor": "#ffffff",
-                },
-                "length": edge_len,
+    def _node_state(self, node_id: str, datos: dict, position: dict, node_label_size: int) -> dict:
+        """Nodo vis-network (SVG o nativo) sin lo heredado del estado previo."""
+        raw_label = datos.get("label", node_id)
+        tipo = datos.get("tipo", "otro")
+        type_badge = datos.get("type_badge", "")
+        color = datos.get("color", "white")
+        wrapped_label = self._wrap_label(raw_label)
+        tooltip = f"<b>{html_lib.escape(str(raw_label))}</b><br>Tipo: {html_lib.escape(str(tipo))}"
+        if type_badge:
+            tooltip = f"{tooltip} ({html_lib.escape(str(type_badge))})"
+        node_metadata = self._node_metadata(node_id, datos)
+
+        if self._node_render_strategy(tipo) == "svg":
+            svg_kind = self._native_shape(tipo)
+            if svg_kind not in {"hexagon", "diamond", "triangle", "triangleDown"}:
+                svg_kind = "hexagon"
+            return {
+                "id": node_id,
+                "shape": "image",
+                "image": self._make_svg_polygon_node(
+                    wrapped_label=wrapped_label,
+                    fill=color,
+                    kind=svg_kind,
+                    type_badge=type_badge,
+                ),
+                "label": "",
+                "font": {"size": 0, "color": "rgba(0,0,0,0)"},
+                "title": tooltip,
+                "x": position["x"],
+                "y": position["y"],
+                "fixed": False,
+                "size": max(22, round(node_label_size * 2.1)),
+                "shapeProperties": {"useImageSize": False},
+                **node_metadata,
             }
-            previous_edge = previous_edges.get(edge_id, {})
-            if isinstance(previous_edge.get("font"), dict):
-                edge_data["font"].update(previous_edge["font"])
-                edge_data["font"]["color"] = edge_color
-            for key in ("smooth", "width", "dashes"):
-                if key in previous_edge:
-                    edge_data[key] = previous_edge[key]
-            edges.append(edge_data)
+        return {
+            "id": node_id,
+            "label": self._node_label_with_badge(wrapped_label, type_badge),
+            "title": tooltip,
+            "color": color,
+            "shape": self._native_shape(tipo),
+            "x": position["x"],
+            "y": position["y"],
+            "fixed": False,
+            "font": {
+                "size": node_label_size,
+                "multi": True,
+                "bold": {"size": max(9, round(node_label_size * 0.62)), "color": "#374151"},
+            },
+            **node_metadata,
+        }
 
+    def _edge_state(self, u: str, v: str, k: str, d: dict, edge_len: int, edge_label_size: int) -> dict:
+        """Arista vis-network sin lo heredado del estado previo."""
+        edge_color = d.get("color", "black")
+        return {
+            "id": d.get("id") or f"{u}::{k}::{v}",
+            "from": u,
+            "to": v,
+            "title": d.get("tipo", ""),
+            "label": d.get("label", "relaciona"),
+            "color": {
+                "color": edge_color,
+                "highlight": edge_color,
+                "hover": edge_color,
+            },
+            "arrows": "to",
+            "font": {
+                "size": edge_label_size,
+                "align": "middle",
+                "color": edge_color,
+                "strokeWidth": 4,
+                "strokeColor": "#ffffff",
+            },
+            "length": edge_len,
+        }
+
+    def _inherit_node_state(self, node_data: dict, previous_node: dict) -> dict:
+        for key in ("x", "y", "fixed", "font", "size"):
+            if key in previous_node:
+                node_data[key] = previous_node[key]
+        return node_data
+
+    def _inherit_edge_state(self, edge_data: dict, previous_edge: dict) -> dict:
+        if isinstance(previous_edge.get("font"), dict):
+            edge_data["font"] = {**edge_data["font"], **previous_edge["font"]}
+            edge_data["font"]["color"] = edge_data["color"]["color"]
+        for key in ("smooth", "width", "dashes"):
+            if key in previous_edge:
+                edge_data[key] = previous_edge[key]
+        return edge_data
+
+    def _graph_state_payload(
+        self,
+        previous_state: dict,
+        settings: dict,
+        nodes: list[dict],
+        edges: list[dict],
+        layout_payload: dict,
+    ) -> dict:
         return {
             "version": previous_state.get("version", 1),
             "exportedAt": datetime.utcnow().isoformat() + "Z",
@@ -847,21 +988,43 @@ class GrafoConocimiento:
                 },
             ),
             "nodeControls": {
-                "edgeLabelSize": edge_label_size,
-                "nodeLabelSize": node_label_size,
+                "edgeLabelSize": settings["edge_label_size"],
+                "nodeLabelSize": settings["node_label_size"],
             },
-            "uiControls": ui_controls,
+            "uiControls": settings["ui_controls"],
             "layout": layout_payload,
             "selection": previous_state.get("selection", []),
             "note": "Generated from filters in Streamlit; existing node positions are preserved when possible.",
         }
 
+    def to_graph_state(self, previous_state: dict | None = None) -> dict:
+        """Build a serializable vis-network state, preserving existing layout when possible."""
+        previous_state = previous_state if isinstance(previous_state, dict) else {}
+        settings = self._graph_state_settings(previous_state)
+        layout_payload = self._layout_payload()
+        initial_positions = layout_payload["initial"]
+        nodes = []
+        for node_id, datos in self.G.nodes(data=True):
+            position = initial_positions.get(node_id, {"x": 0, "y": 0})
+            node_data = self._node_state(node_id, datos, position, settings["node_label_size"])
+            nodes.append(self._inherit_node_state(node_data, settings["nodes"].get(node_id, {})))
+
+        edges = []
+        for u, v, k, d in self.G.edges(keys=True, data=True):
+            edge_len = 340 if self.G.nodes[u].get("tipo") == "nota" or self.G.nodes[v].get("tipo") == "nota" else 260
+            edge_data = self._edge_state(u, v, k, d, edge_len, settings["edge_label_size"])
+            edges.append(self._inherit_edge_state(edge_data, settings["edges"].get(edge_data["id"], {})))
 
-    def _restore_state_bootstrap(self, graph_state: dict | None) -> str:
+        return self._graph_state_payload(previous_state, settings, nodes, edges, layout_payload)
+
+
+    def _restore_state_bootstrap(self, graph_state: dict | None, resolve_atlas: bool = False) -> str:
         if not graph_state:
             return ""
         state_json = json.dumps(graph_state, ensure_ascii=False).replace("</script>", "<\\/script>")
         state_json_literal = json.dumps(state_json, ensure_ascii=False)
+        if resolve_atlas:
+            state_json_literal = f"mmResolveSvgAtlasState({state_json_literal})"
         return f"""
 <script id="exported-graph-state-script">
 (function () {{
@@ -894,6 +1057,7 @@ class GrafoConocimiento:
         if size is None:
             size = self.MaxLengthLabel
         net = Network(height="100vh", width="100%", directed=True, cdn_resources="in_line")
+        atlas = _SvgAtlas()
         layout_payload = self._layout_payload()
         initial_positions = layout_payload["initial"]
 
@@ -928,7 +1092,7 @@ class GrafoConocimiento:
                 net.add_node(
                     n,
                     shape="image",
-                    image=img_uri,
+                    image=atlas.ref(img_uri),
                     label="",
                     font={"size": 0, "color": "rgba(0,0,0,0)"},                # 👈 importante: NO string vacío
                     title=tooltip,           # 👈 tooltip con texto humano
@@ -3653,9 +3817,20 @@ function downloadGraphStateJson() {
 
         # Insert before closing body
         overlay = overlay.replace("__GRAPH_LAYOUTS__", layout_payload_json)
-        overlay += self._restore_state_bootstrap(initial_state)
+        # Las imágenes SVG del grafo y del estado inicial comparten una sola tabla.
+        atlas_state = atlas.state(initial_state)
+        attached = atlas.attach(html)
+        if attached is None:
+            html = atlas.inline(html)
+            overlay += self._restore_state_bootstrap(initial_state)
+        else:
+            html = attached
+            overlay += self._restore_state_bootstrap(atlas_state, resolve_atlas=bool(atlas.uris))
         if "</body>" in html:
             html = html.replace("</body>", overlay + "\n</body>")
+        self.export_metrics = atlas.metrics(html, attached=attached is not None)
+        if DEBUG_KNOWLEDGE_GRAPH:
+            print(f"🧩 SVG atlas: {self.export_metrics}")
         if salida:
             salida_path = validate_mutable_path(resolve_home_path(salida))
             salida_path.parent.mkdir(parents=True, exist_ok=True)
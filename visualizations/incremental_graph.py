@@ -0,0 +1,548 @@
+"""Incremental knowledge-graph views over a cached per-database base graph.
+
+``KnowledgeGraphBase`` reads every concept and relation of a database once,
+keeps them indexed in memory and memoizes the serialized vis-network payload
+of every node and edge. A filter change is then evaluated in memory with the
+same rules as ``GrafoConocimiento.construir_grafo`` plus the Mongo queries
+the editor used to issue, only nodes and edges entering the view are
+serialized, and ``graph_state_delta`` reports what a client already showing
+the previous state has to add, update or remove.
+
+Node and edge dicts of a returned state share their nested values (fonts,
+metadata) with the memo; copy a state before mutating it in place.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Mapping
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+
+from pymongo.database import Database
+from pymongo.errors import PyMongoError
+
+from mathmongo.query_cache import COLLECTION_VERSIONS
+from mathmongo.query_cache import CollectionVersions
+from mathmongo.relation_endpoints import split_relation_endpoint
+from visualizations.grafoconocimiento import GrafoConocimiento
+
+BASE_MAX_AGE_SECONDS = 30.0
+_BASE_COLLECTIONS = ("concepts", "relations")
+_PLACEHOLDER = -1
+_ITEM_KEYS = frozenset({"nodes", "edges", "fullNodes", "fullEdges"})
+
+
+@dataclass(frozen=True, slots=True)
+class GraphFilters:
+    """Sources, relation types and concept types selecting one view; empty means all."""
+
+    sources: tuple[str, ...] = ()
+    relation_types: tuple[str, ...] = ()
+    concept_types: tuple[str, ...] = ()
+
+    @classmethod
+    def clean(
+        cls,
+        sources: Iterable[str] | None = None,
+        relation_types: Iterable[str] | None = None,
+        concept_types: Iterable[str] | None = None,
+    ) -> GraphFilters:
+        """Drop empty values, as the editor does before querying."""
+        return cls(
+            tuple(value for value in sources or [] if value),
+            tuple(value for value in relation_types or [] if value),
+            tuple(value for value in concept_types or [] if value),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class GraphStateDelta:
+    """Changes turning one graph state into another, keyed by node/edge ``id``."""
+
+    added_nodes: tuple[dict[str, Any], ...] = ()
+    updated_nodes: tuple[dict[str, Any], ...] = ()
+    removed_node_ids: tuple[str, ...] = ()
+    added_edges: tuple[dict[str, Any], ...] = ()
+    updated_edges: tuple[dict[str, Any], ...] = ()
+    removed_edge_ids: tuple[str, ...] = ()
+    settings: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def is_empty(self) -> bool:
+        """Return whether applying the delta would change nothing."""
+        return not any(
+            (
+                self.added_nodes,
+                self.updated_nodes,
+                self.removed_node_ids,
+                self.added_edges,
+                self.updated_edges,
+                self.removed_edge_ids,
+                self.settings,
+            )
+        )
+
+    def summary(self) -> dict[str, int]:
+        """Return per-kind counts for logs and status messages."""
+        return {
+            "added_nodes": len(self.added_nodes),
+            "updated_nodes": len(self.updated_nodes),
+            "removed_nodes": len(self.removed_node_ids),
+            "added_edges": len(self.added_edges),
+            "updated_edges": len(self.updated_edges),
+            "removed_edges": len(self.removed_edge_ids),
+        }
+
+    def to_payload(self) -> dict[str, Any]:
+        """Serialize for a vis-network client (``DataSet.add/update/remove``)."""
+        return {
+            "addNodes": list(self.added_nodes),
+            "updateNodes": list(self.updated_nodes),
+            "removeNodeIds": list(self.removed_node_ids),
+            "addEdges": list(self.added_edges),
+            "updateEdges": list(self.updated_edges),
+            "removeEdgeIds": list(self.removed_edge_ids),
+            "settings": dict(self.settings),
+        }
+
+
+def _items(state: Mapping[str, Any] | None, full_key: str, key: str) -> list[dict[str, Any]]:
+    if not isinstance(state, Mapping):
+        return []
+    items = state.get(full_key)
+    if not isinstance(items, list):
+        items = state.get(key)
+    return [item for item in items or [] if isinstance(item, dict) and item.get("id")]
+
+
+def _diff(
+    previous: list[dict[str, Any]], current: list[dict[str, Any]]
+) -> tuple[tuple[dict, ...], tuple[dict, ...], tuple[str, ...]]:
+    before = {item["id"]: item for item in previous}
+    after = {item["id"]: item for item in current}
+    added = tuple(item for item_id, item in after.items() if item_id not in before)
+    updated = tuple(
+        item for item_id, item in after.items() if item_id in before and before[item_id] != item
+    )
+    removed = tuple(item_id for item_id in before if item_id not in after)
+    return added, updated, removed
+
+
+def graph_state_delta(
+    previous_state: Mapping[str, Any] | None, state: Mapping[str, Any]
+) -> GraphStateDelta:
+    """Diff two graph states by node and edge ``id``.
+
+    ``settings`` holds every top-level key other than the node/edge lists
+    whose value changed, ``exportedAt`` included.
+    """
+    added_nodes, updated_nodes, removed_nodes = _diff(
+        _items(previous_state, "fullNodes", "nodes"), _items(state, "fullNodes", "nodes")
+    )
+    added_edges, updated_edges, removed_edges = _diff(
+        _items(previous_state, "fullEdges", "edges"), _items(state, "fullEdges", "edges")
+    )
+    previous_settings = previous_state if isinstance(previous_state, Mapping) else {}
+    settings = {
+        key: value
+        for key, value in state.items()
+        if key not in _ITEM_KEYS and previous_settings.get(key) != value
+    }
+    return GraphStateDelta(
+        added_nodes,
+        updated_nodes,
+        removed_nodes,
+        added_edges,
+        updated_edges,
+        removed_edges,
+        settings,
+    )
+
+
+def _patched(
+    items: list[dict[str, Any]],
+    added: tuple[dict, ...],
+    updated: tuple[dict, ...],
+    removed: tuple[str, ...],
+) -> list[dict[str, Any]]:
+    replacements = {item["id"]: item for item in updated}
+    dropped = set(removed)
+    kept = [replacements.get(item["id"], item) for item in items if item["id"] not in dropped]
+    return [*kept, *added]
+
+
+def apply_graph_state_delta(state: Mapping[str, Any], delta: GraphStateDelta) -> dict[str, Any]:
+    """Return ``state`` with ``delta`` applied; new items are appended at the end."""
+    nodes = _patched(
+        _items(state, "fullNodes", "nodes"),
+        delta.added_nodes,
+        delta.updated_nodes,
+        delta.removed_node_ids,
+    )
+    edges = _patched(
+        _items(state, "fullEdges", "edges"),
+        delta.added_edges,
+        delta.updated_edges,
+        delta.removed_edge_ids,
+    )
+    patched = {key: value for key, value in state.items() if key not in _ITEM_KEYS}
+    patched.update(delta.settings)
+    patched.update({"nodes": nodes, "edges": edges, "fullNodes": nodes, "fullEdges": edges})
+    return patched
+
+
+def _mongo_in(value: Any, allowed: frozenset[str]) -> bool:
+    # ``{"field": {"$in": [...]}}`` also matches arrays holding an allowed value.
+    values = value if isinstance(value, list) else (value,)
+    return any(isinstance(item, str) and item in allowed for item in values)
+
+
+def _endpoint_source(relation: Mapping[str, Any], prefix: str) -> Any:
+    # Mirrors ``relation_source_query``: structured field first, legacy suffix otherwise.
+    if f"{prefix}_source" in relation:
+        return relation[f"{prefix}_source"]
+    endpoint = split_relation_endpoint(relation.get(prefix))
+    return endpoint[1] if endpoint else None
+
+
+@dataclass(frozen=True, slots=True)
+class _ConceptEntry:
+    node_id: str
+    source: Any
+    raw_type: Any
+    filter_type: str
+    attributes: dict[str, Any]
+
+
+@dataclass(frozen=True, slots=True)
+class _RelationEntry:
+    desde: str
+    hasta: str
+    desde_source: Any
+    hasta_source: Any
+    raw_type: Any
+    key: str
+    attributes: dict[str, Any]
+
+
+@dataclass(slots=True)
+class _GraphView:
+    # Node id -> concept entry index (``_PLACEHOLDER`` for missing endpoints),
+    # edge ``(desde, tipo, hasta)`` -> relation entry index, both in build order.
+    nodes: dict[str, int]
+    edges: dict[tuple[str, str, str], int]
+
+
+class KnowledgeGraphBase:
+    """All concepts and relations of one database, ready for filtered views."""
+
+    def __init__(
+        self,
+        concepts: Iterable[Mapping[str, Any]],
+        relations: Iterable[Mapping[str, Any]],
+    ) -> None:
+        """Index documents once; concepts without ``id``/``source`` are skipped."""
+        self._grafo = GrafoConocimiento([], [])
+        self._concepts: list[_ConceptEntry] = []
+        self._relations: list[_RelationEntry] = []
+        self._node_payloads: dict[tuple[Any, ...], dict[str, Any]] = {}
+        self._edge_payloads: dict[tuple[Any, ...], dict[str, Any]] = {}
+        self._layout_metas: dict[tuple[str, int], dict[str, Any]] = {}
+        for doc in concepts:
+            if not isinstance(doc, Mapping) or "id" not in doc or "source" not in doc:
+                continue
+            node_id, attributes = self._grafo._concept_node(dict(doc))
+            self._concepts.append(
+                _ConceptEntry(
+                    node_id,
+                    doc.get("source"),
+                    doc.get("tipo"),
+                    self._grafo._canonical_type(attributes["tipo"]),
+                    attributes,
+                )
+            )
+        for rel in relations:
+            if not isinstance(rel, Mapping):
+                continue
+            rel = dict(rel)
+            try:
+                desde, hasta = self._grafo._relation_endpoints(rel)
+            except KeyError:
+                continue
+            key = self._grafo._relation_value(rel)
+            self._relations.append(
+                _RelationEntry(
+                    desde,
+                    hasta,
+                    _endpoint_source(rel, "desde"),
+                    _endpoint_source(rel, "hasta"),
+                    rel.get("tipo"),
+                    key,
+                    self._grafo._relation_edge(rel, key),
+                )
+            )
+
+    @classmethod
+    def load(cls, database: Any) -> KnowledgeGraphBase:
+        """Read every concept and relation of ``database`` once."""
+        return cls(database["concepts"].find({}), database["relations"].find({}))
+
+    @property
+    def size(self) -> tuple[int, int]:
+        """Return ``(concepts, relations)`` held by the base."""
+        return len(self._concepts), len(self._relations)
+
+    def _view(self, filters: GraphFilters) -> _GraphView:
+        sources = frozenset(filters.sources)
+        concept_types = frozenset(filters.concept_types)
+        allowed_types = {self._grafo._canonical_type(value) for value in filters.concept_types}
+        relation_types = frozenset(filters.relation_types)
+
+        nodes: dict[str, int] = {}
+        for index, entry in enumerate(self._concepts):
+            if sources and not _mongo_in(entry.source, sources):
+                continue
+            if concept_types and not (
+                _mongo_in(entry.raw_type, concept_types) and entry.filter_type in allowed_types
+            ):
+                continue
+            nodes[entry.node_id] = index
+
+        # Without a concept-type filter, missing endpoints become placeholders.
+        use_placeholders = not concept_types
+        adjacency: dict[str, dict[str, dict[str, int]]] = {}
+        for index, entry in enumerate(self._relations):
+            if sources and not (
+                _mongo_in(entry.desde_source, sources) or _mongo_in(entry.hasta_source, sources)
+            ):
+                continue
+            if relation_types and not (
+                _mongo_in(entry.raw_type, relation_types) and entry.key in relation_types
+            ):
+                continue
+            missing = [endpoint for endpoint in (entry.desde, entry.hasta) if endpoint not in nodes]
+            if missing and not use_placeholders:
+                continue
+            for endpoint in missing:
+                nodes.setdefault(endpoint, _PLACEHOLDER)
+            adjacency.setdefault(entry.desde, {}).setdefault(entry.hasta, {})[entry.key] = index
+        # Same edge order as MultiDiGraph.edges: by source node, then target, then key.
+        edges = {
+            (desde, key, hasta): index
+            for desde in nodes
+            for hasta, keyed in adjacency.get(desde, {}).items()
+            for key, index in keyed.items()
+        }
+        return _GraphView(nodes, edges)
+
+    def _node_data(self, node_id: str, index: int) -> dict[str, Any]:
+        if index == _PLACEHOLDER:
+            return self._grafo._placeholder_attributes(node_id)
+        return self._concepts[index].attributes
+
+    def _components(self, view: _GraphView) -> dict[str, str]:
+        # Union-find numbered by first node in build order, as nx.connected_components.
+        parent = {node_id: node_id for node_id in view.nodes}
+
+        def root(node_id: str) -> str:
+            while parent[node_id] != node_id:
+                parent[node_id] = parent[parent[node_id]]
+                node_id = parent[node_id]
+            return node_id
+
+        for desde, _key, hasta in view.edges:
+            first, second = root(desde), root(hasta)
+            if first != second:
+                parent[second] = first
+        labels: dict[str, str] = {}
+        component_by_node = {}
+        for node_id in view.nodes:
+            component = root(node_id)
+            if component not in labels:
+                labels[component] = f"componente {len(labels) + 1}"
+            component_by_node[node_id] = labels[component]
+        return component_by_node
+
+    def _node_payload(self, node_id: str, index: int, datos: dict, node_label_size: int) -> dict:
+        key = (node_id, index, node_label_size)
+        payload = self._node_payloads.get(key)
+        if payload is None:
+            position = {"x": 0, "y": 0}
+            payload = self._grafo._node_state(node_id, datos, position, node_label_size)
+            self._node_payloads[key] = payload
+        return payload
+
+    def _edge_payload(
+        self, edge: tuple[str, str, str], index: int, edge_len: int, size: int
+    ) -> dict:
+        key = (edge, index, edge_len, size)
+        payload = self._edge_payloads.get(key)
+        if payload is None:
+            desde, tipo, hasta = edge
+            attributes = self._relations[index].attributes
+            payload = self._grafo._edge_state(desde, hasta, tipo, attributes, edge_len, size)
+            self._edge_payloads[key] = payload
+        return payload
+
+    def graph_state(self, filters: GraphFilters, previous_state: dict | None = None) -> dict:
+        """Return the state ``GrafoConocimiento.to_graph_state`` builds for ``filters``."""
+        previous_state = previous_state if isinstance(previous_state, dict) else {}
+        settings = self._grafo._graph_state_settings(previous_state)
+        view = self._view(filters)
+        datos_por_nodo = {
+            node_id: self._node_data(node_id, index) for node_id, index in view.nodes.items()
+        }
+        metas = {}
+        for node_id, index in view.nodes.items():
+            meta = self._layout_metas.get((node_id, index))
+            if meta is None:
+                meta = self._grafo._layout_meta(node_id, datos_por_nodo[node_id])
+                self._layout_metas[(node_id, index)] = meta
+            metas[node_id] = meta
+        layout_payload = self._grafo._layout_for(datos_por_nodo, self._components(view), metas)
+        initial_positions = layout_payload["initial"]
+
+        nodes = []
+        for node_id, index in view.nodes.items():
+            node_data = dict(
+                self._node_payload(
+                    node_id, index, datos_por_nodo[node_id], settings["node_label_size"]
+                )
+            )
+            position = initial_positions.get(node_id, {"x": 0, "y": 0})
+            node_data["x"], node_data["y"] = position["x"], position["y"]
+            previous_node = settings["nodes"].get(node_id, {})
+            nodes.append(self._grafo._inherit_node_state(node_data, previous_node))
+
+        edges = []
+        for edge, index in view.edges.items():
+            desde, _tipo, hasta = edge
+            endpoint_types = (datos_por_nodo[desde].get("tipo"), datos_por_nodo[hasta].get("tipo"))
+            edge_len = 340 if "nota" in endpoint_types else 260
+            edge_data = dict(
+                self._edge_payload(edge, index, edge_len, settings["edge_label_size"])
+            )
+            previous_edge = settings["edges"].get(edge_data["id"], {})
+            edges.append(self._grafo._inherit_edge_state(edge_data, previous_edge))
+
+        return self._grafo._graph_state_payload(
+            previous_state, settings, nodes, edges, layout_payload
+        )
+
+    def graph_state_update(
+        self, filters: GraphFilters, previous_state: dict | None = None
+    ) -> tuple[dict, GraphStateDelta]:
+        """Return the state for ``filters`` and its delta against ``previous_state``."""
+        state = self.graph_state(filters, previous_state)
+        return state, graph_state_delta(previous_state, state)
+
+
+def _database(database: Any) -> Any:
+    # Editor pages pass the MathMongo wrapper; attribute access on a real
+    # pymongo Database would return a collection, hence the isinstance checks.
+    if isinstance(database, Database):
+        return database
+    inner = getattr(database, "db", None)
+    return inner if isinstance(inner, Database) else database
+
+
+def _cache_key(database: Any) -> tuple[int, str]:
+    return id(getattr(database, "client", database)), str(getattr(database, "name", ""))
+
+
+def _counts(database: Any) -> tuple[int, int] | None:
+    try:
+        return (
+            int(database["concepts"].estimated_document_count()),
+            int(database["relations"].estimated_document_count()),
+        )
+    except (PyMongoError, AttributeError, TypeError):
+        return None
+
+
+@dataclass(slots=True)
+class _CachedBase:
+    base: KnowledgeGraphBase
+    counts: tuple[int, int] | None
+    versions: tuple[int, ...]
+    loaded_at: float
+
+
+class KnowledgeGraphBaseCache:
+    """Process-wide ``KnowledgeGraphBase`` per database.
+
+    A base is reloaded after an in-process write bumps the ``concepts`` or
+    ``relations`` version through ``bump_collection_versions``, when either
+    count changes, when it is older than ``max_age`` seconds, or after
+    :meth:`invalidate`. The count and age checks bound how long writes made by
+    other processes stay unseen.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_age: float = BASE_MAX_AGE_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+        versions: CollectionVersions = COLLECTION_VERSIONS,
+    ) -> None:
+        """Keep bases for at most ``max_age`` seconds as measured by ``clock``."""
+        self.max_age = max_age
+        self._clock = clock
+        self._versions = versions
+        self._bases: dict[tuple[int, str], _CachedBase] = {}
+        self._lock = threading.Lock()
+
+    def get(self, database: Any) -> KnowledgeGraphBase:
+        """Return the cached base for ``database``, loading it when stale."""
+        database = _database(database)
+        key, counts, now = _cache_key(database), _counts(database), self._clock()
+        # Read before loading so a write racing the load stales the new base.
+        versions = self._versions.snapshot(database, _BASE_COLLECTIONS)
+        with self._lock:
+            cached = self._bases.get(key)
+        if (
+            cached is not None
+            and counts is not None
+            and cached.counts == counts
+            and cached.versions == versions
+            and now - cached.loaded_at <= self.max_age
+        ):
+            return cached.base
+        base = KnowledgeGraphBase.load(database)
+        with self._lock:
+            self._bases[key] = _CachedBase(base, counts, versions, now)
+        return base
+
+    def invalidate(self, database: Any = None) -> None:
+        """Drop the base of ``database``, or every base when omitted."""
+        with self._lock:
+            if database is None:
+                self._bases.clear()
+            else:
+                self._bases.pop(_cache_key(_database(database)), None)
+
+
+KNOWLEDGE_GRAPH_BASES = KnowledgeGraphBaseCache()
+
+
+def invalidate_knowledge_graph_base(database: Any) -> None:
+    """Forget the cached base graph after an in-place concept or relation edit."""
+    KNOWLEDGE_GRAPH_BASES.invalidate(database)
+
+
+__all__ = [
+    "BASE_MAX_AGE_SECONDS",
+    "GraphFilters",
+    "GraphStateDelta",
+    "KNOWLEDGE_GRAPH_BASES",
+    "KnowledgeGraphBase",
+    "KnowledgeGraphBaseCache",
+    "apply_graph_state_delta",
+    "graph_state_delta",
+    "invalidate_knowledge_graph_base",
+]